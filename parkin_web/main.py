@@ -2,12 +2,17 @@ from fastapi import FastAPI, Request
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, Response
 import os
+import re
 import sys
+import hashlib
+import threading
 from pathlib import Path
 import starlette.routing
-from datetime import datetime
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, NamedTuple, Optional, Set, Tuple
 
 # Create the FastAPI app first
 app = FastAPI(
@@ -59,6 +64,207 @@ except Exception as e:
     print(f"Error setting up static files or templates: {e}")
     templates = None
 
+# Rendered page cache
+# The template pages don't vary per user, so each (template, locale) is rendered
+# once and served from memory with ETag/Last-Modified validators. In dev mode
+# (no VERCEL_ENV) a template edit drops the cache on the next request.
+DEV_MODE = os.environ.get("VERCEL_ENV", "local") == "local"
+PAGE_CACHE_MAX_AGE = int(os.environ.get("PAGE_CACHE_MAX_AGE", "300"))
+SUPPORTED_LOCALES = ("en",)
+DEFAULT_LOCALE = "en"
+
+# Pages rendered at startup
+STATIC_PAGES = (
+    "index.html",
+    "auth/login.html",
+    "register.html",
+    "find-parking.html",
+    "list-space.html",
+    "pricing.html",
+    "security.html",
+    "about.html",
+    "contact.html",
+)
+
+# Templates that are layouts, not pages
+LAYOUT_TEMPLATES = {"base.html"}
+
+# Internal links in the templates: href/action attributes and JS redirects such as
+# window.location.href = '/dashboard'. Linked paths without a template of their own
+# yet are served the home page rather than a 404.
+INTERNAL_LINK_RE = re.compile(
+    r"""(?:\b(?:href|action)\s*=\s*|location(?:\.href)?\s*=\s*|location\.(?:assign|replace)\(\s*)"""
+    r"""["'](/[^"'?#]*)"""
+)
+
+TEMPLATES_UNAVAILABLE = {"message": "Templates are not available. Check /api/health for details."}
+NOT_FOUND_BODY = b'{"error":"Page not found"}'
+
+
+class RenderedPage(NamedTuple):
+    body: bytes
+    etag: str
+    last_modified: datetime
+
+
+def negotiate_locale(accept_language: Optional[str]) -> str:
+    """
+    Pick the best supported locale from an Accept-Language header.
+    """
+    if accept_language:
+        for part in accept_language.split(","):
+            language = part.split(";", 1)[0].strip().split("-", 1)[0].lower()
+            if language in SUPPORTED_LOCALES:
+                return language
+    return DEFAULT_LOCALE
+
+
+class PageCache:
+    """
+    Rendered HTML of the template pages, keyed by template and locale.
+    """
+
+    def __init__(self, templates_dir: str):
+        self.templates_dir = templates_dir
+        self._pages: Dict[Tuple[str, str], RenderedPage] = {}
+        self._routes: Optional[Dict[str, str]] = None
+        self._version: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def templates_version(self) -> float:
+        """
+        Latest modification time of any template, base layouts included.
+        """
+        latest = 0.0
+        for root, _, files in os.walk(self.templates_dir):
+            for name in files:
+                latest = max(latest, os.path.getmtime(os.path.join(root, name)))
+        return latest
+
+    def _check_version(self) -> None:
+        version = self.templates_version()
+        if version != self._version:
+            with self._lock:
+                self._pages = {}
+                self._routes = None
+                self._version = version
+
+    def get(self, template: str, locale: str = DEFAULT_LOCALE) -> RenderedPage:
+        """
+        Get a rendered page, rendering it on a miss.
+        """
+        if self._version is None or DEV_MODE:
+            self._check_version()
+        key = (template, locale)
+        page = self._pages.get(key)
+        if page is None:
+            body = templates.get_template(template).render(locale=locale).encode("utf-8")
+            page = RenderedPage(
+                body=body,
+                etag='"' + hashlib.sha256(body).hexdigest()[:32] + '"',
+                last_modified=datetime.fromtimestamp(int(self._version), tz=timezone.utc),
+            )
+            with self._lock:
+                self._pages[key] = page
+        return page
+
+    def resolve(self, path: str) -> Optional[str]:
+        """
+        Get the template serving a catch-all path, None if there is none.
+
+        The path to template table is built once from the template directory,
+        so unknown paths are a dict miss instead of a failed template lookup.
+        """
+        if self._routes is None or DEV_MODE:
+            self._check_version()
+        routes = self._routes
+        if routes is None:
+            routes = {
+                template[: -len(".html")]: template
+                for template in templates.env.list_templates(extensions=["html"])
+                if template not in LAYOUT_TEMPLATES
+            }
+            for link in self.linked_paths():
+                routes.setdefault(link, "index.html")
+            self._routes = routes
+        return routes.get(path.strip("/"))
+
+    def linked_paths(self) -> Set[str]:
+        """
+        Paths the templates link to internally, without the leading slash.
+        """
+        paths = set()
+        for template in templates.env.list_templates(extensions=["html"]):
+            source = templates.env.loader.get_source(templates.env, template)[0]
+            for link in INTERNAL_LINK_RE.findall(source):
+                path = link.strip("/")
+                if path and not path.startswith(("static/", "api/")):
+                    paths.add(path)
+        return paths
+
+    def warm(self) -> None:
+        """
+        Compile every template and render the static pages in the default locale.
+        """
+        for template in templates.env.list_templates(extensions=["html"]):
+            templates.env.get_template(template)
+        for template in STATIC_PAGES:
+            self.get(template)
+        self.resolve("")
+
+
+page_cache = PageCache(templates_dir)
+
+
+def is_not_modified(request: Request, page: RenderedPage) -> bool:
+    """
+    Evaluate the conditional request headers against a rendered page.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip().replace("W/", "", 1) for tag in if_none_match.split(",")]
+        return "*" in tags or page.etag in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return page.last_modified <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def render_page(request: Request, template: str) -> Response:
+    """
+    Serve a template page from the rendered page cache, honoring conditional requests.
+    """
+    if not templates:
+        return JSONResponse(content=TEMPLATES_UNAVAILABLE)
+    try:
+        page = page_cache.get(template, negotiate_locale(request.headers.get("accept-language")))
+    except Exception as e:
+        return JSONResponse(content={"error": str(e)})
+    headers = {
+        "ETag": page.etag,
+        "Last-Modified": format_datetime(page.last_modified, usegmt=True),
+        "Cache-Control": "no-cache" if DEV_MODE else f"public, max-age={PAGE_CACHE_MAX_AGE}",
+        "Vary": "Accept-Language",
+    }
+    if is_not_modified(request, page):
+        return Response(status_code=304, headers=headers)
+    return HTMLResponse(content=page.body, headers=headers)
+
+
+@app.on_event("startup")
+async def warm_page_cache():
+    """
+    Render the static pages once before serving traffic.
+    """
+    if templates:
+        try:
+            page_cache.warm()
+        except Exception as e:
+            print(f"Error warming the page cache: {e}")
+
 # Simple health check endpoint that doesn't rely on templates
 @app.get("/api/health")
 async def health_check():
@@ -90,13 +296,7 @@ async def home(request: Request):
     """
     Render the home page with fallback to JSON response.
     """
-    try:
-        if templates:
-            return templates.TemplateResponse("index.html", {"request": request})
-        else:
-            return JSONResponse(content={"message": "Templates are not available. Check /api/health for details."})
-    except Exception as e:
-        return JSONResponse(content={"error": str(e)})
+    return render_page(request, "index.html")
 
 # Other routes with error handling
 @app.get("/login", response_class=HTMLResponse)
@@ -104,104 +304,56 @@ async def login_page(request: Request):
     """
     Render the login page.
     """
-    try:
-        if templates:
-            return templates.TemplateResponse("auth/login.html", {"request": request})
-        else:
-            return JSONResponse(content={"message": "Templates are not available. Check /api/health for details."})
-    except Exception as e:
-        return JSONResponse(content={"error": str(e)})
+    return render_page(request, "auth/login.html")
 
 @app.get("/register", response_class=HTMLResponse)
 async def register_page(request: Request):
     """
     Render the registration page.
     """
-    try:
-        if templates:
-            return templates.TemplateResponse("register.html", {"request": request})
-        else:
-            return JSONResponse(content={"message": "Templates are not available. Check /api/health for details."})
-    except Exception as e:
-        return JSONResponse(content={"error": str(e)})
+    return render_page(request, "register.html")
 
 @app.get("/find-parking", response_class=HTMLResponse)
 async def find_parking(request: Request):
     """
     Render the find parking page.
     """
-    try:
-        if templates:
-            return templates.TemplateResponse("find-parking.html", {"request": request})
-        else:
-            return JSONResponse(content={"message": "Templates are not available. Check /api/health for details."})
-    except Exception as e:
-        return JSONResponse(content={"error": str(e)})
+    return render_page(request, "find-parking.html")
 
 @app.get("/list-space", response_class=HTMLResponse)
 async def list_space(request: Request):
     """
     Render the list space page.
     """
-    try:
-        if templates:
-            return templates.TemplateResponse("list-space.html", {"request": request})
-        else:
-            return JSONResponse(content={"message": "Templates are not available. Check /api/health for details."})
-    except Exception as e:
-        return JSONResponse(content={"error": str(e)})
+    return render_page(request, "list-space.html")
 
 @app.get("/pricing", response_class=HTMLResponse)
 async def pricing(request: Request):
     """
     Render the pricing page.
     """
-    try:
-        if templates:
-            return templates.TemplateResponse("pricing.html", {"request": request})
-        else:
-            return JSONResponse(content={"message": "Templates are not available. Check /api/health for details."})
-    except Exception as e:
-        return JSONResponse(content={"error": str(e)})
+    return render_page(request, "pricing.html")
 
 @app.get("/security", response_class=HTMLResponse)
 async def security(request: Request):
     """
     Render the security page.
     """
-    try:
-        if templates:
-            return templates.TemplateResponse("security.html", {"request": request})
-        else:
-            return JSONResponse(content={"message": "Templates are not available. Check /api/health for details."})
-    except Exception as e:
-        return JSONResponse(content={"error": str(e)})
+    return render_page(request, "security.html")
 
 @app.get("/about", response_class=HTMLResponse)
 async def about(request: Request):
     """
     Render the about page.
     """
-    try:
-        if templates:
-            return templates.TemplateResponse("about.html", {"request": request})
-        else:
-            return JSONResponse(content={"message": "Templates are not available. Check /api/health for details."})
-    except Exception as e:
-        return JSONResponse(content={"error": str(e)})
+    return render_page(request, "about.html")
 
 @app.get("/contact", response_class=HTMLResponse)
 async def contact(request: Request):
     """
     Render the contact page.
     """
-    try:
-        if templates:
-            return templates.TemplateResponse("contact.html", {"request": request})
-        else:
-            return JSONResponse(content={"message": "Templates are not available. Check /api/health for details."})
-    except Exception as e:
-        return JSONResponse(content={"error": str(e)})
+    return render_page(request, "contact.html")
 
 # Placeholder image handler
 @app.get("/api/placeholder/{width}/{height}")
@@ -218,18 +370,16 @@ async def placeholder(width: int, height: int):
 async def catch_all(request: Request, full_path: str):
     """
     Catch-all route to handle all paths for Vercel serverless deployment.
+    
+    Known template pages come from the page cache; anything else (bot probes
+    like /wp-admin or /.env) gets a prebuilt 404 without touching Jinja.
     """
+    if not templates:
+        return JSONResponse(content=TEMPLATES_UNAVAILABLE)
     try:
-        # Try to serve a template if available
-        if templates:
-            try:
-                return templates.TemplateResponse(f"{full_path}.html", {"request": request})
-            except Exception:
-                try:
-                    return templates.TemplateResponse("index.html", {"request": request})
-                except Exception:
-                    return JSONResponse(content={"error": "Page not found", "path": full_path})
-        else:
-            return JSONResponse(content={"message": "Templates are not available. Check /api/health for details."})
+        template = page_cache.resolve(full_path)
     except Exception as e:
-        return JSONResponse(content={"error": str(e)})
\ No newline at end of file
+        return JSONResponse(content={"error": str(e)})
+    if template is None:
+        return Response(content=NOT_FOUND_BODY, status_code=404, media_type="application/json")
+    return render_page(request, template)
\ No newline at end of file
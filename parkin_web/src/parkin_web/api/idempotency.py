@@ -0,0 +1,111 @@
+# src/parkin_web/api/idempotency.py
+import hashlib
+import json
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Callable, Optional, Type
+
+from fastapi import HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from src.parkin_web import crud
+from src.parkin_web.core.config import settings
+
+MAX_KEY_LENGTH = 255
+
+
+def idempotent(
+    db: Session,
+    *,
+    key: Optional[str],
+    user_id: int,
+    scope: str,
+    payload: BaseModel,
+    response_model: Type[BaseModel],
+    handler: Callable[[], Any],
+) -> Any:
+    """
+    Run a creation handler at most once per Idempotency-Key.
+    
+    The first request with a key runs the handler and stores its response;
+    retries with the same key and body get the stored response back without
+    running the handler. Failed requests release the key, and a key left
+    unfinished (e.g. by a crashed process) can be retried once its
+    IDEMPOTENCY_LOCK_SECONDS lease is over.
+    
+    Args:
+        db: Database session
+        key: Idempotency-Key header value, None to run the handler directly
+        user_id: ID of the user sending the request
+        scope: Endpoint the key is used for, e.g. "POST /bookings/"
+        payload: Parsed request body
+        response_model: Schema used to serialize the handler result
+        handler: Callback performing the request
+        
+    Returns:
+        The handler result, or a JSONResponse with the stored response
+        
+    Raises:
+        HTTPException: If the key is invalid, reused for another request or still in flight
+    """
+    if key is None:
+        return handler()
+    if not key or len(key) > MAX_KEY_LENGTH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Idempotency-Key must be 1 to {MAX_KEY_LENGTH} characters",
+        )
+    
+    fingerprint = hashlib.sha256(
+        f"{scope}\n{payload.json(sort_keys=True)}".encode()
+    ).hexdigest()
+    now = datetime.utcnow()
+    lease_token = uuid.uuid4().hex
+    record, acquired = crud.idempotency_key.acquire(
+        db,
+        user_id=user_id,
+        key=key,
+        fingerprint=fingerprint,
+        now=now,
+        lease_token=lease_token,
+        locked_until=now + timedelta(seconds=settings.IDEMPOTENCY_LOCK_SECONDS),
+        expires_at=now + timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL_SECONDS),
+    )
+    
+    if not acquired:
+        if record.fingerprint != fingerprint:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Idempotency-Key was already used for a different request",
+            )
+        if record.status_code is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A request with this Idempotency-Key is still in progress",
+            )
+        return JSONResponse(
+            content=json.loads(record.response_body),
+            status_code=record.status_code,
+            headers={"Idempotent-Replayed": "true"},
+        )
+    
+    # The handler commits, which expires the record, so keep its ID rather than reload it
+    record_id = record.id
+    try:
+        result = handler()
+    except Exception:
+        crud.idempotency_key.release(db, id=record_id, lease_token=lease_token)
+        raise
+    
+    body = jsonable_encoder(response_model.from_orm(result))
+    crud.idempotency_key.complete(
+        db,
+        id=record_id,
+        lease_token=lease_token,
+        status_code=status.HTTP_200_OK,
+        response_body=json.dumps(body),
+    )
+    return JSONResponse(content=body, status_code=status.HTTP_200_OK)
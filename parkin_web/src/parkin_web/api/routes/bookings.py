@@ -1,4 +1,513 @@
-# src/parkin_web/api/routes/bookings.py (continued)
+# src/parkin_web/api/routes/bookings.py
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from src.parkin_web import crud, models, schemas
+from src.parkin_web.api import deps
+from src.parkin_web.api.idempotency import idempotent
+from src.parkin_web.core import events, export, pricing
+from src.parkin_web.core.config import settings
+
+router = APIRouter(prefix="/bookings", tags=["bookings"])
+
+
+@router.post("/", response_model=schemas.Booking)
+def create_booking(
+    *,
+    db: Session = Depends(deps.get_db),
+    booking_in: schemas.BookingCreate,
+    idempotency_key: Optional[str] = Header(None),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Create new booking.
+    
+    Retries sent with the same Idempotency-Key header get the original
+    response back instead of creating another booking.
+    """
+    return idempotent(
+        db,
+        key=idempotency_key,
+        user_id=current_user.id,
+        scope="POST /bookings/",
+        payload=booking_in,
+        response_model=schemas.Booking,
+        handler=lambda: _create_booking(db, booking_in=booking_in, current_user=current_user),
+    )
+
+
+def _create_booking(
+    db: Session, *, booking_in: schemas.BookingCreate, current_user: models.User
+) -> models.Booking:
+    parking_space = crud.parking_space.get(db=db, id=booking_in.parking_space_id)
+    if not parking_space or not parking_space.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Parking space not found",
+        )
+    
+    # Check the requested window against the space's weekly availability
+    if not crud.parking_space.is_window_available(
+        parking_space, start_time=booking_in.start_time, end_time=booking_in.end_time
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Parking space is not available for the requested time",
+        )
+    
+    # Check for overlapping bookings
+    if crud.booking.has_conflict(
+        db=db,
+        parking_space_id=parking_space.id,
+        start_time=booking_in.start_time,
+        end_time=booking_in.end_time,
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Parking space is already booked for the requested time",
+        )
+    
+    booking = crud.booking.create_with_details(
+        db=db, obj_in=booking_in, user_id=current_user.id, parking_space=parking_space
+    )
+    crud.parking_space.increment_bookings(db=db, id=parking_space.id)
+    return booking
+
+
+@router.post("/quote", response_model=schemas.BookingQuoteList)
+def quote_bookings(
+    *,
+    db: Session = Depends(deps.get_db),
+    quote_in: schemas.BookingQuoteRequest,
+) -> Any:
+    """
+    Price several prospective bookings at once.
+    """
+    if len(quote_in.items) > settings.QUOTE_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cannot quote more than {settings.QUOTE_MAX_ITEMS} bookings at once",
+        )
+    
+    # Cached quotes are reused, the rest are priced together from cached space rates
+    prices = pricing.quote_cache.quote_batch(
+        quote_in.items,
+        load_inputs=lambda ids: crud.parking_space.get_pricing_inputs(db=db, ids=ids),
+    )
+    missing = sorted(
+        {item.parking_space_id for item, price in zip(quote_in.items, prices) if price is None}
+    )
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Parking spaces not found: {missing}",
+        )
+    
+    quotes = [
+        {
+            "parking_space_id": item.parking_space_id,
+            "start_time": item.start_time,
+            "end_time": item.end_time,
+            "duration_type": item.duration_type,
+            **price,
+        }
+        for item, price in zip(quote_in.items, prices)
+    ]
+    return {"quotes": quotes}
+
+
+@router.get("/quote/stats")
+def get_quote_cache_stats(
+    current_user: models.User = Depends(deps.get_current_superuser),
+) -> Any:
+    """
+    Get quote cache hit-rate metrics (admin only).
+    """
+    return pricing.quote_cache.stats()
+
+
+@router.post("/series", response_model=schemas.BookingSeriesResult)
+def create_booking_series(
+    *,
+    db: Session = Depends(deps.get_db),
+    series_in: schemas.BookingSeriesCreate,
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Create a recurring booking series.
+    """
+    parking_space = crud.parking_space.get(db=db, id=series_in.parking_space_id)
+    if not parking_space or not parking_space.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Parking space not found",
+        )
+    
+    occurrences = crud.booking_series.expand(
+        series_in, max_occurrences=settings.BOOKING_SERIES_MAX_OCCURRENCES
+    )
+    if len(occurrences) > settings.BOOKING_SERIES_MAX_OCCURRENCES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A series cannot have more than {settings.BOOKING_SERIES_MAX_OCCURRENCES} occurrences",
+        )
+    
+    # Check all occurrences against existing bookings with one range query
+    reasons = crud.booking_series.find_conflicts(
+        db=db, parking_space=parking_space, occurrences=occurrences
+    )
+    created = [window for window, reason in zip(occurrences, reasons) if reason is None]
+    skipped = [
+        {"start_time": start, "end_time": end, "reason": reason}
+        for (start, end), reason in zip(occurrences, reasons)
+        if reason is not None
+    ]
+    if skipped and series_in.conflict_policy == schemas.SeriesConflictPolicy.REJECT:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"msg": "Some occurrences of the series conflict", "conflicts": jsonable_encoder(skipped)},
+        )
+    if not created:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No occurrence of the series can be booked",
+        )
+    
+    series = crud.booking_series.create_with_occurrences(
+        db=db,
+        obj_in=series_in,
+        user_id=current_user.id,
+        parking_space=parking_space,
+        occurrences=created,
+    )
+    crud.parking_space.increment_bookings(db=db, id=parking_space.id, count=len(created))
+    return {
+        "series": series,
+        "created": [{"start_time": start, "end_time": end} for start, end in created],
+        "skipped": skipped,
+    }
+
+
+def _bulk_booking_action(
+    db: Session,
+    *,
+    bulk_in: schemas.BookingBulkAction,
+    action: str,
+    current_user: models.User,
+    host_only: bool,
+) -> Dict[str, Any]:
+    """
+    Check access to every booking with one query and apply the action set-based.
+    """
+    if len(bulk_in.ids) > settings.BULK_ACTION_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cannot {action} more than {settings.BULK_ACTION_MAX_IDS} bookings at once",
+        )
+    
+    ids = list(dict.fromkeys(bulk_in.ids))
+    rows = crud.booking.get_access_rows(db=db, ids=ids)
+    is_superuser = crud.user.is_superuser(current_user)
+    
+    results: Dict[int, Dict[str, Any]] = {}
+    allowed = []
+    for id in ids:
+        row = rows.get(id)
+        if row is None:
+            results[id] = {"id": id, "result": "not_found"}
+        elif not (
+            is_superuser
+            or row.owner_id == current_user.id
+            or (not host_only and row.user_id == current_user.id)
+        ):
+            results[id] = {"id": id, "result": "forbidden"}
+        else:
+            allowed.append(id)
+    
+    values: Optional[Dict[str, Any]] = None
+    if action in ("cancel", "reject"):
+        values = {"cancellation_reason": bulk_in.reason or ""}
+    updated = crud.booking.bulk_transition(db=db, ids=allowed, action=action, values=values)
+    for id in allowed:
+        if id in updated:
+            results[id] = {"id": id, "result": "updated", "status": updated[id]}
+        else:
+            results[id] = {"id": id, "result": "invalid_status", "status": rows[id].status}
+    
+    return {"results": [results[id] for id in ids]}
+
+
+@router.post("/bulk-confirm", response_model=schemas.BookingBulkResult)
+def bulk_confirm_bookings(
+    *,
+    db: Session = Depends(deps.get_db),
+    bulk_in: schemas.BookingBulkAction,
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Confirm several pending bookings of the current host.
+    """
+    return _bulk_booking_action(
+        db, bulk_in=bulk_in, action="confirm", current_user=current_user, host_only=True
+    )
+
+
+@router.post("/bulk-reject", response_model=schemas.BookingBulkResult)
+def bulk_reject_bookings(
+    *,
+    db: Session = Depends(deps.get_db),
+    bulk_in: schemas.BookingBulkAction,
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Reject several pending bookings of the current host.
+    """
+    return _bulk_booking_action(
+        db, bulk_in=bulk_in, action="reject", current_user=current_user, host_only=True
+    )
+
+
+@router.post("/bulk-cancel", response_model=schemas.BookingBulkResult)
+def bulk_cancel_bookings(
+    *,
+    db: Session = Depends(deps.get_db),
+    bulk_in: schemas.BookingBulkAction,
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Cancel several pending or confirmed bookings.
+    """
+    return _bulk_booking_action(
+        db, bulk_in=bulk_in, action="cancel", current_user=current_user, host_only=False
+    )
+
+
+@router.get("/", response_model=List[schemas.Booking])
+def get_user_bookings(
+    *,
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+    skip: int = 0,
+    limit: int = 10,
+) -> Any:
+    """
+    Get current user's bookings.
+    """
+    return crud.booking.get_user_bookings(
+        db=db, user_id=current_user.id, skip=skip, limit=limit
+    )
+
+
+@router.get("/host", response_model=List[schemas.Booking])
+def get_host_bookings(
+    *,
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+    skip: int = 0,
+    limit: int = 10,
+) -> Any:
+    """
+    Get bookings for current user's parking spaces.
+    """
+    return crud.booking.get_host_bookings(
+        db=db, host_id=current_user.id, skip=skip, limit=limit
+    )
+
+
+@router.get("/host/stats", response_model=schemas.HostStats)
+def get_host_stats(
+    *,
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+    days: int = 30,
+    parking_space_id: Optional[int] = None,
+) -> Any:
+    """
+    Get daily booking, revenue, payout and view stats for current user's parking spaces.
+    """
+    if days < 1 or days > settings.HOST_STATS_MAX_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"days must be between 1 and {settings.HOST_STATS_MAX_DAYS}",
+        )
+    end_day = datetime.utcnow().date()
+    return crud.host_stat.get_host_stats(
+        db=db,
+        host_id=current_user.id,
+        start_day=end_day - timedelta(days=days - 1),
+        end_day=end_day,
+        parking_space_id=parking_space_id,
+    )
+
+
+@router.get("/export")
+def export_bookings(
+    *,
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+    start: datetime = Query(..., alias="from"),
+    end: datetime = Query(..., alias="to"),
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    booking_status: Optional[schemas.BookingStatus] = Query(None, alias="status"),
+    host_id: Optional[int] = None,
+) -> Any:
+    """
+    Stream bookings created in a date range as CSV or NDJSON.
+    
+    Hosts export the bookings of their own parking spaces, superusers can
+    export everything or a single host.
+    """
+    if not crud.user.is_superuser(current_user):
+        if host_id is not None and host_id != current_user.id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You don't have permission to export these bookings",
+            )
+        host_id = current_user.id
+    
+    rows = export.stream_export(
+        lambda session: crud.booking.iter_export(
+            session,
+            start=start,
+            end=end,
+            host_id=host_id,
+            status=booking_status,
+            batch_size=settings.EXPORT_BATCH_SIZE,
+        ),
+        export.BOOKING_EXPORT_COLUMNS,
+        format,
+    )
+    return StreamingResponse(
+        rows,
+        media_type=export.MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="bookings.{format}"'},
+    )
+
+
+@router.get("/events")
+async def stream_booking_events(
+    request: Request,
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Stream status changes of the current user's bookings, as driver or host, as server-sent events.
+    
+    Replaces polling GET /bookings/{id}: a booking event carries the new status
+    and window; a resync event means events were dropped and the client should refetch.
+    """
+    subscription = events.broker.subscribe([events.user_topic(current_user.id)])
+    return StreamingResponse(
+        events.stream(subscription, request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/{id}", response_model=schemas.BookingDetail)
+def get_booking(
+    *,
+    db: Session = Depends(deps.get_db),
+    id: int,
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Get booking by ID.
+    """
+    booking = crud.booking.get_with_archive(db=db, id=id)
+    if not booking:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Booking not found",
+        )
+    
+    # Check if user is authorized to view this booking
+    parking_space = crud.parking_space.get(db=db, id=booking.parking_space_id)
+    if booking.user_id != current_user.id and parking_space.owner_id != current_user.id and not crud.user.is_superuser(current_user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You don't have permission to view this booking",
+        )
+    
+    return booking
+
+
+@router.put("/{id}/cancel", response_model=schemas.Booking)
+def cancel_booking(
+    *,
+    db: Session = Depends(deps.get_db),
+    id: int,
+    cancellation_reason: str = "",
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Cancel booking.
+    """
+    found = crud.booking.get_with_owner_id(db=db, id=id)
+    if not found:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Booking not found",
+        )
+    booking, owner_id = found
+    
+    # Check if user is authorized to cancel this booking
+    if booking.user_id != current_user.id and owner_id != current_user.id and not crud.user.is_superuser(current_user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You don't have permission to cancel this booking",
+        )
+    
+    # Cancel only if the booking is still pending or confirmed
+    updated = crud.booking.cancel(db=db, id=id, cancellation_reason=cancellation_reason)
+    if not updated:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cannot cancel a booking with status {booking.status}",
+        )
+    return updated
+
+
+@router.put("/{id}/reject", response_model=schemas.Booking)
+def reject_booking(
+    *,
+    db: Session = Depends(deps.get_db),
+    id: int,
+    rejection_reason: str = "",
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Reject booking.
+    """
+    found = crud.booking.get_with_owner_id(db=db, id=id)
+    if not found:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Booking not found",
+        )
+    booking, owner_id = found
+    
+    # Check if user is authorized to reject this booking
+    if owner_id != current_user.id and not crud.user.is_superuser(current_user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You don't have permission to reject this booking",
+        )
+    
+    # Reject only if the booking is still pending
+    updated = crud.booking.reject(db=db, id=id, rejection_reason=rejection_reason)
+    if not updated:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cannot reject a booking with status {booking.status}",
+        )
+    return updated
+
+
 @router.put("/{id}/confirm", response_model=schemas.Booking)
 def confirm_booking(
     *,
@@ -9,30 +518,29 @@ def confirm_booking(
     """
     Confirm booking.
     """
-    booking = crud.booking.get(db=db, id=id)
-    if not booking:
+    found = crud.booking.get_with_owner_id(db=db, id=id)
+    if not found:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Booking not found",
         )
+    booking, owner_id = found
     
     # Check if user is authorized to confirm this booking
-    parking_space = crud.parking_space.get(db=db, id=booking.parking_space_id)
-    if parking_space.owner_id != current_user.id and not crud.user.is_superuser(current_user):
+    if owner_id != current_user.id and not crud.user.is_superuser(current_user):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You don't have permission to confirm this booking",
         )
     
-    # Check if booking is pending
-    if booking.status != schemas.BookingStatus.PENDING:
+    # Confirm only if the booking is still pending
+    updated = crud.booking.confirm(db=db, id=id)
+    if not updated:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Cannot confirm a booking with status {booking.status}",
         )
-    
-    booking = crud.booking.confirm(db=db, id=id)
-    return booking
+    return updated
 
 
 @router.put("/{id}/complete", response_model=schemas.Booking)
@@ -45,30 +553,29 @@ def complete_booking(
     """
     Mark booking as completed.
     """
-    booking = crud.booking.get(db=db, id=id)
-    if not booking:
+    found = crud.booking.get_with_owner_id(db=db, id=id)
+    if not found:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Booking not found",
         )
+    booking, owner_id = found
     
     # Check if user is authorized to complete this booking
-    parking_space = crud.parking_space.get(db=db, id=booking.parking_space_id)
-    if booking.user_id != current_user.id and parking_space.owner_id != current_user.id and not crud.user.is_superuser(current_user):
+    if booking.user_id != current_user.id and owner_id != current_user.id and not crud.user.is_superuser(current_user):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You don't have permission to complete this booking",
         )
     
-    # Check if booking is confirmed
-    if booking.status != schemas.BookingStatus.CONFIRMED:
+    # Complete only if the booking is still confirmed
+    updated = crud.booking.complete(db=db, id=id)
+    if not updated:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Cannot complete a booking with status {booking.status}",
         )
-    
-    booking = crud.booking.complete(db=db, id=id)
-    return booking
+    return updated
 
 
 @router.post("/{id}/review", response_model=schemas.Review)
@@ -1,11 +1,18 @@
 # src/parkin_web/api/routes/parking.py
 from typing import Any, List, Optional
+from datetime import datetime, timedelta
+import hashlib
+import json
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
 
 from src.parkin_web import crud, models, schemas
 from src.parkin_web.api import deps
+from src.parkin_web.core import availability, change_feed, events, serialization, tiles
+from src.parkin_web.core.geo import cells_in_bbox
+from src.parkin_web.core.config import settings
 
 router = APIRouter(prefix="/parking", tags=["parking"])
 
@@ -17,8 +24,8 @@ def search_parking_spaces(
     latitude: Optional[float] = None,
     longitude: Optional[float] = None,
     city: Optional[str] = None,
-    start_time: Optional[str] = None,
-    end_time: Optional[str] = None,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
     has_security_camera: Optional[bool] = None,
     has_ev_charging: Optional[bool] = None,
     has_covered_parking: Optional[bool] = None,
@@ -26,10 +33,20 @@ def search_parking_spaces(
     max_price: Optional[float] = None,
     skip: int = 0,
     limit: int = 10,
+    view: str = Query("full", description=serialization.VIEWS_DESCRIPTION),
+    fields: Optional[str] = Query(None, description="Comma-separated fields, overrides view"),
 ) -> Any:
     """
     Search for parking spaces with filters.
+    
+    The response is built straight from the ORM rows, the response model only documents it.
+    With a pin/card view or a fields list, only the selected columns are loaded and returned.
     """
+    try:
+        selected = serialization.resolve_fields(view, fields)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
     parking_spaces = crud.parking_space.search(
         db,
         latitude=latitude,
@@ -44,8 +61,91 @@ def search_parking_spaces(
         max_price=max_price,
         skip=skip,
         limit=limit,
+        columns=serialization.columns_of(selected),
+        with_images=serialization.IMAGES_FIELD in selected,
+    )
+    return ORJSONResponse(serialization.search_result(parking_spaces, fields=selected))
+
+
+@router.get("/tiles/{z}/{x}/{y}", response_model=schemas.ParkingTile)
+def get_parking_tile(
+    *,
+    db: Session = Depends(deps.get_db),
+    z: int,
+    x: int,
+    y: int,
+) -> Any:
+    """
+    Get server-side clusters of parking spaces for a slippy-map tile.
+    """
+    if not tiles.is_valid_tile(z, x, y):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Tile not found",
+        )
+    return ORJSONResponse(crud.parking_space.get_tile(db, z=z, x=x, y=y))
+
+
+@router.get("/changes", response_model=schemas.ChangeFeedPage)
+def get_parking_space_changes(
+    *,
+    db: Session = Depends(deps.get_db),
+    since: Optional[str] = Query(None, description="Cursor returned by the previous page"),
+    limit: int = Query(100, ge=1, le=settings.CHANGE_FEED_MAX_LIMIT),
+) -> Any:
+    """
+    Get the parking spaces created, updated or deleted since a cursor.
+    
+    Clients refresh their copy incrementally by following the returned cursor.
+    A cursor older than the tombstone retention window gets a 410, the client
+    must then reload everything and start again without a cursor.
+    """
+    try:
+        cursor = change_feed.decode_cursor(since)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+    if crud.change_feed.is_expired(cursor):
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="Cursor expired, resync required",
+        )
+    changes, cursor = crud.change_feed.changes_since(
+        db, models.ParkingSpace, cursor=cursor, limit=limit
+    )
+    return {
+        "changes": [change._asdict() for change in changes],
+        "cursor": change_feed.encode_cursor(cursor),
+    }
+
+
+@router.get("/events")
+async def stream_parking_events(
+    request: Request,
+    south: float = Query(..., ge=-90, le=90),
+    west: float = Query(..., ge=-180, le=180),
+    north: float = Query(..., ge=-90, le=90),
+    east: float = Query(..., ge=-180, le=180),
+) -> Any:
+    """
+    Stream availability and parking space changes in a map area as server-sent events.
+    
+    The area is rounded out to geo-cells; availability events carry a booking
+    window that became busy or free, parking_space events a created, updated
+    or deleted space.
+    """
+    try:
+        cells = cells_in_bbox(south, west, north, east, max_cells=settings.SSE_MAX_CELLS)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    subscription = events.broker.subscribe([events.cell_topic(cell) for cell in cells])
+    return StreamingResponse(
+        events.stream(subscription, request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
-    return {"total": len(parking_spaces), "results": parking_spaces}
 
 
 @router.post("/", response_model=schemas.ParkingSpace)
@@ -208,4 +308,69 @@ def create_availability_schedule(
     schedule = crud.availability_schedule.create_with_parking_space(
         db=db, obj_in=schedule_in, parking_space_id=id
     )
-    return schedule
\ No newline at end of file
+    return schedule
+
+
+@router.get("/{id}/calendar", response_model=schemas.ParkingSpaceCalendar)
+def get_parking_space_calendar(
+    *,
+    db: Session = Depends(deps.get_db),
+    id: int,
+    start_time: datetime = Query(..., alias="from"),
+    end_time: datetime = Query(..., alias="to"),
+    granularity: int = Query(60, ge=availability.SLOT_MINUTES, le=24 * 60),
+    if_none_match: Optional[str] = Header(None),
+    response: Response,
+) -> Any:
+    """
+    Get the free/busy calendar of a parking space as run-length encoded slots.
+    
+    Timezone-aware bounds are converted to UTC; naive ones are taken as UTC.
+    """
+    start_time = availability.to_naive_utc(start_time)
+    end_time = availability.to_naive_utc(end_time)
+    if end_time <= start_time:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'to' must be after 'from'",
+        )
+    if end_time - start_time > timedelta(days=settings.CALENDAR_MAX_DAYS):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Calendar range cannot exceed {settings.CALENDAR_MAX_DAYS} days",
+        )
+    if granularity % availability.SLOT_MINUTES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Granularity must be a multiple of {availability.SLOT_MINUTES} minutes",
+        )
+    
+    calendar = crud.parking_space.get_calendar_windows(
+        db=db, id=id, start_time=start_time, end_time=end_time
+    )
+    if calendar is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Parking space not found",
+        )
+    bitmap, busy_windows = calendar
+    runs = availability.build_calendar_runs(
+        bitmap, busy_windows, start_time, end_time, granularity
+    )
+    payload = {
+        "parking_space_id": id,
+        "start_time": start_time,
+        "end_time": end_time,
+        "granularity": granularity,
+        "slots": sum(count for _, count in runs),
+        "runs": runs,
+    }
+    
+    # Strong ETag over the encoded calendar so unchanged calendars come back as 304
+    digest = hashlib.sha256(json.dumps(payload, default=str).encode()).hexdigest()
+    etag = f'"{digest}"'
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    
+    response.headers["ETag"] = etag
+    return payload
@@ -1,26 +1,54 @@
 # src/parkin_web/api/routes/payments.py
-from typing import Any, List
+from datetime import datetime
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from src.parkin_web import crud, models, schemas
 from src.parkin_web.api import deps
+from src.parkin_web.api.idempotency import idempotent
+from src.parkin_web.core import export, webhooks
 from src.parkin_web.core.config import settings
 
 router = APIRouter(prefix="/payments", tags=["payments"])
 
+LEDGER_ACCOUNT_TYPES = ("user", "host")
+
+# Only changed through refunds, provider webhooks and payouts, which post the matching ledger entries
+LEDGER_FIELDS = ("status", "refund_amount", "host_payout_amount", "host_payout_status")
+
 
 @router.post("/", response_model=schemas.Payment)
 def create_payment(
     *,
     db: Session = Depends(deps.get_db),
     payment_in: schemas.PaymentCreate,
+    idempotency_key: Optional[str] = Header(None),
     current_user: models.User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Create new payment.
+    
+    Retries sent with the same Idempotency-Key header get the original
+    response back instead of charging again.
     """
+    return idempotent(
+        db,
+        key=idempotency_key,
+        user_id=current_user.id,
+        scope="POST /payments/",
+        payload=payment_in,
+        response_model=schemas.Payment,
+        handler=lambda: _create_payment(db, payment_in=payment_in, current_user=current_user),
+    )
+
+
+def _create_payment(
+    db: Session, *, payment_in: schemas.PaymentCreate, current_user: models.User
+) -> models.Payment:
     # Check if booking exists and belongs to the current user
     booking = crud.booking.get(db=db, id=payment_in.booking_id)
     if not booking:
@@ -56,11 +84,6 @@ def create_payment(
         booking_id=payment_in.booking_id,
     )
     
-    # Update booking with payment ID
-    booking.payment_id = payment.id
-    db.add(booking)
-    db.commit()
-    
     # If payment is successful, confirm the booking if it's pending
     if payment.status == schemas.PaymentStatus.COMPLETED and booking.status == schemas.BookingStatus.PENDING:
         booking = crud.booking.confirm(db=db, id=booking.id)
@@ -68,6 +91,47 @@ def create_payment(
     return payment
 
 
+@router.post("/webhook", response_model=schemas.Msg)
+async def receive_webhook(
+    request: Request,
+    stripe_signature: Optional[str] = Header(None),
+    db: Session = Depends(deps.get_db),
+) -> Any:
+    """
+    Receive a payment provider event.
+    
+    The event is only verified and queued here; webhook workers apply it.
+    """
+    if not settings.STRIPE_WEBHOOK_SECRET:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Webhooks are not configured",
+        )
+    payload = await request.body()
+    try:
+        webhooks.verify_signature(
+            payload,
+            stripe_signature,
+            settings.STRIPE_WEBHOOK_SECRET,
+            tolerance=settings.WEBHOOK_TOLERANCE_SECONDS,
+        )
+        event_id, event_type = webhooks.parse_event(payload)
+    except (webhooks.WebhookSignatureError, ValueError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    
+    await run_in_threadpool(
+        crud.webhook_event.enqueue,
+        db,
+        event_id=event_id,
+        event_type=event_type,
+        payload=payload.decode(),
+    )
+    return {"msg": "Event received"}
+
+
 @router.get("/", response_model=List[schemas.Payment])
 def get_user_payments(
     *,
@@ -84,6 +148,149 @@ def get_user_payments(
     )
 
 
+@router.get("/balance", response_model=List[schemas.LedgerBalance])
+def get_balances(
+    *,
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Get current user's ledger balances as a driver ("user") and as a host ("host").
+    """
+    balances = []
+    for account_type in LEDGER_ACCOUNT_TYPES:
+        account = crud.ledger.get_balance(db=db, account_type=account_type, account_id=current_user.id)
+        balances.append(account or {"account_type": account_type})
+    return balances
+
+
+@router.get("/statement", response_model=schemas.LedgerStatement)
+def get_statement(
+    *,
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+    account_type: str = Query("user", pattern="^(user|host)$"),
+    start: Optional[datetime] = Query(None, alias="from"),
+    end: Optional[datetime] = Query(None, alias="to"),
+    skip: int = 0,
+    limit: int = 100,
+) -> Any:
+    """
+    Get current user's ledger entries, newest first.
+    """
+    account = crud.ledger.get_balance(db=db, account_type=account_type, account_id=current_user.id)
+    entries = crud.ledger.get_statement(
+        db=db,
+        account_type=account_type,
+        account_id=current_user.id,
+        start=start,
+        end=end,
+        skip=skip,
+        limit=limit,
+    )
+    return {
+        "account_type": account_type,
+        "balance": account.balance if account else 0.0,
+        "entries": entries,
+    }
+
+
+@router.get("/ledger/reconcile", response_model=List[schemas.LedgerDiscrepancy])
+def reconcile_ledger(
+    *,
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_superuser),
+) -> Any:
+    """
+    Check the ledger against payments and payouts (admin only).
+    """
+    return crud.ledger.reconcile(db=db)
+
+
+@router.get("/reconciliation", response_model=schemas.ReconciliationReport)
+def get_reconciliation_report(
+    *,
+    db: Session = Depends(deps.get_db),
+    run_id: Optional[int] = None,
+    current_user: models.User = Depends(deps.get_current_superuser),
+) -> Any:
+    """
+    Get a reconciliation run with its discrepancy counts per rule, the latest by default (admin only).
+    """
+    report = crud.reconciliation.get_report(db=db, run_id=run_id)
+    if not report:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Reconciliation run not found",
+        )
+    return report
+
+
+@router.get(
+    "/reconciliation/{run_id}/discrepancies",
+    response_model=List[schemas.ReconciliationDiscrepancy],
+)
+def get_reconciliation_discrepancies(
+    *,
+    db: Session = Depends(deps.get_db),
+    run_id: int,
+    rule: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+    current_user: models.User = Depends(deps.get_current_superuser),
+) -> Any:
+    """
+    List the discrepancies found by a reconciliation run (admin only).
+    """
+    return crud.reconciliation.get_discrepancies(
+        db=db, run_id=run_id, rule=rule, skip=skip, limit=limit
+    )
+
+
+@router.get("/export")
+def export_payments(
+    *,
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+    start: datetime = Query(..., alias="from"),
+    end: datetime = Query(..., alias="to"),
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    payment_status: Optional[schemas.PaymentStatus] = Query(None, alias="status"),
+    host_id: Optional[int] = None,
+) -> Any:
+    """
+    Stream payments created in a date range as CSV or NDJSON.
+    
+    Hosts export the payments for their own parking spaces, superusers can
+    export everything or a single host.
+    """
+    if not crud.user.is_superuser(current_user):
+        if host_id is not None and host_id != current_user.id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You don't have permission to export these payments",
+            )
+        host_id = current_user.id
+    
+    rows = export.stream_export(
+        lambda session: crud.payment.iter_export(
+            session,
+            start=start,
+            end=end,
+            host_id=host_id,
+            status=payment_status,
+            batch_size=settings.EXPORT_BATCH_SIZE,
+        ),
+        export.PAYMENT_EXPORT_COLUMNS,
+        format,
+    )
+    return StreamingResponse(
+        rows,
+        media_type=export.MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="payments.{format}"'},
+    )
+
+
 @router.get("/{id}", response_model=schemas.Payment)
 def get_payment(
     *,
@@ -102,7 +309,12 @@ def get_payment(
         )
     
     # Check if user is authorized to view this payment
-    booking = crud.booking.get(db=db, id=payment.booking_id)
+    booking = crud.booking.get_with_archive(db=db, id=payment.booking_id)
+    if not booking:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Booking not found",
+        )
     parking_space = crud.parking_space.get(db=db, id=booking.parking_space_id)
     
     if booking.user_id != current_user.id and parking_space.owner_id != current_user.id and not crud.user.is_superuser(current_user):
@@ -134,7 +346,12 @@ def refund_payment(
         )
     
     # Check if user is authorized to refund this payment
-    booking = crud.booking.get(db=db, id=payment.booking_id)
+    booking = crud.booking.get_with_archive(db=db, id=payment.booking_id)
+    if not booking:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Booking not found",
+        )
     parking_space = crud.parking_space.get(db=db, id=booking.parking_space_id)
     
     if parking_space.owner_id != current_user.id and not crud.user.is_superuser(current_user):
@@ -186,6 +403,9 @@ def update_payment(
 ) -> Any:
     """
     Update payment details (admin only).
+    
+    Amounts and statuses can't be edited here, since that would bypass the
+    ledger; use the refund endpoint instead.
     """
     payment = crud.payment.get(db=db, id=id)
     if not payment:
@@ -194,5 +414,13 @@ def update_payment(
             detail="Payment not found",
         )
     
+    changes = payment_in.dict(exclude_unset=True)
+    changed = [field for field in LEDGER_FIELDS if field in changes and changes[field] != getattr(payment, field)]
+    if changed:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cannot update {', '.join(changed)} directly, these changes must go through the ledger",
+        )
+    
     payment = crud.payment.update(db=db, db_obj=payment, obj_in=payment_in)
     return payment
\ No newline at end of file
@@ -1,13 +1,15 @@
 # src/parkin_web/api/routes/users.py
-from typing import Any, List
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, Body, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, status
 from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
 from pydantic import EmailStr
 from sqlalchemy.orm import Session
 
 from src.parkin_web import crud, models, schemas
 from src.parkin_web.api import deps
+from src.parkin_web.core import serialization
 from src.parkin_web.core.config import settings
 
 router = APIRouter(prefix="/users", tags=["users"])
@@ -44,13 +46,33 @@ def read_user_parking_spaces(
     current_user: models.User = Depends(deps.get_current_active_user),
     skip: int = 0,
     limit: int = 100,
+    view: Optional[str] = Query(None, description=serialization.VIEWS_DESCRIPTION),
+    fields: Optional[str] = Query(None, description="Comma-separated fields, overrides view"),
 ) -> Any:
     """
     Get current user's parking spaces.
+    
+    With a view or a fields list, only the selected columns are loaded and returned.
     """
-    return crud.parking_space.get_multi_by_owner(
-        db=db, owner_id=current_user.id, skip=skip, limit=limit
+    if view is None and fields is None:
+        parking_spaces = crud.parking_space.get_multi_by_owner(
+            db=db, owner_id=current_user.id, skip=skip, limit=limit
+        )
+        return ORJSONResponse(serialization.parking_space_list(parking_spaces))
+    
+    try:
+        selected = serialization.resolve_fields(view or "full", fields)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    parking_spaces = crud.parking_space.get_multi_by_owner(
+        db=db,
+        owner_id=current_user.id,
+        skip=skip,
+        limit=limit,
+        columns=serialization.columns_of(selected),
+        with_images=serialization.IMAGES_FIELD in selected,
     )
+    return ORJSONResponse(serialization.parking_space_list(parking_spaces, fields=selected))
 
 
 @router.get("/me/reviews", response_model=List[schemas.Review])
@@ -1,4 +1,6 @@
 # src/parkin_web/api/routes/web.py
+from datetime import datetime, timedelta
+
 from fastapi import APIRouter, Request, Depends, HTTPException
 from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session
@@ -105,9 +107,13 @@ async def hosting_page(
     Render the hosting dashboard page.
     """
     bookings = crud.booking.get_host_bookings(db, host_id=current_user.id)
+    today = datetime.utcnow().date()
+    stats = crud.host_stat.get_host_stats(
+        db, host_id=current_user.id, start_day=today - timedelta(days=29), end_day=today
+    )
     return templates.TemplateResponse(
         "profile/hosting.html", 
-        {"request": request, "user": current_user, "bookings": bookings}
+        {"request": request, "user": current_user, "bookings": bookings, "stats": stats}
     )
 
 
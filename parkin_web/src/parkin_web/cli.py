@@ -1,4 +1,9 @@
 """Console script for parkin_web."""
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
 import parkin_web
 
 import typer
@@ -16,6 +21,116 @@ def main():
     console.print("See Typer documentation at https://typer.tiangolo.com/")
     
 
+@app.command()
+def run_job(name: str):
+    """Run a scheduled background job once."""
+    from src.parkin_web.jobs import scheduler
+
+    if name not in scheduler.jobs:
+        console.print(f"Unknown job {name}, available: {', '.join(sorted(scheduler.jobs))}")
+        raise typer.Exit(code=1)
+    result = scheduler.run(name)
+    console.print(f"{name}: {result}")
+
+
+@app.command()
+def backfill_availability_bitmaps(batch_size: int = 1000):
+    """Compile the weekly availability bitmap of every parking space with schedules."""
+    from src.parkin_web import crud
+    from src.parkin_web.db.session import SessionLocal
+
+    db = SessionLocal()
+    try:
+        spaces = crud.parking_space.backfill_availability_bitmaps(db, batch_size=batch_size)
+    finally:
+        db.close()
+    console.print(f"availability bitmaps: {spaces} parking spaces compiled")
+
+
+@app.command()
+def backfill_ledger(batch_size: int = 1000):
+    """Post opening ledger entries for the payments and payouts that predate the ledger."""
+    from src.parkin_web import crud
+    from src.parkin_web.db.session import SessionLocal
+
+    db = SessionLocal()
+    try:
+        entries = crud.payment.backfill_ledger(db, batch_size=batch_size)
+    finally:
+        db.close()
+    console.print(f"ledger: {entries} opening entries posted")
+
+
+@app.command()
+def backfill_host_stats(days: int = 365):
+    """Rebuild the host dashboard rollup for the last given number of days."""
+    from datetime import timedelta
+
+    from src.parkin_web import crud
+    from src.parkin_web.db.session import SessionLocal
+
+    today = datetime.utcnow().date()
+    db = SessionLocal()
+    try:
+        rows = crud.host_stat.rollup_days(
+            db, days=[today - timedelta(days=offset) for offset in range(days)]
+        )
+    finally:
+        db.close()
+    console.print(f"host stats: {rows} rows written")
+
+
+@app.command()
+def export(
+    kind: str,
+    start: datetime,
+    end: datetime,
+    format: str = "csv",
+    host_id: Optional[int] = None,
+    status: Optional[str] = None,
+    output: Optional[Path] = None,
+):
+    """Stream bookings or payments created between START and END to a file or stdout."""
+    from src.parkin_web import crud
+    from src.parkin_web.core import export as exporter
+    from src.parkin_web.core.config import settings
+
+    from src.parkin_web.models.booking import BookingStatus
+    from src.parkin_web.models.payment import PaymentStatus
+
+    sources = {
+        "bookings": (crud.booking, exporter.BOOKING_EXPORT_COLUMNS, BookingStatus),
+        "payments": (crud.payment, exporter.PAYMENT_EXPORT_COLUMNS, PaymentStatus),
+    }
+    usage = f"Usage: export [{'|'.join(sources)}] START END --format [{'|'.join(exporter.EXPORT_FORMATS)}]"
+    if kind not in sources or format not in exporter.EXPORT_FORMATS:
+        console.print(usage, markup=False)
+        raise typer.Exit(code=1)
+    source, columns, statuses = sources[kind]
+    if status and status not in {member.value for member in statuses}:
+        console.print(f"{usage} --status [{'|'.join(member.value for member in statuses)}]", markup=False)
+        raise typer.Exit(code=1)
+
+    chunks = exporter.stream_export(
+        lambda db: source.iter_export(
+            db,
+            start=start,
+            end=end,
+            host_id=host_id,
+            status=statuses(status) if status else None,
+            batch_size=settings.EXPORT_BATCH_SIZE,
+        ),
+        columns,
+        format,
+    )
+    stream = open(output, "w", newline="") if output else sys.stdout
+    try:
+        for chunk in chunks:
+            stream.write(chunk)
+    finally:
+        if output:
+            stream.close()
+
 
 if __name__ == "__main__":
     app()
@@ -0,0 +1,216 @@
+# src/parkin_web/core/availability.py
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Optional, Tuple
+
+# A week is split into 15-minute slots: 7 days x 96 slots = 672 bits.
+# Bit ``day_of_week * SLOTS_PER_DAY + slot`` is set when the space is available.
+SLOT_MINUTES = 15
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+DAYS_PER_WEEK = 7
+SLOTS_PER_WEEK = SLOTS_PER_DAY * DAYS_PER_WEEK
+FULL_WEEK = (1 << SLOTS_PER_WEEK) - 1
+
+
+def _parse_minutes(value: str) -> int:
+    """
+    Convert an "HH:MM" string into minutes since midnight.
+
+    Args:
+        value: Time in HH:MM format
+
+    Returns:
+        Minutes since midnight
+    """
+    hour, minute = value.split(":")
+    return int(hour) * 60 + int(minute)
+
+
+def _range_mask(start_slot: int, end_slot: int) -> int:
+    """
+    Build a mask for the slots in [start_slot, end_slot), wrapping around the week.
+
+    Args:
+        start_slot: First slot index (0 to SLOTS_PER_WEEK - 1)
+        end_slot: Slot index after the last one, may exceed SLOTS_PER_WEEK
+
+    Returns:
+        Bitmask with the covered slots set
+    """
+    length = end_slot - start_slot
+    if length <= 0:
+        return 0
+    if length >= SLOTS_PER_WEEK:
+        return FULL_WEEK
+    bits = ((1 << length) - 1) << start_slot
+    return (bits | (bits >> SLOTS_PER_WEEK)) & FULL_WEEK
+
+
+def to_naive_utc(value: datetime) -> datetime:
+    """
+    Convert a datetime to naive UTC, the form bookings and schedules are stored in.
+
+    Args:
+        value: Naive (assumed UTC) or timezone-aware datetime
+
+    Returns:
+        The same instant as a naive UTC datetime
+    """
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def compile_weekly_bitmap(schedules: Iterable) -> Optional[int]:
+    """
+    Compile availability schedules into a weekly bitmap.
+
+    Only slots fully covered by an available schedule are set, and slots
+    touched by an unavailable schedule are cleared. A schedule whose end time
+    is not after its start time runs overnight into the next day.
+
+    Args:
+        schedules: AvailabilitySchedule rows (or schemas) of a parking space
+
+    Returns:
+        The weekly bitmap, or None if the space has no schedules (always available)
+    """
+    available = 0
+    blocked = 0
+    has_schedules = False
+    for schedule in schedules:
+        has_schedules = True
+        day_offset = schedule.day_of_week * SLOTS_PER_DAY
+        start_minutes = _parse_minutes(schedule.start_time)
+        end_minutes = _parse_minutes(schedule.end_time)
+        if end_minutes <= start_minutes:
+            end_minutes += 24 * 60
+
+        if schedule.is_available:
+            start_slot = -(-start_minutes // SLOT_MINUTES)
+            end_slot = end_minutes // SLOT_MINUTES
+            available |= _range_mask(day_offset + start_slot, day_offset + end_slot)
+        else:
+            start_slot = start_minutes // SLOT_MINUTES
+            end_slot = -(-end_minutes // SLOT_MINUTES)
+            blocked |= _range_mask(day_offset + start_slot, day_offset + end_slot)
+
+    if not has_schedules:
+        return None
+    return available & ~blocked & FULL_WEEK
+
+
+def window_mask(start_time: datetime, end_time: datetime) -> int:
+    """
+    Build the weekly mask of every slot touched by a time window.
+
+    Timezone-aware bounds are converted to naive UTC first, so the slots line
+    up with the schedules whatever offset the caller passed.
+
+    Args:
+        start_time: Start of the window, naive UTC or timezone-aware
+        end_time: End of the window, naive UTC or timezone-aware
+
+    Returns:
+        Bitmask of the slots the window needs
+    """
+    start_time = to_naive_utc(start_time)
+    end_time = to_naive_utc(end_time)
+    start_offset = (
+        start_time.weekday() * 24 * 60
+        + start_time.hour * 60
+        + start_time.minute
+        + start_time.second / 60
+    )
+    end_offset = start_offset + (end_time - start_time).total_seconds() / 60
+    start_slot = int(start_offset // SLOT_MINUTES)
+    end_slot = int(-(-end_offset // SLOT_MINUTES))
+    return _range_mask(start_slot, end_slot)
+
+
+def is_window_available(
+    bitmap: Optional[int], start_time: datetime, end_time: datetime
+) -> bool:
+    """
+    Check whether a weekly bitmap covers a time window.
+
+    Args:
+        bitmap: Weekly availability bitmap, None meaning always available
+        start_time: Start of the window, naive UTC or timezone-aware
+        end_time: End of the window, naive UTC or timezone-aware
+
+    Returns:
+        True if every slot of the window is available, False otherwise
+    """
+    if bitmap is None:
+        return True
+    mask = window_mask(start_time, end_time)
+    return bitmap & mask == mask
+
+
+def build_calendar_runs(
+    bitmap: Optional[int],
+    busy_windows: Iterable[Tuple[datetime, datetime]],
+    start_time: datetime,
+    end_time: datetime,
+    granularity: int,
+) -> List[List[int]]:
+    """
+    Merge a weekly bitmap and booked windows into run-length encoded calendar slots.
+
+    Args:
+        bitmap: Weekly availability bitmap, None meaning always available
+        busy_windows: (start, end) pairs of bookings that block the space
+        start_time: Start of the calendar
+        end_time: End of the calendar
+        granularity: Slot length in minutes
+
+    Returns:
+        List of [state, count] runs, where state is 1 for free and 0 for busy
+    """
+    step = timedelta(minutes=granularity)
+    slots = -(-(end_time - start_time) // step)
+    free = bytearray(slots)
+    for i in range(slots):
+        slot_start = start_time + i * step
+        slot_end = min(slot_start + step, end_time)
+        free[i] = is_window_available(bitmap, slot_start, slot_end)
+
+    for busy_start, busy_end in busy_windows:
+        first = max(0, (busy_start - start_time) // step)
+        last = min(slots, -(-(busy_end - start_time) // step))
+        for i in range(first, last):
+            free[i] = 0
+
+    runs: List[List[int]] = []
+    for state in free:
+        if runs and runs[-1][0] == state:
+            runs[-1][1] += 1
+        else:
+            runs.append([state, 1])
+    return runs
+
+
+def bitmap_to_bits(bitmap: int) -> str:
+    """
+    Serialize a bitmap as a bit string, slot 0 first.
+
+    Args:
+        bitmap: Weekly bitmap
+
+    Returns:
+        String of SLOTS_PER_WEEK "0"/"1" characters
+    """
+    return format(bitmap, f"0{SLOTS_PER_WEEK}b")[::-1]
+
+
+def bits_to_bitmap(bits: str) -> int:
+    """
+    Parse a bit string produced by bitmap_to_bits.
+
+    Args:
+        bits: String of "0"/"1" characters, slot 0 first
+
+    Returns:
+        Weekly bitmap
+    """
+    return int(bits[::-1], 2)
@@ -0,0 +1,89 @@
+# src/parkin_web/core/change_feed.py
+import heapq
+from datetime import datetime
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+UPSERT = "upsert"
+DELETE = "delete"
+
+
+class Cursor(NamedTuple):
+    """
+    Position in a change feed: changes strictly after (changed_at, id) come next.
+    """
+
+    changed_at: datetime
+    id: int
+
+
+class Change(NamedTuple):
+    """
+    A row that was created, updated (upsert) or deleted.
+    """
+
+    changed_at: datetime
+    id: int
+    operation: str
+
+    @property
+    def cursor(self) -> Cursor:
+        return Cursor(self.changed_at, self.id)
+
+
+def encode_cursor(cursor: Optional[Cursor]) -> Optional[str]:
+    """
+    Encode a cursor as an opaque string for API clients.
+
+    Args:
+        cursor: Cursor to encode
+
+    Returns:
+        "<isoformat>_<id>", or None for the start of the feed
+    """
+    if cursor is None:
+        return None
+    return f"{cursor.changed_at.isoformat()}_{cursor.id}"
+
+
+def decode_cursor(value: Optional[str]) -> Optional[Cursor]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        value: Encoded cursor, None or empty for the start of the feed
+
+    Returns:
+        The cursor, or None for the start of the feed
+
+    Raises:
+        ValueError: If the value is not a valid cursor
+    """
+    if not value:
+        return None
+    changed_at, _, id = value.rpartition("_")
+    if not changed_at:
+        raise ValueError(f"Invalid cursor: {value}")
+    return Cursor(datetime.fromisoformat(changed_at), int(id))
+
+
+def merge_changes(
+    upserts: Iterable[Tuple[datetime, int]],
+    deletes: Iterable[Tuple[datetime, int]],
+    limit: int,
+) -> List[Change]:
+    """
+    Merge upserts and deletes, each sorted by (changed_at, id), into one page.
+
+    Args:
+        upserts: (updated_at, id) of changed rows
+        deletes: (deleted_at, id) of deleted rows
+        limit: Maximum number of changes returned
+
+    Returns:
+        Up to limit changes sorted by (changed_at, id)
+    """
+    merged = heapq.merge(
+        (Change(changed_at, id, UPSERT) for changed_at, id in upserts),
+        (Change(changed_at, id, DELETE) for changed_at, id in deletes),
+    )
+    return [change for change, _ in zip(merged, range(limit))]
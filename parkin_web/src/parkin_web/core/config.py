@@ -71,9 +71,96 @@ class Settings(BaseSettings):
     EV_CHARGING_API_KEY: Optional[str] = None
     EV_CHARGING_API_URL: Optional[HttpUrl] = None
     
+    # Availability
+    CALENDAR_MAX_DAYS: int = 92
+    
+    # Pricing
+    QUOTE_MAX_ITEMS: int = 100
+    QUOTE_CACHE_SIZE: int = 10000
+    QUOTE_CACHE_TTL_SECONDS: int = 300
+    
+    # Bulk booking actions
+    BULK_ACTION_MAX_IDS: int = 500
+    BOOKING_SERIES_MAX_OCCURRENCES: int = 366
+    
+    # Demand-based pricing
+    GEO_CELL_DEGREES: float = 0.01  # Roughly 1km grid cells
+    DEMAND_WINDOW_DAYS: int = 28
+    DEMAND_MAX_MULTIPLIER: float = 2.0
+    DEMAND_ROLLUP_INTERVAL_SECONDS: int = 60 * 60
+    DEMAND_RELOAD_INTERVAL_SECONDS: int = 5 * 60  # Every process reloads the rolled-up table
+    
+    # Background jobs
+    SCHEDULER_ENABLED: bool = False
+    
+    # Booking sweeper
+    BOOKING_SWEEP_INTERVAL_SECONDS: int = 5 * 60
+    BOOKING_SWEEP_BATCH_SIZE: int = 1000
+    PENDING_BOOKING_TTL_MINUTES: int = 60 * 24
+    
+    # Booking archival
+    BOOKING_ARCHIVE_AFTER_DAYS: int = 180
+    BOOKING_ARCHIVE_INTERVAL_SECONDS: int = 24 * 60 * 60
+    BOOKING_ARCHIVE_BATCH_SIZE: int = 1000
+    
+    # Exports
+    EXPORT_BATCH_SIZE: int = 1000
+    
+    # Map tiles
+    TILE_MAX_ZOOM: int = 18
+    TILE_CLUSTER_GRID: int = 8  # Clusters per tile side
+    TILE_CACHE_SIZE: int = 5000
+    TILE_CACHE_TTL_SECONDS: int = 600
+    
+    # Change feed
+    # Changes younger than this are held back. updated_at is stamped by the app at flush
+    # time, so this must exceed the longest write transaction plus the clock skew between
+    # app servers, or a change committed late can fall behind a cursor already handed out
+    CHANGE_FEED_SETTLE_SECONDS: int = 10
+    CHANGE_FEED_MAX_LIMIT: int = 1000
+    TOMBSTONE_RETENTION_DAYS: int = 7
+    TOMBSTONE_PURGE_INTERVAL_SECONDS: int = 60 * 60
+    
+    # Server-sent events
+    SSE_HEARTBEAT_SECONDS: int = 15
+    SSE_QUEUE_SIZE: int = 256  # Events buffered per connection before it must resync
+    SSE_MAX_CELLS: int = 100  # Geo-cells one map connection may watch
+    
+    # In-memory read model of active parking spaces for search
+    READ_MODEL_ENABLED: bool = False
+    READ_MODEL_REFRESH_SECONDS: int = 5
+    READ_MODEL_MAX_STALENESS_SECONDS: int = 30  # Search falls back to SQL past this
+    READ_MODEL_FULL_RELOAD_SECONDS: int = 60 * 60  # Catches deletions that left no tombstone
+    
+    # Host dashboard
+    HOST_STATS_ROLLUP_INTERVAL_SECONDS: int = 10 * 60
+    HOST_STATS_ROLLUP_OVERLAP_SECONDS: int = 60  # Changes re-read from before the previous run
+    HOST_STATS_MAX_DAYS: int = 366
+    
+    # Idempotency keys for POST /bookings/ and /payments/
+    IDEMPOTENCY_KEY_TTL_SECONDS: int = 24 * 60 * 60
+    IDEMPOTENCY_LOCK_SECONDS: int = 60  # An unfinished request loses its key after this
+    IDEMPOTENCY_PURGE_INTERVAL_SECONDS: int = 60 * 60
+    
+    # Host payouts
+    HOST_PAYOUT_INTERVAL_SECONDS: int = 24 * 60 * 60
+    HOST_PAYOUT_HOLD_DAYS: int = 1
+    HOST_PAYOUT_CHUNK_SIZE: int = 1000
+    LEDGER_RECONCILE_INTERVAL_SECONDS: int = 24 * 60 * 60
+    
+    # Booking/payment reconciliation
+    RECONCILIATION_INTERVAL_SECONDS: int = 24 * 60 * 60
+    RECONCILIATION_CHUNK_SIZE: int = 5000
+    
     # Payment
     STRIPE_API_KEY: Optional[str] = None
     STRIPE_WEBHOOK_SECRET: Optional[str] = None
+    WEBHOOK_TOLERANCE_SECONDS: int = 5 * 60
+    WEBHOOK_WORKERS: int = 4
+    WEBHOOK_POLL_INTERVAL_SECONDS: int = 5
+    WEBHOOK_BATCH_SIZE: int = 500
+    WEBHOOK_MAX_ATTEMPTS: int = 5
+    WEBHOOK_PROCESSING_TIMEOUT_SECONDS: int = 5 * 60
 
     class Config:
         case_sensitive = True
@@ -0,0 +1,196 @@
+# src/parkin_web/core/events.py
+import asyncio
+import itertools
+import threading
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, NamedTuple, Optional, Set
+
+import orjson
+
+from src.parkin_web.core.config import settings
+
+# Event types
+BOOKING = "booking"
+AVAILABILITY = "availability"
+PARKING_SPACE = "parking_space"
+RESYNC = "resync"  # Events were dropped, the client must refetch its state
+
+
+def booking_topic(id: int) -> str:
+    return f"booking:{id}"
+
+
+def user_topic(id: int) -> str:
+    return f"user:{id}"
+
+
+def cell_topic(cell: str) -> str:
+    return f"cell:{cell}"
+
+
+class Event(NamedTuple):
+    id: int
+    type: str
+    data: Dict[str, Any]
+
+
+class Subscription:
+    """
+    Bounded queue of events for one client connection, bound to the event loop serving it.
+    """
+
+    def __init__(self, topics: Iterable[str], loop: asyncio.AbstractEventLoop, maxsize: int):
+        self.topics = frozenset(topics)
+        self.loop = loop
+        self.queue: "asyncio.Queue[Event]" = asyncio.Queue(maxsize)
+        self.lagged = False
+
+    def _put(self, event: Event) -> None:
+        # Runs on the subscription's loop; a slow client loses events and is told to resync
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.lagged = True
+
+
+class EventBroker:
+    """
+    In-process pub/sub fanning events out to SSE connections by topic.
+
+    publish() is thread-safe and cheap when nobody listens, so it can be called
+    from sync routes and scheduler jobs. Events only reach connections served by
+    the same process.
+    """
+
+    def __init__(self, maxsize: int):
+        """
+        Args:
+            maxsize: Maximum number of queued events per subscription
+        """
+        self.maxsize = maxsize
+        self._topics: Dict[str, Set[Subscription]] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def subscribe(self, topics: Iterable[str]) -> Subscription:
+        """
+        Subscribe to topics, must be called from the event loop that will consume the events.
+
+        Args:
+            topics: Topics to receive events from
+
+        Returns:
+            The subscription, to be passed to unsubscribe when the client goes away
+        """
+        subscription = Subscription(topics, asyncio.get_running_loop(), self.maxsize)
+        with self._lock:
+            for topic in subscription.topics:
+                self._topics.setdefault(topic, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """
+        Remove a subscription from all its topics.
+
+        Args:
+            subscription: Subscription to remove
+        """
+        with self._lock:
+            for topic in subscription.topics:
+                subscribers = self._topics.get(topic)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._topics[topic]
+
+    def has_subscribers(self) -> bool:
+        """
+        Check whether anyone listens at all, so publishers can skip building events.
+
+        Returns:
+            Whether there is at least one subscription
+        """
+        return bool(self._topics)
+
+    def publish(self, topics: Iterable[str], event_type: str, data: Dict[str, Any]) -> int:
+        """
+        Send an event to every subscription of any of the topics, at most once each.
+
+        Args:
+            topics: Topics the event belongs to
+            event_type: Event type
+            data: JSON-serializable payload (orjson types)
+
+        Returns:
+            Number of subscriptions the event was sent to
+        """
+        with self._lock:
+            subscriptions: Set[Subscription] = set()
+            for topic in topics:
+                subscriptions.update(self._topics.get(topic, ()))
+        if not subscriptions:
+            return 0
+        event = Event(next(self._ids), event_type, data)
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._put, event)
+            except RuntimeError:
+                # The loop was closed, the connection is gone
+                self.unsubscribe(subscription)
+        return len(subscriptions)
+
+
+def format_sse(event_type: str, data: Any, id: Optional[int] = None) -> str:
+    """
+    Format one server-sent event.
+
+    Args:
+        event_type: Event type
+        data: JSON-serializable payload
+        id: Event ID
+
+    Returns:
+        The event in text/event-stream format
+    """
+    lines = [] if id is None else [f"id: {id}"]
+    lines.append(f"event: {event_type}")
+    lines.append(f"data: {orjson.dumps(data).decode()}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def stream(
+    subscription: Subscription,
+    is_disconnected: Callable[[], Awaitable[bool]],
+    *,
+    heartbeat: float = settings.SSE_HEARTBEAT_SECONDS,
+) -> AsyncIterator[str]:
+    """
+    Stream the events of a subscription as server-sent events until the client disconnects.
+
+    A comment line is sent every heartbeat seconds without events, to keep proxies
+    from closing the connection and to notice disconnections.
+
+    Args:
+        subscription: Subscription to consume, unsubscribed when the stream ends
+        is_disconnected: Coroutine function telling whether the client went away
+        heartbeat: Seconds between keep-alive comments
+
+    Yields:
+        Chunks of the text/event-stream body
+    """
+    try:
+        yield format_sse("ready", {"topics": sorted(subscription.topics)})
+        while not await is_disconnected():
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if subscription.lagged:
+                subscription.lagged = False
+                yield format_sse(RESYNC, {})
+            yield format_sse(event.type, event.data, event.id)
+    finally:
+        broker.unsubscribe(subscription)
+
+
+broker = EventBroker(maxsize=settings.SSE_QUEUE_SIZE)
@@ -0,0 +1,161 @@
+# src/parkin_web/core/export.py
+import csv
+import enum
+import io
+import json
+from datetime import date, datetime
+from typing import Any, Callable, Iterable, Iterator, Sequence
+
+EXPORT_FORMATS = ("csv", "ndjson")
+
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+BOOKING_EXPORT_COLUMNS = (
+    "id",
+    "created_at",
+    "start_time",
+    "end_time",
+    "status",
+    "duration_type",
+    "base_price",
+    "service_fee",
+    "ev_charging_fee",
+    "insurance_fee",
+    "total_price",
+    "user_id",
+    "parking_space_id",
+    "payment_id",
+)
+
+PAYMENT_EXPORT_COLUMNS = (
+    "id",
+    "created_at",
+    "payment_date",
+    "status",
+    "amount",
+    "currency",
+    "payment_method",
+    "base_amount",
+    "service_fee",
+    "insurance_fee",
+    "ev_charging_fee",
+    "tax_amount",
+    "refund_amount",
+    "host_payout_amount",
+    "host_payout_status",
+    "host_payout_date",
+    "booking_id",
+    "parking_space_id",
+    "host_id",
+)
+
+
+def _format_value(value: Any) -> Any:
+    """
+    Convert a database value into a JSON/CSV friendly value.
+
+    Args:
+        value: Column value
+
+    Returns:
+        The value with enums and dates converted to strings
+    """
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def iter_csv(rows: Iterable[Sequence[Any]], columns: Sequence[str], chunk_rows: int = 500) -> Iterator[str]:
+    """
+    Serialize rows as CSV, yielding a header then chunks of lines.
+
+    Args:
+        rows: Row tuples aligned with columns
+        columns: Column names
+        chunk_rows: Number of rows per yielded chunk
+
+    Yields:
+        CSV text chunks
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    count = 0
+    for row in rows:
+        writer.writerow([_format_value(value) for value in row])
+        count += 1
+        if count % chunk_rows == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def iter_ndjson(rows: Iterable[Sequence[Any]], columns: Sequence[str], chunk_rows: int = 500) -> Iterator[str]:
+    """
+    Serialize rows as newline-delimited JSON objects.
+
+    Args:
+        rows: Row tuples aligned with columns
+        columns: Column names
+        chunk_rows: Number of rows per yielded chunk
+
+    Yields:
+        NDJSON text chunks
+    """
+    lines = []
+    for row in rows:
+        lines.append(json.dumps(dict(zip(columns, map(_format_value, row)))))
+        if len(lines) == chunk_rows:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+def iter_export(rows: Iterable[Sequence[Any]], columns: Sequence[str], fmt: str) -> Iterator[str]:
+    """
+    Serialize rows in one of the EXPORT_FORMATS.
+
+    Args:
+        rows: Row tuples aligned with columns
+        columns: Column names
+        fmt: "csv" or "ndjson"
+
+    Yields:
+        Text chunks
+    """
+    if fmt == "csv":
+        return iter_csv(rows, columns)
+    return iter_ndjson(rows, columns)
+
+
+def stream_export(
+    fetch: Callable[[Any], Iterable[Sequence[Any]]], columns: Sequence[str], fmt: str
+) -> Iterator[str]:
+    """
+    Serialize rows fetched with a dedicated database session.
+
+    The session lives as long as the generator, so a StreamingResponse can keep
+    reading from the server-side cursor after the request handler returned.
+
+    Args:
+        fetch: Callback returning the rows for a database session
+        columns: Column names
+        fmt: "csv" or "ndjson"
+
+    Yields:
+        Text chunks
+    """
+    from src.parkin_web.db.session import SessionLocal
+
+    db = SessionLocal()
+    try:
+        yield from iter_export(fetch(db), columns, fmt)
+    finally:
+        db.close()
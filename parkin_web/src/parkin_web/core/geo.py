@@ -0,0 +1,62 @@
+# src/parkin_web/core/geo.py
+import math
+from typing import List, Optional
+
+from src.parkin_web.core.config import settings
+
+
+def geo_cell(
+    latitude: Optional[float],
+    longitude: Optional[float],
+    cell_degrees: Optional[float] = None,
+) -> Optional[str]:
+    """
+    Get the key of the grid cell containing a point.
+
+    Args:
+        latitude: Latitude of the point
+        longitude: Longitude of the point
+        cell_degrees: Cell size in degrees, defaults to settings.GEO_CELL_DEGREES
+
+    Returns:
+        Cell key as "row:col", or None if the point has no coordinates
+    """
+    if latitude is None or longitude is None:
+        return None
+    size = cell_degrees or settings.GEO_CELL_DEGREES
+    return f"{math.floor(latitude / size)}:{math.floor(longitude / size)}"
+
+
+def cells_in_bbox(
+    south: float,
+    west: float,
+    north: float,
+    east: float,
+    cell_degrees: Optional[float] = None,
+    max_cells: Optional[int] = None,
+) -> List[str]:
+    """
+    Get the keys of the grid cells covering a bounding box.
+
+    Args:
+        south: Southern latitude
+        west: Western longitude
+        north: Northern latitude
+        east: Eastern longitude
+        cell_degrees: Cell size in degrees, defaults to settings.GEO_CELL_DEGREES
+        max_cells: Maximum number of cells allowed
+
+    Returns:
+        Cell keys as "row:col", row by row
+
+    Raises:
+        ValueError: If the box is inverted or covers more than max_cells cells
+    """
+    if south > north or west > east:
+        raise ValueError("Invalid bounding box")
+    size = cell_degrees or settings.GEO_CELL_DEGREES
+    rows = range(math.floor(south / size), math.floor(north / size) + 1)
+    cols = range(math.floor(west / size), math.floor(east / size) + 1)
+    if max_cells is not None and len(rows) * len(cols) > max_cells:
+        raise ValueError(f"The area covers more than {max_cells} cells")
+    return [f"{row}:{col}" for row in rows for col in cols]
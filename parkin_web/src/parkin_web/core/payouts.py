@@ -0,0 +1,49 @@
+# src/parkin_web/core/payouts.py
+import threading
+import uuid
+from typing import Dict
+
+
+class PayoutError(Exception):
+    """
+    Raised when the payout provider rejects a transfer.
+    """
+
+
+class StubPayoutProvider:
+    """
+    Local stand-in for the payout provider.
+
+    Like a real provider API, transfers are deduplicated on the idempotency
+    key, so retrying a payout after a crash never pays a host twice.
+    """
+
+    def __init__(self) -> None:
+        self._transfers: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def transfer(self, *, host_id: int, amount: float, currency: str, idempotency_key: str) -> str:
+        """
+        Send money to a host.
+
+        Args:
+            host_id: ID of the host being paid
+            amount: Amount to transfer
+            currency: Currency code
+            idempotency_key: Key identifying the transfer across retries
+
+        Returns:
+            Provider reference of the transfer
+
+        Raises:
+            PayoutError: If the amount is not positive
+        """
+        if amount <= 0:
+            raise PayoutError(f"Invalid payout amount {amount} for host {host_id}")
+        with self._lock:
+            if idempotency_key not in self._transfers:
+                self._transfers[idempotency_key] = f"po_{uuid.uuid4().hex}"
+            return self._transfers[idempotency_key]
+
+
+payout_provider = StubPayoutProvider()
@@ -0,0 +1,387 @@
+# src/parkin_web/core/pricing.py
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.parkin_web.core.cache import LRUCache
+from src.parkin_web.core.config import settings
+from src.parkin_web.core.geo import geo_cell
+
+SERVICE_FEE_RATE = 0.15  # 15% service fee
+BASE_INSURANCE_FEE = 5.0
+HIGH_COVERAGE_INSURANCE_FEE = 10.0
+HIGH_COVERAGE_THRESHOLD = 10000
+
+PRICE_FIELDS = ("base_price", "service_fee", "ev_charging_fee", "insurance_fee", "total_price")
+
+
+def hour_of_week(value: datetime) -> int:
+    """
+    Get the hour of the week of a datetime, Monday 00:00 being hour 0.
+
+    Args:
+        value: Datetime to convert
+
+    Returns:
+        Hour of the week (0-167)
+    """
+    return value.weekday() * 24 + value.hour
+
+
+class DemandMultipliers:
+    """
+    In-memory copy of the precomputed demand multiplier table.
+
+    Lookups are a single dict access; the table is swapped atomically when the
+    rollup job (or a reload) produces a new one.
+    """
+
+    def __init__(self) -> None:
+        self._table: Dict[Tuple[str, int], float] = {}
+        self._lock = threading.Lock()
+
+    def replace(self, table: Dict[Tuple[str, int], float]) -> bool:
+        """
+        Swap in a new multiplier table.
+
+        Args:
+            table: Dict mapping (geo_cell, hour_of_week) to multiplier
+
+        Returns:
+            Whether the table differs from the previous one
+        """
+        table = dict(table)
+        with self._lock:
+            changed = table != self._table
+            self._table = table
+        return changed
+
+    def get(self, latitude: Optional[float], longitude: Optional[float], start_time: datetime) -> float:
+        """
+        Get the multiplier for a location and start time.
+
+        Args:
+            latitude: Latitude of the parking space
+            longitude: Longitude of the parking space
+            start_time: Start of the booking
+
+        Returns:
+            The multiplier, 1.0 when none was computed for that cell and hour
+        """
+        cell = geo_cell(latitude, longitude)
+        if cell is None:
+            return 1.0
+        return self._table.get((cell, hour_of_week(start_time)), 1.0)
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+
+demand_multipliers = DemandMultipliers()
+
+
+def _rates(values: Sequence[Any]) -> np.ndarray:
+    """
+    Convert optional rates into a float array, missing rates becoming 0.
+
+    Args:
+        values: Rates, possibly None
+
+    Returns:
+        Float array of rates
+    """
+    return np.array([value or 0.0 for value in values], dtype=np.float64)
+
+
+def price_arrays(
+    *,
+    hourly_rates: np.ndarray,
+    daily_rates: np.ndarray,
+    monthly_rates: np.ndarray,
+    ev_rates: np.ndarray,
+    hours: np.ndarray,
+    duration_types: np.ndarray,
+    with_ev_charging: np.ndarray,
+    with_insurance: np.ndarray,
+    insurance_coverages: np.ndarray,
+    multipliers: Optional[np.ndarray] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Price a batch of bookings at once.
+
+    All arguments are aligned 1-D arrays, one element per booking. Missing
+    daily/monthly/EV rates must be passed as 0, in which case the hourly rate
+    (or no EV fee) applies. Demand multipliers only scale the hourly rate.
+
+    Args:
+        hourly_rates: Hourly rate of each parking space
+        daily_rates: Daily rate of each parking space
+        monthly_rates: Monthly rate of each parking space
+        ev_rates: EV charging rate of each parking space (0 if the space has no charger)
+        hours: Booking duration in hours
+        duration_types: "hourly", "daily" or "monthly" for each booking
+        with_ev_charging: Whether EV charging was requested
+        with_insurance: Whether insurance was requested
+        insurance_coverages: Requested insurance coverage amount
+        multipliers: Demand multiplier applied to the hourly rate, 1 if omitted
+
+    Returns:
+        Dict mapping each price field to an array of amounts
+    """
+    hourly_price = hourly_rates * hours
+    if multipliers is not None:
+        hourly_price = hourly_price * multipliers
+    base_price = np.select(
+        [
+            (duration_types == "daily") & (daily_rates > 0),
+            (duration_types == "monthly") & (monthly_rates > 0),
+        ],
+        [daily_rates * hours / 24, monthly_rates],
+        default=hourly_price,
+    )
+    service_fee = base_price * SERVICE_FEE_RATE
+    ev_charging_fee = np.where(with_ev_charging & (ev_rates > 0), ev_rates * hours, 0.0)
+    insurance_fee = np.where(
+        with_insurance,
+        np.where(
+            insurance_coverages > HIGH_COVERAGE_THRESHOLD,
+            HIGH_COVERAGE_INSURANCE_FEE,
+            BASE_INSURANCE_FEE,
+        ),
+        0.0,
+    )
+    total_price = base_price + service_fee + ev_charging_fee + insurance_fee
+    return {
+        "base_price": base_price,
+        "service_fee": service_fee,
+        "ev_charging_fee": ev_charging_fee,
+        "insurance_fee": insurance_fee,
+        "total_price": total_price,
+    }
+
+
+def quote_batch(parking_spaces: Sequence[Any], requests: Sequence[Any]) -> List[Dict[str, float]]:
+    """
+    Price a batch of booking requests.
+
+    Args:
+        parking_spaces: Parking space for each request, aligned with requests
+        requests: Booking requests (start_time, end_time, duration_type,
+            has_ev_charging, has_insurance, insurance_coverage)
+
+    Returns:
+        One dict of price fields per request
+    """
+    if not requests:
+        return []
+
+    hours = np.array(
+        [(request.end_time - request.start_time).total_seconds() / 3600 for request in requests],
+        dtype=np.float64,
+    )
+    prices = price_arrays(
+        hourly_rates=_rates([space.hourly_rate for space in parking_spaces]),
+        daily_rates=_rates([space.daily_rate for space in parking_spaces]),
+        monthly_rates=_rates([space.monthly_rate for space in parking_spaces]),
+        ev_rates=_rates(
+            [space.ev_charging_rate if space.has_ev_charging else 0.0 for space in parking_spaces]
+        ),
+        hours=hours,
+        duration_types=np.array([str(request.duration_type.value) for request in requests]),
+        with_ev_charging=np.array([bool(request.has_ev_charging) for request in requests]),
+        with_insurance=np.array([bool(request.has_insurance) for request in requests]),
+        insurance_coverages=_rates([request.insurance_coverage for request in requests]),
+        multipliers=np.array(
+            [
+                demand_multipliers.get(space.latitude, space.longitude, request.start_time)
+                for space, request in zip(parking_spaces, requests)
+            ],
+            dtype=np.float64,
+        ),
+    )
+    columns = [prices[field].tolist() for field in PRICE_FIELDS]
+    return [dict(zip(PRICE_FIELDS, row)) for row in zip(*columns)]
+
+
+def quote(parking_space: Any, request: Any) -> Dict[str, float]:
+    """
+    Price a single booking request.
+
+    Args:
+        parking_space: Parking space being booked
+        request: Booking request
+
+    Returns:
+        Dict of price fields
+    """
+    return quote_batch([parking_space], [request])[0]
+
+
+class PricingInputs(NamedTuple):
+    """
+    Snapshot of the parking space fields the pricing engine reads.
+    """
+
+    id: int
+    latitude: Optional[float]
+    longitude: Optional[float]
+    hourly_rate: float
+    daily_rate: Optional[float]
+    monthly_rate: Optional[float]
+    has_ev_charging: bool
+    ev_charging_rate: Optional[float]
+    instant_booking: bool
+
+
+class QuoteCache:
+    """
+    Cache of pricing inputs per parking space and of computed quotes.
+
+    Quote keys embed a per-space generation, so invalidating a space is O(1):
+    its old quotes become unreachable and age out of the LRU. At most maxsize
+    generations are tracked; past that they are reset along with a bump of the
+    global generation, which drops every cached quote.
+    """
+
+    def __init__(self, maxsize: int, ttl: Optional[float] = None):
+        """
+        Args:
+            maxsize: Maximum number of entries in each cache
+            ttl: Seconds after which entries expire
+        """
+        self.maxsize = maxsize
+        self.inputs = LRUCache(maxsize, ttl)
+        self.quotes = LRUCache(maxsize, ttl)
+        self._generations: Dict[int, int] = {}
+        self._global_generation = 0
+        self._lock = threading.Lock()
+
+    def _quote_key(self, parking_space_id: int, request: Any) -> Tuple:
+        with self._lock:
+            generations = (self._global_generation, self._generations.get(parking_space_id, 0))
+        return (
+            *generations,
+            parking_space_id,
+            request.start_time,
+            request.end_time,
+            request.duration_type.value,
+            bool(request.has_ev_charging),
+            bool(request.has_insurance),
+            request.insurance_coverage,
+        )
+
+    def get_inputs(self, parking_space_id: int) -> Optional[PricingInputs]:
+        """
+        Get the cached pricing inputs of a parking space.
+
+        Args:
+            parking_space_id: ID of the parking space
+
+        Returns:
+            The pricing inputs if cached, None otherwise
+        """
+        return self.inputs.get(parking_space_id)
+
+    def set_inputs(self, inputs: PricingInputs) -> None:
+        """
+        Cache the pricing inputs of a parking space.
+
+        Args:
+            inputs: Pricing inputs to cache
+        """
+        self.inputs.set(inputs.id, inputs)
+
+    def get_quote(self, parking_space_id: int, request: Any) -> Optional[Dict[str, float]]:
+        """
+        Get a cached quote.
+
+        Args:
+            parking_space_id: ID of the parking space
+            request: Booking request
+
+        Returns:
+            The cached price fields, or None on a miss
+        """
+        return self.quotes.get(self._quote_key(parking_space_id, request))
+
+    def set_quote(self, parking_space_id: int, request: Any, prices: Dict[str, float]) -> None:
+        """
+        Cache a computed quote.
+
+        Args:
+            parking_space_id: ID of the parking space
+            request: Booking request
+            prices: Computed price fields
+        """
+        self.quotes.set(self._quote_key(parking_space_id, request), prices)
+
+    def quote_batch(
+        self,
+        requests: Sequence[Any],
+        load_inputs: Callable[[List[int]], Dict[int, PricingInputs]],
+    ) -> List[Optional[Dict[str, float]]]:
+        """
+        Price a batch of booking requests, only computing the quotes not cached yet.
+
+        Args:
+            requests: Booking requests with a parking_space_id
+            load_inputs: Callback returning the pricing inputs for a list of space IDs
+
+        Returns:
+            One dict of price fields per request, None where the space doesn't exist
+        """
+        # Keys are taken before loading inputs, so a quote computed from inputs
+        # invalidated meanwhile is stored under the old generation and never served
+        keys = [self._quote_key(request.parking_space_id, request) for request in requests]
+        quotes = [self.quotes.get(key) for key in keys]
+        misses = [i for i, prices in enumerate(quotes) if prices is None]
+        if not misses:
+            return quotes
+
+        inputs = load_inputs([requests[i].parking_space_id for i in misses])
+        misses = [i for i in misses if requests[i].parking_space_id in inputs]
+        computed = quote_batch(
+            [inputs[requests[i].parking_space_id] for i in misses],
+            [requests[i] for i in misses],
+        )
+        for i, prices in zip(misses, computed):
+            self.quotes.set(keys[i], prices)
+            quotes[i] = prices
+        return quotes
+
+    def invalidate_space(self, parking_space_id: int) -> None:
+        """
+        Drop the cached inputs and quotes of a parking space.
+
+        Args:
+            parking_space_id: ID of the parking space
+        """
+        with self._lock:
+            if parking_space_id not in self._generations and len(self._generations) >= self.maxsize:
+                self._generations.clear()
+                self._global_generation += 1
+            self._generations[parking_space_id] = self._generations.get(parking_space_id, 0) + 1
+        self.inputs.delete(parking_space_id)
+
+    def invalidate_quotes(self) -> None:
+        """
+        Drop every cached quote, e.g. after the demand multipliers changed.
+        """
+        with self._lock:
+            self._global_generation += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get hit-rate metrics for both caches.
+
+        Returns:
+            Dict with the metrics of the inputs and quotes caches
+        """
+        return {"inputs": self.inputs.stats(), "quotes": self.quotes.stats()}
+
+
+quote_cache = QuoteCache(
+    maxsize=settings.QUOTE_CACHE_SIZE, ttl=settings.QUOTE_CACHE_TTL_SECONDS
+)
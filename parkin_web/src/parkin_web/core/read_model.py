@@ -0,0 +1,311 @@
+# src/parkin_web/core/read_model.py
+import threading
+import time
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from src.parkin_web.core.availability import FULL_WEEK, SLOTS_PER_WEEK
+from src.parkin_web.core.change_feed import Cursor
+from src.parkin_web.core.config import settings
+
+# Columns loaded from parkingspace, in row order
+READ_MODEL_COLUMNS = (
+    "id",
+    "is_active",
+    "updated_at",
+    "latitude",
+    "longitude",
+    "hourly_rate",
+    "city",
+    "has_security_camera",
+    "has_ev_charging",
+    "has_covered_parking",
+    "availability_bitmap",
+)
+
+FLAG_COLUMNS = ("has_security_camera", "has_ev_charging", "has_covered_parking")
+
+BITMAP_BYTES = SLOTS_PER_WEEK // 8
+
+
+def pack_bitmap(bitmap: Optional[int]) -> np.ndarray:
+    """
+    Pack a weekly availability bitmap into bytes so windows can be checked with a vectorized AND.
+
+    Args:
+        bitmap: Weekly bitmap, None meaning always available
+
+    Returns:
+        uint8 array of BITMAP_BYTES bytes
+    """
+    value = FULL_WEEK if bitmap is None else bitmap
+    return np.frombuffer(value.to_bytes(BITMAP_BYTES, "little"), dtype=np.uint8)
+
+
+class Snapshot(NamedTuple):
+    """
+    Immutable columnar copy of the active parking spaces, one element per space, sorted by ID.
+    """
+
+    ids: np.ndarray
+    latitude: np.ndarray  # NaN when unknown
+    longitude: np.ndarray
+    hourly_rate: np.ndarray
+    city: np.ndarray  # Lowercased
+    has_security_camera: np.ndarray
+    has_ev_charging: np.ndarray
+    has_covered_parking: np.ndarray
+    availability: np.ndarray  # (n, BITMAP_BYTES) packed bitmaps
+
+
+def build_snapshot(rows: Iterable[Dict[str, Any]]) -> Snapshot:
+    """
+    Build the columnar arrays from active rows.
+
+    Args:
+        rows: Rows as dicts of READ_MODEL_COLUMNS, sorted by ID
+
+    Returns:
+        The snapshot
+    """
+    rows = list(rows)
+
+    def floats(column: str) -> np.ndarray:
+        return np.array(
+            [np.nan if row[column] is None else row[column] for row in rows], dtype=np.float64
+        )
+
+    return Snapshot(
+        ids=np.array([row["id"] for row in rows], dtype=np.int64),
+        latitude=floats("latitude"),
+        longitude=floats("longitude"),
+        hourly_rate=floats("hourly_rate"),
+        city=np.array([(row["city"] or "").lower() for row in rows], dtype=str),
+        has_security_camera=np.array([bool(row["has_security_camera"]) for row in rows], dtype=bool),
+        has_ev_charging=np.array([bool(row["has_ev_charging"]) for row in rows], dtype=bool),
+        has_covered_parking=np.array([bool(row["has_covered_parking"]) for row in rows], dtype=bool),
+        availability=(
+            np.stack([pack_bitmap(row["availability_bitmap"]) for row in rows])
+            if rows
+            else np.empty((0, BITMAP_BYTES), dtype=np.uint8)
+        ),
+    )
+
+
+def patch_snapshot(
+    snapshot: Snapshot, removed: Iterable[int], rows: Iterable[Dict[str, Any]]
+) -> Snapshot:
+    """
+    Build a new snapshot from an existing one with a few rows removed, replaced or added.
+
+    Rows are located through the sorted ID array with searchsorted and patched
+    with vectorized deletes and inserts, so the Python work is proportional to
+    the number of changes rather than to the number of spaces.
+
+    Args:
+        snapshot: Current snapshot
+        removed: IDs to drop, unknown IDs are ignored
+        rows: Rows to insert as dicts of READ_MODEL_COLUMNS, sorted by ID; existing
+            rows with the same ID are replaced
+
+    Returns:
+        The new snapshot, the current one is left untouched
+    """
+    changes = build_snapshot(rows)
+    drop = np.concatenate([np.fromiter(removed, dtype=np.int64), changes.ids])
+    positions = np.searchsorted(snapshot.ids, drop)
+    found = positions < len(snapshot.ids)
+    found[found] = snapshot.ids[positions[found]] == drop[found]
+    kept = [np.delete(column, positions[found], axis=0) for column in snapshot]
+    at = np.searchsorted(kept[0], changes.ids)
+    return Snapshot(*[
+        # Promote first so longer city strings are not truncated to the current width
+        np.insert(column.astype(np.result_type(column, new), copy=False), at, new, axis=0)
+        for column, new in zip(kept, changes)
+    ])
+
+
+class ParkingReadModel:
+    """
+    In-process read model of the active parking spaces, answering searches from NumPy arrays.
+
+    The rows are kept fresh by following the parking space change feed (see
+    crud.parking_space.refresh_read_model); changes are patched into a copy of
+    the arrays (see patch_snapshot) which is then swapped in, so searches never
+    see a half-applied update. Only full reloads rebuild the arrays. Searches
+    return None when the model is disabled, not loaded yet or stale, and the
+    caller falls back to SQL.
+    """
+
+    def __init__(self, max_staleness: float):
+        """
+        Args:
+            max_staleness: Seconds without a successful refresh after which the model is stale
+        """
+        self.max_staleness = max_staleness
+        self.cursor: Optional[Cursor] = None  # Change feed position
+        self.refreshed_at: Optional[float] = None
+        self.full_reload_at: Optional[float] = None
+        self._rows: Dict[int, Dict[str, Any]] = {}
+        self._snapshot: Optional[Snapshot] = None
+        self._lock = threading.Lock()
+
+    def needs_full_reload(self, interval: float) -> bool:
+        """
+        Check whether the next refresh should reload every row instead of polling changes.
+
+        Args:
+            interval: Seconds between full reloads
+
+        Returns:
+            Whether a full reload is due
+        """
+        return self.full_reload_at is None or time.monotonic() - self.full_reload_at > interval
+
+    def is_fresh(self) -> bool:
+        """
+        Check whether searches can be answered from memory.
+
+        Returns:
+            Whether the model was refreshed recently enough
+        """
+        return (
+            self._snapshot is not None
+            and self.refreshed_at is not None
+            and time.monotonic() - self.refreshed_at <= self.max_staleness
+        )
+
+    def apply(
+        self,
+        rows: Iterable[Tuple],
+        *,
+        deleted: Iterable[int] = (),
+        full: bool = False,
+        cursor: Optional[Cursor] = None,
+    ) -> int:
+        """
+        Apply rows loaded from the database and swap in a new snapshot.
+
+        Args:
+            rows: Tuples of READ_MODEL_COLUMNS, of changed rows or of every active row
+            deleted: IDs of deleted parking spaces
+            full: Whether rows is the whole table, replacing the current content
+            cursor: Change feed position the model is now at
+
+        Returns:
+            Number of rows that changed the model
+        """
+        now = time.monotonic()
+        with self._lock:
+            if full:
+                self._rows = {}
+            # Changed IDs mapped to their new row, None when removed
+            changed: Dict[int, Optional[Dict[str, Any]]] = {}
+            for id in deleted:
+                if self._rows.pop(id, None) is not None:
+                    changed[id] = None
+            for values in rows:
+                row = dict(zip(READ_MODEL_COLUMNS, values))
+                if row["is_active"]:
+                    if self._rows.get(row["id"]) != row:
+                        self._rows[row["id"]] = row
+                        changed[row["id"]] = row
+                elif self._rows.pop(row["id"], None) is not None:
+                    changed[row["id"]] = None
+
+            if full or self._snapshot is None:
+                self._snapshot = build_snapshot(self._rows[id] for id in sorted(self._rows))
+            elif changed:
+                self._snapshot = patch_snapshot(
+                    self._snapshot,
+                    [id for id, row in changed.items() if row is None],
+                    [changed[id] for id in sorted(changed) if changed[id] is not None],
+                )
+            count = len(changed)
+            if cursor is not None:
+                self.cursor = cursor
+            self.refreshed_at = now
+            if full:
+                self.full_reload_at = now
+            return count
+
+    def discard(self, id: int) -> None:
+        """
+        Drop a parking space deleted by this process, before its tombstone reaches the feed.
+
+        Args:
+            id: ID of the parking space
+        """
+        with self._lock:
+            if self._rows.pop(id, None) is not None and self._snapshot is not None:
+                self._snapshot = patch_snapshot(self._snapshot, [id], [])
+
+    def search(
+        self,
+        *,
+        latitude: Optional[float] = None,
+        longitude: Optional[float] = None,
+        city: Optional[str] = None,
+        window_mask: Optional[int] = None,
+        has_security_camera: Optional[bool] = None,
+        has_ev_charging: Optional[bool] = None,
+        has_covered_parking: Optional[bool] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> Optional[List[int]]:
+        """
+        Search the active parking spaces with the same filters as the SQL search.
+
+        Args:
+            latitude: Latitude for distance ordering
+            longitude: Longitude for distance ordering
+            city: Case-insensitive substring of the city
+            window_mask: Weekly mask of the slots the spaces must be available in
+            has_security_camera: Security camera filter
+            has_ev_charging: EV charging filter
+            has_covered_parking: Covered parking filter
+            min_price: Minimum hourly rate
+            max_price: Maximum hourly rate
+            skip: Number of results to skip
+            limit: Maximum number of results
+
+        Returns:
+            IDs of the matching spaces, closest first when a location is given and by ID
+            otherwise, or None if the model can't answer
+        """
+        if not self.is_fresh():
+            return None
+        snapshot = self._snapshot
+
+        mask = np.ones(len(snapshot.ids), dtype=bool)
+        if city:
+            mask &= np.char.find(snapshot.city, city.lower()) >= 0
+        for column, value in zip(
+            FLAG_COLUMNS, (has_security_camera, has_ev_charging, has_covered_parking)
+        ):
+            if value is not None:
+                mask &= getattr(snapshot, column) == value
+        if min_price is not None:
+            mask &= snapshot.hourly_rate >= min_price
+        if max_price is not None:
+            mask &= snapshot.hourly_rate <= max_price
+        if window_mask is not None:
+            wanted = pack_bitmap(window_mask)
+            mask &= ((snapshot.availability & wanted) == wanted).all(axis=1)
+
+        rows = np.flatnonzero(mask)
+        if latitude is not None and longitude is not None:
+            # Same simplified distance as the SQL search; spaces without coordinates (NaN) sort last
+            distance = np.hypot(snapshot.latitude[rows] - latitude, snapshot.longitude[rows] - longitude)
+            rows = rows[np.argsort(distance, kind="stable")]
+        return snapshot.ids[rows[skip:skip + limit]].tolist()
+
+    def __len__(self) -> int:
+        snapshot = self._snapshot
+        return 0 if snapshot is None else len(snapshot.ids)
+
+
+parking_read_model = ParkingReadModel(max_staleness=settings.READ_MODEL_MAX_STALENESS_SECONDS)
@@ -0,0 +1,123 @@
+# src/parkin_web/core/reconciliation.py
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+# Amounts are floats, differences below this are rounding noise
+AMOUNT_TOLERANCE = 0.01
+
+ACTIVE_BOOKING_STATUSES = ("pending", "confirmed")
+CLOSED_BOOKING_STATUSES = ("canceled", "rejected")
+
+
+class ReconciliationRow(NamedTuple):
+    """
+    Booking and payment state checked by the rules.
+    """
+
+    booking_id: Optional[int]
+    booking_status: Any
+    total_price: Optional[float]
+    payment_id: Optional[int]
+    payment_status: Any
+    amount: Optional[float]
+    refund_amount: Optional[float]
+    host_payout_status: Optional[str]
+    host_payout_amount: Optional[float]
+
+
+class Rule(NamedTuple):
+    """
+    Invariant checked on every reconciliation row.
+
+    Rows have the fields of ReconciliationRow; payment fields are None when
+    there is no payment, booking fields are None for payments no booking
+    points to.
+    """
+
+    name: str
+    description: str
+    violated: Callable[[Any], bool]
+
+
+def _value(status: Any) -> Any:
+    """
+    Get the string value of an enum status, leaving strings and None alone.
+
+    Args:
+        status: Enum member, string or None
+
+    Returns:
+        The status as a plain value
+    """
+    return getattr(status, "value", status)
+
+
+RULES: List[Rule] = [
+    Rule(
+        "refunded_payment_active_booking",
+        "Payment fully refunded but the booking is still pending or confirmed",
+        lambda row: _value(row.payment_status) == "refunded"
+        and _value(row.booking_status) in ACTIVE_BOOKING_STATUSES,
+    ),
+    Rule(
+        "failed_payment_confirmed_booking",
+        "Payment failed but the booking is confirmed",
+        lambda row: _value(row.payment_status) == "failed"
+        and _value(row.booking_status) == "confirmed",
+    ),
+    Rule(
+        "payout_pending_after_cancellation",
+        "Booking canceled or rejected but its host payout is still pending",
+        lambda row: _value(row.booking_status) in CLOSED_BOOKING_STATUSES
+        and row.host_payout_status == "pending"
+        and (row.host_payout_amount or 0.0) > 0,
+    ),
+    Rule(
+        "payout_completed_after_full_refund",
+        "Host was paid out for a payment that was fully refunded",
+        lambda row: _value(row.payment_status) == "refunded"
+        and row.host_payout_status == "completed",
+    ),
+    Rule(
+        "completed_booking_without_payment",
+        "Booking completed without any payment",
+        lambda row: _value(row.booking_status) == "completed" and row.payment_id is None,
+    ),
+    Rule(
+        "payment_amount_mismatch",
+        "Payment amount differs from the booking total price",
+        lambda row: row.booking_id is not None
+        and row.payment_id is not None
+        and abs((row.amount or 0.0) - (row.total_price or 0.0)) > AMOUNT_TOLERANCE,
+    ),
+    Rule(
+        "orphan_payment",
+        "Payment not referenced by any live or archived booking",
+        lambda row: row.booking_id is None and row.payment_id is not None,
+    ),
+]
+
+
+def evaluate(rows: Iterable[Any], rules: List[Rule] = RULES) -> Iterator[Dict[str, Any]]:
+    """
+    Check rows against the rules, yielding one discrepancy per violated rule.
+
+    Args:
+        rows: Reconciliation rows
+        rules: Rules to check
+
+    Yields:
+        Dicts with rule, booking_id, payment_id and details
+    """
+    for row in rows:
+        for rule in rules:
+            if rule.violated(row):
+                yield {
+                    "rule": rule.name,
+                    "booking_id": row.booking_id,
+                    "payment_id": row.payment_id,
+                    "details": (
+                        f"{rule.description} (booking status {_value(row.booking_status)}, "
+                        f"payment status {_value(row.payment_status)}, "
+                        f"payout status {row.host_payout_status})"
+                    ),
+                }
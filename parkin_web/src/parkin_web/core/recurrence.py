@@ -0,0 +1,65 @@
+# src/parkin_web/core/recurrence.py
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator, Optional, Tuple
+
+
+def iter_occurrences(
+    start_time: datetime,
+    end_time: datetime,
+    *,
+    frequency: str,
+    interval: int = 1,
+    weekdays: Optional[Iterable[int]] = None,
+    until: Optional[datetime] = None,
+    count: Optional[int] = None,
+) -> Iterator[Tuple[datetime, datetime]]:
+    """
+    Lazily expand an RRULE-like daily or weekly pattern into booking windows.
+
+    Every occurrence keeps the time of day and duration of the first window.
+    Without until or count the generator is infinite, so callers must bound it.
+
+    Args:
+        start_time: Start of the first occurrence
+        end_time: End of the first occurrence
+        frequency: "daily" or "weekly"
+        interval: Number of days/weeks between occurrences
+        weekdays: Days of the week (0-6 for Monday-Sunday) for weekly patterns,
+            defaults to the weekday of start_time
+        until: No occurrence starts after this time
+        count: Maximum number of occurrences
+
+    Yields:
+        (start, end) of each occurrence, in chronological order
+    """
+    duration = end_time - start_time
+    produced = 0
+
+    def done(occurrence: datetime) -> bool:
+        return (until is not None and occurrence > until) or (count is not None and produced >= count)
+
+    if frequency == "daily":
+        current = start_time
+        step = timedelta(days=interval)
+        while not done(current):
+            yield current, current + duration
+            produced += 1
+            current += step
+        return
+
+    if frequency != "weekly":
+        raise ValueError(f"Unsupported frequency: {frequency}")
+
+    days = sorted(set(weekdays)) if weekdays else [start_time.weekday()]
+    week_start = start_time - timedelta(days=start_time.weekday())
+    step = timedelta(weeks=interval)
+    while True:
+        for day in days:
+            current = week_start + timedelta(days=day)
+            if current < start_time:
+                continue
+            if done(current):
+                return
+            yield current, current + duration
+            produced += 1
+        week_start += step
@@ -0,0 +1,163 @@
+# src/parkin_web/core/serialization.py
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from src.parkin_web.schemas.parking_space import ParkingSpace, ParkingSpaceImage
+
+# Field lists are taken from the response schemas so both paths stay in sync
+PARKING_SPACE_FIELDS = tuple(ParkingSpace.__fields__)
+PARKING_SPACE_IMAGE_FIELDS = tuple(ParkingSpaceImage.__fields__)
+
+# Nested images are requested like a field but are not a column of the space
+IMAGES_FIELD = "images"
+
+# Predefined projections: map pins, result cards and the full object
+PARKING_SPACE_VIEWS = {
+    "pin": ("id", "title", "latitude", "longitude", "hourly_rate"),
+    "card": (
+        "id",
+        "title",
+        "latitude",
+        "longitude",
+        "hourly_rate",
+        "daily_rate",
+        "address",
+        "city",
+        "parking_type",
+        "main_image",
+        "instant_booking",
+        "has_security_camera",
+        "has_ev_charging",
+        "has_covered_parking",
+        "average_rating",
+        "reviews_count",
+    ),
+    "full": PARKING_SPACE_FIELDS + (IMAGES_FIELD,),
+}
+
+# Query parameter documentation; unknown views are rejected by resolve_fields with a 400
+VIEWS_DESCRIPTION = f"Predefined projection: {', '.join(PARKING_SPACE_VIEWS)}"
+
+
+def resolve_fields(view: str = "full", fields: Optional[str] = None) -> Tuple[str, ...]:
+    """
+    Resolve the parking space fields a response should contain.
+
+    Args:
+        view: Name of a predefined projection (pin, card or full)
+        fields: Comma-separated field list, takes precedence over the view
+
+    Returns:
+        Ordered tuple of fields, always starting with id
+
+    Raises:
+        ValueError: If the view or one of the fields is unknown
+    """
+    if not fields:
+        if view not in PARKING_SPACE_VIEWS:
+            raise ValueError(f"Unknown view: {view}")
+        return PARKING_SPACE_VIEWS[view]
+
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [
+        field for field in requested
+        if field not in PARKING_SPACE_FIELDS and field != IMAGES_FIELD
+    ]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return tuple(dict.fromkeys(["id", *requested]))
+
+
+def columns_of(fields: Sequence[str]) -> Tuple[str, ...]:
+    """
+    Get the parking space columns to load for a set of response fields.
+
+    Args:
+        fields: Resolved response fields
+
+    Returns:
+        The fields that are columns, i.e. without the nested images
+    """
+    return tuple(field for field in fields if field != IMAGES_FIELD)
+
+
+def row_dict(obj: Any, fields: Sequence[str]) -> Dict[str, Any]:
+    """
+    Build a response dict straight from an ORM row, skipping schema validation.
+
+    Values are left as-is (datetimes, enums), orjson serializes them natively.
+
+    Args:
+        obj: ORM instance
+        fields: Attributes to copy
+
+    Returns:
+        Dict mapping each field to the attribute value
+    """
+    return {field: getattr(obj, field) for field in fields}
+
+
+def parking_space_dict(
+    parking_space: Any, *, with_images: bool = False, fields: Optional[Sequence[str]] = None
+) -> Dict[str, Any]:
+    """
+    Build the response dict of a parking space.
+
+    Args:
+        parking_space: ParkingSpace instance
+        with_images: Whether to nest the images of the space
+        fields: Sparse fieldset (see resolve_fields), overrides with_images
+
+    Returns:
+        Dict matching schemas.ParkingSpace (or schemas.ParkingSpaceSearchItem with images),
+        restricted to the requested fields
+    """
+    if fields is not None:
+        with_images = IMAGES_FIELD in fields
+        data = row_dict(parking_space, columns_of(fields))
+    else:
+        data = row_dict(parking_space, PARKING_SPACE_FIELDS)
+    if with_images:
+        data["images"] = [row_dict(image, PARKING_SPACE_IMAGE_FIELDS) for image in parking_space.images]
+    return data
+
+
+def parking_space_list(
+    parking_spaces: Iterable[Any],
+    *,
+    with_images: bool = False,
+    fields: Optional[Sequence[str]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Build the response dicts of several parking spaces.
+
+    Args:
+        parking_spaces: ParkingSpace instances
+        with_images: Whether to nest the images of each space
+        fields: Sparse fieldset (see resolve_fields), overrides with_images
+
+    Returns:
+        List of parking space dicts
+    """
+    return [
+        parking_space_dict(space, with_images=with_images, fields=fields)
+        for space in parking_spaces
+    ]
+
+
+def search_result(
+    parking_spaces: Sequence[Any], fields: Optional[Sequence[str]] = None
+) -> Dict[str, Any]:
+    """
+    Build the response dict of a parking space search.
+
+    Args:
+        parking_spaces: ParkingSpace instances, with their images loaded if requested
+        fields: Sparse fieldset (see resolve_fields), the full object with images if omitted
+
+    Returns:
+        Dict matching schemas.ParkingSpaceSearchResult
+    """
+    return {
+        "total": len(parking_spaces),
+        "results": parking_space_list(parking_spaces, with_images=True, fields=fields),
+    }
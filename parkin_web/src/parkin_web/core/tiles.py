@@ -0,0 +1,137 @@
+# src/parkin_web/core/tiles.py
+import math
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from src.parkin_web.core.cache import LRUCache
+from src.parkin_web.core.config import settings
+
+# Web Mercator can't represent the poles, points beyond are clamped
+MAX_LATITUDE = 85.05112878
+
+
+def is_valid_tile(z: int, x: int, y: int) -> bool:
+    """
+    Check that tile coordinates exist at their zoom level.
+
+    Args:
+        z: Zoom level
+        x: Tile column
+        y: Tile row
+
+    Returns:
+        Whether the tile exists
+    """
+    if z < 0 or z > settings.TILE_MAX_ZOOM:
+        return False
+    return 0 <= x < 2 ** z and 0 <= y < 2 ** z
+
+
+def tile_for(latitude: float, longitude: float, z: int) -> Tuple[int, int]:
+    """
+    Get the slippy-map tile containing a point.
+
+    Args:
+        latitude: Latitude of the point
+        longitude: Longitude of the point
+        z: Zoom level
+
+    Returns:
+        (x, y) of the tile
+    """
+    n = 2 ** z
+    latitude = max(-MAX_LATITUDE, min(MAX_LATITUDE, latitude))
+    lat_rad = math.radians(latitude)
+    x = int((longitude + 180.0) / 360.0 * n)
+    y = int((1.0 - math.asinh(math.tan(lat_rad)) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def tile_bounds(z: int, x: int, y: int) -> Tuple[float, float, float, float]:
+    """
+    Get the geographic bounds of a tile.
+
+    Args:
+        z: Zoom level
+        x: Tile column
+        y: Tile row
+
+    Returns:
+        (south, west, north, east) in degrees
+    """
+    n = 2 ** z
+
+    def latitude(row: int) -> float:
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * row / n))))
+
+    return latitude(y + 1), x / n * 360.0 - 180.0, latitude(y), (x + 1) / n * 360.0 - 180.0
+
+
+class TileCache:
+    """
+    Cache of computed tile clusters, keyed by (z, x, y).
+
+    A parking space lives in exactly one tile per zoom level, so a change only
+    evicts TILE_MAX_ZOOM + 1 entries per position it occupied.
+    """
+
+    def __init__(self, maxsize: int, ttl: Optional[float] = None):
+        """
+        Args:
+            maxsize: Maximum number of cached tiles
+            ttl: Seconds after which tiles expire
+        """
+        self.tiles = LRUCache(maxsize, ttl)
+
+    def get(self, z: int, x: int, y: int) -> Optional[Dict[str, Any]]:
+        """
+        Get a cached tile.
+
+        Args:
+            z: Zoom level
+            x: Tile column
+            y: Tile row
+
+        Returns:
+            The cached tile, or None on a miss
+        """
+        return self.tiles.get((z, x, y))
+
+    def set(self, z: int, x: int, y: int, tile: Dict[str, Any]) -> None:
+        """
+        Cache a computed tile.
+
+        Args:
+            z: Zoom level
+            x: Tile column
+            y: Tile row
+            tile: Computed tile
+        """
+        self.tiles.set((z, x, y), tile)
+
+    def invalidate_points(self, points: Iterable[Tuple[Optional[float], Optional[float]]]) -> None:
+        """
+        Drop the cached tiles containing any of the given points, at every zoom level.
+
+        Args:
+            points: (latitude, longitude) pairs, points without coordinates are ignored
+        """
+        for latitude, longitude in points:
+            if latitude is None or longitude is None:
+                continue
+            for z in range(settings.TILE_MAX_ZOOM + 1):
+                x, y = tile_for(latitude, longitude, z)
+                self.tiles.delete((z, x, y))
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get hit-rate metrics.
+
+        Returns:
+            Dict with the metrics of the tile cache
+        """
+        return self.tiles.stats()
+
+
+tile_cache = TileCache(
+    maxsize=settings.TILE_CACHE_SIZE, ttl=settings.TILE_CACHE_TTL_SECONDS
+)
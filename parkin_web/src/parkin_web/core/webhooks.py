@@ -0,0 +1,142 @@
+# src/parkin_web/core/webhooks.py
+import hashlib
+import hmac
+import json
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Provider event types and the payment status they lead to
+PAYMENT_SUCCEEDED = "payment_intent.succeeded"
+PAYMENT_FAILED = "payment_intent.payment_failed"
+CHARGE_REFUNDED = "charge.refunded"
+HANDLED_EVENT_TYPES = (PAYMENT_SUCCEEDED, PAYMENT_FAILED, CHARGE_REFUNDED)
+
+
+class WebhookSignatureError(Exception):
+    """
+    Raised when a webhook signature header is missing, malformed, stale or wrong.
+    """
+
+
+def sign_payload(payload: bytes, secret: str, timestamp: int) -> str:
+    """
+    Build a signature header for a payload, in the provider's "t=...,v1=..." format.
+
+    Args:
+        payload: Raw request body
+        secret: Webhook signing secret
+        timestamp: Unix time of the signature
+
+    Returns:
+        Signature header value
+    """
+    signed = f"{timestamp}.".encode() + payload
+    digest = hmac.new(secret.encode(), signed, hashlib.sha256).hexdigest()
+    return f"t={timestamp},v1={digest}"
+
+
+def verify_signature(
+    payload: bytes,
+    header: Optional[str],
+    secret: str,
+    tolerance: int = 300,
+    now: Optional[float] = None,
+) -> None:
+    """
+    Check a webhook signature header against the raw payload.
+
+    Args:
+        payload: Raw request body
+        header: Signature header value
+        secret: Webhook signing secret
+        tolerance: Maximum age of the signature in seconds
+        now: Current unix time, defaults to time.time()
+
+    Raises:
+        WebhookSignatureError: If the signature doesn't match or is too old
+    """
+    if not header:
+        raise WebhookSignatureError("Missing signature header")
+    parts: Dict[str, List[str]] = {}
+    for item in header.split(","):
+        key, _, value = item.strip().partition("=")
+        parts.setdefault(key, []).append(value)
+    try:
+        timestamp = int(parts["t"][0])
+    except (KeyError, ValueError):
+        raise WebhookSignatureError("Malformed signature header")
+
+    now = time.time() if now is None else now
+    if abs(now - timestamp) > tolerance:
+        raise WebhookSignatureError("Signature timestamp outside the tolerance")
+    expected = sign_payload(payload, secret, timestamp).split("v1=", 1)[1]
+    if not any(hmac.compare_digest(expected, value) for value in parts.get("v1", [])):
+        raise WebhookSignatureError("Signature mismatch")
+
+
+def parse_event(payload: bytes) -> Tuple[str, str]:
+    """
+    Extract the event ID and type from a raw event.
+
+    Args:
+        payload: Raw request body
+
+    Returns:
+        (event_id, event_type)
+
+    Raises:
+        ValueError: If the payload isn't a JSON event
+    """
+    event = json.loads(payload)
+    if not isinstance(event, dict) or not event.get("id") or not event.get("type"):
+        raise ValueError("Event must be a JSON object with an id and a type")
+    return str(event["id"]), str(event["type"])
+
+
+def plan_batch(events: Iterable[Tuple[int, str, str, str]]) -> Dict[str, Any]:
+    """
+    Reduce a batch of queued events to the changes to apply.
+
+    Events are deduplicated by provider event ID. Status changes and refunds
+    are planned separately: the latest success or failure per transaction
+    wins, so a batch holding both the failure and the later success of the
+    same payment only applies the success, while a refund is kept alongside
+    the status change and applied after it. Refunded amounts are cumulative
+    on the provider side, so the largest one per transaction is kept.
+
+    Args:
+        events: (queue_id, event_id, event_type, payload) rows, in queue order
+
+    Returns:
+        Dict with "succeeded" and "failed" transaction ID sets, "refunded"
+        mapping transaction ID to the total refunded amount, and "ignored"
+        queue IDs (duplicates, unhandled types and malformed payloads)
+    """
+    seen = set()
+    statuses: Dict[str, str] = {}
+    refunded: Dict[str, float] = {}
+    ignored: List[int] = []
+    for queue_id, event_id, event_type, payload in events:
+        if event_id in seen or event_type not in HANDLED_EVENT_TYPES:
+            ignored.append(queue_id)
+            continue
+        seen.add(event_id)
+        try:
+            obj = json.loads(payload)["data"]["object"]
+            transaction_id = obj.get("payment_intent") or obj["id"]
+        except (ValueError, KeyError, TypeError):
+            ignored.append(queue_id)
+            continue
+        if event_type == CHARGE_REFUNDED:
+            # Provider amounts are in the smallest currency unit
+            amount = obj.get("amount_refunded", 0) / 100
+            refunded[transaction_id] = max(amount, refunded.get(transaction_id, 0.0))
+        else:
+            statuses[transaction_id] = event_type
+
+    return {
+        "succeeded": {tid for tid, event_type in statuses.items() if event_type == PAYMENT_SUCCEEDED},
+        "failed": {tid for tid, event_type in statuses.items() if event_type == PAYMENT_FAILED},
+        "refunded": refunded,
+        "ignored": ignored,
+    }
@@ -1,5 +1,12 @@
 # src/parkin_web/crud/__init__.py
 from src.parkin_web.crud.user import user
 from src.parkin_web.crud.parking_space import parking_space, parking_space_image, availability_schedule
-from src.parkin_web.crud.booking import booking, review
-from src.parkin_web.crud.payment import payment
\ No newline at end of file
+from src.parkin_web.crud.booking import booking, booking_series, review
+from src.parkin_web.crud.ledger import ledger
+from src.parkin_web.crud.payment import host_payout, payment
+from src.parkin_web.crud.reconciliation import reconciliation
+from src.parkin_web.crud.demand_multiplier import demand_multiplier
+from src.parkin_web.crud.host_stat import host_stat
+from src.parkin_web.crud.idempotency_key import idempotency_key
+from src.parkin_web.crud.webhook_event import webhook_event
+from src.parkin_web.crud.change_feed import change_feed
\ No newline at end of file
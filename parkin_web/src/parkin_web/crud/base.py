@@ -5,6 +5,7 @@ from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
+from src.parkin_web.crud.change_feed import change_feed
 from src.parkin_web.db.base_class import Base
 
 ModelType = TypeVar("ModelType", bound=Base)
@@ -102,7 +103,7 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
 
     def remove(self, db: Session, *, id: int) -> ModelType:
         """
-        Remove a record.
+        Remove a record, leaving a tombstone for the change feed.
         
         Args:
             db: Database session
@@ -113,5 +114,6 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """
         obj = db.query(self.model).get(id)
         db.delete(obj)
+        change_feed.record_delete(db, entity=self.model.__tablename__, id=id)
         db.commit()
         return obj
\ No newline at end of file
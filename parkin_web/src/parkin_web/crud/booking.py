@@ -1,15 +1,65 @@
 # src/parkin_web/crud/booking.py
-from typing import List, Optional, Dict, Any, Union
+from typing import List, Optional, Dict, Any, Iterator, Tuple, Union
 from datetime import datetime, timedelta
+from bisect import bisect_left
+from heapq import merge
+from itertools import accumulate, islice
 
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func
+from sqlalchemy import and_, or_, func, delete, insert, literal, select, update
 from fastapi.encoders import jsonable_encoder
 
+from src.parkin_web.core import availability, events, pricing, recurrence
+from src.parkin_web.core.geo import geo_cell
+from src.parkin_web.core.export import BOOKING_EXPORT_COLUMNS
 from src.parkin_web.crud.base import CRUDBase
-from src.parkin_web.models.booking import Booking, Review, BookingStatus
+from src.parkin_web.models.booking import (
+    ARCHIVED_STATUSES,
+    Booking,
+    BookingArchive,
+    BookingSeries,
+    BookingStatus,
+    Review,
+)
 from src.parkin_web.models.parking_space import ParkingSpace
-from src.parkin_web.schemas.booking import BookingCreate, BookingUpdate
+from src.parkin_web.models.tombstone import Tombstone
+from src.parkin_web.schemas.booking import BookingBase, BookingCreate, BookingSeriesCreate, BookingUpdate
+
+# Statuses holding a parking space for their time window
+BLOCKING_STATUSES = (BookingStatus.PENDING, BookingStatus.CONFIRMED)
+
+# Allowed current statuses and resulting status of each booking action
+TRANSITIONS = {
+    "confirm": ([BookingStatus.PENDING], BookingStatus.CONFIRMED),
+    "cancel": ([BookingStatus.PENDING, BookingStatus.CONFIRMED], BookingStatus.CANCELED),
+    "complete": ([BookingStatus.CONFIRMED], BookingStatus.COMPLETED),
+    "reject": ([BookingStatus.PENDING], BookingStatus.REJECTED),
+}
+
+
+def _merge_history(live: Any, archived: Any, skip: int, limit: int) -> List[Any]:
+    """
+    Page through live and archived bookings as if they were a single table.
+    
+    Both queries must be ordered by created_at descending. Each side only has
+    to return skip + limit rows, which are merged and sliced in memory.
+    
+    Args:
+        live: Query over Booking
+        archived: Equivalent query over BookingArchive
+        skip: Number of records to skip
+        limit: Maximum number of records to return
+        
+    Returns:
+        List of Booking and BookingArchive instances
+    """
+    rows = merge(
+        live.limit(skip + limit).all(),
+        archived.limit(skip + limit).all(),
+        key=lambda booking: booking.created_at,
+        reverse=True,
+    )
+    return list(islice(rows, skip, skip + limit))
 
 
 class CRUDBooking(CRUDBase[Booking, BookingCreate, BookingUpdate]):
@@ -28,56 +78,82 @@ class CRUDBooking(CRUDBase[Booking, BookingCreate, BookingUpdate]):
         Returns:
             The created booking instance
         """
-        # Calculate pricing based on duration type
-        duration = obj_in.end_time - obj_in.start_time
-        hours = duration.total_seconds() / 3600
-        days = hours / 24
-        
-        if obj_in.duration_type == "hourly":
-            base_price = parking_space.hourly_rate * hours
-        elif obj_in.duration_type == "daily":
-            base_price = parking_space.daily_rate * days if parking_space.daily_rate else parking_space.hourly_rate * hours
-        elif obj_in.duration_type == "monthly":
-            base_price = parking_space.monthly_rate if parking_space.monthly_rate else parking_space.hourly_rate * hours
-        
-        # Calculate fees
-        service_fee = base_price * 0.15  # 15% service fee
-        ev_charging_fee = 0.0
-        if obj_in.has_ev_charging and parking_space.has_ev_charging and parking_space.ev_charging_rate:
-            ev_charging_fee = parking_space.ev_charging_rate * hours
-        
-        insurance_fee = 0.0
-        if obj_in.has_insurance:
-            # Calculate insurance fee based on coverage
-            insurance_fee = 5.0  # Base insurance fee
-            if obj_in.insurance_coverage and obj_in.insurance_coverage > 10000:
-                insurance_fee = 10.0  # Higher coverage fee
-        
-        total_price = base_price + service_fee + ev_charging_fee + insurance_fee
+        # Calculate pricing based on duration type and requested options
+        prices = pricing.quote(parking_space, obj_in)
         
         # Create booking object
         obj_in_data = jsonable_encoder(obj_in)
         db_obj = Booking(
             **obj_in_data,
             user_id=user_id,
-            base_price=base_price,
-            service_fee=service_fee,
-            ev_charging_fee=ev_charging_fee,
-            insurance_fee=insurance_fee,
-            total_price=total_price,
+            **prices,
             status=BookingStatus.PENDING if not parking_space.instant_booking else BookingStatus.CONFIRMED,
         )
         
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
+        self.publish_changes(db, Booking.id == db_obj.id)
         return db_obj
     
+    def publish_changes(self, db: Session, *where: Any) -> None:
+        """
+        Push the current state of changed bookings to live subscribers.
+        
+        Drivers and hosts get a booking event on their user topic (and the booking
+        topic), map clients watching the geo-cell of the space get an availability
+        event for the booking window. Does nothing when nobody is subscribed.
+        
+        Args:
+            db: Database session
+            where: Filter conditions selecting the changed bookings
+        """
+        if not events.broker.has_subscribers():
+            return
+        rows = (
+            db.query(
+                Booking.id,
+                Booking.status,
+                Booking.user_id,
+                Booking.parking_space_id,
+                Booking.start_time,
+                Booking.end_time,
+                ParkingSpace.owner_id,
+                ParkingSpace.latitude,
+                ParkingSpace.longitude,
+            )
+            .join(ParkingSpace, Booking.parking_space_id == ParkingSpace.id)
+            .filter(*where)
+            .all()
+        )
+        for row in rows:
+            window = {
+                "parking_space_id": row.parking_space_id,
+                "start_time": row.start_time,
+                "end_time": row.end_time,
+            }
+            events.broker.publish(
+                [
+                    events.booking_topic(row.id),
+                    events.user_topic(row.user_id),
+                    events.user_topic(row.owner_id),
+                ],
+                events.BOOKING,
+                {"id": row.id, "status": row.status, **window},
+            )
+            cell = geo_cell(row.latitude, row.longitude)
+            if cell is not None:
+                events.broker.publish(
+                    [events.cell_topic(cell)],
+                    events.AVAILABILITY,
+                    {**window, "available": row.status not in BLOCKING_STATUSES},
+                )
+    
     def get_user_bookings(
         self, db: Session, *, user_id: int, skip: int = 0, limit: int = 100
     ) -> List[Booking]:
         """
-        Get bookings made by a user.
+        Get bookings made by a user, including archived ones.
         
         Args:
             db: Database session
@@ -88,20 +164,22 @@ class CRUDBooking(CRUDBase[Booking, BookingCreate, BookingUpdate]):
         Returns:
             List of booking instances
         """
-        return (
+        return _merge_history(
             db.query(Booking)
             .filter(Booking.user_id == user_id)
-            .order_by(Booking.created_at.desc())
-            .offset(skip)
-            .limit(limit)
-            .all()
+            .order_by(Booking.created_at.desc()),
+            db.query(BookingArchive)
+            .filter(BookingArchive.user_id == user_id)
+            .order_by(BookingArchive.created_at.desc()),
+            skip,
+            limit,
         )
     
     def get_host_bookings(
         self, db: Session, *, host_id: int, skip: int = 0, limit: int = 100
     ) -> List[Booking]:
         """
-        Get bookings for a host's parking spaces.
+        Get bookings for a host's parking spaces, including archived ones.
         
         Args:
             db: Database session
@@ -112,16 +190,74 @@ class CRUDBooking(CRUDBase[Booking, BookingCreate, BookingUpdate]):
         Returns:
             List of booking instances
         """
-        return (
+        return _merge_history(
             db.query(Booking)
             .join(ParkingSpace, Booking.parking_space_id == ParkingSpace.id)
             .filter(ParkingSpace.owner_id == host_id)
-            .order_by(Booking.created_at.desc())
-            .offset(skip)
-            .limit(limit)
-            .all()
+            .order_by(Booking.created_at.desc()),
+            db.query(BookingArchive)
+            .join(ParkingSpace, BookingArchive.parking_space_id == ParkingSpace.id)
+            .filter(ParkingSpace.owner_id == host_id)
+            .order_by(BookingArchive.created_at.desc()),
+            skip,
+            limit,
         )
     
+    def get_with_archive(self, db: Session, *, id: int) -> Optional[Union[Booking, BookingArchive]]:
+        """
+        Get a booking by ID, falling back to the archive.
+        
+        Args:
+            db: Database session
+            id: ID of the booking
+            
+        Returns:
+            The booking or archived booking if found, None otherwise
+        """
+        booking = db.query(Booking).filter(Booking.id == id).first()
+        if booking is None:
+            booking = db.query(BookingArchive).filter(BookingArchive.id == id).first()
+        return booking
+    
+    def iter_export(
+        self,
+        db: Session,
+        *,
+        start: datetime,
+        end: datetime,
+        host_id: Optional[int] = None,
+        status: Optional[BookingStatus] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[Tuple]:
+        """
+        Stream live and archived bookings created in a date range with a server-side cursor.
+        
+        Args:
+            db: Database session
+            start: Only bookings created at or after this are exported
+            end: Only bookings created before this are exported
+            host_id: Restrict to bookings of this host's parking spaces
+            status: Restrict to bookings with this status
+            batch_size: Number of rows fetched per round trip
+            
+        Returns:
+            Iterator of row tuples aligned with BOOKING_EXPORT_COLUMNS
+        """
+        def export_query(model: Any) -> Any:
+            query = db.query(*[getattr(model, column) for column in BOOKING_EXPORT_COLUMNS]).filter(
+                model.created_at >= start, model.created_at < end
+            )
+            if host_id is not None:
+                query = query.join(ParkingSpace, model.parking_space_id == ParkingSpace.id).filter(
+                    ParkingSpace.owner_id == host_id
+                )
+            if status is not None:
+                query = query.filter(model.status == status)
+            return query
+        
+        query = export_query(Booking).union_all(export_query(BookingArchive))
+        return iter(query.order_by(Booking.created_at, Booking.id).yield_per(batch_size))
+    
     def has_conflict(
         self, db: Session, *, parking_space_id: int, start_time: datetime, end_time: datetime, exclude_id: Optional[int] = None
     ) -> bool:
@@ -168,28 +304,84 @@ class CRUDBooking(CRUDBase[Booking, BookingCreate, BookingUpdate]):
         
         return db.query(query.exists()).scalar()
     
-    def confirm(self, db: Session, *, id: int) -> Booking:
+    def get_with_owner_id(self, db: Session, *, id: int) -> Optional[Tuple[Booking, int]]:
         """
-        Confirm a booking.
+        Get a booking together with the owner ID of its parking space in one query.
         
         Args:
             db: Database session
             id: ID of the booking
             
         Returns:
-            The updated booking instance
+            Tuple of (booking, owner ID) if found, None otherwise
         """
-        booking = db.query(Booking).filter(Booking.id == id).first()
-        if booking:
-            booking.status = BookingStatus.CONFIRMED
-            db.add(booking)
-            db.commit()
-            db.refresh(booking)
+        return (
+            db.query(Booking, ParkingSpace.owner_id)
+            .join(ParkingSpace, Booking.parking_space_id == ParkingSpace.id)
+            .filter(Booking.id == id)
+            .first()
+        )
+    
+    def transition(
+        self,
+        db: Session,
+        *,
+        id: int,
+        expected: List[BookingStatus],
+        status: BookingStatus,
+        values: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Booking]:
+        """
+        Move a booking to a new status if it is currently in one of the expected ones.
+        
+        The status check and the write happen in a single
+        UPDATE ... WHERE id = :id AND status IN (:expected) RETURNING statement,
+        so there is no race between checking and updating.
+        
+        Args:
+            db: Database session
+            id: ID of the booking
+            expected: Statuses the booking may currently be in
+            status: New status
+            values: Extra column values to set
+            
+        Returns:
+            The updated booking instance, or None if not found or not in an expected status
+        """
+        stmt = (
+            update(Booking)
+            .where(Booking.id == id, Booking.status.in_(expected))
+            .values(status=status, **(values or {}))
+            .returning(Booking)
+            .execution_options(populate_existing=True)
+        )
+        booking = db.execute(stmt).scalars().first()
+        if booking is not None:
+            # Keep the RETURNING values loaded instead of re-selecting them after commit
+            db.expunge(booking)
+        db.commit()
+        if booking is not None:
+            self.publish_changes(db, Booking.id == booking.id)
         return booking
     
-    def cancel(self, db: Session, *, id: int, cancellation_reason: str = "") -> Booking:
+    def confirm(self, db: Session, *, id: int) -> Optional[Booking]:
+        """
+        Confirm a pending booking.
+        
+        Args:
+            db: Database session
+            id: ID of the booking
+            
+        Returns:
+            The updated booking instance, or None if it isn't pending
+        """
+        return self.transition(
+            db, id=id, expected=[BookingStatus.PENDING], status=BookingStatus.CONFIRMED
+        )
+    
+    def cancel(self, db: Session, *, id: int, cancellation_reason: str = "") -> Optional[Booking]:
         """
-        Cancel a booking.
+        Cancel a pending or confirmed booking.
         
         Args:
             db: Database session
@@ -197,39 +389,34 @@ class CRUDBooking(CRUDBase[Booking, BookingCreate, BookingUpdate]):
             cancellation_reason: Reason for cancellation
             
         Returns:
-            The updated booking instance
+            The updated booking instance, or None if it can't be canceled
         """
-        booking = db.query(Booking).filter(Booking.id == id).first()
-        if booking:
-            booking.status = BookingStatus.CANCELED
-            booking.cancellation_reason = cancellation_reason
-            db.add(booking)
-            db.commit()
-            db.refresh(booking)
-        return booking
+        return self.transition(
+            db,
+            id=id,
+            expected=[BookingStatus.PENDING, BookingStatus.CONFIRMED],
+            status=BookingStatus.CANCELED,
+            values={"cancellation_reason": cancellation_reason},
+        )
     
-    def complete(self, db: Session, *, id: int) -> Booking:
+    def complete(self, db: Session, *, id: int) -> Optional[Booking]:
         """
-        Mark a booking as completed.
+        Mark a confirmed booking as completed.
         
         Args:
             db: Database session
             id: ID of the booking
             
         Returns:
-            The updated booking instance
+            The updated booking instance, or None if it isn't confirmed
         """
-        booking = db.query(Booking).filter(Booking.id == id).first()
-        if booking:
-            booking.status = BookingStatus.COMPLETED
-            db.add(booking)
-            db.commit()
-            db.refresh(booking)
-        return booking
+        return self.transition(
+            db, id=id, expected=[BookingStatus.CONFIRMED], status=BookingStatus.COMPLETED
+        )
     
-    def reject(self, db: Session, *, id: int, rejection_reason: str = "") -> Booking:
+    def reject(self, db: Session, *, id: int, rejection_reason: str = "") -> Optional[Booking]:
         """
-        Reject a booking.
+        Reject a pending booking.
         
         Args:
             db: Database session
@@ -237,16 +424,357 @@ class CRUDBooking(CRUDBase[Booking, BookingCreate, BookingUpdate]):
             rejection_reason: Reason for rejection
             
         Returns:
-            The updated booking instance
+            The updated booking instance, or None if it isn't pending
         """
-        booking = db.query(Booking).filter(Booking.id == id).first()
-        if booking:
-            booking.status = BookingStatus.REJECTED
-            booking.cancellation_reason = rejection_reason
-            db.add(booking)
+        return self.transition(
+            db,
+            id=id,
+            expected=[BookingStatus.PENDING],
+            status=BookingStatus.REJECTED,
+            values={"cancellation_reason": rejection_reason},
+        )
+    
+    def get_access_rows(self, db: Session, *, ids: List[int]) -> Dict[int, Any]:
+        """
+        Get status, driver and host of several bookings with one join query.
+        
+        Args:
+            db: Database session
+            ids: IDs of the bookings
+            
+        Returns:
+            Dict mapping booking ID to a row with id, status, user_id and owner_id
+        """
+        if not ids:
+            return {}
+        rows = (
+            db.query(Booking.id, Booking.status, Booking.user_id, ParkingSpace.owner_id)
+            .join(ParkingSpace, Booking.parking_space_id == ParkingSpace.id)
+            .filter(Booking.id.in_(ids))
+            .all()
+        )
+        return {row.id: row for row in rows}
+    
+    def bulk_transition(
+        self, db: Session, *, ids: List[int], action: str, values: Optional[Dict[str, Any]] = None
+    ) -> Dict[int, BookingStatus]:
+        """
+        Apply a booking action to several bookings with a single guarded UPDATE.
+        
+        Args:
+            db: Database session
+            ids: IDs of the bookings
+            action: One of the TRANSITIONS keys
+            values: Extra column values to set
+            
+        Returns:
+            Dict mapping the ID of each updated booking to its new status
+        """
+        if not ids:
+            return {}
+        expected, new_status = TRANSITIONS[action]
+        stmt = (
+            update(Booking)
+            .where(Booking.id.in_(ids), Booking.status.in_(expected))
+            .values(status=new_status, **(values or {}))
+            .returning(Booking.id, Booking.status)
+            .execution_options(synchronize_session=False)
+        )
+        updated = {row.id: row.status for row in db.execute(stmt)}
+        db.commit()
+        if updated:
+            self.publish_changes(db, Booking.id.in_(list(updated)))
+        return updated
+    
+    def _update_in_batches(
+        self, db: Session, *, where: List[Any], values: Dict[str, Any], batch_size: int
+    ) -> List[int]:
+        """
+        Apply a set-based UPDATE to the matching bookings in bounded batches.
+        
+        Each batch is a single UPDATE ... WHERE id IN (SELECT ... LIMIT n FOR UPDATE
+        SKIP LOCKED) RETURNING id statement committed on its own, so rows locked by
+        concurrent requests are skipped instead of waited on.
+        
+        Args:
+            db: Database session
+            where: Filter conditions selecting the bookings to update
+            values: Column values to set
+            batch_size: Maximum number of rows updated per statement
+            
+        Returns:
+            IDs of the updated bookings
+        """
+        updated_ids: List[int] = []
+        while True:
+            batch = (
+                select(Booking.id)
+                .where(*where)
+                .order_by(Booking.id)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+                .scalar_subquery()
+            )
+            stmt = (
+                update(Booking)
+                .where(Booking.id.in_(batch), *where)
+                .values(**values)
+                .returning(Booking.id)
+                .execution_options(synchronize_session=False)
+            )
+            ids = [row.id for row in db.execute(stmt)]
             db.commit()
-            db.refresh(booking)
-        return booking
+            if ids:
+                self.publish_changes(db, Booking.id.in_(ids))
+            updated_ids.extend(ids)
+            if len(ids) < batch_size:
+                return updated_ids
+    
+    def complete_ended(
+        self, db: Session, *, now: datetime, batch_size: int = 1000
+    ) -> List[int]:
+        """
+        Mark every confirmed booking whose end time has passed as completed.
+        
+        Args:
+            db: Database session
+            now: Current time
+            batch_size: Maximum number of rows updated per statement
+            
+        Returns:
+            IDs of the completed bookings
+        """
+        return self._update_in_batches(
+            db,
+            where=[Booking.status == BookingStatus.CONFIRMED, Booking.end_time < now],
+            values={"status": BookingStatus.COMPLETED},
+            batch_size=batch_size,
+        )
+    
+    def expire_pending(
+        self, db: Session, *, now: datetime, created_before: datetime, batch_size: int = 1000
+    ) -> List[int]:
+        """
+        Cancel pending bookings that were never confirmed in time.
+        
+        A pending booking is stale once it was created before created_before or
+        once its start time has passed.
+        
+        Args:
+            db: Database session
+            now: Current time
+            created_before: Pending bookings created before this are expired
+            batch_size: Maximum number of rows updated per statement
+            
+        Returns:
+            IDs of the expired bookings
+        """
+        return self._update_in_batches(
+            db,
+            where=[
+                Booking.status == BookingStatus.PENDING,
+                or_(Booking.created_at < created_before, Booking.start_time <= now),
+            ],
+            values={
+                "status": BookingStatus.CANCELED,
+                "cancellation_reason": "Expired: not confirmed in time",
+            },
+            batch_size=batch_size,
+        )
+    
+    def archive_terminal(
+        self, db: Session, *, ended_before: datetime, batch_size: int = 1000
+    ) -> int:
+        """
+        Move terminal bookings that ended before a cutoff into the archive table.
+        
+        Each batch is a single statement, a DELETE ... RETURNING feeding an
+        INSERT ... SELECT through a CTE, committed on its own. The same statement
+        records a tombstone per archived booking, so the booking change feed
+        reports them as deleted. Reviewed bookings stay in place since reviews
+        reference them.
+        
+        Args:
+            db: Database session
+            ended_before: Only bookings that ended before this are archived
+            batch_size: Maximum number of rows moved per statement
+            
+        Returns:
+            Number of archived bookings
+        """
+        columns = [column.name for column in Booking.__table__.columns]
+        where = [
+            Booking.status.in_(ARCHIVED_STATUSES),
+            Booking.end_time < ended_before,
+            ~select(Review.id).where(Review.booking_id == Booking.id).exists(),
+        ]
+        archived = 0
+        while True:
+            batch = (
+                select(Booking.id)
+                .where(*where)
+                .order_by(Booking.id)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+                .scalar_subquery()
+            )
+            moved = (
+                delete(Booking)
+                .where(Booking.id.in_(batch))
+                .returning(*Booking.__table__.columns)
+                .cte("moved")
+            )
+            copied = (
+                insert(BookingArchive)
+                .from_select(columns, select(*[moved.c[name] for name in columns]))
+                .returning(BookingArchive.id)
+                .cte("copied")
+            )
+            now = datetime.utcnow()
+            stmt = insert(Tombstone).from_select(
+                ["entity", "entity_id", "created_at", "updated_at"],
+                select(literal(Booking.__tablename__), copied.c.id, literal(now), literal(now)),
+            )
+            count = db.execute(stmt).rowcount
+            db.commit()
+            archived += count
+            if count < batch_size:
+                return archived
+
+
+class CRUDBookingSeries(CRUDBase[BookingSeries, BookingSeriesCreate, Any]):
+    def expand(
+        self, obj_in: BookingSeriesCreate, *, max_occurrences: int
+    ) -> List[Tuple[datetime, datetime]]:
+        """
+        Expand the occurrences of a series, stopping one past max_occurrences.
+        
+        Args:
+            obj_in: Schema describing the series
+            max_occurrences: Maximum number of occurrences allowed
+            
+        Returns:
+            List of (start, end) windows, longer than max_occurrences if the series is too long
+        """
+        occurrences = recurrence.iter_occurrences(
+            obj_in.start_time,
+            obj_in.end_time,
+            frequency=obj_in.frequency.value,
+            interval=obj_in.interval,
+            weekdays=obj_in.weekdays,
+            until=obj_in.until,
+            count=obj_in.count,
+        )
+        return list(islice(occurrences, max_occurrences + 1))
+    
+    def find_conflicts(
+        self,
+        db: Session,
+        *,
+        parking_space: ParkingSpace,
+        occurrences: List[Tuple[datetime, datetime]],
+    ) -> List[Optional[str]]:
+        """
+        Check every occurrence against availability and existing bookings.
+        
+        Existing bookings over the whole series range are loaded with a single
+        range query, then each occurrence is checked with a binary search.
+        
+        Args:
+            db: Database session
+            parking_space: Parking space being booked
+            occurrences: (start, end) windows in chronological order
+            
+        Returns:
+            Per occurrence, None if it can be booked, otherwise "unavailable",
+            "booked" or "overlap" (overlaps an earlier occurrence of the series)
+        """
+        if not occurrences:
+            return []
+        booked = (
+            db.query(Booking.start_time, Booking.end_time)
+            .filter(
+                Booking.parking_space_id == parking_space.id,
+                Booking.status.in_([BookingStatus.PENDING, BookingStatus.CONFIRMED]),
+                Booking.start_time < max(end for _, end in occurrences),
+                Booking.end_time > occurrences[0][0],
+            )
+            .order_by(Booking.start_time)
+            .all()
+        )
+        starts = [row.start_time for row in booked]
+        # Latest end among bookings starting before each index
+        max_ends = list(accumulate((row.end_time for row in booked), max))
+        
+        reasons: List[Optional[str]] = []
+        previous_end: Optional[datetime] = None
+        for start, end in occurrences:
+            index = bisect_left(starts, end)
+            if not availability.is_window_available(parking_space.availability_bitmap, start, end):
+                reasons.append("unavailable")
+            elif index and max_ends[index - 1] > start:
+                reasons.append("booked")
+            elif previous_end is not None and start < previous_end:
+                reasons.append("overlap")
+            else:
+                reasons.append(None)
+                previous_end = end
+        return reasons
+    
+    def create_with_occurrences(
+        self,
+        db: Session,
+        *,
+        obj_in: BookingSeriesCreate,
+        user_id: int,
+        parking_space: ParkingSpace,
+        occurrences: List[Tuple[datetime, datetime]],
+    ) -> BookingSeries:
+        """
+        Create a series and bulk insert one booking per occurrence.
+        
+        Args:
+            db: Database session
+            obj_in: Schema describing the series
+            user_id: ID of the user making the bookings
+            parking_space: Parking space being booked
+            occurrences: (start, end) windows to book
+            
+        Returns:
+            The created series instance
+        """
+        series = BookingSeries(
+            **obj_in.dict(exclude={"weekdays"}),
+            weekdays=",".join(str(day) for day in obj_in.weekdays) if obj_in.weekdays else None,
+            user_id=user_id,
+        )
+        db.add(series)
+        db.flush()
+        
+        requests = [obj_in.copy(update={"start_time": start, "end_time": end}) for start, end in occurrences]
+        prices = pricing.quote_batch([parking_space] * len(requests), requests)
+        options = obj_in.dict(include=set(BookingBase.__fields__) - {"start_time", "end_time"})
+        status = BookingStatus.CONFIRMED if parking_space.instant_booking else BookingStatus.PENDING
+        db.bulk_insert_mappings(
+            Booking,
+            [
+                {
+                    **options,
+                    **price,
+                    "start_time": request.start_time,
+                    "end_time": request.end_time,
+                    "status": status,
+                    "user_id": user_id,
+                    "parking_space_id": parking_space.id,
+                    "series_id": series.id,
+                }
+                for request, price in zip(requests, prices)
+            ],
+        )
+        db.commit()
+        db.refresh(series)
+        booking.publish_changes(db, Booking.series_id == series.id)
+        return series
 
 
 class CRUDReview(CRUDBase[Review, Any, Any]):
@@ -317,4 +845,5 @@ class CRUDReview(CRUDBase[Review, Any, Any]):
 
 
 booking = CRUDBooking(Booking)
+booking_series = CRUDBookingSeries(BookingSeries)
 review = CRUDReview(Review)
\ No newline at end of file
@@ -0,0 +1,162 @@
+# src/parkin_web/crud/change_feed.py
+from datetime import datetime, timedelta
+from typing import Iterator, List, Optional, Tuple, Type
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session
+
+from src.parkin_web.core.change_feed import Change, Cursor, merge_changes
+from src.parkin_web.core.config import settings
+from src.parkin_web.db.base_class import Base
+from src.parkin_web.models.tombstone import Tombstone
+
+
+class CRUDChangeFeed:
+    def record_delete(self, db: Session, *, entity: str, id: int) -> None:
+        """
+        Record a tombstone for a deleted row, in the caller's transaction.
+        
+        Args:
+            db: Database session
+            entity: Table name of the deleted row
+            id: ID of the deleted row
+        """
+        db.add(Tombstone(entity=entity, entity_id=id))
+    
+    def start(self, *, now: Optional[datetime] = None) -> Cursor:
+        """
+        Get a cursor to follow the feed from now on, e.g. right after a full load.
+        
+        The cursor sits CHANGE_FEED_SETTLE_SECONDS in the past so the first page
+        overlaps the load; re-applying an unchanged row must be a no-op.
+        
+        Args:
+            now: Current time, defaults to utcnow
+            
+        Returns:
+            The cursor
+        """
+        now = now or datetime.utcnow()
+        return Cursor(now - timedelta(seconds=settings.CHANGE_FEED_SETTLE_SECONDS), 0)
+    
+    def is_expired(self, cursor: Optional[Cursor], *, now: Optional[datetime] = None) -> bool:
+        """
+        Check whether a cursor is older than the tombstone retention window.
+        
+        Deletions after such a cursor may have been purged, so following the feed
+        from it could miss them; the consumer must do a full reload instead.
+        
+        Args:
+            cursor: Cursor to check, None for the start of the feed
+            now: Current time, defaults to utcnow
+            
+        Returns:
+            Whether the cursor can no longer be followed
+        """
+        if cursor is None:
+            return False
+        now = now or datetime.utcnow()
+        return cursor.changed_at < now - timedelta(days=settings.TOMBSTONE_RETENTION_DAYS)
+    
+    def changes_since(
+        self,
+        db: Session,
+        model: Type[Base],
+        *,
+        cursor: Optional[Cursor] = None,
+        limit: int = 1000,
+        now: Optional[datetime] = None,
+    ) -> Tuple[List[Change], Optional[Cursor]]:
+        """
+        Get the rows of a table changed or deleted after a cursor.
+        
+        Upserts come from the (updated_at, id) index of the table, deletions from
+        tombstones. Changes younger than CHANGE_FEED_SETTLE_SECONDS are held back,
+        so a transaction committing after a later timestamp was read is not skipped.
+        updated_at is the app server's clock at flush time rather than the commit
+        time, so this only holds for transactions that commit within the window.
+        
+        Args:
+            db: Database session
+            model: Model class of the table
+            cursor: Position returned by the previous call, None for the start of the feed
+            limit: Maximum number of changes returned
+            now: Current time, defaults to utcnow
+            
+        Returns:
+            The changes in (changed_at, id) order, and the cursor to pass next time
+            (unchanged when there is nothing new)
+        """
+        now = now or datetime.utcnow()
+        settled = now - timedelta(seconds=settings.CHANGE_FEED_SETTLE_SECONDS)
+        
+        upserts = db.query(model.updated_at, model.id).filter(model.updated_at <= settled)
+        deletes = db.query(Tombstone.created_at, Tombstone.entity_id).filter(
+            Tombstone.entity == model.__tablename__,
+            Tombstone.created_at <= settled,
+        )
+        if cursor is not None:
+            upserts = upserts.filter(tuple_(model.updated_at, model.id) > tuple_(*cursor))
+            deletes = deletes.filter(
+                tuple_(Tombstone.created_at, Tombstone.entity_id) > tuple_(*cursor)
+            )
+        
+        changes = merge_changes(
+            upserts.order_by(model.updated_at, model.id).limit(limit).all(),
+            deletes.order_by(Tombstone.created_at, Tombstone.entity_id).limit(limit).all(),
+            limit,
+        )
+        return changes, changes[-1].cursor if changes else cursor
+    
+    def iter_changes(
+        self,
+        db: Session,
+        model: Type[Base],
+        *,
+        cursor: Optional[Cursor] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[Change]:
+        """
+        Iterate over every settled change of a table after a cursor, page by page.
+        
+        Args:
+            db: Database session
+            model: Model class of the table
+            cursor: Position to start after, None for the start of the feed
+            batch_size: Number of changes loaded per query
+            
+        Yields:
+            Changes in (changed_at, id) order; the cursor of the last one resumes the feed
+        """
+        now = datetime.utcnow()
+        while True:
+            changes, cursor = self.changes_since(
+                db, model, cursor=cursor, limit=batch_size, now=now
+            )
+            yield from changes
+            if len(changes) < batch_size:
+                return
+    
+    def purge_tombstones(self, db: Session, *, before: datetime) -> int:
+        """
+        Delete tombstones older than the retention window.
+        
+        Consumers whose cursor is older than the window must do a full reload.
+        
+        Args:
+            db: Database session
+            before: Tombstones created before this are deleted
+            
+        Returns:
+            Number of tombstones deleted
+        """
+        count = (
+            db.query(Tombstone)
+            .filter(Tombstone.created_at < before)
+            .delete(synchronize_session=False)
+        )
+        db.commit()
+        return count
+
+
+change_feed = CRUDChangeFeed()
@@ -0,0 +1,43 @@
+# src/parkin_web/crud/demand_multiplier.py
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy.orm import Session
+
+from src.parkin_web.crud.base import CRUDBase
+from src.parkin_web.models.demand_multiplier import DemandMultiplier
+
+
+class CRUDDemandMultiplier(CRUDBase[DemandMultiplier, Any, Any]):
+    def get_table(self, db: Session) -> Dict[Tuple[str, int], float]:
+        """
+        Get every multiplier as a lookup table.
+        
+        Args:
+            db: Database session
+            
+        Returns:
+            Dict mapping (geo_cell, hour_of_week) to multiplier
+        """
+        rows = db.query(
+            DemandMultiplier.geo_cell, DemandMultiplier.hour_of_week, DemandMultiplier.multiplier
+        ).all()
+        return {(row.geo_cell, row.hour_of_week): row.multiplier for row in rows}
+    
+    def replace_all(self, db: Session, *, rows: List[Dict[str, Any]]) -> int:
+        """
+        Replace the whole multiplier table in a single transaction.
+        
+        Args:
+            db: Database session
+            rows: Dicts with geo_cell, hour_of_week, multiplier, bookings_count and views_count
+            
+        Returns:
+            Number of rows written
+        """
+        db.query(DemandMultiplier).delete(synchronize_session=False)
+        db.bulk_insert_mappings(DemandMultiplier, rows)
+        db.commit()
+        return len(rows)
+
+
+demand_multiplier = CRUDDemandMultiplier(DemandMultiplier)
@@ -0,0 +1,258 @@
+# src/parkin_web/crud/host_stat.py
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import case, func, select, union_all
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from src.parkin_web.crud.base import CRUDBase
+from src.parkin_web.models.booking import Booking, BookingArchive, BookingStatus
+from src.parkin_web.models.host_stat import HostDailyStat, HostStatRollup
+from src.parkin_web.models.parking_space import ParkingSpace
+from src.parkin_web.models.payment import Payment
+
+# Columns recomputed by the rollup; views_count is maintained incrementally instead
+ROLLUP_FIELDS = ("bookings_count", "canceled_count", "completed_count", "revenue", "payouts")
+STAT_FIELDS = ROLLUP_FIELDS + ("views_count",)
+
+HISTORY_COLUMNS = ("parking_space_id", "created_at", "status", "total_price", "payment_id")
+
+
+def _booking_history() -> Any:
+    """
+    Build a subquery over live and archived bookings with the columns the rollup reads.
+    
+    Returns:
+        Subquery named "bookings"
+    """
+    return union_all(
+        select(*[getattr(Booking, column) for column in HISTORY_COLUMNS]),
+        select(*[getattr(BookingArchive, column) for column in HISTORY_COLUMNS]),
+    ).subquery("bookings")
+
+
+class CRUDHostDailyStat(CRUDBase[HostDailyStat, Any, Any]):
+    def record_view(
+        self, db: Session, *, host_id: int, parking_space_id: int, day: date
+    ) -> None:
+        """
+        Count a parking space view in the daily rollup, without committing.
+        
+        Args:
+            db: Database session
+            host_id: ID of the parking space owner
+            parking_space_id: ID of the viewed parking space
+            day: Day of the view
+        """
+        stmt = insert(HostDailyStat).values(
+            host_id=host_id, parking_space_id=parking_space_id, day=day, views_count=1
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["parking_space_id", "day"],
+            set_={"views_count": HostDailyStat.views_count + 1},
+        )
+        db.execute(stmt)
+    
+    def get_dirty_days(self, db: Session, *, since: datetime) -> List[date]:
+        """
+        Get the days whose rollup may be stale because of changes since a point in time.
+        
+        Booking rows are bucketed by creation day, so a booking updated since
+        then dirties its creation day; a payout dirties the day it was paid.
+        
+        Args:
+            db: Database session
+            since: Time of the previous rollup
+            
+        Returns:
+            Sorted list of days to recompute
+        """
+        booking_days = (
+            db.query(func.date(Booking.created_at))
+            .filter(Booking.updated_at >= since)
+            .distinct()
+            .all()
+        )
+        payout_days = (
+            db.query(func.date(Payment.host_payout_date))
+            .filter(Payment.host_payout_date >= since)
+            .distinct()
+            .all()
+        )
+        days: Set[date] = {row[0] for row in booking_days + payout_days if row[0] is not None}
+        return sorted(days)
+    
+    def rollup_days(self, db: Session, *, days: List[date]) -> int:
+        """
+        Recompute the booking and payout columns of the given days.
+        
+        Each day is aggregated with one GROUP BY per source table, then written
+        with a single upsert; views_count is left untouched.
+        
+        Args:
+            db: Database session
+            days: Days to recompute
+            
+        Returns:
+            Number of (parking space, day) rows written
+        """
+        if not days:
+            return 0
+        
+        bookings = _booking_history()
+        created_day = func.date(bookings.c.created_at)
+        booking_rows = (
+            db.query(
+                ParkingSpace.owner_id,
+                bookings.c.parking_space_id,
+                created_day,
+                func.count(),
+                func.sum(
+                    case(
+                        (bookings.c.status.in_([BookingStatus.CANCELED, BookingStatus.REJECTED]), 1),
+                        else_=0,
+                    )
+                ),
+                func.sum(case((bookings.c.status == BookingStatus.COMPLETED, 1), else_=0)),
+                func.sum(
+                    case(
+                        (
+                            bookings.c.status.in_([BookingStatus.CONFIRMED, BookingStatus.COMPLETED]),
+                            bookings.c.total_price,
+                        ),
+                        else_=0.0,
+                    )
+                ),
+            )
+            .join(ParkingSpace, bookings.c.parking_space_id == ParkingSpace.id)
+            .filter(created_day.in_(days))
+            .group_by(ParkingSpace.owner_id, bookings.c.parking_space_id, created_day)
+            .all()
+        )
+        
+        payout_day = func.date(Payment.host_payout_date)
+        payout_rows = (
+            db.query(
+                ParkingSpace.owner_id,
+                bookings.c.parking_space_id,
+                payout_day,
+                func.sum(Payment.host_payout_amount),
+            )
+            .join(bookings, bookings.c.payment_id == Payment.id)
+            .join(ParkingSpace, bookings.c.parking_space_id == ParkingSpace.id)
+            .filter(Payment.host_payout_status == "completed", payout_day.in_(days))
+            .group_by(ParkingSpace.owner_id, bookings.c.parking_space_id, payout_day)
+            .all()
+        )
+        
+        rows: Dict[Tuple[int, date], Dict[str, Any]] = defaultdict(dict)
+        for host_id, space_id, day, bookings_count, canceled, completed, revenue in booking_rows:
+            rows[(space_id, day)].update(
+                host_id=host_id,
+                bookings_count=bookings_count,
+                canceled_count=canceled or 0,
+                completed_count=completed or 0,
+                revenue=revenue or 0.0,
+            )
+        for host_id, space_id, day, payouts in payout_rows:
+            rows[(space_id, day)].update(host_id=host_id, payouts=payouts or 0.0)
+        
+        # Reset the recomputed days first so rows that lost all activity go back to 0
+        db.query(HostDailyStat).filter(HostDailyStat.day.in_(days)).update(
+            {field: 0 for field in ROLLUP_FIELDS}, synchronize_session=False
+        )
+        if rows:
+            values = [
+                {
+                    **{field: 0 for field in ROLLUP_FIELDS},
+                    **row,
+                    "parking_space_id": space_id,
+                    "day": day,
+                }
+                for (space_id, day), row in rows.items()
+            ]
+            stmt = insert(HostDailyStat).values(values)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["parking_space_id", "day"],
+                set_={field: stmt.excluded[field] for field in ROLLUP_FIELDS},
+            )
+            db.execute(stmt)
+        db.commit()
+        return len(rows)
+    
+    def get_last_rollup_time(self, db: Session) -> Optional[datetime]:
+        """
+        Get the time of the latest successful rollup.
+        
+        Args:
+            db: Database session
+            
+        Returns:
+            The latest rolled_up_at, None if the rollup never ran
+        """
+        return db.query(func.max(HostStatRollup.rolled_up_at)).scalar()
+    
+    def record_rollup(
+        self, db: Session, *, rolled_up_at: datetime, days_count: int, rows_count: int
+    ) -> HostStatRollup:
+        """
+        Record a successful rollup so the next one starts from it.
+        
+        Args:
+            db: Database session
+            rolled_up_at: Time the run started reading changes
+            days_count: Number of days recomputed
+            rows_count: Number of (parking space, day) rows written
+            
+        Returns:
+            The created rollup instance
+        """
+        rollup = HostStatRollup(rolled_up_at=rolled_up_at, days_count=days_count, rows_count=rows_count)
+        db.add(rollup)
+        db.commit()
+        return rollup
+    
+    def get_host_stats(
+        self,
+        db: Session,
+        *,
+        host_id: int,
+        start_day: date,
+        end_day: date,
+        parking_space_id: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Get a host's daily stats and totals over a range of days.
+        
+        Args:
+            db: Database session
+            host_id: ID of the host
+            start_day: First day included
+            end_day: Last day included
+            parking_space_id: Restrict to a single parking space
+            
+        Returns:
+            Dict with start_day, end_day, totals and one entry per day with activity
+        """
+        query = db.query(
+            HostDailyStat.day,
+            *[func.coalesce(func.sum(getattr(HostDailyStat, field)), 0) for field in STAT_FIELDS],
+        ).filter(
+            HostDailyStat.host_id == host_id,
+            HostDailyStat.day >= start_day,
+            HostDailyStat.day <= end_day,
+        )
+        if parking_space_id is not None:
+            query = query.filter(HostDailyStat.parking_space_id == parking_space_id)
+        
+        days = [
+            {"day": row[0], **dict(zip(STAT_FIELDS, row[1:]))}
+            for row in query.group_by(HostDailyStat.day).order_by(HostDailyStat.day).all()
+        ]
+        totals = {field: sum(day[field] for day in days) for field in STAT_FIELDS}
+        return {"start_day": start_day, "end_day": end_day, "totals": totals, "days": days}
+
+
+host_stat = CRUDHostDailyStat(HostDailyStat)
@@ -0,0 +1,151 @@
+# src/parkin_web/crud/idempotency_key.py
+from datetime import datetime
+from typing import Any, Tuple
+
+from sqlalchemy import and_, or_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from src.parkin_web.crud.base import CRUDBase
+from src.parkin_web.models.idempotency_key import IdempotencyKey
+
+
+class CRUDIdempotencyKey(CRUDBase[IdempotencyKey, Any, Any]):
+    def acquire(
+        self,
+        db: Session,
+        *,
+        user_id: int,
+        key: str,
+        fingerprint: str,
+        now: datetime,
+        lease_token: str,
+        locked_until: datetime,
+        expires_at: datetime,
+    ) -> Tuple[IdempotencyKey, bool]:
+        """
+        Reserve an idempotency key, or get the record already holding it.
+        
+        The reservation is a single INSERT ... ON CONFLICT statement, so two
+        concurrent requests with the same key cannot both acquire it. An expired
+        record, or one whose request never stored a response and whose lease ran
+        out (e.g. the process died), is taken over as if the key were new.
+        
+        Args:
+            db: Database session
+            user_id: ID of the user sending the request
+            key: Client supplied Idempotency-Key
+            fingerprint: Fingerprint of the request
+            now: Current time
+            lease_token: Random token identifying this request as the lease holder
+            locked_until: End of the lease of a newly acquired key
+            expires_at: Expiry of a newly acquired key
+            
+        Returns:
+            The key record and whether this request acquired it
+        """
+        stmt = insert(IdempotencyKey).values(
+            user_id=user_id,
+            key=key,
+            fingerprint=fingerprint,
+            lease_token=lease_token,
+            locked_until=locked_until,
+            expires_at=expires_at,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "key"],
+            set_={
+                "fingerprint": stmt.excluded.fingerprint,
+                "status_code": None,
+                "response_body": None,
+                "lease_token": stmt.excluded.lease_token,
+                "locked_until": stmt.excluded.locked_until,
+                "expires_at": stmt.excluded.expires_at,
+            },
+            where=or_(
+                IdempotencyKey.expires_at < now,
+                and_(IdempotencyKey.status_code.is_(None), IdempotencyKey.locked_until < now),
+            ),
+        ).returning(IdempotencyKey.id)
+        acquired = db.execute(stmt).first() is not None
+        db.commit()
+        
+        record = (
+            db.query(IdempotencyKey)
+            .filter(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key)
+            .first()
+        )
+        return record, acquired
+    
+    def complete(
+        self, db: Session, *, id: int, lease_token: str, status_code: int, response_body: str
+    ) -> bool:
+        """
+        Store the response of the request holding a key.
+        
+        Nothing is stored if the request lost its lease and the key was taken
+        over by another request since.
+        
+        Args:
+            db: Database session
+            id: ID of the key record acquired by the request
+            lease_token: Token the request acquired the key with
+            status_code: HTTP status code of the response
+            response_body: Serialized JSON response body
+            
+        Returns:
+            True if the response was stored, False if the lease was lost
+        """
+        stored = (
+            db.query(IdempotencyKey)
+            .filter(IdempotencyKey.id == id, IdempotencyKey.lease_token == lease_token)
+            .update(
+                {
+                    IdempotencyKey.status_code: status_code,
+                    IdempotencyKey.response_body: response_body,
+                    IdempotencyKey.locked_until: None,
+                },
+                synchronize_session=False,
+            )
+        )
+        db.commit()
+        return bool(stored)
+    
+    def release(self, db: Session, *, id: int, lease_token: str) -> None:
+        """
+        Free a key whose request failed, so the client can retry it.
+        
+        A key taken over by another request since is left alone.
+        
+        Args:
+            db: Database session
+            id: ID of the key record acquired by the request
+            lease_token: Token the request acquired the key with
+        """
+        db.rollback()
+        db.query(IdempotencyKey).filter(
+            IdempotencyKey.id == id, IdempotencyKey.lease_token == lease_token
+        ).delete(synchronize_session=False)
+        db.commit()
+    
+    def purge_expired(self, db: Session, *, now: datetime) -> int:
+        """
+        Delete expired keys.
+        
+        Args:
+            db: Database session
+            now: Current time
+            
+        Returns:
+            Number of deleted keys
+        """
+        deleted = (
+            db.query(IdempotencyKey)
+            .filter(IdempotencyKey.expires_at < now)
+            .delete(synchronize_session=False)
+        )
+        db.commit()
+        return deleted
+
+
+idempotency_key = CRUDIdempotencyKey(IdempotencyKey)
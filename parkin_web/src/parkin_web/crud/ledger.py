@@ -0,0 +1,253 @@
+# src/parkin_web/crud/ledger.py
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from src.parkin_web.crud.base import CRUDBase
+from src.parkin_web.models.ledger import LedgerAccount, LedgerEntry
+from src.parkin_web.models.payment import HostPayout, Payment, PaymentStatus
+
+# Amounts are floats, differences below this are rounding noise
+TOLERANCE = 0.005
+
+
+def expected_totals(
+    status: Any, amount: float, refund_amount: Optional[float], host_payout_amount: Optional[float]
+) -> Tuple[float, float]:
+    """
+    Get what the user and host payment/refund entries of a payment should sum to.
+    
+    Failed payments were never collected, so their entries must cancel out.
+    
+    Args:
+        status: Payment status
+        amount: Payment amount
+        refund_amount: Amount refunded so far
+        host_payout_amount: Amount owed to the host
+        
+    Returns:
+        (user_total, host_total)
+    """
+    if status == PaymentStatus.FAILED:
+        return 0.0, 0.0
+    return amount - (refund_amount or 0.0), host_payout_amount or 0.0
+
+
+class CRUDLedger(CRUDBase[LedgerEntry, Any, Any]):
+    def post(
+        self,
+        db: Session,
+        *,
+        account_type: str,
+        account_id: int,
+        entry_type: str,
+        amount: float,
+        payment_id: Optional[int] = None,
+        host_payout_id: Optional[int] = None,
+    ) -> Optional[LedgerEntry]:
+        """
+        Append an entry and update the account balance, without committing.
+        
+        The account row is locked for the rest of the transaction so concurrent
+        entries for the same account get consecutive running balances.
+        
+        Args:
+            db: Database session
+            account_type: "user" or "host"
+            account_id: ID of the user owning the account
+            entry_type: "payment", "refund", "reversal", "payout" or "opening"
+            amount: Signed change of the balance
+            payment_id: Payment the entry comes from
+            host_payout_id: Host payout the entry comes from
+            
+        Returns:
+            The new entry, None if the amount is zero
+        """
+        if not amount:
+            return None
+        db.execute(
+            insert(LedgerAccount)
+            .values(account_type=account_type, account_id=account_id, balance=0.0, entries_count=0)
+            .on_conflict_do_nothing(index_elements=["account_type", "account_id"])
+        )
+        account = (
+            db.query(LedgerAccount)
+            .filter(LedgerAccount.account_type == account_type, LedgerAccount.account_id == account_id)
+            .with_for_update()
+            .one()
+        )
+        entry = LedgerEntry(
+            account_type=account_type,
+            account_id=account_id,
+            entry_type=entry_type,
+            amount=amount,
+            balance=account.balance + amount,
+            payment_id=payment_id,
+            host_payout_id=host_payout_id,
+        )
+        db.add(entry)
+        db.flush()
+        
+        account.balance = entry.balance
+        account.entries_count += 1
+        account.last_entry_id = entry.id
+        db.add(account)
+        return entry
+    
+    def get_balance(
+        self, db: Session, *, account_type: str, account_id: int
+    ) -> Optional[LedgerAccount]:
+        """
+        Get an account balance.
+        
+        Args:
+            db: Database session
+            account_type: "user" or "host"
+            account_id: ID of the user owning the account
+            
+        Returns:
+            The account if it has any entry, None otherwise
+        """
+        return (
+            db.query(LedgerAccount)
+            .filter(LedgerAccount.account_type == account_type, LedgerAccount.account_id == account_id)
+            .first()
+        )
+    
+    def get_statement(
+        self,
+        db: Session,
+        *,
+        account_type: str,
+        account_id: int,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> List[LedgerEntry]:
+        """
+        Get the entries of an account, newest first.
+        
+        Args:
+            db: Database session
+            account_type: "user" or "host"
+            account_id: ID of the user owning the account
+            start: Only entries created at or after this
+            end: Only entries created before this
+            skip: Number of records to skip
+            limit: Maximum number of records to return
+            
+        Returns:
+            List of ledger entries
+        """
+        query = db.query(LedgerEntry).filter(
+            LedgerEntry.account_type == account_type, LedgerEntry.account_id == account_id
+        )
+        if start is not None:
+            query = query.filter(LedgerEntry.created_at >= start)
+        if end is not None:
+            query = query.filter(LedgerEntry.created_at < end)
+        return (
+            query.order_by(LedgerEntry.created_at.desc(), LedgerEntry.id.desc())
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+    
+    def reconcile(self, db: Session, *, batch_size: int = 1000) -> List[Dict[str, Any]]:
+        """
+        Verify the ledger against the payment and payout rows.
+        
+        Payments are checked in id-ordered chunks, each with one aggregate query
+        over its ledger entries. The checks are:
+        
+        - user_payment: user entries of a payment equal its amount net of refunds,
+          zero for a failed payment
+        - host_earnings: host payment/refund entries of a payment equal its host payout
+          amount, zero for a failed payment
+        - host_payout: entries of a completed payout equal minus its amount
+        - account_balance: each account balance equals the sum of its entries
+        
+        Args:
+            db: Database session
+            batch_size: Number of payments checked per chunk
+            
+        Returns:
+            List of discrepancies with check, reference_id, expected and actual
+        """
+        discrepancies: List[Dict[str, Any]] = []
+        
+        def check(name: str, reference_id: int, expected: float, actual: float) -> None:
+            if abs(expected - actual) > TOLERANCE:
+                discrepancies.append({
+                    "check": name,
+                    "reference_id": reference_id,
+                    "expected": expected,
+                    "actual": actual,
+                })
+        
+        last_id = 0
+        while True:
+            payments = (
+                db.query(
+                    Payment.id,
+                    Payment.status,
+                    Payment.amount,
+                    Payment.refund_amount,
+                    Payment.host_payout_amount,
+                )
+                .filter(Payment.id > last_id)
+                .order_by(Payment.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not payments:
+                break
+            last_id = payments[-1].id
+            
+            sums = (
+                db.query(LedgerEntry.payment_id, LedgerEntry.account_type, func.sum(LedgerEntry.amount))
+                .filter(
+                    LedgerEntry.payment_id.between(payments[0].id, last_id),
+                    LedgerEntry.entry_type != "payout",
+                )
+                .group_by(LedgerEntry.payment_id, LedgerEntry.account_type)
+                .all()
+            )
+            totals = {(payment_id, account_type): total for payment_id, account_type, total in sums}
+            for payment in payments:
+                user_total, host_total = expected_totals(
+                    payment.status, payment.amount, payment.refund_amount, payment.host_payout_amount
+                )
+                check("user_payment", payment.id, user_total, totals.get((payment.id, "user"), 0.0))
+                check("host_earnings", payment.id, host_total, totals.get((payment.id, "host"), 0.0))
+        
+        payouts = (
+            db.query(HostPayout.id, HostPayout.amount, func.coalesce(func.sum(LedgerEntry.amount), 0.0))
+            .outerjoin(LedgerEntry, LedgerEntry.host_payout_id == HostPayout.id)
+            .filter(HostPayout.status == "completed")
+            .group_by(HostPayout.id, HostPayout.amount)
+            .yield_per(batch_size)
+        )
+        for payout_id, amount, total in payouts:
+            check("host_payout", payout_id, -amount, total)
+        
+        accounts = (
+            db.query(LedgerAccount.id, LedgerAccount.balance, func.coalesce(func.sum(LedgerEntry.amount), 0.0))
+            .outerjoin(
+                LedgerEntry,
+                (LedgerEntry.account_type == LedgerAccount.account_type)
+                & (LedgerEntry.account_id == LedgerAccount.account_id),
+            )
+            .group_by(LedgerAccount.id, LedgerAccount.balance)
+            .yield_per(batch_size)
+        )
+        for account_id, balance, total in accounts:
+            check("account_balance", account_id, total, balance)
+        return discrepancies
+
+
+ledger = CRUDLedger(LedgerEntry)
@@ -1,11 +1,20 @@
 # src/parkin_web/crud/parking_space.py
-from typing import List, Optional, Dict, Any, Union
+from collections import defaultdict
+from typing import List, Optional, Dict, Any, Sequence, Tuple, Union
+from datetime import datetime
 
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func
+from sqlalchemy.orm import Session, load_only, selectinload
+from sqlalchemy import and_, or_, func, update
 from fastapi.encoders import jsonable_encoder
 
+from src.parkin_web.core import availability, events, pricing, read_model, tiles
+from src.parkin_web.core.change_feed import DELETE, UPSERT
+from src.parkin_web.core.config import settings
+from src.parkin_web.core.geo import geo_cell
 from src.parkin_web.crud.base import CRUDBase
+from src.parkin_web.crud.change_feed import change_feed
+from src.parkin_web.crud.host_stat import host_stat
+from src.parkin_web.models.booking import Booking, BookingStatus
 from src.parkin_web.models.parking_space import ParkingSpace, ParkingSpaceImage, AvailabilitySchedule
 from src.parkin_web.schemas.parking_space import ParkingSpaceCreate, ParkingSpaceUpdate
 
@@ -40,11 +49,250 @@ class CRUDParkingSpace(CRUDBase[ParkingSpace, ParkingSpaceCreate, ParkingSpaceUp
                 )
                 db.add(db_schedule)
             db.commit()
+            self.refresh_availability_bitmap(db, id=db_obj.id)
         
+        tiles.tile_cache.invalidate_points([(db_obj.latitude, db_obj.longitude)])
+        self.publish_change(db_obj, "created")
         return db_obj
     
+    def publish_change(
+        self,
+        parking_space: ParkingSpace,
+        operation: str,
+        old_position: Optional[Tuple[Optional[float], Optional[float]]] = None,
+    ) -> None:
+        """
+        Push a parking space change to live map subscribers of its geo-cell.
+        
+        Args:
+            parking_space: Created, updated or removed parking space
+            operation: created, updated or deleted
+            old_position: (latitude, longitude) before an update, to also notify
+                the cell the space moved out of
+        """
+        if not events.broker.has_subscribers():
+            return
+        cells = {geo_cell(parking_space.latitude, parking_space.longitude)}
+        if old_position is not None:
+            cells.add(geo_cell(*old_position))
+        cells.discard(None)
+        if not cells:
+            return
+        events.broker.publish(
+            [events.cell_topic(cell) for cell in cells],
+            events.PARKING_SPACE,
+            {
+                "id": parking_space.id,
+                "operation": operation,
+                "title": parking_space.title,
+                "latitude": parking_space.latitude,
+                "longitude": parking_space.longitude,
+                "hourly_rate": parking_space.hourly_rate,
+                "is_available": parking_space.is_available,
+                "is_active": parking_space.is_active,
+            },
+        )
+    
+    def get_multi_by_ids(self, db: Session, *, ids: List[int]) -> Dict[int, ParkingSpace]:
+        """
+        Get multiple parking spaces by ID in a single query.
+        
+        Args:
+            db: Database session
+            ids: IDs of the parking spaces
+            
+        Returns:
+            Dict mapping ID to parking space instance, missing IDs are left out
+        """
+        if not ids:
+            return {}
+        parking_spaces = db.query(ParkingSpace).filter(ParkingSpace.id.in_(set(ids))).all()
+        return {parking_space.id: parking_space for parking_space in parking_spaces}
+    
+    def get_pricing_inputs(self, db: Session, *, ids: List[int]) -> Dict[int, pricing.PricingInputs]:
+        """
+        Get the pricing inputs of several parking spaces, loading cache misses in one query.
+        
+        Args:
+            db: Database session
+            ids: IDs of the parking spaces
+            
+        Returns:
+            Dict mapping ID to pricing inputs, missing IDs are left out
+        """
+        inputs = {}
+        missing = set()
+        for id in ids:
+            cached = pricing.quote_cache.get_inputs(id)
+            if cached is None:
+                missing.add(id)
+            else:
+                inputs[id] = cached
+        
+        if missing:
+            rows = (
+                db.query(*[getattr(ParkingSpace, field) for field in pricing.PricingInputs._fields])
+                .filter(ParkingSpace.id.in_(missing))
+                .all()
+            )
+            for row in rows:
+                loaded = pricing.PricingInputs(*row)
+                pricing.quote_cache.set_inputs(loaded)
+                inputs[loaded.id] = loaded
+        return inputs
+    
+    def update(
+        self,
+        db: Session,
+        *,
+        db_obj: ParkingSpace,
+        obj_in: Union[ParkingSpaceUpdate, Dict[str, Any]]
+    ) -> ParkingSpace:
+        """
+        Update a parking space and invalidate its cached pricing and map tiles.
+        
+        Args:
+            db: Database session
+            db_obj: Parking space instance to update
+            obj_in: Schema or dict containing the data to update
+            
+        Returns:
+            The updated parking space instance
+        """
+        old_position = (db_obj.latitude, db_obj.longitude)
+        db_obj = super().update(db, db_obj=db_obj, obj_in=obj_in)
+        pricing.quote_cache.invalidate_space(db_obj.id)
+        tiles.tile_cache.invalidate_points([old_position, (db_obj.latitude, db_obj.longitude)])
+        self.publish_change(db_obj, "updated", old_position)
+        return db_obj
+    
+    def remove(self, db: Session, *, id: int) -> ParkingSpace:
+        """
+        Remove a parking space and invalidate its cached pricing and map tiles.
+        
+        Args:
+            db: Database session
+            id: ID of the parking space to remove
+            
+        Returns:
+            The removed parking space instance
+        """
+        obj = super().remove(db, id=id)
+        pricing.quote_cache.invalidate_space(id)
+        tiles.tile_cache.invalidate_points([(obj.latitude, obj.longitude)])
+        read_model.parking_read_model.discard(id)
+        self.publish_change(obj, "deleted")
+        return obj
+    
+    def refresh_read_model(self, db: Session) -> int:
+        """
+        Apply the parking space change feed to the read model.
+        
+        The whole table is loaded on the first run and every
+        READ_MODEL_FULL_RELOAD_SECONDS, as a safety net for deletions that left
+        no tombstone (bulk deletes, purged tombstones), and whenever the cursor
+        fell out of the tombstone retention window.
+        
+        Args:
+            db: Database session
+            
+        Returns:
+            Number of rows that changed the read model
+        """
+        model = read_model.parking_read_model
+        query = db.query(*[getattr(ParkingSpace, column) for column in read_model.READ_MODEL_COLUMNS])
+        if (
+            model.cursor is None
+            or model.needs_full_reload(settings.READ_MODEL_FULL_RELOAD_SECONDS)
+            or change_feed.is_expired(model.cursor)
+        ):
+            cursor = change_feed.start()
+            rows = query.filter(ParkingSpace.is_active == True).all()
+            return model.apply(rows, full=True, cursor=cursor)
+        
+        changes, cursor = change_feed.changes_since(
+            db, ParkingSpace, cursor=model.cursor, limit=settings.CHANGE_FEED_MAX_LIMIT
+        )
+        upserted = [change.id for change in changes if change.operation == UPSERT]
+        deleted = [change.id for change in changes if change.operation == DELETE]
+        rows = query.filter(ParkingSpace.id.in_(upserted)).all() if upserted else []
+        return model.apply(rows, deleted=deleted, cursor=cursor)
+    
+    def get_tile(self, db: Session, *, z: int, x: int, y: int) -> Dict[str, Any]:
+        """
+        Get the clusters of active parking spaces in a map tile.
+        
+        The tile is split into a TILE_CLUSTER_GRID x TILE_CLUSTER_GRID grid and
+        spaces are bucketed per grid cell in SQL. Results are cached per tile.
+        
+        Args:
+            db: Database session
+            z: Zoom level
+            x: Tile column
+            y: Tile row
+            
+        Returns:
+            Dict with the tile coordinates, the number of spaces and the clusters
+        """
+        cached = tiles.tile_cache.get(z, x, y)
+        if cached is not None:
+            return cached
+        
+        south, west, north, east = tiles.tile_bounds(z, x, y)
+        grid = settings.TILE_CLUSTER_GRID
+        row = func.floor((ParkingSpace.latitude - south) / ((north - south) / grid))
+        col = func.floor((ParkingSpace.longitude - west) / ((east - west) / grid))
+        rows = (
+            db.query(
+                func.count(ParkingSpace.id),
+                func.min(ParkingSpace.id),
+                func.avg(ParkingSpace.latitude),
+                func.avg(ParkingSpace.longitude),
+                func.min(ParkingSpace.hourly_rate),
+                func.max(ParkingSpace.hourly_rate),
+            )
+            .filter(
+                ParkingSpace.is_active == True,
+                ParkingSpace.latitude >= south,
+                ParkingSpace.latitude < north,
+                ParkingSpace.longitude >= west,
+                ParkingSpace.longitude < east,
+            )
+            .group_by(row, col)
+            .all()
+        )
+        
+        clusters = [
+            {
+                "latitude": latitude,
+                "longitude": longitude,
+                "count": count,
+                "min_price": min_price,
+                "max_price": max_price,
+                # A cluster of one is a plain pin the client can link to
+                "parking_space_id": first_id if count == 1 else None,
+            }
+            for count, first_id, latitude, longitude, min_price, max_price in rows
+        ]
+        tile = {
+            "z": z,
+            "x": x,
+            "y": y,
+            "total": sum(cluster["count"] for cluster in clusters),
+            "clusters": clusters,
+        }
+        tiles.tile_cache.set(z, x, y, tile)
+        return tile
+    
     def get_multi_by_owner(
-        self, db: Session, *, owner_id: int, skip: int = 0, limit: int = 100
+        self,
+        db: Session,
+        *,
+        owner_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        columns: Optional[Sequence[str]] = None,
+        with_images: bool = False,
     ) -> List[ParkingSpace]:
         """
         Get multiple parking spaces by owner ID.
@@ -54,17 +302,30 @@ class CRUDParkingSpace(CRUDBase[ParkingSpace, ParkingSpaceCreate, ParkingSpaceUp
             owner_id: ID of the owner
             skip: Number of records to skip
             limit: Maximum number of records to return
+            columns: Only load these columns, the others are deferred
+            with_images: Whether to eager-load the images of the results
             
         Returns:
             List of parking space instances
         """
-        return (
-            db.query(ParkingSpace)
-            .filter(ParkingSpace.owner_id == owner_id)
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+        query = db.query(ParkingSpace).filter(ParkingSpace.owner_id == owner_id)
+        if columns is not None:
+            query = query.options(load_only(*self._column_attrs(columns)))
+        if with_images:
+            query = query.options(selectinload(ParkingSpace.images))
+        return query.offset(skip).limit(limit).all()
+    
+    def _column_attrs(self, columns: Sequence[str]) -> List[Any]:
+        """
+        Map column names to ParkingSpace attributes for load_only, always keeping the primary key.
+        
+        Args:
+            columns: Column names
+            
+        Returns:
+            List of column attributes
+        """
+        return [getattr(ParkingSpace, column) for column in dict.fromkeys(["id", *columns])]
     
     def search(
         self,
@@ -73,15 +334,17 @@ class CRUDParkingSpace(CRUDBase[ParkingSpace, ParkingSpaceCreate, ParkingSpaceUp
         latitude: Optional[float] = None,
         longitude: Optional[float] = None,
         city: Optional[str] = None,
-        start_time: Optional[str] = None,
-        end_time: Optional[str] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
         has_security_camera: Optional[bool] = None,
         has_ev_charging: Optional[bool] = None,
         has_covered_parking: Optional[bool] = None,
         min_price: Optional[float] = None,
         max_price: Optional[float] = None,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        columns: Optional[Sequence[str]] = None,
+        with_images: bool = True
     ) -> List[ParkingSpace]:
         """
         Search for parking spaces with filters.
@@ -100,11 +363,42 @@ class CRUDParkingSpace(CRUDBase[ParkingSpace, ParkingSpaceCreate, ParkingSpaceUp
             max_price: Maximum hourly rate filter
             skip: Number of records to skip
             limit: Maximum number of records to return
+            columns: Only load these columns, the others are deferred
+            with_images: Whether to eager-load the images of the results
             
         Returns:
             List of parking space instances
         """
         query = db.query(ParkingSpace).filter(ParkingSpace.is_active == True)
+        if columns is not None:
+            query = query.options(load_only(*self._column_attrs(columns)))
+        if with_images:
+            query = query.options(selectinload(ParkingSpace.images))
+        
+        # Answer from the in-memory read model when it is enabled and fresh, then
+        # only load the matching rows by primary key
+        if settings.READ_MODEL_ENABLED:
+            ids = read_model.parking_read_model.search(
+                latitude=latitude,
+                longitude=longitude,
+                city=city,
+                window_mask=(
+                    availability.window_mask(start_time, end_time)
+                    if start_time and end_time else None
+                ),
+                has_security_camera=has_security_camera,
+                has_ev_charging=has_ev_charging,
+                has_covered_parking=has_covered_parking,
+                min_price=min_price,
+                max_price=max_price,
+                skip=skip,
+                limit=limit,
+            )
+            if ids is not None:
+                if not ids:
+                    return []
+                by_id = {obj.id: obj for obj in query.filter(ParkingSpace.id.in_(ids)).all()}
+                return [by_id[id] for id in ids if id in by_id]
         
         # Apply filters
         if city:
@@ -137,38 +431,176 @@ class CRUDParkingSpace(CRUDBase[ParkingSpace, ParkingSpaceCreate, ParkingSpaceUp
             query = query.order_by(distance)
         
         # Apply availability filters if start_time and end_time are provided
-        # This is a simplified approach - in production you'd check for overlapping bookings
+        # The window is checked against the compiled weekly bitmap with a single AND
         if start_time and end_time:
-            # Here you would join with availability schedules and check time ranges
-            pass
+            mask = availability.window_mask(start_time, end_time)
+            query = query.filter(
+                or_(
+                    ParkingSpace.availability_bitmap.is_(None),
+                    ParkingSpace.availability_bitmap.op("&")(mask) == mask,
+                )
+            )
         
         return query.offset(skip).limit(limit).all()
     
+    def refresh_availability_bitmap(self, db: Session, *, id: int) -> Optional[int]:
+        """
+        Recompile the weekly availability bitmap of a parking space from its schedules.
+        
+        Args:
+            db: Database session
+            id: ID of the parking space
+            
+        Returns:
+            The new bitmap, or None if the space has no schedules
+        """
+        schedules = db.query(AvailabilitySchedule).filter(
+            AvailabilitySchedule.parking_space_id == id
+        ).all()
+        bitmap = availability.compile_weekly_bitmap(schedules)
+        db.query(ParkingSpace).filter(ParkingSpace.id == id).update(
+            {ParkingSpace.availability_bitmap: bitmap}, synchronize_session="fetch"
+        )
+        db.commit()
+        return bitmap
+    
+    def backfill_availability_bitmaps(self, db: Session, *, batch_size: int = 1000) -> int:
+        """
+        Compile the weekly availability bitmap of every parking space with schedules.
+        
+        Spaces whose schedules predate the bitmap column are only compiled when a
+        schedule changes, this fills them all in. Spaces are processed in id-ordered
+        chunks, each with one query for its schedules and one bulk UPDATE, committed
+        on its own.
+        
+        Args:
+            db: Database session
+            batch_size: Number of parking spaces compiled per chunk
+            
+        Returns:
+            Number of parking spaces updated
+        """
+        updated = 0
+        last_id = 0
+        while True:
+            ids = [
+                row[0]
+                for row in db.query(AvailabilitySchedule.parking_space_id)
+                .filter(AvailabilitySchedule.parking_space_id > last_id)
+                .distinct()
+                .order_by(AvailabilitySchedule.parking_space_id)
+                .limit(batch_size)
+            ]
+            if not ids:
+                return updated
+            schedules: Dict[int, List[AvailabilitySchedule]] = defaultdict(list)
+            for schedule in db.query(AvailabilitySchedule).filter(
+                AvailabilitySchedule.parking_space_id.in_(ids)
+            ):
+                schedules[schedule.parking_space_id].append(schedule)
+            db.execute(
+                update(ParkingSpace),
+                [
+                    {"id": id, "availability_bitmap": availability.compile_weekly_bitmap(schedules[id])}
+                    for id in ids
+                ],
+            )
+            db.commit()
+            updated += len(ids)
+            last_id = ids[-1]
+    
+    def is_window_available(
+        self, parking_space: ParkingSpace, *, start_time: datetime, end_time: datetime
+    ) -> bool:
+        """
+        Check whether a parking space's schedules cover a time window.
+        
+        Args:
+            parking_space: Parking space instance
+            start_time: Start of the window
+            end_time: End of the window
+            
+        Returns:
+            True if the space is available for the whole window, False otherwise
+        """
+        return availability.is_window_available(
+            parking_space.availability_bitmap, start_time, end_time
+        )
+    
+    def get_calendar_windows(
+        self, db: Session, *, id: int, start_time: datetime, end_time: datetime
+    ) -> Optional[Tuple[Optional[int], List[Tuple[datetime, datetime]]]]:
+        """
+        Get the availability bitmap and blocking bookings of a parking space in one query.
+        
+        Args:
+            db: Database session
+            id: ID of the parking space
+            start_time: Start of the calendar range
+            end_time: End of the calendar range
+            
+        Returns:
+            Tuple of (bitmap, booked windows), or None if the parking space doesn't exist
+        """
+        rows = (
+            db.query(ParkingSpace.availability_bitmap, Booking.start_time, Booking.end_time)
+            .outerjoin(
+                Booking,
+                and_(
+                    Booking.parking_space_id == ParkingSpace.id,
+                    Booking.status.in_([BookingStatus.PENDING, BookingStatus.CONFIRMED]),
+                    Booking.start_time < end_time,
+                    Booking.end_time > start_time,
+                ),
+            )
+            .filter(ParkingSpace.id == id)
+            .all()
+        )
+        if not rows:
+            return None
+        bitmap = rows[0].availability_bitmap
+        windows = [(row.start_time, row.end_time) for row in rows if row.start_time is not None]
+        return bitmap, windows
+    
     def increment_views(self, db: Session, *, id: int) -> None:
         """
         Increment the views count for a parking space.
         
+        The count is bumped with a single UPDATE that keeps updated_at as it is,
+        so views don't show up as changes in the change feed.
+        
         Args:
             db: Database session
             id: ID of the parking space
         """
-        parking_space = db.query(ParkingSpace).filter(ParkingSpace.id == id).first()
-        if parking_space:
-            parking_space.views_count += 1
-            db.add(parking_space)
+        owner_id = db.execute(
+            update(ParkingSpace)
+            .where(ParkingSpace.id == id)
+            .values(views_count=ParkingSpace.views_count + 1, updated_at=ParkingSpace.updated_at)
+            .returning(ParkingSpace.owner_id)
+            .execution_options(synchronize_session=False)
+        ).scalar()
+        if owner_id is not None:
+            host_stat.record_view(
+                db,
+                host_id=owner_id,
+                parking_space_id=id,
+                day=datetime.utcnow().date(),
+            )
             db.commit()
     
-    def increment_bookings(self, db: Session, *, id: int) -> None:
+    def increment_bookings(self, db: Session, *, id: int, count: int = 1) -> None:
         """
         Increment the bookings count for a parking space.
         
         Args:
             db: Database session
             id: ID of the parking space
+            count: Number of new bookings
         """
         parking_space = db.query(ParkingSpace).filter(ParkingSpace.id == id).first()
         if parking_space:
-            parking_space.bookings_count += 1
+            parking_space.bookings_count += count
             db.add(parking_space)
             db.commit()
     
@@ -265,8 +697,38 @@ class CRUDAvailabilitySchedule(CRUDBase[AvailabilitySchedule, Any, Any]):
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
+        self.refresh_parking_space(db, parking_space_id=parking_space_id)
         return db_obj
     
+    def refresh_parking_space(self, db: Session, *, parking_space_id: int) -> None:
+        """
+        Recompile the bitmap of a space whose schedules changed and notify map subscribers.
+        
+        Args:
+            db: Database session
+            parking_space_id: ID of the parking space
+        """
+        parking_space.refresh_availability_bitmap(db, id=parking_space_id)
+        if events.broker.has_subscribers():
+            space = parking_space.get(db, id=parking_space_id)
+            if space is not None:
+                parking_space.publish_change(space, "updated")
+    
+    def remove(self, db: Session, *, id: int) -> AvailabilitySchedule:
+        """
+        Remove an availability schedule and recompile the space's bitmap.
+        
+        Args:
+            db: Database session
+            id: ID of the schedule to remove
+            
+        Returns:
+            The removed schedule instance
+        """
+        obj = super().remove(db, id=id)
+        self.refresh_parking_space(db, parking_space_id=obj.parking_space_id)
+        return obj
+    
     def get_by_parking_space(
         self, db: Session, *, parking_space_id: int
     ) -> List[AvailabilitySchedule]:
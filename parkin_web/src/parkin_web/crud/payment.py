@@ -1,4 +1,210 @@
-# src/parkin_web/crud/payment.py (continued)
+# src/parkin_web/crud/payment.py
+from typing import List, Optional, Dict, Any, Iterator, Tuple, Union
+from datetime import datetime
+
+from sqlalchemy import func, select, union_all, update
+from sqlalchemy.orm import Session
+from fastapi.encoders import jsonable_encoder
+
+from src.parkin_web.core.export import PAYMENT_EXPORT_COLUMNS
+from src.parkin_web.core.payouts import PayoutError
+from src.parkin_web.crud.base import CRUDBase
+from src.parkin_web.crud.booking import booking
+from src.parkin_web.crud.ledger import TOLERANCE, expected_totals, ledger
+from src.parkin_web.models.ledger import LedgerEntry
+from src.parkin_web.models.booking import Booking, BookingArchive, BookingStatus
+from src.parkin_web.models.parking_space import ParkingSpace
+from src.parkin_web.models.payment import HostPayout, Payment, PaymentStatus
+from src.parkin_web.schemas.payment import PaymentCreate, PaymentUpdate
+
+
+def _booking_links() -> Any:
+    """
+    Build a subquery linking payments to the parking space of their live or archived booking.
+    
+    Returns:
+        Subquery named "bookings" with id, user_id, parking_space_id and payment_id
+    """
+    return union_all(
+        select(Booking.id, Booking.user_id, Booking.parking_space_id, Booking.payment_id),
+        select(
+            BookingArchive.id,
+            BookingArchive.user_id,
+            BookingArchive.parking_space_id,
+            BookingArchive.payment_id,
+        ),
+    ).subquery("bookings")
+
+
+def _payment_parties(db: Session, *, payment_id: int) -> Optional[Tuple[int, int]]:
+    """
+    Get the user who paid a payment and the host receiving it.
+    
+    Args:
+        db: Database session
+        payment_id: ID of the payment
+        
+    Returns:
+        (user_id, host_id), or None if the payment isn't linked to a booking
+    """
+    bookings = _booking_links()
+    return (
+        db.query(bookings.c.user_id, ParkingSpace.owner_id)
+        .join(ParkingSpace, bookings.c.parking_space_id == ParkingSpace.id)
+        .filter(bookings.c.payment_id == payment_id)
+        .first()
+    )
+
+
+def _settle_ledger(db: Session, *, payment_ids: List[int], entry_type: str) -> None:
+    """
+    Post the entries bringing the ledger of payments in line with their status, without committing.
+    
+    Each payment gets the difference between what its user and host entries
+    should sum to (see crud.ledger.expected_totals) and what they sum to now,
+    e.g. reversing entries once a payment failed.
+    
+    Args:
+        db: Database session
+        payment_ids: IDs of the payments
+        entry_type: Type of the entries posted
+    """
+    bookings = _booking_links()
+    payments = (
+        db.query(
+            Payment.id,
+            Payment.status,
+            Payment.amount,
+            Payment.refund_amount,
+            Payment.host_payout_amount,
+            bookings.c.user_id,
+            ParkingSpace.owner_id,
+        )
+        .join(bookings, bookings.c.payment_id == Payment.id)
+        .join(ParkingSpace, bookings.c.parking_space_id == ParkingSpace.id)
+        .filter(Payment.id.in_(payment_ids))
+        .all()
+    )
+    sums = (
+        db.query(LedgerEntry.payment_id, LedgerEntry.account_type, func.sum(LedgerEntry.amount))
+        .filter(LedgerEntry.payment_id.in_(payment_ids), LedgerEntry.entry_type != "payout")
+        .group_by(LedgerEntry.payment_id, LedgerEntry.account_type)
+        .all()
+    )
+    totals = {(payment_id, account_type): total for payment_id, account_type, total in sums}
+    for payment in payments:
+        user_total, host_total = expected_totals(
+            payment.status, payment.amount, payment.refund_amount, payment.host_payout_amount
+        )
+        for account_type, account_id, expected in (
+            ("user", payment.user_id, user_total),
+            ("host", payment.owner_id, host_total),
+        ):
+            difference = expected - totals.get((payment.id, account_type), 0.0)
+            if abs(difference) > TOLERANCE:
+                ledger.post(
+                    db,
+                    account_type=account_type,
+                    account_id=account_id,
+                    entry_type=entry_type,
+                    amount=difference,
+                    payment_id=payment.id,
+                )
+
+
+class CRUDPayment(CRUDBase[Payment, PaymentCreate, PaymentUpdate]):
+    def create_with_booking(
+        self, db: Session, *, obj_in: PaymentCreate, booking_id: int
+    ) -> Payment:
+        """
+        Create a new payment for a booking and link the booking to it.
+        
+        Payments don't reference their booking, the booking points to its
+        payment through Booking.payment_id.
+        
+        Args:
+            db: Database session
+            obj_in: Schema containing the data to create the payment
+            booking_id: ID of the booking
+            
+        Returns:
+            The created payment instance
+        """
+        obj_in_data = jsonable_encoder(obj_in.dict(exclude={"booking_id"}))
+        
+        # Calculate host payout amount (70% of payment amount)
+        host_payout_amount = obj_in.amount * 0.7
+        
+        db_obj = Payment(
+            **obj_in_data,
+            status=PaymentStatus.COMPLETED,  # Assume payment is completed for simplicity
+            payment_date=datetime.utcnow(),
+            payment_processor="stripe",  # Mock payment processor
+            host_payout_amount=host_payout_amount,
+            host_payout_status="pending",
+        )
+        db.add(db_obj)
+        db.flush()
+        db.execute(
+            update(Booking)
+            .where(Booking.id == booking_id)
+            .values(payment_id=db_obj.id)
+            .execution_options(synchronize_session="fetch")
+        )
+        
+        # Record the charge for the driver and the earnings owed to the host
+        user_id, host_id = (
+            db.query(Booking.user_id, ParkingSpace.owner_id)
+            .join(ParkingSpace, Booking.parking_space_id == ParkingSpace.id)
+            .filter(Booking.id == booking_id)
+            .one()
+        )
+        ledger.post(
+            db,
+            account_type="user",
+            account_id=user_id,
+            entry_type="payment",
+            amount=db_obj.amount,
+            payment_id=db_obj.id,
+        )
+        ledger.post(
+            db,
+            account_type="host",
+            account_id=host_id,
+            entry_type="payment",
+            amount=db_obj.host_payout_amount,
+            payment_id=db_obj.id,
+        )
+        db.commit()
+        db.refresh(db_obj)
+        return db_obj
+    
+    def get_user_payments(
+        self, db: Session, *, user_id: int, skip: int = 0, limit: int = 100
+    ) -> List[Payment]:
+        """
+        Get payments made by a user.
+        
+        Args:
+            db: Database session
+            user_id: ID of the user
+            skip: Number of records to skip
+            limit: Maximum number of records to return
+            
+        Returns:
+            List of payment instances
+        """
+        bookings = _booking_links()
+        return (
+            db.query(Payment)
+            .join(bookings, bookings.c.payment_id == Payment.id)
+            .filter(bookings.c.user_id == user_id)
+            .order_by(Payment.created_at.desc())
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+    
     def refund(
         self, db: Session, *, id: int, refund_amount: float, refund_reason: str = ""
     ) -> Payment:
@@ -8,7 +214,7 @@
         Args:
             db: Database session
             id: ID of the payment
-            refund_amount: Amount to refund
+            refund_amount: Total amount refunded so far, including earlier refunds
             refund_reason: Reason for the refund
             
         Returns:
@@ -19,6 +225,8 @@
             # In a real-world application, you would integrate with a payment provider here
             # For now, we'll simulate a successful refund
             
+            previous_refund = payment.refund_amount or 0.0
+            previous_payout = payment.host_payout_amount or 0.0
             payment.refund_amount = refund_amount
             payment.refund_reason = refund_reason
             payment.refund_date = datetime.utcnow()
@@ -31,8 +239,8 @@
             
             # Update host payout
             if payment.host_payout_status == "pending":
-                # If payout hasn't been processed yet, adjust it
-                payment.host_payout_amount -= refund_amount
+                # If payout hasn't been processed yet, adjust it by what this refund adds
+                payment.host_payout_amount -= refund_amount - previous_refund
                 if payment.host_payout_amount <= 0:
                     payment.host_payout_status = "canceled"
                     payment.host_payout_amount = 0
@@ -41,6 +249,26 @@
                 # This is simplified for the example
                 pass
             
+            parties = _payment_parties(db, payment_id=payment.id)
+            if parties:
+                user_id, host_id = parties
+                ledger.post(
+                    db,
+                    account_type="user",
+                    account_id=user_id,
+                    entry_type="refund",
+                    amount=previous_refund - refund_amount,
+                    payment_id=payment.id,
+                )
+                ledger.post(
+                    db,
+                    account_type="host",
+                    account_id=host_id,
+                    entry_type="refund",
+                    amount=(payment.host_payout_amount or 0.0) - previous_payout,
+                    payment_id=payment.id,
+                )
+            
             db.add(payment)
             db.commit()
             db.refresh(payment)
@@ -67,10 +295,434 @@
             payment.host_payout_date = datetime.utcnow()
             payment.host_payout_status = "completed"
             
+            parties = _payment_parties(db, payment_id=payment.id)
+            if parties:
+                ledger.post(
+                    db,
+                    account_type="host",
+                    account_id=parties[1],
+                    entry_type="payout",
+                    amount=-(payment.host_payout_amount or 0.0),
+                    payment_id=payment.id,
+                )
+            
             db.add(payment)
             db.commit()
             db.refresh(payment)
         return payment
+    
+    def iter_export(
+        self,
+        db: Session,
+        *,
+        start: datetime,
+        end: datetime,
+        host_id: Optional[int] = None,
+        status: Optional[PaymentStatus] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[Tuple]:
+        """
+        Stream payments created in a date range with a server-side cursor.
+        
+        Payments are joined to their live or archived booking for the booking,
+        parking space and host IDs.
+        
+        Args:
+            db: Database session
+            start: Only payments created at or after this are exported
+            end: Only payments created before this are exported
+            host_id: Restrict to payments for this host's parking spaces
+            status: Restrict to payments with this status
+            batch_size: Number of rows fetched per round trip
+            
+        Returns:
+            Iterator of row tuples aligned with PAYMENT_EXPORT_COLUMNS
+        """
+        bookings = _booking_links()
+        payment_columns = [getattr(Payment, column) for column in PAYMENT_EXPORT_COLUMNS[:-3]]
+        query = (
+            db.query(
+                *payment_columns,
+                bookings.c.id,
+                bookings.c.parking_space_id,
+                ParkingSpace.owner_id,
+            )
+            .outerjoin(bookings, bookings.c.payment_id == Payment.id)
+            .outerjoin(ParkingSpace, bookings.c.parking_space_id == ParkingSpace.id)
+            .filter(Payment.created_at >= start, Payment.created_at < end)
+        )
+        if host_id is not None:
+            query = query.filter(ParkingSpace.owner_id == host_id)
+        if status is not None:
+            query = query.filter(Payment.status == status)
+        return iter(query.order_by(Payment.created_at, Payment.id).yield_per(batch_size))
+    
+    def apply_provider_events(
+        self, db: Session, *, plan: Dict[str, Any], now: datetime
+    ) -> Dict[str, int]:
+        """
+        Apply a batch of payment provider events planned by core.webhooks.plan_batch.
+        
+        Successes and failures are applied with one UPDATE per table and
+        committed together with the ledger entries they lead to (reversals
+        for failed payments); refunds are applied after them and go through
+        refund() so the ledger follows.
+        
+        Args:
+            db: Database session
+            plan: Dict with "succeeded" and "failed" transaction IDs and "refunded"
+                mapping transaction IDs to their total refunded amount
+            now: Processing time
+            
+        Returns:
+            Number of payments marked succeeded, failed and refunded
+        """
+        counts = {"succeeded": 0, "failed": 0, "refunded": 0}
+        paid: List[int] = []
+        failed: List[int] = []
+        
+        if plan["succeeded"]:
+            paid = db.execute(
+                update(Payment)
+                .where(
+                    Payment.transaction_id.in_(plan["succeeded"]),
+                    Payment.status.in_([PaymentStatus.PENDING, PaymentStatus.FAILED]),
+                )
+                .values(status=PaymentStatus.COMPLETED, payment_date=now)
+                .returning(Payment.id)
+                .execution_options(synchronize_session=False)
+            ).scalars().all()
+            if paid:
+                db.execute(
+                    update(Booking)
+                    .where(Booking.payment_id.in_(paid), Booking.status == BookingStatus.PENDING)
+                    .values(status=BookingStatus.CONFIRMED)
+                    .execution_options(synchronize_session=False)
+                )
+                # Re-posts the entries reversed when a retried payment had failed
+                _settle_ledger(db, payment_ids=paid, entry_type="payment")
+            counts["succeeded"] = len(paid)
+        
+        if plan["failed"]:
+            failed = db.execute(
+                update(Payment)
+                .where(
+                    Payment.transaction_id.in_(plan["failed"]),
+                    Payment.status == PaymentStatus.PENDING,
+                )
+                .values(status=PaymentStatus.FAILED)
+                .returning(Payment.id)
+                .execution_options(synchronize_session=False)
+            ).scalars().all()
+            if failed:
+                db.execute(
+                    update(Booking)
+                    .where(Booking.payment_id.in_(failed), Booking.status == BookingStatus.PENDING)
+                    .values(status=BookingStatus.CANCELED, cancellation_reason="Payment failed")
+                    .execution_options(synchronize_session=False)
+                )
+                _settle_ledger(db, payment_ids=failed, entry_type="reversal")
+            counts["failed"] = len(failed)
+        db.commit()
+        if paid or failed:
+            booking.publish_changes(db, Booking.payment_id.in_(paid + failed))
+        
+        if plan["refunded"]:
+            payments = (
+                db.query(Payment)
+                .filter(Payment.transaction_id.in_(list(plan["refunded"])))
+                .all()
+            )
+            for payment in payments:
+                refunded = min(plan["refunded"][payment.transaction_id], payment.amount)
+                if refunded <= (payment.refund_amount or 0.0):
+                    continue
+                payment = self.refund(
+                    db, id=payment.id, refund_amount=refunded, refund_reason="Refunded by provider"
+                )
+                if payment.status == PaymentStatus.REFUNDED:
+                    db.execute(
+                        update(Booking)
+                        .where(Booking.payment_id == payment.id, Booking.status == BookingStatus.CONFIRMED)
+                        .values(status=BookingStatus.CANCELED, cancellation_reason="Refunded by provider")
+                        .execution_options(synchronize_session=False)
+                    )
+                    db.commit()
+                    booking.publish_changes(db, Booking.payment_id == payment.id)
+                counts["refunded"] += 1
+        return counts
+    
+    def get_payable(self, db: Session, *, paid_before: datetime) -> List[Tuple[int, int, str]]:
+        """
+        Get the payments whose host payout is due.
+        
+        Args:
+            db: Database session
+            paid_before: Only payments made before this are eligible
+            
+        Returns:
+            List of (payment_id, host_id, currency) ordered by host and currency
+        """
+        bookings = _booking_links()
+        return (
+            db.query(Payment.id, ParkingSpace.owner_id, Payment.currency)
+            .join(bookings, bookings.c.payment_id == Payment.id)
+            .join(ParkingSpace, bookings.c.parking_space_id == ParkingSpace.id)
+            .filter(
+                Payment.host_payout_status == "pending",
+                Payment.host_payout_amount > 0,
+                Payment.status.in_([PaymentStatus.COMPLETED, PaymentStatus.PARTIALLY_REFUNDED]),
+                Payment.payment_date < paid_before,
+            )
+            .order_by(ParkingSpace.owner_id, Payment.currency, Payment.id)
+            .all()
+        )
+    
+    def backfill_ledger(self, db: Session, *, batch_size: int = 1000) -> int:
+        """
+        Post opening entries for the payments and payouts that predate the ledger.
+        
+        A payment without any ledger entry gets one "opening" entry per party
+        bringing it to what reconcile expects, plus a "payout" entry if its host
+        was already paid outside a host payout. Completed host payouts without
+        entries get their "payout" entry. Payments are processed in id-ordered
+        chunks, each committed on its own, so the backfill can be rerun.
+        
+        Args:
+            db: Database session
+            batch_size: Number of payments processed per chunk
+            
+        Returns:
+            Number of entries posted
+        """
+        posted = 0
+        last_id = 0
+        while True:
+            payments = (
+                db.query(
+                    Payment.id,
+                    Payment.status,
+                    Payment.amount,
+                    Payment.refund_amount,
+                    Payment.host_payout_amount,
+                    Payment.host_payout_status,
+                    Payment.host_payout_id,
+                )
+                .filter(Payment.id > last_id)
+                .order_by(Payment.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not payments:
+                break
+            last_id = payments[-1].id
+            
+            ids = [row.id for row in payments]
+            with_entries = {
+                row[0]
+                for row in db.query(LedgerEntry.payment_id)
+                .filter(LedgerEntry.payment_id.in_(ids))
+                .distinct()
+            }
+            bookings = _booking_links()
+            parties = {
+                payment_id: (user_id, host_id)
+                for payment_id, user_id, host_id in db.query(
+                    bookings.c.payment_id, bookings.c.user_id, ParkingSpace.owner_id
+                )
+                .join(ParkingSpace, bookings.c.parking_space_id == ParkingSpace.id)
+                .filter(bookings.c.payment_id.in_(ids))
+            }
+            for row in payments:
+                if row.id in with_entries or row.id not in parties:
+                    continue
+                user_id, host_id = parties[row.id]
+                user_total, host_total = expected_totals(
+                    row.status, row.amount, row.refund_amount, row.host_payout_amount
+                )
+                entries = [
+                    ("user", user_id, "opening", user_total),
+                    ("host", host_id, "opening", host_total),
+                ]
+                if row.host_payout_status == "completed" and row.host_payout_id is None:
+                    entries.append(("host", host_id, "payout", -(row.host_payout_amount or 0.0)))
+                for account_type, account_id, entry_type, amount in entries:
+                    if ledger.post(
+                        db,
+                        account_type=account_type,
+                        account_id=account_id,
+                        entry_type=entry_type,
+                        amount=amount,
+                        payment_id=row.id,
+                    ):
+                        posted += 1
+            db.commit()
+        
+        payouts = (
+            db.query(HostPayout)
+            .filter(
+                HostPayout.status == "completed",
+                ~select(LedgerEntry.id).where(LedgerEntry.host_payout_id == HostPayout.id).exists(),
+            )
+            .order_by(HostPayout.id)
+            .all()
+        )
+        for payout in payouts:
+            if ledger.post(
+                db,
+                account_type="host",
+                account_id=payout.host_id,
+                entry_type="payout",
+                amount=-payout.amount,
+                host_payout_id=payout.id,
+            ):
+                posted += 1
+        db.commit()
+        return posted
+
+
+class CRUDHostPayout(CRUDBase[HostPayout, Any, Any]):
+    def get_unfinished(self, db: Session) -> List[HostPayout]:
+        """
+        Get payouts left pending by an interrupted run.
+        
+        Args:
+            db: Database session
+            
+        Returns:
+            List of pending payout instances
+        """
+        return db.query(HostPayout).filter(HostPayout.status == "pending").order_by(HostPayout.id).all()
+    
+    def create_for_host(
+        self, db: Session, *, host_id: int, currency: str, eligible_before: datetime
+    ) -> HostPayout:
+        """
+        Create an empty pending payout for a host.
+        
+        Args:
+            db: Database session
+            host_id: ID of the host
+            currency: Currency of the payments settled by the payout
+            eligible_before: Eligibility cutoff of the run creating it
+            
+        Returns:
+            The created payout instance
+        """
+        payout = HostPayout(host_id=host_id, currency=currency, eligible_before=eligible_before)
+        db.add(payout)
+        db.commit()
+        db.refresh(payout)
+        return payout
+    
+    def claim_payments(self, db: Session, *, payout: HostPayout, payment_ids: List[int]) -> int:
+        """
+        Attach a chunk of pending payments to a payout with a single UPDATE.
+        
+        Payments that are no longer pending (e.g. refunded or claimed by a
+        concurrent run since they were selected) are left alone.
+        
+        Args:
+            db: Database session
+            payout: Payout claiming the payments
+            payment_ids: IDs of the payments to claim
+            
+        Returns:
+            Number of payments claimed
+        """
+        stmt = (
+            update(Payment)
+            .where(Payment.id.in_(payment_ids), Payment.host_payout_status == "pending")
+            .values(host_payout_status="processing", host_payout_id=payout.id)
+            .execution_options(synchronize_session=False)
+        )
+        claimed = db.execute(stmt).rowcount
+        db.commit()
+        return claimed
+    
+    def settle(
+        self, db: Session, *, payout: HostPayout, provider: Any, now: datetime
+    ) -> Optional[HostPayout]:
+        """
+        Send a payout through the provider and settle its payments.
+        
+        The provider call is keyed on the payout ID, so settling the same payout
+        again after a crash cannot pay the host twice. The payout row stays
+        locked until the settlement is committed and its status is checked
+        under the lock, so a concurrent settle of the same payout waits and
+        then leaves it alone instead of settling it a second time. On failure
+        the payments are released back to pending for the next run.
+        
+        Args:
+            db: Database session
+            payout: Pending payout with its payments claimed
+            provider: Payout provider exposing transfer()
+            now: Settlement time
+            
+        Returns:
+            The updated payout instance, None if it was no longer pending
+        """
+        payout = (
+            db.query(HostPayout)
+            .filter(HostPayout.id == payout.id, HostPayout.status == "pending")
+            .with_for_update()
+            .populate_existing()
+            .first()
+        )
+        if payout is None:
+            db.rollback()
+            return None
+        
+        count, amount = (
+            db.query(func.count(Payment.id), func.coalesce(func.sum(Payment.host_payout_amount), 0.0))
+            .filter(Payment.host_payout_id == payout.id, Payment.host_payout_status == "processing")
+            .one()
+        )
+        payout.payments_count = count
+        payout.amount = amount
+        payout.processed_at = now
+        payments = (
+            update(Payment)
+            .where(Payment.host_payout_id == payout.id, Payment.host_payout_status == "processing")
+            .execution_options(synchronize_session=False)
+        )
+        
+        if not count:
+            # Every payment was released or claimed elsewhere before settlement
+            payout.status = "canceled"
+            db.add(payout)
+            db.commit()
+            db.refresh(payout)
+            return payout
+        
+        try:
+            payout.provider_reference = provider.transfer(
+                host_id=payout.host_id,
+                amount=amount,
+                currency=payout.currency,
+                idempotency_key=f"host-payout-{payout.id}",
+            )
+        except PayoutError as e:
+            payout.status = "failed"
+            payout.failure_reason = str(e)
+            db.execute(payments.values(host_payout_status="pending", host_payout_id=None))
+        else:
+            payout.status = "completed"
+            db.execute(payments.values(host_payout_status="completed", host_payout_date=now))
+            ledger.post(
+                db,
+                account_type="host",
+                account_id=payout.host_id,
+                entry_type="payout",
+                amount=-amount,
+                host_payout_id=payout.id,
+            )
+        
+        db.add(payout)
+        db.commit()
+        db.refresh(payout)
+        return payout
 
 
-payment = CRUDPayment(Payment)
\ No newline at end of file
+payment = CRUDPayment(Payment)
+host_payout = CRUDHostPayout(HostPayout)
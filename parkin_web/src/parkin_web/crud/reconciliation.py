@@ -0,0 +1,217 @@
+# src/parkin_web/crud/reconciliation.py
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from src.parkin_web.core.reconciliation import ReconciliationRow
+from src.parkin_web.crud.base import CRUDBase
+from src.parkin_web.models.booking import Booking, BookingArchive
+from src.parkin_web.models.payment import Payment
+from src.parkin_web.models.reconciliation import ReconciliationDiscrepancy, ReconciliationRun
+
+PAYMENT_COLUMNS = (
+    Payment.id.label("payment_id"),
+    Payment.status.label("payment_status"),
+    Payment.amount,
+    Payment.refund_amount,
+    Payment.host_payout_status,
+    Payment.host_payout_amount,
+)
+
+
+class CRUDReconciliation(CRUDBase[ReconciliationRun, Any, Any]):
+    def iter_chunks(
+        self, db: Session, *, chunk_size: int
+    ) -> Iterator[Tuple[int, List[ReconciliationRow]]]:
+        """
+        Stream live bookings, archived bookings and orphan payments in id-ordered chunks.
+        
+        Every chunk is its own keyset query (id > last id ORDER BY id LIMIT n),
+        so memory is bounded by the chunk size and no cursor stays open
+        between chunks. Payment chunks only keep the orphans, so each chunk
+        comes with the number of rows scanned to build it.
+        
+        Args:
+            db: Database session
+            chunk_size: Number of rows per chunk
+            
+        Yields:
+            Number of rows scanned and the reconciliation rows of each chunk
+        """
+        for model in (Booking, BookingArchive):
+            last_id = 0
+            while True:
+                rows = (
+                    db.query(
+                        model.id.label("booking_id"),
+                        model.status.label("booking_status"),
+                        model.total_price,
+                        *PAYMENT_COLUMNS,
+                    )
+                    .outerjoin(Payment, model.payment_id == Payment.id)
+                    .filter(model.id > last_id)
+                    .order_by(model.id)
+                    .limit(chunk_size)
+                    .all()
+                )
+                if not rows:
+                    break
+                last_id = rows[-1].booking_id
+                yield len(rows), [ReconciliationRow(**row._asdict()) for row in rows]
+        
+        last_id = 0
+        while True:
+            payments = (
+                db.query(*PAYMENT_COLUMNS)
+                .filter(Payment.id > last_id)
+                .order_by(Payment.id)
+                .limit(chunk_size)
+                .all()
+            )
+            if not payments:
+                break
+            last_id = payments[-1].payment_id
+            ids = [payment.payment_id for payment in payments]
+            referenced = {
+                row[0]
+                for model in (Booking, BookingArchive)
+                for row in db.query(model.payment_id).filter(model.payment_id.in_(ids)).all()
+            }
+            yield len(payments), [
+                ReconciliationRow(booking_id=None, booking_status=None, total_price=None, **payment._asdict())
+                for payment in payments
+                if payment.payment_id not in referenced
+            ]
+    
+    def start_run(self, db: Session, *, now: datetime) -> ReconciliationRun:
+        """
+        Create a running reconciliation run.
+        
+        Args:
+            db: Database session
+            now: Start time
+            
+        Returns:
+            The created run instance
+        """
+        run = ReconciliationRun(status="running", started_at=now, rows_checked=0, discrepancies_count=0)
+        db.add(run)
+        db.commit()
+        db.refresh(run)
+        return run
+    
+    def record_chunk(
+        self,
+        db: Session,
+        *,
+        run: ReconciliationRun,
+        rows_checked: int,
+        discrepancies: List[Dict[str, Any]],
+    ) -> None:
+        """
+        Store the discrepancies found in a chunk and update the run counters.
+        
+        Args:
+            db: Database session
+            run: Current run
+            rows_checked: Number of rows scanned for the chunk
+            discrepancies: Discrepancies found in the chunk
+        """
+        if discrepancies:
+            db.bulk_insert_mappings(
+                ReconciliationDiscrepancy,
+                [{**discrepancy, "run_id": run.id} for discrepancy in discrepancies],
+            )
+        run.rows_checked += rows_checked
+        run.discrepancies_count += len(discrepancies)
+        db.add(run)
+        db.commit()
+    
+    def finish_run(
+        self, db: Session, *, run: ReconciliationRun, status: str, now: datetime
+    ) -> ReconciliationRun:
+        """
+        Close a run.
+        
+        Args:
+            db: Database session
+            run: Current run
+            status: "completed" or "failed"
+            now: End time
+            
+        Returns:
+            The updated run instance
+        """
+        run.status = status
+        run.finished_at = now
+        db.add(run)
+        db.commit()
+        db.refresh(run)
+        return run
+    
+    def get_report(self, db: Session, *, run_id: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get a run with its discrepancy counts per rule.
+        
+        Args:
+            db: Database session
+            run_id: ID of the run, the latest one if omitted
+            
+        Returns:
+            Dict with the run fields and counts, None if there is no such run
+        """
+        query = db.query(ReconciliationRun)
+        if run_id is not None:
+            run = query.filter(ReconciliationRun.id == run_id).first()
+        else:
+            run = query.order_by(ReconciliationRun.id.desc()).first()
+        if run is None:
+            return None
+        
+        counts = (
+            db.query(ReconciliationDiscrepancy.rule, func.count(ReconciliationDiscrepancy.id))
+            .filter(ReconciliationDiscrepancy.run_id == run.id)
+            .group_by(ReconciliationDiscrepancy.rule)
+            .all()
+        )
+        return {
+            "id": run.id,
+            "status": run.status,
+            "started_at": run.started_at,
+            "finished_at": run.finished_at,
+            "rows_checked": run.rows_checked,
+            "discrepancies_count": run.discrepancies_count,
+            "counts": dict(counts),
+        }
+    
+    def get_discrepancies(
+        self,
+        db: Session,
+        *,
+        run_id: int,
+        rule: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> List[ReconciliationDiscrepancy]:
+        """
+        Get the discrepancies of a run.
+        
+        Args:
+            db: Database session
+            run_id: ID of the run
+            rule: Restrict to one rule
+            skip: Number of records to skip
+            limit: Maximum number of records to return
+            
+        Returns:
+            List of discrepancy instances
+        """
+        query = db.query(ReconciliationDiscrepancy).filter(ReconciliationDiscrepancy.run_id == run_id)
+        if rule is not None:
+            query = query.filter(ReconciliationDiscrepancy.rule == rule)
+        return query.order_by(ReconciliationDiscrepancy.id).offset(skip).limit(limit).all()
+
+
+reconciliation = CRUDReconciliation(ReconciliationRun)
@@ -1,4 +1,28 @@
-# src/parkin_web/crud/user.py (continued)
+# src/parkin_web/crud/user.py
+from typing import Any, Dict, List, Optional, Union
+
+from sqlalchemy.orm import Session
+
+from src.parkin_web.core.security import get_password_hash, verify_password
+from src.parkin_web.crud.base import CRUDBase
+from src.parkin_web.models.user import User
+from src.parkin_web.schemas.user import UserCreate, UserUpdate
+
+
+class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
+    def get_by_email(self, db: Session, *, email: str) -> Optional[User]:
+        """
+        Get a user by email.
+        
+        Args:
+            db: Database session
+            email: Email of the user
+            
+        Returns:
+            The user instance if found, None otherwise
+        """
+        return db.query(User).filter(User.email == email).first()
+    
     def create(self, db: Session, *, obj_in: UserCreate) -> User:
         """
         Create a new user.
@@ -151,4 +175,4 @@
             db.commit()
 
 
-user = CRUDUser(User)
\ No newline at end of file
+user = CRUDUser(User)
@@ -0,0 +1,137 @@
+# src/parkin_web/crud/webhook_event.py
+from datetime import datetime
+from typing import Any, List, Optional
+
+from sqlalchemy import case, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from src.parkin_web.crud.base import CRUDBase
+from src.parkin_web.models.webhook_event import WebhookEvent
+
+
+class CRUDWebhookEvent(CRUDBase[WebhookEvent, Any, Any]):
+    def enqueue(self, db: Session, *, event_id: str, event_type: str, payload: str) -> bool:
+        """
+        Append a raw event to the queue, ignoring provider redeliveries.
+        
+        Args:
+            db: Database session
+            event_id: Provider event ID
+            event_type: Provider event type
+            payload: Raw event body
+            
+        Returns:
+            True if the event was queued, False if it was already known
+        """
+        stmt = (
+            insert(WebhookEvent)
+            .values(event_id=event_id, event_type=event_type, payload=payload, status="queued", attempts=0)
+            .on_conflict_do_nothing(index_elements=["event_id"])
+            .returning(WebhookEvent.id)
+        )
+        queued = db.execute(stmt).first() is not None
+        db.commit()
+        return queued
+    
+    def claim_batch(self, db: Session, *, batch_size: int) -> List[Any]:
+        """
+        Take the oldest queued events for processing.
+        
+        Rows locked by another worker are skipped, so several workers can
+        claim batches concurrently without overlapping.
+        
+        Args:
+            db: Database session
+            batch_size: Maximum number of events claimed
+            
+        Returns:
+            List of rows with id, event_id, event_type and payload, in queue order
+        """
+        batch = (
+            select(WebhookEvent.id)
+            .where(WebhookEvent.status == "queued")
+            .order_by(WebhookEvent.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        stmt = (
+            update(WebhookEvent)
+            .where(WebhookEvent.id.in_(batch))
+            .values(status="processing", attempts=WebhookEvent.attempts + 1)
+            .returning(WebhookEvent.id, WebhookEvent.event_id, WebhookEvent.event_type, WebhookEvent.payload)
+            .execution_options(synchronize_session=False)
+        )
+        rows = sorted(db.execute(stmt).all(), key=lambda row: row.id)
+        db.commit()
+        return rows
+    
+    def finish(
+        self, db: Session, *, ids: List[int], status: str, now: datetime, error: Optional[str] = None
+    ) -> None:
+        """
+        Mark claimed events as done.
+        
+        Args:
+            db: Database session
+            ids: IDs of the events
+            status: "processed" or "ignored"
+            now: Processing time
+            error: Optional note stored with the events
+        """
+        if not ids:
+            return
+        db.execute(
+            update(WebhookEvent)
+            .where(WebhookEvent.id.in_(ids))
+            .values(status=status, processed_at=now, error=error)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+    
+    def retry(self, db: Session, *, ids: List[int], error: str, max_attempts: int) -> None:
+        """
+        Put claimed events back in the queue after a failure, or give up on them.
+        
+        Args:
+            db: Database session
+            ids: IDs of the events
+            error: Error message stored with the events
+            max_attempts: Events attempted this many times are marked failed
+        """
+        if not ids:
+            return
+        db.execute(
+            update(WebhookEvent)
+            .where(WebhookEvent.id.in_(ids))
+            .values(
+                status=case((WebhookEvent.attempts >= max_attempts, "failed"), else_="queued"),
+                error=error,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+    
+    def requeue_stale(self, db: Session, *, claimed_before: datetime) -> int:
+        """
+        Put back events left processing by a worker that died.
+        
+        Args:
+            db: Database session
+            claimed_before: Events claimed before this are considered abandoned
+            
+        Returns:
+            Number of requeued events
+        """
+        requeued = db.execute(
+            update(WebhookEvent)
+            .where(WebhookEvent.status == "processing", WebhookEvent.updated_at < claimed_before)
+            .values(status="queued")
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.commit()
+        return requeued
+
+
+webhook_event = CRUDWebhookEvent(WebhookEvent)
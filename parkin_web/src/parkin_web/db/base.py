@@ -2,8 +2,15 @@
 from src.parkin_web.db.base_class import Base
 from src.parkin_web.models.user import User
 from src.parkin_web.models.parking_space import ParkingSpace
-from src.parkin_web.models.booking import Booking
-from src.parkin_web.models.payment import Payment
+from src.parkin_web.models.booking import Booking, BookingArchive, BookingSeries
+from src.parkin_web.models.payment import HostPayout, Payment
+from src.parkin_web.models.demand_multiplier import DemandMultiplier
+from src.parkin_web.models.host_stat import HostDailyStat, HostStatRollup
+from src.parkin_web.models.idempotency_key import IdempotencyKey
+from src.parkin_web.models.ledger import LedgerAccount, LedgerEntry
+from src.parkin_web.models.webhook_event import WebhookEvent
+from src.parkin_web.models.reconciliation import ReconciliationDiscrepancy, ReconciliationRun
+from src.parkin_web.models.tombstone import Tombstone
 
 # Import all the models here that should be included in create_all
 
@@ -0,0 +1,29 @@
+# src/parkin_web/db/types.py
+from typing import Any, Optional
+
+from sqlalchemy.dialects.postgresql import BIT
+from sqlalchemy.types import TypeDecorator
+
+from src.parkin_web.core.availability import SLOTS_PER_WEEK, bitmap_to_bits, bits_to_bitmap
+
+
+class WeeklyBitmap(TypeDecorator):
+    """
+    Weekly availability bitmap stored as a fixed-width Postgres bit string.
+
+    The Python side works with plain integers so callers can use ``&`` and ``|``
+    directly, and the database side can AND the column against a window mask.
+    """
+
+    impl = BIT(SLOTS_PER_WEEK)
+    cache_ok = True
+
+    def process_bind_param(self, value: Optional[int], dialect: Any) -> Optional[str]:
+        if value is None:
+            return None
+        return bitmap_to_bits(value)
+
+    def process_result_value(self, value: Optional[str], dialect: Any) -> Optional[int]:
+        if value is None:
+            return None
+        return bits_to_bitmap(value)
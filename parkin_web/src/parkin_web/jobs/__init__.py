@@ -0,0 +1,3 @@
+# src/parkin_web/jobs/__init__.py
+from src.parkin_web.jobs.scheduler import scheduler
+from src.parkin_web.jobs import demand, host_stats, payouts, read_model, reconciliation, sweeper, webhooks
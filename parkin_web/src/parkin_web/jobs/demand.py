@@ -0,0 +1,136 @@
+# src/parkin_web/jobs/demand.py
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from src.parkin_web import crud
+from src.parkin_web.core import pricing
+from src.parkin_web.core.config import settings
+from src.parkin_web.core.geo import geo_cell
+from src.parkin_web.jobs.scheduler import scheduler
+from src.parkin_web.models.booking import Booking, BookingStatus
+from src.parkin_web.models.parking_space import ParkingSpace
+
+HOURS_PER_WEEK = 7 * 24
+
+# Weight of each demand signal in the combined demand ratio
+BOOKING_WEIGHT = 0.7
+VIEW_WEIGHT = 0.3
+
+# Cell-hours with fewer bookings than this in the window are left at the base rate
+MIN_BOOKINGS = 3
+
+# Postgres advisory lock key held by the process running the rollup
+ROLLUP_LOCK_KEY = 7_301_001
+
+
+@scheduler.job("demand_reload", interval=settings.DEMAND_RELOAD_INTERVAL_SECONDS)
+def load_demand_multipliers(db: Session) -> int:
+    """
+    Load the multiplier table into the in-memory pricing lookup.
+    
+    Runs in every process, so each one picks up the table written by whichever
+    process ran the rollup. Cached quotes are only dropped when the table changed.
+    
+    Args:
+        db: Database session
+        
+    Returns:
+        Number of multipliers loaded
+    """
+    if pricing.demand_multipliers.replace(crud.demand_multiplier.get_table(db)):
+        pricing.quote_cache.invalidate_quotes()
+    return len(pricing.demand_multipliers)
+
+
+@scheduler.job("demand_rollup", interval=settings.DEMAND_ROLLUP_INTERVAL_SECONDS)
+def rollup_demand_multipliers(db: Session, *, now: Optional[datetime] = None) -> int:
+    """
+    Recompute demand multipliers per geo-cell and hour-of-week.
+    
+    Booking density is the number of bookings starting in a cell-hour per active
+    space and per week, relative to the average over all cells and hours. View
+    density is the views per space of the cell relative to the global average.
+    Both are combined and clamped to [1, DEMAND_MAX_MULTIPLIER]; only cell-hours
+    above 1 are stored, everything else prices at the base rate.
+    
+    Only one process rolls up at a time: the run holds a transaction-level
+    advisory lock until the new table is committed, and is skipped when another
+    process holds it. Other processes pick the table up through demand_reload.
+    
+    Args:
+        db: Database session
+        now: End of the rollup window, defaults to the current time
+        
+    Returns:
+        Number of multipliers written, 0 when another process is rolling up
+    """
+    if not db.execute(select(func.pg_try_advisory_xact_lock(ROLLUP_LOCK_KEY))).scalar():
+        db.rollback()
+        return 0
+    now = now or datetime.utcnow()
+    since = now - timedelta(days=settings.DEMAND_WINDOW_DAYS)
+    weeks = settings.DEMAND_WINDOW_DAYS / 7
+    
+    spaces: Dict[str, int] = defaultdict(int)
+    views: Dict[str, int] = defaultdict(int)
+    space_rows = (
+        db.query(ParkingSpace.latitude, ParkingSpace.longitude, ParkingSpace.views_count)
+        .filter(ParkingSpace.is_active == True)
+        .yield_per(1000)
+    )
+    for latitude, longitude, views_count in space_rows:
+        cell = geo_cell(latitude, longitude)
+        if cell is not None:
+            spaces[cell] += 1
+            views[cell] += views_count or 0
+    
+    bookings: Dict[Tuple[str, int], int] = defaultdict(int)
+    booking_rows = (
+        db.query(ParkingSpace.latitude, ParkingSpace.longitude, Booking.start_time)
+        .join(ParkingSpace, Booking.parking_space_id == ParkingSpace.id)
+        .filter(
+            Booking.start_time >= since,
+            Booking.start_time < now,
+            Booking.status.in_(
+                [BookingStatus.PENDING, BookingStatus.CONFIRMED, BookingStatus.COMPLETED]
+            ),
+        )
+        .yield_per(1000)
+    )
+    for latitude, longitude, start_time in booking_rows:
+        cell = geo_cell(latitude, longitude)
+        if cell in spaces:
+            bookings[(cell, pricing.hour_of_week(start_time))] += 1
+    
+    total_spaces = sum(spaces.values())
+    total_bookings = sum(bookings.values())
+    mean_density = total_bookings / (total_spaces * HOURS_PER_WEEK * weeks) if total_spaces else 0.0
+    mean_views = sum(views.values()) / total_spaces if total_spaces else 0.0
+    
+    rows = []
+    for (cell, hour), count in bookings.items():
+        if count < MIN_BOOKINGS:
+            continue
+        density_ratio = count / (spaces[cell] * weeks) / mean_density
+        view_ratio = views[cell] / spaces[cell] / mean_views if mean_views else 1.0
+        demand = BOOKING_WEIGHT * density_ratio + VIEW_WEIGHT * view_ratio
+        multiplier = min(max(demand, 1.0), settings.DEMAND_MAX_MULTIPLIER)
+        if multiplier > 1.0:
+            rows.append({
+                "geo_cell": cell,
+                "hour_of_week": hour,
+                "multiplier": round(multiplier, 4),
+                "bookings_count": count,
+                "views_count": views[cell],
+            })
+    
+    crud.demand_multiplier.replace_all(db, rows=rows)
+    if pricing.demand_multipliers.replace(
+        {(row["geo_cell"], row["hour_of_week"]): row["multiplier"] for row in rows}
+    ):
+        pricing.quote_cache.invalidate_quotes()
+    return len(rows)
@@ -0,0 +1,44 @@
+# src/parkin_web/jobs/host_stats.py
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from src.parkin_web import crud
+from src.parkin_web.core.config import settings
+from src.parkin_web.jobs.scheduler import scheduler
+
+
+@scheduler.job("host_stats_rollup", interval=settings.HOST_STATS_ROLLUP_INTERVAL_SECONDS)
+def rollup_host_stats(
+    db: Session, *, now: Optional[datetime] = None, since: Optional[datetime] = None
+) -> int:
+    """
+    Refresh the host dashboard rollup for the days touched by recent changes.
+    
+    Each successful run is recorded, and the next one recomputes the days with
+    changes since then, so days changed while the job wasn't running are
+    caught up. Changes are re-read from HOST_STATS_ROLLUP_OVERLAP_SECONDS
+    before the previous run, to pick up transactions that were still in flight
+    while it was reading.
+    
+    Args:
+        db: Database session
+        now: Current time, defaults to utcnow
+        since: Only days with changes after this time are recomputed, defaults to
+            the previous run, or two job intervals ago on the first run
+        
+    Returns:
+        Number of (parking space, day) rows written
+    """
+    now = now or datetime.utcnow()
+    if since is None:
+        since = crud.host_stat.get_last_rollup_time(db)
+        if since is None:
+            since = now - timedelta(seconds=2 * settings.HOST_STATS_ROLLUP_INTERVAL_SECONDS)
+        else:
+            since -= timedelta(seconds=settings.HOST_STATS_ROLLUP_OVERLAP_SECONDS)
+    days = crud.host_stat.get_dirty_days(db, since=since)
+    rows = crud.host_stat.rollup_days(db, days=days)
+    crud.host_stat.record_rollup(db, rolled_up_at=now, days_count=len(days), rows_count=rows)
+    return rows
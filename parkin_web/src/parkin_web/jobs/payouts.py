@@ -0,0 +1,107 @@
+# src/parkin_web/jobs/payouts.py
+import logging
+from datetime import datetime, timedelta
+from itertools import groupby
+from typing import Dict, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from src.parkin_web import crud
+from src.parkin_web.core.config import settings
+from src.parkin_web.core.payouts import payout_provider
+from src.parkin_web.jobs.scheduler import scheduler
+
+logger = logging.getLogger(__name__)
+
+# Postgres advisory lock key held by the process settling payouts
+PAYOUT_LOCK_KEY = 7_301_002
+
+
+@scheduler.job("host_payouts", interval=settings.HOST_PAYOUT_INTERVAL_SECONDS)
+def process_host_payouts(db: Session, *, now: Optional[datetime] = None) -> Dict[str, int]:
+    """
+    Settle every due host payout, one transfer per host and currency.
+    
+    Only one process settles payouts at a time: the run holds a session-level
+    advisory lock on a connection of its own, since every step below commits,
+    and is skipped when another process holds it.
+    
+    Args:
+        db: Database session
+        now: Current time, defaults to utcnow
+        
+    Returns:
+        Number of payouts per final status and of settled payments, all 0 when
+        another process is settling payouts
+    """
+    with db.get_bind().connect() as lock:
+        if not lock.execute(select(func.pg_try_advisory_lock(PAYOUT_LOCK_KEY))).scalar():
+            return {"completed": 0, "failed": 0, "canceled": 0, "payments": 0}
+        lock.commit()
+        try:
+            return settle_due_payouts(db, now=now or datetime.utcnow())
+        finally:
+            lock.execute(select(func.pg_advisory_unlock(PAYOUT_LOCK_KEY)))
+            lock.commit()
+
+
+def settle_due_payouts(db: Session, *, now: datetime) -> Dict[str, int]:
+    """
+    Settle the payouts left pending by an interrupted run, then the due payments.
+    
+    The due payments are grouped per host and claimed in chunks. Every step
+    commits on its own, so the run can be stopped and rerun at any point.
+    
+    Args:
+        db: Database session
+        now: Current time
+        
+    Returns:
+        Number of payouts per final status and of settled payments
+    """
+    eligible_before = now - timedelta(days=settings.HOST_PAYOUT_HOLD_DAYS)
+    result = {"completed": 0, "failed": 0, "canceled": 0, "payments": 0}
+    
+    def settle(payout):
+        payout = crud.host_payout.settle(db, payout=payout, provider=payout_provider, now=now)
+        if payout is None:
+            return
+        result[payout.status] += 1
+        if payout.status == "completed":
+            result["payments"] += payout.payments_count
+    
+    for payout in crud.host_payout.get_unfinished(db):
+        settle(payout)
+    
+    payable = crud.payment.get_payable(db, paid_before=eligible_before)
+    for (host_id, currency), rows in groupby(payable, key=lambda row: (row[1], row[2])):
+        payment_ids = [row[0] for row in rows]
+        payout = crud.host_payout.create_for_host(
+            db, host_id=host_id, currency=currency, eligible_before=eligible_before
+        )
+        for start in range(0, len(payment_ids), settings.HOST_PAYOUT_CHUNK_SIZE):
+            crud.host_payout.claim_payments(
+                db,
+                payout=payout,
+                payment_ids=payment_ids[start:start + settings.HOST_PAYOUT_CHUNK_SIZE],
+            )
+        settle(payout)
+    return result
+
+
+@scheduler.job("ledger_reconcile", interval=settings.LEDGER_RECONCILE_INTERVAL_SECONDS)
+def reconcile_ledger(db: Session) -> int:
+    """
+    Check the ledger against payments and payouts and log every discrepancy.
+    
+    Args:
+        db: Database session
+        
+    Returns:
+        Number of discrepancies found
+    """
+    discrepancies = crud.ledger.reconcile(db)
+    for discrepancy in discrepancies:
+        logger.warning("Ledger discrepancy: %s", discrepancy)
+    return len(discrepancies)
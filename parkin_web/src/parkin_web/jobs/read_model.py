@@ -0,0 +1,22 @@
+# src/parkin_web/jobs/read_model.py
+from sqlalchemy.orm import Session
+
+from src.parkin_web import crud
+from src.parkin_web.core.config import settings
+from src.parkin_web.jobs.scheduler import scheduler
+
+
+@scheduler.job("parking_read_model", interval=settings.READ_MODEL_REFRESH_SECONDS)
+def refresh_parking_read_model(db: Session) -> int:
+    """
+    Keep the in-memory parking search model in sync with the database.
+    
+    Args:
+        db: Database session
+        
+    Returns:
+        Number of rows that changed the model, 0 when the model is disabled
+    """
+    if not settings.READ_MODEL_ENABLED:
+        return 0
+    return crud.parking_space.refresh_read_model(db)
@@ -0,0 +1,46 @@
+# src/parkin_web/jobs/reconciliation.py
+from datetime import datetime
+from typing import Any, Dict
+
+from sqlalchemy.orm import Session
+
+from src.parkin_web import crud
+from src.parkin_web.core import reconciliation
+from src.parkin_web.core.config import settings
+from src.parkin_web.jobs.scheduler import scheduler
+
+
+@scheduler.job("reconciliation", interval=settings.RECONCILIATION_INTERVAL_SECONDS)
+def run_reconciliation(db: Session) -> Dict[str, Any]:
+    """
+    Check every booking and payment against the reconciliation rules.
+    
+    Rows are streamed in chunks of RECONCILIATION_CHUNK_SIZE and the
+    discrepancies of each chunk are written before the next one is read.
+    
+    Args:
+        db: Database session
+        
+    Returns:
+        ID of the run, number of rows checked and of discrepancies found
+    """
+    run = crud.reconciliation.start_run(db, now=datetime.utcnow())
+    try:
+        chunks = crud.reconciliation.iter_chunks(db, chunk_size=settings.RECONCILIATION_CHUNK_SIZE)
+        for scanned, rows in chunks:
+            crud.reconciliation.record_chunk(
+                db,
+                run=run,
+                rows_checked=scanned,
+                discrepancies=list(reconciliation.evaluate(rows)),
+            )
+    except Exception:
+        db.rollback()
+        crud.reconciliation.finish_run(db, run=run, status="failed", now=datetime.utcnow())
+        raise
+    run = crud.reconciliation.finish_run(db, run=run, status="completed", now=datetime.utcnow())
+    return {
+        "run_id": run.id,
+        "rows_checked": run.rows_checked,
+        "discrepancies": run.discrepancies_count,
+    }
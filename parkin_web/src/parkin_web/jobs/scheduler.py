@@ -0,0 +1,90 @@
+# src/parkin_web/jobs/scheduler.py
+import logging
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from src.parkin_web.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+JobFunc = Callable[[Session], object]
+
+
+class Scheduler:
+    """
+    Minimal in-process scheduler running registered jobs at fixed intervals.
+
+    Each job runs in its own daemon thread with a fresh database session per run.
+    """
+
+    def __init__(self) -> None:
+        self.jobs: Dict[str, Tuple[float, JobFunc]] = {}
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def job(self, name: str, *, interval: float) -> Callable[[JobFunc], JobFunc]:
+        """
+        Register a job function.
+
+        Args:
+            name: Unique job name
+            interval: Seconds between two runs
+
+        Returns:
+            Decorator returning the function unchanged
+        """
+        def decorator(func: JobFunc) -> JobFunc:
+            self.jobs[name] = (interval, func)
+            return func
+        return decorator
+
+    def run(self, name: str, db: Optional[Session] = None) -> object:
+        """
+        Run a registered job once.
+
+        Args:
+            name: Job name
+            db: Database session, a new one is opened if not provided
+
+        Returns:
+            Whatever the job returns
+        """
+        _, func = self.jobs[name]
+        if db is not None:
+            return func(db)
+        db = SessionLocal()
+        try:
+            return func(db)
+        finally:
+            db.close()
+
+    def _loop(self, name: str, interval: float) -> None:
+        while not self._stop.wait(interval):
+            try:
+                self.run(name)
+            except Exception:
+                logger.exception("Scheduled job %s failed", name)
+
+    def start(self) -> None:
+        """
+        Start one background thread per registered job.
+        """
+        self._stop.clear()
+        for name, (interval, _) in self.jobs.items():
+            thread = threading.Thread(
+                target=self._loop, args=(name, interval), name=f"job-{name}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self) -> None:
+        """
+        Ask every job thread to stop after its current run.
+        """
+        self._stop.set()
+        self._threads = []
+
+
+scheduler = Scheduler()
@@ -0,0 +1,87 @@
+# src/parkin_web/jobs/sweeper.py
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from src.parkin_web import crud
+from src.parkin_web.core.config import settings
+from src.parkin_web.jobs.scheduler import scheduler
+
+
+@scheduler.job("booking_sweep", interval=settings.BOOKING_SWEEP_INTERVAL_SECONDS)
+def sweep_bookings(db: Session, *, now: Optional[datetime] = None) -> Dict[str, int]:
+    """
+    Complete ended confirmed bookings and expire stale pending ones.
+    
+    Args:
+        db: Database session
+        now: Current time, defaults to utcnow
+        
+    Returns:
+        Number of completed and expired bookings
+    """
+    now = now or datetime.utcnow()
+    completed = crud.booking.complete_ended(
+        db, now=now, batch_size=settings.BOOKING_SWEEP_BATCH_SIZE
+    )
+    expired = crud.booking.expire_pending(
+        db,
+        now=now,
+        created_before=now - timedelta(minutes=settings.PENDING_BOOKING_TTL_MINUTES),
+        batch_size=settings.BOOKING_SWEEP_BATCH_SIZE,
+    )
+    return {"completed": len(completed), "expired": len(expired)}
+
+
+@scheduler.job("booking_archive", interval=settings.BOOKING_ARCHIVE_INTERVAL_SECONDS)
+def archive_bookings(db: Session, *, now: Optional[datetime] = None) -> int:
+    """
+    Move old completed, canceled and rejected bookings to the archive table.
+    
+    Args:
+        db: Database session
+        now: Current time, defaults to utcnow
+        
+    Returns:
+        Number of archived bookings
+    """
+    now = now or datetime.utcnow()
+    return crud.booking.archive_terminal(
+        db,
+        ended_before=now - timedelta(days=settings.BOOKING_ARCHIVE_AFTER_DAYS),
+        batch_size=settings.BOOKING_ARCHIVE_BATCH_SIZE,
+    )
+
+
+@scheduler.job("idempotency_purge", interval=settings.IDEMPOTENCY_PURGE_INTERVAL_SECONDS)
+def purge_idempotency_keys(db: Session, *, now: Optional[datetime] = None) -> int:
+    """
+    Delete expired idempotency keys.
+    
+    Args:
+        db: Database session
+        now: Current time, defaults to utcnow
+        
+    Returns:
+        Number of deleted keys
+    """
+    return crud.idempotency_key.purge_expired(db, now=now or datetime.utcnow())
+
+
+@scheduler.job("tombstone_purge", interval=settings.TOMBSTONE_PURGE_INTERVAL_SECONDS)
+def purge_tombstones(db: Session, *, now: Optional[datetime] = None) -> int:
+    """
+    Delete change feed tombstones past the retention window.
+    
+    Args:
+        db: Database session
+        now: Current time, defaults to utcnow
+        
+    Returns:
+        Number of deleted tombstones
+    """
+    now = now or datetime.utcnow()
+    return crud.change_feed.purge_tombstones(
+        db, before=now - timedelta(days=settings.TOMBSTONE_RETENTION_DAYS)
+    )
@@ -0,0 +1,77 @@
+# src/parkin_web/jobs/webhooks.py
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from src.parkin_web import crud
+from src.parkin_web.core import webhooks
+from src.parkin_web.core.config import settings
+from src.parkin_web.jobs.scheduler import scheduler
+
+logger = logging.getLogger(__name__)
+
+
+def process_webhook_events(
+    db: Session, *, now: Optional[datetime] = None, max_batches: Optional[int] = None
+) -> Dict[str, int]:
+    """
+    Drain the webhook queue in batches.
+    
+    Each batch is deduplicated and reduced to the latest event per payment
+    before being applied. A failed batch goes back to the queue until
+    WEBHOOK_MAX_ATTEMPTS is reached.
+    
+    Args:
+        db: Database session
+        now: Current time, defaults to utcnow
+        max_batches: Stop after this many batches, None to drain the queue
+        
+    Returns:
+        Number of processed, ignored and retried events
+    """
+    now = now or datetime.utcnow()
+    crud.webhook_event.requeue_stale(
+        db, claimed_before=now - timedelta(seconds=settings.WEBHOOK_PROCESSING_TIMEOUT_SECONDS)
+    )
+    
+    result = {"processed": 0, "ignored": 0, "retried": 0}
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        rows = crud.webhook_event.claim_batch(db, batch_size=settings.WEBHOOK_BATCH_SIZE)
+        if not rows:
+            break
+        batches += 1
+        
+        plan = webhooks.plan_batch(
+            (row.id, row.event_id, row.event_type, row.payload) for row in rows
+        )
+        ignored = set(plan["ignored"])
+        processed = [row.id for row in rows if row.id not in ignored]
+        try:
+            crud.payment.apply_provider_events(db, plan=plan, now=now)
+        except Exception as e:
+            db.rollback()
+            logger.exception("Webhook batch failed")
+            crud.webhook_event.retry(
+                db,
+                ids=[row.id for row in rows],
+                error=str(e),
+                max_attempts=settings.WEBHOOK_MAX_ATTEMPTS,
+            )
+            result["retried"] += len(rows)
+            continue
+        
+        crud.webhook_event.finish(db, ids=processed, status="processed", now=now)
+        crud.webhook_event.finish(db, ids=sorted(ignored), status="ignored", now=now)
+        result["processed"] += len(processed)
+        result["ignored"] += len(ignored)
+    return result
+
+
+# A pool of identical workers; SKIP LOCKED claims keep their batches disjoint
+for worker in range(settings.WEBHOOK_WORKERS):
+    scheduler.job(
+        f"webhook_worker_{worker}", interval=settings.WEBHOOK_POLL_INTERVAL_SECONDS
+    )(process_webhook_events)
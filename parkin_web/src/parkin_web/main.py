@@ -1,14 +1,18 @@
 # src/parkin_web/main.py
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
 import os
 
+from src.parkin_web import crud
 from src.parkin_web.core.config import settings
 from src.parkin_web.api.routes import auth, parking, bookings, users, payments, web
-from src.parkin_web.db.session import engine
+from src.parkin_web.db.session import engine, SessionLocal
 from src.parkin_web.db.base import Base
+from src.parkin_web.jobs import scheduler
+from src.parkin_web.jobs.demand import load_demand_multipliers
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
@@ -17,7 +21,8 @@ app = FastAPI(
     title=settings.PROJECT_NAME,
     description=settings.PROJECT_DESCRIPTION,
     version=settings.PROJECT_VERSION,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    default_response_class=ORJSONResponse,
 )
 
 # Set up CORS
@@ -48,6 +53,31 @@ templates = Jinja2Templates(directory=os.path.join(ROOT_DIR, "templates"))
 # Include web routes for rendering templates
 app.include_router(web.router)
 
+
+@app.on_event("startup")
+def start_background_jobs() -> None:
+    """
+    Load precomputed tables and start the job scheduler.
+    """
+    db = SessionLocal()
+    try:
+        load_demand_multipliers(db)
+        if settings.READ_MODEL_ENABLED:
+            crud.parking_space.refresh_read_model(db)
+    finally:
+        db.close()
+    if settings.SCHEDULER_ENABLED:
+        scheduler.start()
+
+
+@app.on_event("shutdown")
+def stop_background_jobs() -> None:
+    """
+    Stop the job scheduler.
+    """
+    scheduler.stop()
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("src.parkin_web.main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
@@ -1 +1,12 @@
-# src/parkin_web/models/__init__.py
\ No newline at end of file
+# src/parkin_web/models/__init__.py
+from src.parkin_web.models.user import User
+from src.parkin_web.models.parking_space import AvailabilitySchedule, ParkingSpace, ParkingSpaceImage
+from src.parkin_web.models.booking import Booking, BookingArchive, BookingSeries, Review
+from src.parkin_web.models.payment import HostPayout, Payment
+from src.parkin_web.models.demand_multiplier import DemandMultiplier
+from src.parkin_web.models.host_stat import HostDailyStat, HostStatRollup
+from src.parkin_web.models.idempotency_key import IdempotencyKey
+from src.parkin_web.models.ledger import LedgerAccount, LedgerEntry
+from src.parkin_web.models.webhook_event import WebhookEvent
+from src.parkin_web.models.reconciliation import ReconciliationDiscrepancy, ReconciliationRun
+from src.parkin_web.models.tombstone import Tombstone
@@ -1,5 +1,5 @@
 # src/parkin_web/models/booking.py
-from sqlalchemy import Column, Integer, String, Float, Boolean, ForeignKey, Text, Enum, DateTime
+from sqlalchemy import Column, Integer, String, Float, Boolean, ForeignKey, Text, Enum, DateTime, Index, Table, func
 from sqlalchemy.orm import relationship
 import enum
 from datetime import datetime
@@ -21,7 +21,20 @@ class BookingDuration(str, enum.Enum):
     MONTHLY = "monthly"
 
 
+class RecurrenceFrequency(str, enum.Enum):
+    DAILY = "daily"
+    WEEKLY = "weekly"
+
+
+class SeriesConflictPolicy(str, enum.Enum):
+    REJECT = "reject"
+    SKIP = "skip"
+
+
 class Booking(Base):
+    # Keyset for the change feed
+    __table_args__ = (Index("ix_booking_updated_at_id", "updated_at", "id"),)
+    
     id = Column(Integer, primary_key=True, index=True)
     
     # Booking details
@@ -57,10 +70,82 @@ class Booking(Base):
     parking_space_id = Column(Integer, ForeignKey("parkingspace.id"), nullable=False)
     parking_space = relationship("ParkingSpace", back_populates="bookings")
     
-    payment_id = Column(Integer, ForeignKey("payment.id"))
+    payment_id = Column(Integer, ForeignKey("payment.id"), index=True)
     payment = relationship("Payment", back_populates="booking")
     
     review = relationship("Review", back_populates="booking", uselist=False)
+    
+    series_id = Column(Integer, ForeignKey("bookingseries.id"), index=True)
+    series = relationship("BookingSeries", back_populates="bookings")
+
+
+# Partial index backing has_conflict; the booking sweeper keeps it limited to live bookings
+Index(
+    "ix_booking_active_window",
+    Booking.parking_space_id,
+    Booking.start_time,
+    Booking.end_time,
+    postgresql_where=Booking.status.in_([BookingStatus.PENDING, BookingStatus.CONFIRMED]),
+)
+
+# Terminal bookings are moved here by the archival job. The table mirrors the
+# booking columns (without foreign keys, so users and spaces can still be
+# purged) plus the time the row was archived.
+ARCHIVED_STATUSES = [BookingStatus.COMPLETED, BookingStatus.CANCELED, BookingStatus.REJECTED]
+
+booking_archive_table = Table(
+    "bookingarchive",
+    Base.metadata,
+    *[
+        Column(column.name, column.type, primary_key=column.primary_key, nullable=column.nullable)
+        for column in Booking.__table__.columns
+    ],
+    Column("archived_at", DateTime, server_default=func.now()),
+    Index("ix_bookingarchive_user_created", "user_id", "created_at"),
+    Index("ix_bookingarchive_space_created", "parking_space_id", "created_at"),
+    Index("ix_bookingarchive_payment", "payment_id"),
+)
+
+
+class BookingArchive(Base):
+    __table__ = booking_archive_table
+    
+    user = relationship(
+        "User", primaryjoin="foreign(BookingArchive.user_id) == User.id", viewonly=True
+    )
+    parking_space = relationship(
+        "ParkingSpace",
+        primaryjoin="foreign(BookingArchive.parking_space_id) == ParkingSpace.id",
+        viewonly=True,
+    )
+
+
+class BookingSeries(Base):
+    id = Column(Integer, primary_key=True, index=True)
+    
+    # First occurrence, later ones keep its time of day and duration
+    start_time = Column(DateTime, nullable=False)
+    end_time = Column(DateTime, nullable=False)
+    
+    # Recurrence rule
+    frequency = Column(Enum(RecurrenceFrequency), nullable=False)
+    interval = Column(Integer, default=1)
+    weekdays = Column(String)  # Comma-separated 0-6 for Monday-Sunday, weekly only
+    until = Column(DateTime)
+    count = Column(Integer)
+    conflict_policy = Column(Enum(SeriesConflictPolicy), default=SeriesConflictPolicy.REJECT)
+    
+    # Options applied to every occurrence
+    duration_type = Column(Enum(BookingDuration), default=BookingDuration.HOURLY)
+    has_ev_charging = Column(Boolean, default=False)
+    has_insurance = Column(Boolean, default=False)
+    insurance_coverage = Column(Float, default=0.0)
+    special_instructions = Column(Text)
+    
+    # Relationships
+    user_id = Column(Integer, ForeignKey("user.id"), nullable=False)
+    parking_space_id = Column(Integer, ForeignKey("parkingspace.id"), nullable=False)
+    bookings = relationship("Booking", back_populates="series")
 
 
 class Review(Base):
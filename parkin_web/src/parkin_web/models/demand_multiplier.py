@@ -0,0 +1,17 @@
+# src/parkin_web/models/demand_multiplier.py
+from sqlalchemy import Column, Integer, String, Float, UniqueConstraint
+
+from src.parkin_web.db.base_class import Base
+
+
+class DemandMultiplier(Base):
+    __table_args__ = (UniqueConstraint("geo_cell", "hour_of_week"),)
+    
+    id = Column(Integer, primary_key=True, index=True)
+    geo_cell = Column(String, nullable=False)  # Format: row:col, see core/geo.py
+    hour_of_week = Column(Integer, nullable=False)  # 0-167, Monday 00:00 first
+    multiplier = Column(Float, nullable=False)
+    
+    # Demand signals the multiplier was computed from
+    bookings_count = Column(Integer, default=0)
+    views_count = Column(Integer, default=0)
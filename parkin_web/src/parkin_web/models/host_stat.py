@@ -0,0 +1,40 @@
+# src/parkin_web/models/host_stat.py
+from sqlalchemy import Column, Integer, Float, Date, DateTime, ForeignKey, Index, UniqueConstraint
+
+from src.parkin_web.db.base_class import Base
+
+
+class HostDailyStat(Base):
+    __table_args__ = (
+        UniqueConstraint("parking_space_id", "day"),
+        Index("ix_hostdailystat_host_day", "host_id", "day"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    host_id = Column(Integer, ForeignKey("user.id"), nullable=False)
+    parking_space_id = Column(Integer, ForeignKey("parkingspace.id"), nullable=False)
+    day = Column(Date, nullable=False)
+    
+    # Bookings created that day, by current status
+    bookings_count = Column(Integer, default=0)
+    canceled_count = Column(Integer, default=0)  # Canceled or rejected
+    completed_count = Column(Integer, default=0)
+    revenue = Column(Float, default=0.0)  # Total price of confirmed and completed bookings
+    
+    # Host payouts completed that day
+    payouts = Column(Float, default=0.0)
+    
+    # Detail page views that day, counted as they happen
+    views_count = Column(Integer, default=0)
+
+
+class HostStatRollup(Base):
+    """
+    A successful run of the host stats rollup.
+    
+    The next run recomputes the days with changes since the latest rolled_up_at.
+    """
+    id = Column(Integer, primary_key=True, index=True)
+    rolled_up_at = Column(DateTime, nullable=False, index=True)
+    days_count = Column(Integer, default=0)
+    rows_count = Column(Integer, default=0)
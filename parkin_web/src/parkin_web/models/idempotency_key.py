@@ -0,0 +1,23 @@
+# src/parkin_web/models/idempotency_key.py
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, UniqueConstraint
+
+from src.parkin_web.db.base_class import Base
+
+
+class IdempotencyKey(Base):
+    __table_args__ = (UniqueConstraint("user_id", "key"),)
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("user.id"), nullable=False)
+    key = Column(String(255), nullable=False)
+    fingerprint = Column(String(64), nullable=False)  # sha256 of the endpoint and request body
+    
+    # Stored response, both NULL while the first request is still running
+    status_code = Column(Integer)
+    response_body = Column(Text)
+    
+    # Lease of the request running with the key; an abandoned key is taken over past it
+    locked_until = Column(DateTime)
+    lease_token = Column(String(32))  # Random token of the request holding the lease
+    
+    expires_at = Column(DateTime, nullable=False, index=True)
@@ -0,0 +1,38 @@
+# src/parkin_web/models/ledger.py
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Index, UniqueConstraint
+
+from src.parkin_web.db.base_class import Base
+
+
+class LedgerAccount(Base):
+    """
+    Current balance of a user ("user": amount paid net of refunds) or host
+    ("host": earnings not paid out yet), kept in step with its entries.
+    """
+    __table_args__ = (UniqueConstraint("account_type", "account_id"),)
+    
+    id = Column(Integer, primary_key=True, index=True)
+    account_type = Column(String, nullable=False)  # "user" or "host"
+    account_id = Column(Integer, ForeignKey("user.id"), nullable=False)
+    balance = Column(Float, default=0.0, nullable=False)
+    entries_count = Column(Integer, default=0, nullable=False)
+    last_entry_id = Column(Integer)
+
+
+class LedgerEntry(Base):
+    """
+    Append-only ledger line. Rows are never updated; corrections are new entries.
+    """
+    __table_args__ = (
+        Index("ix_ledgerentry_account_created", "account_type", "account_id", "created_at"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    account_type = Column(String, nullable=False)
+    account_id = Column(Integer, ForeignKey("user.id"), nullable=False)
+    entry_type = Column(String, nullable=False)  # "payment", "refund", "reversal", "payout" or "opening"
+    amount = Column(Float, nullable=False)  # Signed change of the account balance
+    balance = Column(Float, nullable=False)  # Account balance after this entry
+    
+    payment_id = Column(Integer, ForeignKey("payment.id"), index=True)
+    host_payout_id = Column(Integer, ForeignKey("hostpayout.id"), index=True)
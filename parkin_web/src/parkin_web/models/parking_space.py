@@ -1,9 +1,10 @@
 # src/parkin_web/models/parking_space.py
-from sqlalchemy import Column, Integer, String, Float, Boolean, ForeignKey, Text, Enum
+from sqlalchemy import Column, Integer, String, Float, Boolean, ForeignKey, Text, Enum, Index
 from sqlalchemy.orm import relationship
 import enum
 
 from src.parkin_web.db.base_class import Base
+from src.parkin_web.db.types import WeeklyBitmap
 
 
 class ParkingType(str, enum.Enum):
@@ -15,6 +16,9 @@ class ParkingType(str, enum.Enum):
 
 
 class ParkingSpace(Base):
+    # Keyset for the change feed
+    __table_args__ = (Index("ix_parkingspace_updated_at_id", "updated_at", "id"),)
+    
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, index=True, nullable=False)
     description = Column(Text)
@@ -41,6 +45,8 @@ class ParkingSpace(Base):
     is_available = Column(Boolean, default=True)
     is_active = Column(Boolean, default=True)
     instant_booking = Column(Boolean, default=False)
+    # Compiled from availability_schedules, None when no schedule restricts the space
+    availability_bitmap = Column(WeeklyBitmap, nullable=True)
     
     # Special features
     has_security_camera = Column(Boolean, default=False)
@@ -61,6 +61,47 @@ class Payment(Base):
     host_payout_amount = Column(Float)
     host_payout_status = Column(String)
     host_payout_date = Column(DateTime)
+    host_payout_id = Column(Integer, ForeignKey("hostpayout.id"), index=True)
     
     # Relationships
-    booking = relationship("Booking", back_populates="payment", uselist=False)
\ No newline at end of file
+    booking = relationship("Booking", back_populates="payment", uselist=False)
+    archived_booking = relationship(
+        "BookingArchive",
+        primaryjoin="foreign(BookingArchive.payment_id) == Payment.id",
+        uselist=False,
+        viewonly=True,
+    )
+    host_payout = relationship("HostPayout", back_populates="payments")
+    
+    @property
+    def booking_id(self):
+        """
+        ID of the live or archived booking paid by this payment, which holds the link through payment_id.
+        """
+        booking = self.booking if self.booking is not None else self.archived_booking
+        return booking.id if booking is not None else None
+
+
+class HostPayout(Base):
+    """
+    One transfer to a host settling a batch of payments.
+    
+    Status goes from "pending" (payments being claimed or provider not called
+    yet) to "completed", "failed", or "canceled" when no payment was left to settle.
+    """
+    id = Column(Integer, primary_key=True, index=True)
+    host_id = Column(Integer, ForeignKey("user.id"), nullable=False, index=True)
+    amount = Column(Float, default=0.0)
+    currency = Column(String, default="USD")
+    payments_count = Column(Integer, default=0)
+    status = Column(String, default="pending", index=True)
+    
+    # Payments made up to this time were eligible for the payout
+    eligible_before = Column(DateTime, nullable=False)
+    
+    # Payout provider details
+    provider_reference = Column(String)
+    failure_reason = Column(Text)
+    processed_at = Column(DateTime)
+    
+    payments = relationship("Payment", back_populates="host_payout")
\ No newline at end of file
@@ -0,0 +1,29 @@
+# src/parkin_web/models/reconciliation.py
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy.orm import relationship
+
+from src.parkin_web.db.base_class import Base
+
+
+class ReconciliationRun(Base):
+    id = Column(Integer, primary_key=True, index=True)
+    status = Column(String, default="running")  # "running", "completed" or "failed"
+    started_at = Column(DateTime, nullable=False)
+    finished_at = Column(DateTime)
+    rows_checked = Column(Integer, default=0)
+    discrepancies_count = Column(Integer, default=0)
+    
+    discrepancies = relationship("ReconciliationDiscrepancy", back_populates="run")
+
+
+class ReconciliationDiscrepancy(Base):
+    id = Column(Integer, primary_key=True, index=True)
+    run_id = Column(Integer, ForeignKey("reconciliationrun.id"), nullable=False, index=True)
+    rule = Column(String, nullable=False, index=True)
+    
+    # Plain IDs rather than foreign keys, rows may be archived or purged later
+    booking_id = Column(Integer)
+    payment_id = Column(Integer)
+    details = Column(Text)
+    
+    run = relationship("ReconciliationRun", back_populates="discrepancies")
@@ -0,0 +1,17 @@
+# src/parkin_web/models/tombstone.py
+from sqlalchemy import Column, Index, Integer, String
+
+from src.parkin_web.db.base_class import Base
+
+
+class Tombstone(Base):
+    """
+    Record of a deleted row, so the change feed can report deletions.
+    
+    created_at is the deletion time.
+    """
+    __table_args__ = (Index("ix_tombstone_entity_created_at", "entity", "created_at", "entity_id"),)
+    
+    id = Column(Integer, primary_key=True, index=True)
+    entity = Column(String, nullable=False)  # Table name of the deleted row
+    entity_id = Column(Integer, nullable=False)
@@ -1,110 +1,45 @@
-# src/parkin_web/api/deps.py
-from typing import Generator, Optional
+# src/parkin_web/models/user.py
+from sqlalchemy import Column, Integer, String, Float, Boolean, ForeignKey, Text, Enum, DateTime
+from sqlalchemy.orm import relationship
 
-from fastapi import Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
-from jose import jwt
-from pydantic import ValidationError
-from sqlalchemy.orm import Session
+from src.parkin_web.db.base_class import Base
 
-from src.parkin_web import crud, models, schemas
-from src.parkin_web.core import security
-from src.parkin_web.core.config import settings
-from src.parkin_web.db.session import SessionLocal
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/login/access-token")
-
-
-def get_db() -> Generator:
-    """
-    Get database session.
+class User(Base):
+    id = Column(Integer, primary_key=True, index=True)
+    email = Column(String, unique=True, index=True, nullable=False)
+    hashed_password = Column(String, nullable=False)
     
-    Yields:
-        Database session
-    """
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
-def get_current_user(
-    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
-) -> models.User:
-    """
-    Get current user from token.
+    # Profile information
+    first_name = Column(String)
+    last_name = Column(String)
+    phone_number = Column(String)
+    profile_image = Column(String)
+    bio = Column(Text)
     
-    Args:
-        db: Database session
-        token: JWT token
-        
-    Returns:
-        User instance
-        
-    Raises:
-        HTTPException: If token is invalid or user not found
-    """
-    try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[security.ALGORITHM]
-        )
-        token_data = schemas.TokenPayload(**payload)
-    except (jwt.JWTError, ValidationError):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Could not validate credentials",
-        )
-    user = crud.user.get(db, id=token_data.sub)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found",
-        )
-    return user
-
-
-def get_current_active_user(
-    current_user: models.User = Depends(get_current_user),
-) -> models.User:
-    """
-    Get current active user.
+    # User type
+    user_type = Column(String, default="driver")  # driver, host, both
     
-    Args:
-        current_user: Current user
-        
-    Returns:
-        User instance
-        
-    Raises:
-        HTTPException: If user is not active
-    """
-    if not crud.user.is_active(current_user):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Inactive user",
-        )
-    return current_user
-
-
-def get_current_superuser(
-    current_user: models.User = Depends(get_current_user),
-) -> models.User:
-    """
-    Get current superuser.
+    # Driver-specific information
+    driving_license = Column(String)
+    vehicle_model = Column(String)
+    vehicle_plate = Column(String)
+    
+    # Host-specific information
+    bank_account = Column(String)
+    tax_id = Column(String)
+    
+    # Status
+    is_active = Column(Boolean, default=True)
+    is_superuser = Column(Boolean, default=False)
+    is_verified = Column(Boolean, default=False)
+    
+    # Ratings
+    rating = Column(Float, default=0.0)
+    total_ratings = Column(Integer, default=0)
     
-    Args:
-        current_user: Current user
-        
-    Returns:
-        User instance
-        
-    Raises:
-        HTTPException: If user is not a superuser
-    """
-    if not crud.user.is_superuser(current_user):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="The user doesn't have enough privileges",
-        )
-    return current_user
\ No newline at end of file
+    # Relationships
+    parking_spaces = relationship("ParkingSpace", back_populates="owner")
+    bookings = relationship("Booking", back_populates="user")
+    reviews_given = relationship("Review", foreign_keys="[Review.reviewer_id]", back_populates="reviewer")
+    reviews_received = relationship("Review", foreign_keys="[Review.reviewed_id]", back_populates="reviewed")
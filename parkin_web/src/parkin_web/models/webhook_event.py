@@ -0,0 +1,26 @@
+# src/parkin_web/models/webhook_event.py
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index, text
+
+from src.parkin_web.db.base_class import Base
+
+
+class WebhookEvent(Base):
+    """
+    Durable queue of raw payment provider events.
+    
+    Status goes from "queued" to "processing" while a worker holds the event,
+    then to "processed", "ignored" or "failed" (after WEBHOOK_MAX_ATTEMPTS).
+    """
+    __table_args__ = (
+        Index("ix_webhookevent_queued", "id", postgresql_where=text("status = 'queued'")),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    event_id = Column(String, nullable=False, unique=True)  # Provider event ID
+    event_type = Column(String, nullable=False)
+    payload = Column(Text, nullable=False)
+    
+    status = Column(String, default="queued", nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    error = Column(Text)
+    processed_at = Column(DateTime)
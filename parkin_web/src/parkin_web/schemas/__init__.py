@@ -1,2 +1,85 @@
 # src/parkin_web/schemas/__init__.py
-
+from src.parkin_web.schemas.user import (
+    UserBase,
+    UserCreate,
+    UserUpdate,
+    DriverInfo,
+    HostInfo,
+    User,
+    UserDetail,
+)
+from src.parkin_web.schemas.token import (
+    Token,
+    TokenPayload,
+    Msg,
+)
+from src.parkin_web.schemas.parking_space import (
+    ParkingType,
+    ParkingSpaceImageBase,
+    ParkingSpaceImageCreate,
+    ParkingSpaceImage,
+    AvailabilityScheduleBase,
+    AvailabilityScheduleCreate,
+    AvailabilitySchedule,
+    ParkingSpaceBase,
+    ParkingSpaceCreate,
+    ParkingSpaceUpdate,
+    ParkingSpace,
+    ParkingSpaceDetail,
+    ParkingSpaceSearchItem,
+    ParkingSpaceSearchResult,
+    TileCluster,
+    ParkingTile,
+    ParkingSpaceCalendar,
+)
+from src.parkin_web.schemas.booking import (
+    BookingStatus,
+    BookingDuration,
+    RecurrenceFrequency,
+    SeriesConflictPolicy,
+    ReviewBase,
+    ReviewCreate,
+    Review,
+    BookingBase,
+    BookingCreate,
+    BookingUpdate,
+    Booking,
+    BookingDetail,
+    BookingList,
+    BookingQuoteRequest,
+    BookingQuote,
+    BookingQuoteList,
+    BookingBulkAction,
+    BookingBulkItemResult,
+    BookingBulkResult,
+    BookingSeriesCreate,
+    BookingSeries,
+    SeriesOccurrence,
+    BookingSeriesResult,
+)
+from src.parkin_web.schemas.payment import (
+    PaymentStatus,
+    PaymentMethod,
+    PaymentBase,
+    PaymentCreate,
+    PaymentUpdate,
+    Payment,
+)
+from src.parkin_web.schemas.ledger import (
+    LedgerEntry,
+    LedgerBalance,
+    LedgerStatement,
+    LedgerDiscrepancy,
+)
+from src.parkin_web.schemas.host_stat import (
+    HostStatTotals,
+    HostDailyStat,
+    HostStats,
+)
+from src.parkin_web.schemas.reconciliation import (
+    ReconciliationReport,
+    ReconciliationDiscrepancy,
+)
+from src.parkin_web.schemas.change_feed import (
+    ChangeFeedPage,
+)
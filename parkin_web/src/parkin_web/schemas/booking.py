@@ -1,6 +1,6 @@
 # src/parkin_web/schemas/booking.py
 from typing import Optional, List
-from pydantic import BaseModel, validator
+from pydantic import BaseModel, Field, validator
 from datetime import datetime
 from enum import Enum
 
@@ -19,6 +19,16 @@ class BookingDuration(str, Enum):
     MONTHLY = "monthly"
 
 
+class RecurrenceFrequency(str, Enum):
+    DAILY = "daily"
+    WEEKLY = "weekly"
+
+
+class SeriesConflictPolicy(str, Enum):
+    REJECT = "reject"
+    SKIP = "skip"
+
+
 # Base Review schema
 class ReviewBase(BaseModel):
     rating: int
@@ -129,4 +139,106 @@ class BookingList(BaseModel):
     bookings: List[Booking]
     
     class Config:
-        orm_mode = True
\ No newline at end of file
+        orm_mode = True
+
+
+# Schema for requesting price quotes for several bookings at once
+class BookingQuoteRequest(BaseModel):
+    items: List[BookingCreate]
+
+
+# Schema for a single price quote
+class BookingQuote(BaseModel):
+    parking_space_id: int
+    start_time: datetime
+    end_time: datetime
+    duration_type: BookingDuration
+    
+    base_price: float
+    service_fee: float
+    ev_charging_fee: float
+    insurance_fee: float
+    total_price: float
+
+
+# Schema for a batch of price quotes, aligned with the request items
+class BookingQuoteList(BaseModel):
+    quotes: List[BookingQuote]
+
+
+# Schema for applying an action to several bookings at once
+class BookingBulkAction(BaseModel):
+    ids: List[int]
+    reason: Optional[str] = None
+
+
+# Schema for the outcome of a bulk action on one booking
+class BookingBulkItemResult(BaseModel):
+    id: int
+    result: str  # updated, not_found, forbidden or invalid_status
+    status: Optional[BookingStatus] = None
+
+
+# Schema for the outcome of a bulk action, in request order
+class BookingBulkResult(BaseModel):
+    results: List[BookingBulkItemResult]
+
+
+# Schema for creating a recurring booking series
+class BookingSeriesCreate(BookingBase):
+    parking_space_id: int
+    frequency: RecurrenceFrequency
+    interval: int = Field(1, ge=1)
+    weekdays: Optional[List[int]] = None  # 0-6 for Monday-Sunday, weekly only
+    until: Optional[datetime] = None
+    count: Optional[int] = Field(None, ge=1)
+    conflict_policy: SeriesConflictPolicy = SeriesConflictPolicy.REJECT
+    
+    @validator('weekdays')
+    def validate_weekdays(cls, v):
+        if v is not None and any(day < 0 or day > 6 for day in v):
+            raise ValueError('Weekdays must be between 0 (Monday) and 6 (Sunday)')
+        return v
+    
+    @validator('count', always=True)
+    def until_or_count(cls, v, values):
+        if v is None and values.get('until') is None:
+            raise ValueError('Either until or count must be provided')
+        return v
+
+
+# Schema for reading a booking series
+class BookingSeries(BookingBase):
+    id: int
+    parking_space_id: int
+    user_id: int
+    frequency: RecurrenceFrequency
+    interval: int
+    weekdays: Optional[List[int]] = None
+    until: Optional[datetime] = None
+    count: Optional[int] = None
+    conflict_policy: SeriesConflictPolicy
+    created_at: datetime
+    
+    @validator('weekdays', pre=True)
+    def split_weekdays(cls, v):
+        if isinstance(v, str):
+            return [int(day) for day in v.split(',') if day]
+        return v
+    
+    class Config:
+        orm_mode = True
+
+
+# Schema for a single occurrence of a series
+class SeriesOccurrence(BaseModel):
+    start_time: datetime
+    end_time: datetime
+    reason: Optional[str] = None  # Why the occurrence was skipped: booked or unavailable
+
+
+# Schema for the outcome of creating a booking series
+class BookingSeriesResult(BaseModel):
+    series: BookingSeries
+    created: List[SeriesOccurrence]
+    skipped: List[SeriesOccurrence]
@@ -0,0 +1,16 @@
+# src/parkin_web/schemas/change_feed.py
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class Change(BaseModel):
+    id: int
+    operation: str  # upsert or delete
+    changed_at: datetime
+
+
+class ChangeFeedPage(BaseModel):
+    changes: List[Change]
+    cursor: Optional[str] = None  # Pass back as since= to get the next page
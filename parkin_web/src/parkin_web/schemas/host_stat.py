@@ -0,0 +1,25 @@
+# src/parkin_web/schemas/host_stat.py
+from datetime import date
+from typing import List
+
+from pydantic import BaseModel
+
+
+class HostStatTotals(BaseModel):
+    bookings_count: int = 0
+    canceled_count: int = 0
+    completed_count: int = 0
+    revenue: float = 0.0
+    payouts: float = 0.0
+    views_count: int = 0
+
+
+class HostDailyStat(HostStatTotals):
+    day: date
+
+
+class HostStats(BaseModel):
+    start_day: date
+    end_day: date
+    totals: HostStatTotals
+    days: List[HostDailyStat]
@@ -0,0 +1,40 @@
+# src/parkin_web/schemas/ledger.py
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class LedgerEntry(BaseModel):
+    id: int
+    entry_type: str
+    amount: float
+    balance: float
+    payment_id: Optional[int] = None
+    host_payout_id: Optional[int] = None
+    created_at: datetime
+    
+    class Config:
+        orm_mode = True
+
+
+class LedgerBalance(BaseModel):
+    account_type: str
+    balance: float = 0.0
+    entries_count: int = 0
+    
+    class Config:
+        orm_mode = True
+
+
+class LedgerStatement(BaseModel):
+    account_type: str
+    balance: float
+    entries: List[LedgerEntry]
+
+
+class LedgerDiscrepancy(BaseModel):
+    check: str
+    reference_id: int
+    expected: float
+    actual: float
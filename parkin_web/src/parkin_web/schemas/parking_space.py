@@ -177,10 +177,47 @@ class ParkingSpaceDetail(ParkingSpace):
         orm_mode = True
 
 
+# Schema for a search result item, with its images for the result cards
+class ParkingSpaceSearchItem(ParkingSpace):
+    images: List[ParkingSpaceImage] = []
+    
+    class Config:
+        orm_mode = True
+
+
 # Schema for search results
 class ParkingSpaceSearchResult(BaseModel):
     total: int
-    results: List[ParkingSpace]
+    results: List[ParkingSpaceSearchItem]
     
     class Config:
-        orm_mode = True
\ No newline at end of file
+        orm_mode = True
+
+
+# Schema for a cluster of parking spaces on a map tile
+class TileCluster(BaseModel):
+    latitude: float  # Centroid of the clustered spaces
+    longitude: float
+    count: int
+    min_price: float  # Hourly rate range
+    max_price: float
+    parking_space_id: Optional[int] = None  # Set when the cluster is a single space
+
+
+# Schema for the clusters of a map tile
+class ParkingTile(BaseModel):
+    z: int
+    x: int
+    y: int
+    total: int
+    clusters: List[TileCluster]
+
+
+# Schema for the occupancy calendar of a parking space
+class ParkingSpaceCalendar(BaseModel):
+    parking_space_id: int
+    start_time: datetime
+    end_time: datetime
+    granularity: int  # Slot length in minutes
+    slots: int
+    runs: List[List[int]]  # [state, count] pairs, state 1 = free, 0 = busy
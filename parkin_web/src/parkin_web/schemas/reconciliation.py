@@ -0,0 +1,26 @@
+# src/parkin_web/schemas/reconciliation.py
+from datetime import datetime
+from typing import Dict, Optional
+
+from pydantic import BaseModel
+
+
+class ReconciliationReport(BaseModel):
+    id: int
+    status: str
+    started_at: datetime
+    finished_at: Optional[datetime] = None
+    rows_checked: int
+    discrepancies_count: int
+    counts: Dict[str, int]
+
+
+class ReconciliationDiscrepancy(BaseModel):
+    id: int
+    rule: str
+    booking_id: Optional[int] = None
+    payment_id: Optional[int] = None
+    details: Optional[str] = None
+    
+    class Config:
+        orm_mode = True
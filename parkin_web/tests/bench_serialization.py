@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+
+"""Benchmark of the parking search response: response_model + JSONResponse vs ORM fast path + orjson.
+
+Run with ``python -m tests.bench_serialization [--items 100] [--images 3] [--rounds 200]``.
+"""
+
+import argparse
+import json
+import timeit
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+
+from src.parkin_web import schemas
+from src.parkin_web.core import serialization
+from src.parkin_web.schemas.parking_space import ParkingType
+
+
+def fake_parking_spaces(items, images):
+    """Build ORM-like parking spaces with nested images."""
+    now = datetime(2025, 6, 1, 12, 30, 15, 123456)
+    spaces = []
+    for i in range(items):
+        space = SimpleNamespace(
+            id=i + 1,
+            owner_id=i % 17 + 1,
+            title=f"Covered spot #{i}",
+            description="Close to the station, easy access from the main road.",
+            address=f"{i} Main Street",
+            city="Springfield",
+            state="IL",
+            zip_code="62701",
+            country="US",
+            latitude=39.78 + i * 0.001,
+            longitude=-89.65 - i * 0.001,
+            parking_type=ParkingType.GARAGE,
+            hourly_rate=4.5 + i % 5,
+            daily_rate=30.0,
+            monthly_rate=None,
+            width=8.5,
+            length=18.0,
+            height=None,
+            is_available=True,
+            is_active=True,
+            instant_booking=bool(i % 2),
+            has_security_camera=True,
+            has_ev_charging=bool(i % 3),
+            ev_charging_rate=0.3,
+            has_covered_parking=True,
+            has_gate_access=False,
+            access_instructions="Code at the gate",
+            main_image=f"https://img.example.com/{i}/0.jpg",
+            created_at=now - timedelta(days=i),
+            updated_at=now,
+            views_count=i * 7,
+            bookings_count=i,
+            average_rating=4.25,
+            reviews_count=i // 2,
+        )
+        space.images = [
+            SimpleNamespace(
+                id=i * images + j + 1,
+                url=f"https://img.example.com/{i}/{j}.jpg",
+                description=None,
+                is_main=j == 0,
+                parking_space_id=space.id,
+                created_at=now,
+            )
+            for j in range(images)
+        ]
+        spaces.append(space)
+    return spaces
+
+
+def render_response_model(spaces):
+    """What FastAPI does for a route returning ORM rows: validate, encode, json.dumps."""
+    content = schemas.ParkingSpaceSearchResult(total=len(spaces), results=spaces)
+    return json.dumps(
+        jsonable_encoder(content),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def render_fast_path(spaces):
+    """What the search route does now: dicts from the ORM rows, orjson."""
+    return orjson.dumps(serialization.search_result(spaces))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--images", type=int, default=3)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    spaces = fake_parking_spaces(args.items, args.images)
+    assert json.loads(render_response_model(spaces)) == json.loads(render_fast_path(spaces))
+
+    results = {}
+    for name, func in (("response_model", render_response_model), ("fast_path", render_fast_path)):
+        best = min(timeit.repeat(lambda: func(spaces), number=args.rounds, repeat=5))
+        results[name] = best / args.rounds * 1000
+        print(f"{name:>15}: {results[name]:8.3f} ms/response ({len(func(spaces))} bytes)")
+    print(f"{'speedup':>15}: {results['response_model'] / results['fast_path']:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+
+"""Tests for weekly availability bitmaps and window masks."""
+
+import unittest
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.postgresql import BIT
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+
+from src.parkin_web import crud
+from src.parkin_web.core import availability
+from src.parkin_web.core.availability import FULL_WEEK, SLOTS_PER_DAY, SLOTS_PER_WEEK
+from src.parkin_web.db.base_class import Base
+from src.parkin_web.models.parking_space import AvailabilitySchedule, ParkingSpace
+
+# A Monday, weekday 0
+MONDAY = datetime(2025, 6, 2)
+
+
+@compiles(BIT, "sqlite")
+def compile_bit(type_, compiler, **kw):
+    """SQLite has no BIT type, weekly bitmaps are stored as their bit strings."""
+    return "TEXT"
+
+
+def schedule(day_of_week, start_time, end_time, is_available=True):
+    """Stand-in for an AvailabilitySchedule row."""
+    return SimpleNamespace(
+        day_of_week=day_of_week, start_time=start_time, end_time=end_time, is_available=is_available
+    )
+
+
+def slots(*ranges):
+    """Mask with the slots of each (start, end) range set."""
+    mask = 0
+    for start, end in ranges:
+        for slot in range(start, end):
+            mask |= 1 << (slot % SLOTS_PER_WEEK)
+    return mask
+
+
+class TestCompileWeeklyBitmap(unittest.TestCase):
+    """Schedules compile into the slots they fully cover."""
+
+    def test_no_schedules(self):
+        self.assertIsNone(availability.compile_weekly_bitmap([]))
+
+    def test_day_range(self):
+        bitmap = availability.compile_weekly_bitmap([schedule(1, "09:00", "17:00")])
+        self.assertEqual(bitmap, slots((SLOTS_PER_DAY + 36, SLOTS_PER_DAY + 68)))
+
+    def test_partial_slots_are_not_available(self):
+        bitmap = availability.compile_weekly_bitmap([schedule(0, "09:10", "09:50")])
+        self.assertEqual(bitmap, slots((37, 39)))
+
+    def test_overnight_range_wraps_around_the_week(self):
+        bitmap = availability.compile_weekly_bitmap([schedule(6, "22:00", "02:00")])
+        self.assertEqual(bitmap, slots((SLOTS_PER_WEEK - 8, SLOTS_PER_WEEK + 8)))
+        self.assertEqual(
+            availability.compile_weekly_bitmap([schedule(0, "00:00", "00:00")]), slots((0, SLOTS_PER_DAY))
+        )
+
+    def test_unavailable_ranges_win(self):
+        bitmap = availability.compile_weekly_bitmap([
+            schedule(0, "08:00", "18:00"),
+            schedule(0, "12:10", "12:20", is_available=False),
+        ])
+        self.assertEqual(bitmap, slots((32, 48), (50, 72)))
+        # An unavailable range alone leaves nothing available
+        self.assertEqual(availability.compile_weekly_bitmap([schedule(0, "08:00", "09:00", False)]), 0)
+
+    def test_bits_round_trip(self):
+        bitmap = slots((0, 3), (SLOTS_PER_WEEK - 2, SLOTS_PER_WEEK))
+        bits = availability.bitmap_to_bits(bitmap)
+        self.assertEqual(len(bits), SLOTS_PER_WEEK)
+        self.assertTrue(bits.startswith("111"))
+        self.assertEqual(availability.bits_to_bitmap(bits), bitmap)
+
+
+class TestBackfill(unittest.TestCase):
+    """The backfill compiles every space with schedules, in chunks."""
+
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(self.engine, tables=[ParkingSpace.__table__, AvailabilitySchedule.__table__])
+        self.db = Session(self.engine)
+        self.addCleanup(self.engine.dispose)
+        self.addCleanup(self.db.close)
+
+        space = {
+            "title": "Driveway",
+            "address": "1 Main St",
+            "city": "Springfield",
+            "state": "IL",
+            "zip_code": "62701",
+            "country": "US",
+            "hourly_rate": 10.0,
+            "owner_id": 1,
+        }
+        self.db.add_all([ParkingSpace(id=id, **space) for id in range(1, 6)])
+        # Space 4 has no schedules and stays always available
+        for space_id, day in ((1, 0), (2, 1), (2, 2), (3, 3), (5, 4)):
+            self.db.add(AvailabilitySchedule(
+                parking_space_id=space_id, day_of_week=day, start_time="09:00", end_time="10:00"
+            ))
+        self.db.commit()
+
+    def test_backfill(self):
+        updated = crud.parking_space.backfill_availability_bitmaps(self.db, batch_size=2)
+        self.assertEqual(updated, 4)
+        self.db.expire_all()
+        bitmaps = dict(self.db.query(ParkingSpace.id, ParkingSpace.availability_bitmap))
+        nine_to_ten = [slots((day * SLOTS_PER_DAY + 36, day * SLOTS_PER_DAY + 40)) for day in range(7)]
+        self.assertEqual(
+            bitmaps,
+            {1: nine_to_ten[0], 2: nine_to_ten[1] | nine_to_ten[2], 3: nine_to_ten[3], 4: None, 5: nine_to_ten[4]},
+        )
+
+
+class TestWindowMask(unittest.TestCase):
+    """Windows map onto the 15-minute slots they touch."""
+
+    def test_aligned_window(self):
+        start = MONDAY + timedelta(hours=9)
+        self.assertEqual(availability.window_mask(start, start + timedelta(hours=1)), slots((36, 40)))
+
+    def test_partial_slots_are_included(self):
+        start = MONDAY + timedelta(hours=9, minutes=10)
+        end = MONDAY + timedelta(hours=9, minutes=50)
+        self.assertEqual(availability.window_mask(start, end), slots((36, 40)))
+
+    def test_wraps_around_the_week(self):
+        start = MONDAY + timedelta(days=6, hours=23)
+        end = start + timedelta(hours=2)
+        self.assertEqual(availability.window_mask(start, end), slots((SLOTS_PER_WEEK - 4, SLOTS_PER_WEEK + 4)))
+
+    def test_long_window_covers_the_week(self):
+        self.assertEqual(availability.window_mask(MONDAY, MONDAY + timedelta(days=8)), FULL_WEEK)
+
+    def test_aware_bounds_are_converted_to_utc(self):
+        tz = timezone(timedelta(hours=2))
+        start = datetime(2025, 6, 2, 11, 0, tzinfo=tz)
+        self.assertEqual(
+            availability.window_mask(start, start + timedelta(hours=1)),
+            availability.window_mask(MONDAY + timedelta(hours=9), MONDAY + timedelta(hours=10)),
+        )
+        # Mixed naive UTC and aware bounds agree as well
+        self.assertEqual(
+            availability.window_mask(MONDAY + timedelta(hours=9), start + timedelta(hours=1)),
+            slots((36, 40)),
+        )
+
+    def test_is_window_available(self):
+        bitmap = slots((36, 40))
+        start = MONDAY + timedelta(hours=9)
+        self.assertTrue(availability.is_window_available(None, start, start + timedelta(days=3)))
+        self.assertTrue(availability.is_window_available(bitmap, start, start + timedelta(hours=1)))
+        self.assertFalse(availability.is_window_available(bitmap, start, start + timedelta(hours=1, minutes=1)))
+        aware = datetime(2025, 6, 2, 5, 0, tzinfo=timezone(timedelta(hours=-4)))
+        self.assertTrue(availability.is_window_available(bitmap, aware, aware + timedelta(hours=1)))
+        naive = aware.replace(tzinfo=None)
+        self.assertFalse(availability.is_window_available(bitmap, naive, naive + timedelta(hours=1)))
+
+    def test_calendar_runs(self):
+        bitmap = slots((36, 40))
+        start = MONDAY + timedelta(hours=8)
+        busy = [(MONDAY + timedelta(hours=9, minutes=30), MONDAY + timedelta(hours=9, minutes=45))]
+        runs = availability.build_calendar_runs(bitmap, busy, start, start + timedelta(hours=3), 15)
+        self.assertEqual(runs, [[0, 4], [1, 2], [0, 1], [1, 1], [0, 4]])
+
+
+if __name__ == "__main__":
+    unittest.main()
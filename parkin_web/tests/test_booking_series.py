@@ -0,0 +1,210 @@
+#!/usr/bin/env python
+
+"""Tests for recurring booking series expansion and conflict checking."""
+
+import unittest
+from datetime import datetime, timedelta
+from itertools import islice
+from types import SimpleNamespace
+
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.postgresql import BIT
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+
+from src.parkin_web import crud
+from src.parkin_web.api.routes import bookings
+from src.parkin_web.core import availability
+from src.parkin_web.core.recurrence import iter_occurrences
+from src.parkin_web.db.base_class import Base
+from src.parkin_web.models.booking import Booking, BookingSeries, BookingStatus
+from src.parkin_web.models.parking_space import ParkingSpace
+from src.parkin_web.models.user import User
+from src.parkin_web.schemas.booking import BookingSeriesCreate
+
+MONDAY_9AM = datetime(2025, 6, 2, 9, 0, 0)
+WEDNESDAY_9AM = MONDAY_9AM + timedelta(days=2)
+DRIVER_ID = 1
+
+
+@compiles(BIT, "sqlite")
+def compile_bit(type_, compiler, **kw):
+    """SQLite has no BIT type, weekly bitmaps are stored as their bit strings."""
+    return "TEXT"
+
+
+def starts(occurrences):
+    return [start for start, _ in occurrences]
+
+
+def make_series(start_time=MONDAY_9AM, hours=2, **fields):
+    values = {
+        "parking_space_id": 1,
+        "start_time": start_time,
+        "end_time": start_time + timedelta(hours=hours),
+        "frequency": "daily",
+        "count": 5,
+    }
+    values.update(fields)
+    return BookingSeriesCreate(**values)
+
+
+class TestIterOccurrences(unittest.TestCase):
+    """Daily and weekly patterns expand into windows of the first one's length."""
+
+    def test_daily(self):
+        occurrences = list(iter_occurrences(MONDAY_9AM, MONDAY_9AM + timedelta(hours=2), frequency="daily", count=3))
+        self.assertEqual(
+            occurrences,
+            [(MONDAY_9AM + timedelta(days=day), MONDAY_9AM + timedelta(days=day, hours=2)) for day in range(3)],
+        )
+
+    def test_daily_until(self):
+        occurrences = iter_occurrences(
+            MONDAY_9AM, MONDAY_9AM + timedelta(hours=1), frequency="daily", interval=2, until=MONDAY_9AM + timedelta(days=6)
+        )
+        self.assertEqual(starts(occurrences), [MONDAY_9AM + timedelta(days=day) for day in (0, 2, 4, 6)])
+
+    def test_weekly_weekdays(self):
+        # Monday of the first week is before the start, so it is skipped
+        occurrences = iter_occurrences(
+            WEDNESDAY_9AM, WEDNESDAY_9AM + timedelta(hours=1), frequency="weekly", weekdays=[4, 0, 2], count=5
+        )
+        self.assertEqual(
+            starts(occurrences),
+            [MONDAY_9AM + timedelta(days=day) for day in (2, 4, 7, 9, 11)],
+        )
+
+    def test_weekly_interval(self):
+        occurrences = iter_occurrences(
+            MONDAY_9AM, MONDAY_9AM + timedelta(hours=1), frequency="weekly", interval=2, count=3
+        )
+        self.assertEqual(starts(occurrences), [MONDAY_9AM + timedelta(weeks=weeks) for weeks in (0, 2, 4)])
+
+    def test_unbounded(self):
+        occurrences = iter_occurrences(MONDAY_9AM, MONDAY_9AM + timedelta(hours=1), frequency="daily")
+        self.assertEqual(len(list(islice(occurrences, 1000))), 1000)
+
+    def test_unsupported_frequency(self):
+        with self.assertRaises(ValueError):
+            list(iter_occurrences(MONDAY_9AM, MONDAY_9AM + timedelta(hours=1), frequency="monthly", count=1))
+
+
+class SeriesTestCase(unittest.TestCase):
+    """SQLite database with a parking space booked on Tuesday, and a canceled booking on Wednesday."""
+
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(
+            self.engine, tables=[ParkingSpace.__table__, Booking.__table__, BookingSeries.__table__]
+        )
+        self.db = Session(self.engine)
+        self.addCleanup(self.engine.dispose)
+        self.addCleanup(self.db.close)
+        self.db.add(ParkingSpace(
+            id=1,
+            title="Driveway",
+            address="1 Main St",
+            city="Springfield",
+            state="IL",
+            zip_code="62701",
+            country="US",
+            hourly_rate=10.0,
+            owner_id=2,
+            bookings_count=0,
+        ))
+        for id, status in ((1, BookingStatus.CONFIRMED), (2, BookingStatus.CANCELED)):
+            self.add_booking(id, MONDAY_9AM + timedelta(days=id, hours=1), status)
+        self.db.commit()
+
+    def add_booking(self, id, start_time, status):
+        self.db.add(Booking(
+            id=id,
+            start_time=start_time,
+            end_time=start_time + timedelta(hours=2),
+            base_price=20.0,
+            service_fee=3.0,
+            total_price=23.0,
+            status=status,
+            user_id=3,
+            parking_space_id=1,
+        ))
+
+
+class TestFindConflicts(SeriesTestCase):
+    """Each occurrence is checked against availability, bookings and earlier occurrences."""
+
+    def test_expand_stops_past_the_limit(self):
+        self.assertEqual(len(crud.booking_series.expand(make_series(count=50), max_occurrences=10)), 11)
+        self.assertEqual(len(crud.booking_series.expand(make_series(count=5), max_occurrences=10)), 5)
+
+    def test_reasons(self):
+        # Available every day but Saturday and Sunday
+        bitmap = availability.compile_weekly_bitmap(
+            [SimpleNamespace(day_of_week=day, start_time="00:00", end_time="00:00", is_available=True) for day in range(5)]
+        )
+        space = SimpleNamespace(id=1, availability_bitmap=bitmap)
+        occurrences = crud.booking_series.expand(make_series(count=7), max_occurrences=10)
+        self.assertEqual(
+            crud.booking_series.find_conflicts(self.db, parking_space=space, occurrences=occurrences),
+            [None, "booked", None, None, None, "unavailable", "unavailable"],
+        )
+
+    def test_overlapping_occurrences(self):
+        # 30 hour windows every day: every other one overlaps the previous booked occurrence
+        occurrences = crud.booking_series.expand(
+            make_series(start_time=MONDAY_9AM + timedelta(days=2), hours=30),
+            max_occurrences=10,
+        )
+        space = SimpleNamespace(id=1, availability_bitmap=None)
+        self.assertEqual(
+            crud.booking_series.find_conflicts(self.db, parking_space=space, occurrences=occurrences),
+            [None, "overlap", None, "overlap", None],
+        )
+
+    def test_no_occurrences(self):
+        self.assertEqual(crud.booking_series.find_conflicts(self.db, parking_space=None, occurrences=[]), [])
+
+
+class TestCreateSeries(SeriesTestCase):
+    """The series route books every free occurrence at once, or none under the reject policy."""
+
+    def setUp(self):
+        super().setUp()
+        self.driver = User(id=DRIVER_ID, is_superuser=False)
+
+    def test_reject_policy(self):
+        with self.assertRaises(HTTPException) as raised:
+            bookings.create_booking_series(db=self.db, series_in=make_series(), current_user=self.driver)
+        self.assertEqual(raised.exception.status_code, 400)
+        self.assertEqual([conflict["reason"] for conflict in raised.exception.detail["conflicts"]], ["booked"])
+        self.assertEqual(self.db.query(BookingSeries).count(), 0)
+
+    def test_skip_policy(self):
+        result = bookings.create_booking_series(
+            db=self.db, series_in=make_series(conflict_policy="skip"), current_user=self.driver
+        )
+        self.assertEqual(len(result["created"]), 4)
+        self.assertEqual(result["skipped"], [
+            {"start_time": MONDAY_9AM + timedelta(days=1), "end_time": MONDAY_9AM + timedelta(days=1, hours=2), "reason": "booked"},
+        ])
+        rows = self.db.query(Booking).filter(Booking.series_id == result["series"].id).order_by(Booking.start_time).all()
+        self.assertEqual([row.start_time for row in rows], [MONDAY_9AM + timedelta(days=day) for day in (0, 2, 3, 4)])
+        self.assertEqual({(row.user_id, row.total_price) for row in rows}, {(DRIVER_ID, 23.0)})
+        self.assertEqual(self.db.get(ParkingSpace, 1).bookings_count, 4)
+
+    def test_nothing_to_book(self):
+        with self.assertRaises(HTTPException) as raised:
+            bookings.create_booking_series(
+                db=self.db,
+                series_in=make_series(
+                    start_time=MONDAY_9AM + timedelta(days=1), count=1, conflict_policy="skip"
+                ),
+                current_user=self.driver,
+            )
+        self.assertEqual(raised.exception.detail, "No occurrence of the series can be booked")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,249 @@
+#!/usr/bin/env python
+
+"""Tests for booking status changes."""
+
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.postgresql import BIT
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+
+from src.parkin_web import crud
+from src.parkin_web.api.routes import bookings
+from src.parkin_web.core.config import settings
+from src.parkin_web.crud.booking import TRANSITIONS
+from src.parkin_web.db.base_class import Base
+from src.parkin_web.jobs import sweeper
+from src.parkin_web.models.booking import Booking, BookingStatus
+from src.parkin_web.models.parking_space import ParkingSpace
+from src.parkin_web.models.user import User
+from src.parkin_web.schemas.booking import BookingBulkAction
+
+NOW = datetime(2025, 6, 1, 12, 0, 0)
+DRIVER_ID = 1
+HOST_ID = 2
+
+
+@compiles(BIT, "sqlite")
+def compile_bit(type_, compiler, **kw):
+    """SQLite has no BIT type, weekly bitmaps are stored as their bit strings."""
+    return "TEXT"
+
+
+class BookingTestCase(unittest.TestCase):
+    """SQLite database with a host's parking space."""
+
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(self.engine, tables=[ParkingSpace.__table__, Booking.__table__])
+        self.db = Session(self.engine)
+        self.addCleanup(self.engine.dispose)
+        self.addCleanup(self.db.close)
+        self.add_space(1, owner_id=HOST_ID)
+
+    def add_space(self, id, owner_id):
+        self.db.add(ParkingSpace(
+            id=id,
+            title="Driveway",
+            address="1 Main St",
+            city="Springfield",
+            state="IL",
+            zip_code="62701",
+            country="US",
+            hourly_rate=10.0,
+            owner_id=owner_id,
+        ))
+        self.db.commit()
+
+    def add_booking(
+        self, id, status, start_time=NOW + timedelta(days=1), hours=2, created_at=NOW, parking_space_id=1
+    ):
+        self.db.add(Booking(
+            id=id,
+            start_time=start_time,
+            end_time=start_time + timedelta(hours=hours),
+            base_price=20.0,
+            service_fee=3.0,
+            total_price=23.0,
+            status=status,
+            user_id=DRIVER_ID,
+            parking_space_id=parking_space_id,
+            created_at=created_at,
+        ))
+        self.db.commit()
+
+    def statuses(self):
+        self.db.expire_all()
+        return {booking.id: booking.status for booking in self.db.query(Booking)}
+
+
+class TestSweeper(BookingTestCase):
+    """Ended bookings are completed and stale pending ones expired, in batches."""
+
+    def setUp(self):
+        super().setUp()
+        past = NOW - timedelta(hours=5)
+        self.add_booking(1, BookingStatus.CONFIRMED, start_time=past)
+        self.add_booking(2, BookingStatus.CONFIRMED, start_time=past)
+        self.add_booking(3, BookingStatus.CONFIRMED, start_time=past)
+        self.add_booking(4, BookingStatus.CONFIRMED, start_time=NOW - timedelta(hours=1))  # Still running
+        self.add_booking(5, BookingStatus.PENDING, created_at=NOW - timedelta(days=2))  # Never confirmed
+        self.add_booking(6, BookingStatus.PENDING, start_time=NOW - timedelta(minutes=1))  # Already started
+        self.add_booking(7, BookingStatus.PENDING)
+        self.add_booking(8, BookingStatus.CANCELED, start_time=past)
+
+    def test_complete_ended(self):
+        self.assertEqual(crud.booking.complete_ended(self.db, now=NOW, batch_size=2), [1, 2, 3])
+        self.assertEqual(crud.booking.complete_ended(self.db, now=NOW, batch_size=2), [])
+
+    def test_expire_pending(self):
+        expired = crud.booking.expire_pending(
+            self.db, now=NOW, created_before=NOW - timedelta(hours=1), batch_size=1
+        )
+        self.assertEqual(expired, [5, 6])
+        self.assertEqual(
+            self.db.get(Booking, 5, populate_existing=True).cancellation_reason,
+            "Expired: not confirmed in time",
+        )
+
+    def test_sweep(self):
+        self.assertEqual(sweeper.sweep_bookings(self.db, now=NOW), {"completed": 3, "expired": 2})
+        self.assertEqual(
+            self.statuses(),
+            {
+                1: BookingStatus.COMPLETED,
+                2: BookingStatus.COMPLETED,
+                3: BookingStatus.COMPLETED,
+                4: BookingStatus.CONFIRMED,
+                5: BookingStatus.CANCELED,
+                6: BookingStatus.CANCELED,
+                7: BookingStatus.PENDING,
+                8: BookingStatus.CANCELED,
+            },
+        )
+
+
+class TestTransition(BookingTestCase):
+    """Status changes only apply from the statuses the action allows."""
+
+    ACTIONS = {
+        "confirm": crud.booking.confirm,
+        "cancel": crud.booking.cancel,
+        "complete": crud.booking.complete,
+        "reject": crud.booking.reject,
+    }
+
+    def test_allowed_statuses(self):
+        for action, (expected, new_status) in TRANSITIONS.items():
+            for status in BookingStatus:
+                with self.subTest(action=action, status=status):
+                    self.db.query(Booking).delete()
+                    self.add_booking(1, status)
+                    updated = self.ACTIONS[action](self.db, id=1)
+                    if status in expected:
+                        self.assertEqual(updated.status, new_status)
+                    else:
+                        self.assertIsNone(updated)
+                    self.assertEqual(self.statuses(), {1: new_status if status in expected else status})
+
+    def test_returned_booking_is_loaded(self):
+        self.add_booking(1, BookingStatus.CONFIRMED)
+        booking = crud.booking.cancel(self.db, id=1, cancellation_reason="Plans changed")
+        self.assertEqual((booking.status, booking.cancellation_reason), (BookingStatus.CANCELED, "Plans changed"))
+        self.assertEqual(booking.total_price, 23.0)
+
+    def test_missing_booking(self):
+        self.assertIsNone(crud.booking.confirm(self.db, id=1))
+
+
+class TestTransitionRoutes(BookingTestCase):
+    """The routes check access first and report a failed guard as a bad request."""
+
+    def setUp(self):
+        super().setUp()
+        self.add_booking(1, BookingStatus.PENDING)
+        self.host = User(id=HOST_ID, is_superuser=False)
+
+    def assertStatusCode(self, status_code, route, current_user):
+        with self.assertRaises(HTTPException) as raised:
+            route(db=self.db, id=1, current_user=current_user)
+        self.assertEqual(raised.exception.status_code, status_code)
+        return raised.exception
+
+    def test_confirm(self):
+        self.assertEqual(bookings.confirm_booking(db=self.db, id=1, current_user=self.host).status, BookingStatus.CONFIRMED)
+        error = self.assertStatusCode(400, bookings.confirm_booking, self.host)
+        self.assertTrue(error.detail.startswith("Cannot confirm a booking"))
+
+    def test_driver_cannot_confirm(self):
+        self.assertStatusCode(403, bookings.confirm_booking, User(id=DRIVER_ID, is_superuser=False))
+        self.assertEqual(self.statuses(), {1: BookingStatus.PENDING})
+
+    def test_missing_booking(self):
+        self.db.query(Booking).delete()
+        self.assertStatusCode(404, bookings.complete_booking, self.host)
+
+
+class TestBulkActions(BookingTestCase):
+    """Bulk actions report a result per booking and update the allowed ones at once."""
+
+    def setUp(self):
+        super().setUp()
+        self.add_space(2, owner_id=3)
+        self.add_booking(1, BookingStatus.PENDING)
+        self.add_booking(2, BookingStatus.CONFIRMED)
+        self.add_booking(3, BookingStatus.PENDING, parking_space_id=2)
+        self.host = User(id=HOST_ID, is_superuser=False)
+        self.driver = User(id=DRIVER_ID, is_superuser=False)
+
+    def results(self, route, ids, current_user, reason=None):
+        result = route(db=self.db, bulk_in=BookingBulkAction(ids=ids, reason=reason), current_user=current_user)
+        return [(item["id"], item["result"], item.get("status")) for item in result["results"]]
+
+    def test_bulk_confirm(self):
+        self.assertEqual(
+            self.results(bookings.bulk_confirm_bookings, [1, 2, 3, 99, 1], self.host),
+            [
+                (1, "updated", BookingStatus.CONFIRMED),
+                (2, "invalid_status", BookingStatus.CONFIRMED),
+                (3, "forbidden", None),
+                (99, "not_found", None),
+            ],
+        )
+        self.assertEqual(
+            self.statuses(), {1: BookingStatus.CONFIRMED, 2: BookingStatus.CONFIRMED, 3: BookingStatus.PENDING}
+        )
+
+    def test_drivers_cancel_but_do_not_reject(self):
+        self.assertEqual(
+            [result for _, result, _ in self.results(bookings.bulk_reject_bookings, [1, 3], self.driver)],
+            ["forbidden", "forbidden"],
+        )
+        self.results(bookings.bulk_cancel_bookings, [1, 2, 3], self.driver, reason="Trip canceled")
+        self.assertEqual(set(self.statuses().values()), {BookingStatus.CANCELED})
+        self.assertEqual(self.db.get(Booking, 3).cancellation_reason, "Trip canceled")
+
+    def test_superuser(self):
+        admin = User(id=99, is_superuser=True)
+        self.results(bookings.bulk_reject_bookings, [1, 3], admin)
+        self.assertEqual(self.statuses()[3], BookingStatus.REJECTED)
+
+    def test_too_many_ids(self):
+        with mock.patch.object(settings, "BULK_ACTION_MAX_IDS", 2):
+            with self.assertRaises(HTTPException) as raised:
+                self.results(bookings.bulk_confirm_bookings, [1, 2, 3], self.host)
+        self.assertEqual(raised.exception.status_code, 400)
+
+    def test_bulk_transition(self):
+        self.assertEqual(crud.booking.bulk_transition(self.db, ids=[], action="confirm"), {})
+        self.assertEqual(
+            crud.booking.bulk_transition(self.db, ids=[1, 2, 3], action="complete"), {2: BookingStatus.COMPLETED}
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
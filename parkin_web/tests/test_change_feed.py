@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+
+"""Tests for change feed cursors and merging."""
+
+import unittest
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.postgresql import BIT
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+
+from src.parkin_web import crud
+from src.parkin_web.core import change_feed
+from src.parkin_web.core.change_feed import Change, Cursor
+from src.parkin_web.core.config import settings
+from src.parkin_web.db.base_class import Base
+from src.parkin_web.models.host_stat import HostDailyStat
+from src.parkin_web.models.parking_space import ParkingSpace
+from src.parkin_web.models.tombstone import Tombstone
+
+T0 = datetime(2025, 6, 1, 12, 0, 0, 250000)
+
+
+@compiles(BIT, "sqlite")
+def compile_bit(type_, compiler, **kw):
+    """SQLite has no BIT type, weekly bitmaps are stored as their bit strings."""
+    return "TEXT"
+
+
+class TestChangeFeed(unittest.TestCase):
+    """Cursors round-trip and pages merge upserts and tombstones in order."""
+
+    def test_cursor_round_trip(self):
+        cursor = Cursor(T0, 42)
+        self.assertEqual(change_feed.decode_cursor(change_feed.encode_cursor(cursor)), cursor)
+        self.assertIsNone(change_feed.decode_cursor(None))
+        self.assertIsNone(change_feed.encode_cursor(None))
+
+    def test_invalid_cursor(self):
+        for value in ("42", "yesterday_1", f"{T0.isoformat()}_x"):
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                change_feed.decode_cursor(value)
+
+    def test_merge_orders_and_limits(self):
+        upserts = [(T0, 1), (T0, 3), (T0 + timedelta(seconds=2), 2)]
+        deletes = [(T0, 2), (T0 + timedelta(seconds=1), 7)]
+        changes = change_feed.merge_changes(upserts, deletes, limit=4)
+        self.assertEqual(
+            changes,
+            [
+                Change(T0, 1, change_feed.UPSERT),
+                Change(T0, 2, change_feed.DELETE),
+                Change(T0, 3, change_feed.UPSERT),
+                Change(T0 + timedelta(seconds=1), 7, change_feed.DELETE),
+            ],
+        )
+        self.assertEqual(changes[-1].cursor, Cursor(T0 + timedelta(seconds=1), 7))
+
+    def test_cursor_expires_with_tombstone_retention(self):
+        retention = timedelta(days=settings.TOMBSTONE_RETENTION_DAYS)
+        now = T0 + retention
+        self.assertFalse(crud.change_feed.is_expired(None, now=now))
+        self.assertFalse(crud.change_feed.is_expired(Cursor(T0, 1), now=now))
+        self.assertTrue(
+            crud.change_feed.is_expired(Cursor(T0 - timedelta(microseconds=1), 1), now=now)
+        )
+
+
+class TestParkingSpaceFeed(unittest.TestCase):
+    """Only real edits of a parking space show up in its feed."""
+
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(
+            self.engine, tables=[ParkingSpace.__table__, HostDailyStat.__table__, Tombstone.__table__]
+        )
+        self.db = Session(self.engine)
+        self.addCleanup(self.engine.dispose)
+        self.addCleanup(self.db.close)
+        self.db.add(ParkingSpace(
+            id=1,
+            title="Driveway",
+            address="1 Main St",
+            city="Springfield",
+            state="IL",
+            zip_code="62701",
+            country="US",
+            hourly_rate=10.0,
+            owner_id=2,
+            views_count=0,
+            created_at=T0,
+            updated_at=T0,
+        ))
+        self.db.commit()
+
+    def feed(self):
+        """Every change, including the ones still settling."""
+        now = datetime.utcnow() + timedelta(seconds=settings.CHANGE_FEED_SETTLE_SECONDS)
+        changes, _ = crud.change_feed.changes_since(self.db, ParkingSpace, now=now)
+        return changes
+
+    def test_views_are_not_changes(self):
+        self.assertEqual(self.feed(), [Change(T0, 1, change_feed.UPSERT)])
+        crud.parking_space.increment_views(self.db, id=1)
+        crud.parking_space.increment_views(self.db, id=1)
+        space = self.db.get(ParkingSpace, 1)
+        self.assertEqual((space.views_count, space.updated_at), (2, T0))
+        self.assertEqual(self.feed(), [Change(T0, 1, change_feed.UPSERT)])
+        self.assertEqual(self.db.query(HostDailyStat.views_count).scalar(), 2)
+        # Unknown spaces are ignored
+        crud.parking_space.increment_views(self.db, id=2)
+
+    def test_edits_are_changes(self):
+        space = self.db.get(ParkingSpace, 1)
+        space.title = "Covered driveway"
+        self.db.commit()
+        [change] = self.feed()
+        self.assertGreater(change.changed_at, T0)
+
+
+if __name__ == "__main__":
+    unittest.main()
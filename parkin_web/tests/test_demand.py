@@ -0,0 +1,187 @@
+#!/usr/bin/env python
+
+"""Tests for demand multipliers and their rollup."""
+
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects.postgresql import BIT
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+
+from src.parkin_web.core import pricing
+from src.parkin_web.core.config import settings
+from src.parkin_web.core.pricing import DemandMultipliers, PricingInputs, QuoteCache, hour_of_week
+from src.parkin_web.db.base_class import Base
+from src.parkin_web.jobs import demand
+from src.parkin_web.models.booking import Booking, BookingStatus
+from src.parkin_web.models.demand_multiplier import DemandMultiplier
+from src.parkin_web.models.parking_space import ParkingSpace
+from src.parkin_web.schemas.booking import BookingCreate
+
+NOW = datetime(2025, 6, 30, 0, 0, 0)  # A Monday, the window starts on Monday June 2
+MONDAY_9AM = datetime(2025, 6, 2, 9, 0, 0)
+
+
+@compiles(BIT, "sqlite")
+def compile_bit(type_, compiler, **kw):
+    """SQLite has no BIT type, weekly bitmaps are stored as their bit strings."""
+    return "TEXT"
+
+
+class TestDemandMultipliers(unittest.TestCase):
+    """Lookups by geo cell and hour of week."""
+
+    def test_hour_of_week(self):
+        self.assertEqual(hour_of_week(MONDAY_9AM), 9)
+        self.assertEqual(hour_of_week(datetime(2025, 6, 8, 23, 30)), 167)
+
+    def test_get(self):
+        multipliers = DemandMultipliers()
+        self.assertTrue(multipliers.replace({("4100:-8701", 9): 1.5}))
+        self.assertEqual(multipliers.get(41.005, -87.005, MONDAY_9AM), 1.5)
+        self.assertEqual(multipliers.get(41.005, -87.005, MONDAY_9AM + timedelta(hours=1)), 1.0)
+        self.assertEqual(multipliers.get(None, None, MONDAY_9AM), 1.0)
+
+    def test_replace_reports_changes(self):
+        multipliers = DemandMultipliers()
+        self.assertFalse(multipliers.replace({}))
+        self.assertTrue(multipliers.replace({("0:0", 0): 1.2}))
+        self.assertFalse(multipliers.replace({("0:0", 0): 1.2}))
+        self.assertEqual(len(multipliers), 1)
+
+    def test_only_the_hourly_rate_is_scaled(self):
+        space = PricingInputs(
+            id=1,
+            latitude=41.005,
+            longitude=-87.005,
+            hourly_rate=4.0,
+            daily_rate=30.0,
+            monthly_rate=None,
+            has_ev_charging=False,
+            ev_charging_rate=None,
+            instant_booking=True,
+        )
+        multipliers = DemandMultipliers()
+        multipliers.replace({("4100:-8701", 9): 1.5})
+        with mock.patch.object(pricing, "demand_multipliers", multipliers):
+            hourly, daily = pricing.quote_batch(
+                [space, space],
+                [
+                    BookingCreate(parking_space_id=1, start_time=MONDAY_9AM, end_time=MONDAY_9AM + timedelta(hours=2)),
+                    BookingCreate(
+                        parking_space_id=1,
+                        start_time=MONDAY_9AM,
+                        end_time=MONDAY_9AM + timedelta(hours=24),
+                        duration_type="daily",
+                    ),
+                ],
+            )
+        self.assertEqual(hourly["base_price"], 12.0)
+        self.assertEqual(daily["base_price"], 30.0)
+
+
+class TestRollup(unittest.TestCase):
+    """The rollup turns booking and view density into stored multipliers."""
+
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        event.listen(
+            self.engine,
+            "connect",
+            lambda connection, _: connection.create_function("pg_try_advisory_xact_lock", 1, lambda key: 1),
+        )
+        Base.metadata.create_all(
+            self.engine, tables=[ParkingSpace.__table__, Booking.__table__, DemandMultiplier.__table__]
+        )
+        self.db = Session(self.engine)
+        self.addCleanup(self.engine.dispose)
+        self.addCleanup(self.db.close)
+        for patcher in (
+            mock.patch.object(pricing, "demand_multipliers", DemandMultipliers()),
+            mock.patch.object(pricing, "quote_cache", QuoteCache(maxsize=10)),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        # One space in each of two cells, and an inactive one in the first cell
+        for id, latitude, views_count, is_active in (
+            (1, 41.005, 30, True),
+            (2, 42.005, 10, True),
+            (3, 41.005, 500, False),
+        ):
+            self.db.add(ParkingSpace(
+                id=id,
+                title="Driveway",
+                address="1 Main St",
+                city="Springfield",
+                state="IL",
+                zip_code="62701",
+                country="US",
+                latitude=latitude,
+                longitude=-87.005,
+                hourly_rate=4.0,
+                owner_id=1,
+                views_count=views_count,
+                is_active=is_active,
+            ))
+        for id, (parking_space_id, start_time, status) in enumerate(
+            [
+                (1, MONDAY_9AM, BookingStatus.CONFIRMED),
+                (1, MONDAY_9AM + timedelta(weeks=1), BookingStatus.COMPLETED),
+                (1, MONDAY_9AM + timedelta(weeks=2), BookingStatus.PENDING),
+                (1, MONDAY_9AM + timedelta(weeks=3), BookingStatus.CANCELED),
+                (1, MONDAY_9AM - timedelta(weeks=1), BookingStatus.CONFIRMED),  # Before the window
+                (2, MONDAY_9AM, BookingStatus.CONFIRMED),
+            ],
+            start=1,
+        ):
+            self.db.add(Booking(
+                id=id,
+                start_time=start_time,
+                end_time=start_time + timedelta(hours=2),
+                base_price=8.0,
+                service_fee=1.2,
+                total_price=9.2,
+                status=status,
+                user_id=1,
+                parking_space_id=parking_space_id,
+            ))
+        self.db.commit()
+
+    def test_multiplier_is_clamped(self):
+        self.assertEqual(demand.rollup_demand_multipliers(self.db, now=NOW), 1)
+        row = self.db.query(DemandMultiplier).one()
+        self.assertEqual(
+            (row.geo_cell, row.hour_of_week, row.multiplier, row.bookings_count, row.views_count),
+            ("4100:-8701", 9, settings.DEMAND_MAX_MULTIPLIER, 3, 30),
+        )
+        self.assertEqual(pricing.demand_multipliers.get(41.005, -87.005, MONDAY_9AM), settings.DEMAND_MAX_MULTIPLIER)
+
+    def test_demand_formula(self):
+        # 4 bookings over 2 spaces and 4 weeks; the first cell has 3 of them and 30 of the 40 views
+        mean_density = 4 / (2 * 168 * 4)
+        expected = 0.7 * (3 / 4 / mean_density) + 0.3 * (30 / 20)
+        with mock.patch.object(settings, "DEMAND_MAX_MULTIPLIER", 1000.0):
+            demand.rollup_demand_multipliers(self.db, now=NOW)
+        self.assertAlmostEqual(self.db.query(DemandMultiplier.multiplier).scalar(), round(expected, 4))
+
+    def test_rollup_replaces_the_table(self):
+        demand.rollup_demand_multipliers(self.db, now=NOW)
+        self.assertEqual(demand.rollup_demand_multipliers(self.db, now=NOW + timedelta(weeks=8)), 0)
+        self.assertEqual(self.db.query(DemandMultiplier).count(), 0)
+
+    def test_reload_drops_quotes_only_on_change(self):
+        demand.rollup_demand_multipliers(self.db, now=NOW)
+        with mock.patch.object(pricing.quote_cache, "invalidate_quotes") as invalidate_quotes:
+            self.assertEqual(demand.load_demand_multipliers(self.db), 1)
+            invalidate_quotes.assert_not_called()
+            pricing.demand_multipliers.replace({})
+            demand.load_demand_multipliers(self.db)
+            invalidate_quotes.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
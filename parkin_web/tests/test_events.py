@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+
+"""Tests for the in-process event broker behind the SSE endpoints."""
+
+import asyncio
+import json
+import threading
+import unittest
+
+from src.parkin_web.core import events
+from src.parkin_web.core.events import EventBroker
+
+
+def parse(chunk):
+    """Parse one text/event-stream chunk into (event, data)."""
+    fields = dict(line.split(": ", 1) for line in chunk.strip().splitlines())
+    return fields["event"], json.loads(fields["data"])
+
+
+class TestEventBroker(unittest.TestCase):
+    """Events reach the right subscriptions, once, from any thread."""
+
+    def run_async(self, coro):
+        return asyncio.run(coro)
+
+    def test_publish_routes_by_topic_once(self):
+        async def scenario():
+            broker = EventBroker(maxsize=10)
+            driver = broker.subscribe([events.user_topic(1)])
+            host = broker.subscribe([events.user_topic(2), events.booking_topic(7)])
+            topics = [events.booking_topic(7), events.user_topic(1), events.user_topic(2)]
+            self.assertEqual(broker.publish(topics, events.BOOKING, {"id": 7}), 2)
+            await asyncio.sleep(0)
+            self.assertEqual(driver.queue.qsize(), 1)
+            self.assertEqual(host.queue.qsize(), 1)
+            broker.unsubscribe(driver)
+            broker.unsubscribe(host)
+            self.assertFalse(broker.has_subscribers())
+            self.assertEqual(broker.publish(topics, events.BOOKING, {"id": 7}), 0)
+
+        self.run_async(scenario())
+
+    def test_publish_from_another_thread(self):
+        async def scenario():
+            broker = EventBroker(maxsize=10)
+            subscription = broker.subscribe([events.cell_topic("1:2")])
+            thread = threading.Thread(
+                target=broker.publish,
+                args=([events.cell_topic("1:2")], events.AVAILABILITY, {"available": True}),
+            )
+            thread.start()
+            thread.join()
+            event = await asyncio.wait_for(subscription.queue.get(), timeout=1)
+            self.assertEqual(event.data, {"available": True})
+
+        self.run_async(scenario())
+
+    def test_stream_formats_events_and_resyncs_slow_clients(self):
+        async def scenario():
+            subscription = events.broker.subscribe([events.user_topic(3)])
+            subscription.queue = asyncio.Queue(1)
+            for id in (1, 2):
+                events.broker.publish([events.user_topic(3)], events.BOOKING, {"id": id})
+            await asyncio.sleep(0)
+
+            disconnected = [False, False, True]
+
+            async def is_disconnected():
+                return disconnected.pop(0)
+
+            chunks = [chunk async for chunk in events.stream(subscription, is_disconnected, heartbeat=0.01)]
+            self.assertEqual(
+                [parse(chunk) for chunk in chunks if not chunk.startswith(":")],
+                [
+                    ("ready", {"topics": [events.user_topic(3)]}),
+                    (events.RESYNC, {}),
+                    (events.BOOKING, {"id": 1}),
+                ],
+            )
+            self.assertFalse(events.broker.has_subscribers())
+
+        self.run_async(scenario())
+
+
+if __name__ == "__main__":
+    unittest.main()
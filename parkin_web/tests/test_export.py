@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+
+"""Tests for the CSV/NDJSON export serializers and export queries."""
+
+import csv
+import io
+import json
+import unittest
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.postgresql import BIT
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+
+from src.parkin_web import crud
+from src.parkin_web.core import export
+from src.parkin_web.core.export import BOOKING_EXPORT_COLUMNS
+from src.parkin_web.db.base_class import Base
+from src.parkin_web.models.booking import Booking, BookingArchive, BookingStatus
+from src.parkin_web.models.parking_space import ParkingSpace
+
+T0 = datetime(2025, 6, 1, 12, 0, 0)
+COLUMNS = ("id", "created_at", "status", "amount", "note")
+ROWS = [
+    (1, T0, BookingStatus.CONFIRMED, 20.5, None),
+    (2, date(2025, 6, 2), BookingStatus.CANCELED, 0.0, 'says "hi", twice'),
+    (3, T0, "pending", 7.0, "line\nbreak"),
+]
+
+
+@compiles(BIT, "sqlite")
+def compile_bit(type_, compiler, **kw):
+    """SQLite has no BIT type, weekly bitmaps are stored as their bit strings."""
+    return "TEXT"
+
+
+class TestSerializers(unittest.TestCase):
+    """Rows are written in chunks, with enums and dates as strings."""
+
+    def test_csv(self):
+        chunks = list(export.iter_csv(ROWS, COLUMNS, chunk_rows=2))
+        self.assertEqual(len(chunks), 2)
+        self.assertEqual(
+            list(csv.reader(io.StringIO("".join(chunks)))),
+            [
+                list(COLUMNS),
+                ["1", "2025-06-01T12:00:00", "confirmed", "20.5", ""],
+                ["2", "2025-06-02", "canceled", "0.0", 'says "hi", twice'],
+                ["3", "2025-06-01T12:00:00", "pending", "7.0", "line\nbreak"],
+            ],
+        )
+
+    def test_csv_without_rows(self):
+        self.assertEqual(list(export.iter_csv([], COLUMNS)), [",".join(COLUMNS) + "\r\n"])
+
+    def test_ndjson(self):
+        chunks = list(export.iter_ndjson(ROWS, COLUMNS, chunk_rows=2))
+        self.assertEqual(len(chunks), 2)
+        self.assertTrue(all(chunk.endswith("\n") for chunk in chunks))
+        objects = [json.loads(line) for line in "".join(chunks).splitlines()]
+        self.assertEqual(
+            objects[0], {"id": 1, "created_at": "2025-06-01T12:00:00", "status": "confirmed", "amount": 20.5, "note": None}
+        )
+        self.assertEqual([obj["note"] for obj in objects[1:]], ['says "hi", twice', "line\nbreak"])
+
+    def test_ndjson_without_rows(self):
+        self.assertEqual(list(export.iter_ndjson([], COLUMNS)), [])
+
+    def test_iter_export(self):
+        self.assertEqual("".join(export.iter_export(ROWS, COLUMNS, "csv")), "".join(export.iter_csv(ROWS, COLUMNS)))
+        self.assertEqual("".join(export.iter_export(ROWS, COLUMNS, "ndjson")), "".join(export.iter_ndjson(ROWS, COLUMNS)))
+
+
+class TestBookingExport(unittest.TestCase):
+    """Live and archived bookings are exported together, in creation order."""
+
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(
+            self.engine, tables=[ParkingSpace.__table__, Booking.__table__, BookingArchive.__table__]
+        )
+        self.db = Session(self.engine)
+        self.addCleanup(self.engine.dispose)
+        self.addCleanup(self.db.close)
+        for id, owner_id in ((1, 2), (2, 3)):
+            self.db.add(ParkingSpace(
+                id=id,
+                title="Driveway",
+                address="1 Main St",
+                city="Springfield",
+                state="IL",
+                zip_code="62701",
+                country="US",
+                hourly_rate=10.0,
+                owner_id=owner_id,
+            ))
+        booking = {
+            "start_time": T0,
+            "end_time": T0 + timedelta(hours=2),
+            "base_price": 20.0,
+            "service_fee": 3.0,
+            "total_price": 23.0,
+            "user_id": 1,
+        }
+        for id, days, status, parking_space_id in (
+            (1, 1, BookingStatus.CONFIRMED, 1),
+            (2, 3, BookingStatus.PENDING, 2),
+            (3, 10, BookingStatus.CONFIRMED, 1),  # Outside the range
+        ):
+            self.db.add(Booking(
+                id=id, created_at=T0 + timedelta(days=days), status=status, parking_space_id=parking_space_id, **booking
+            ))
+        self.db.execute(
+            BookingArchive.__table__.insert().values(
+                id=4, created_at=T0 + timedelta(days=2), status=BookingStatus.COMPLETED, parking_space_id=1, **booking
+            )
+        )
+        self.db.commit()
+
+    def export(self, **filters):
+        rows = crud.booking.iter_export(self.db, start=T0, end=T0 + timedelta(days=7), **filters)
+        return [dict(zip(BOOKING_EXPORT_COLUMNS, row)) for row in rows]
+
+    def test_live_and_archived(self):
+        self.assertEqual([row["id"] for row in self.export()], [1, 4, 2])
+
+    def test_filters(self):
+        self.assertEqual([row["id"] for row in self.export(host_id=2)], [1, 4])
+        self.assertEqual([row["id"] for row in self.export(status=BookingStatus.CONFIRMED)], [1])
+
+
+if __name__ == "__main__":
+    unittest.main()
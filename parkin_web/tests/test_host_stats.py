@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+
+"""Tests for the host stats rollup job."""
+
+import unittest
+from datetime import date, datetime, timedelta
+from unittest import mock
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from src.parkin_web import crud
+from src.parkin_web.core.config import settings
+from src.parkin_web.db.base_class import Base
+from src.parkin_web.jobs.host_stats import rollup_host_stats
+from src.parkin_web.models.host_stat import HostStatRollup
+
+T0 = datetime(2025, 6, 1, 12, 0, 0)
+
+
+class TestRollupWatermark(unittest.TestCase):
+    """Each run picks up the changes since the previous successful run."""
+
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(self.engine, tables=[HostStatRollup.__table__])
+        self.db = Session(self.engine)
+        self.addCleanup(self.engine.dispose)
+        self.addCleanup(self.db.close)
+
+        patcher = mock.patch.object(crud.host_stat, "get_dirty_days", return_value=[date(2025, 6, 1)])
+        self.get_dirty_days = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(crud.host_stat, "rollup_days", return_value=3)
+        self.rollup_days = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def since(self):
+        return self.get_dirty_days.call_args.kwargs["since"]
+
+    def test_first_run(self):
+        self.assertEqual(rollup_host_stats(self.db, now=T0), 3)
+        interval = timedelta(seconds=settings.HOST_STATS_ROLLUP_INTERVAL_SECONDS)
+        self.assertEqual(self.since(), T0 - 2 * interval)
+        self.assertEqual(crud.host_stat.get_last_rollup_time(self.db), T0)
+
+    def test_runs_continue_from_the_previous_one(self):
+        overlap = timedelta(seconds=settings.HOST_STATS_ROLLUP_OVERLAP_SECONDS)
+        rollup_host_stats(self.db, now=T0)
+        # The job didn't run for a day, the next run still starts from the last one
+        rollup_host_stats(self.db, now=T0 + timedelta(days=1))
+        self.assertEqual(self.since(), T0 - overlap)
+        rollup_host_stats(self.db, now=T0 + timedelta(days=1, minutes=10))
+        self.assertEqual(self.since(), T0 + timedelta(days=1) - overlap)
+
+    def test_failed_run_is_not_recorded(self):
+        rollup_host_stats(self.db, now=T0)
+        self.rollup_days.side_effect = RuntimeError("database went away")
+        with self.assertRaises(RuntimeError):
+            rollup_host_stats(self.db, now=T0 + timedelta(hours=1))
+        self.assertEqual(crud.host_stat.get_last_rollup_time(self.db), T0)
+
+    def test_explicit_since(self):
+        rollup_host_stats(self.db, now=T0, since=T0 - timedelta(days=30))
+        self.assertEqual(self.since(), T0 - timedelta(days=30))
+        rollup = self.db.query(HostStatRollup).one()
+        self.assertEqual((rollup.days_count, rollup.rows_count), (1, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+
+"""Tests for idempotency key reservation, replay and lease takeover."""
+
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from src.parkin_web import crud
+from src.parkin_web.api.idempotency import idempotent
+from src.parkin_web.db.base_class import Base
+from src.parkin_web.models.idempotency_key import IdempotencyKey
+
+T0 = datetime(2025, 6, 1, 12, 0, 0)
+USER_ID = 1
+
+
+class Payload(BaseModel):
+    value: int
+
+
+class Result(BaseModel):
+    id: int
+
+    class Config:
+        orm_mode = True
+
+
+class IdempotencyTestCase(unittest.TestCase):
+    """SQLite database with the idempotency key table."""
+
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(self.engine, tables=[IdempotencyKey.__table__])
+        self.db = Session(self.engine)
+        self.addCleanup(self.engine.dispose)
+        self.addCleanup(self.db.close)
+
+    def acquire(self, token, now=T0, fingerprint="f1"):
+        return crud.idempotency_key.acquire(
+            self.db,
+            user_id=USER_ID,
+            key="k1",
+            fingerprint=fingerprint,
+            now=now,
+            lease_token=token,
+            locked_until=now + timedelta(seconds=60),
+            expires_at=now + timedelta(days=1),
+        )
+
+
+class TestAcquire(IdempotencyTestCase):
+    """Only one request holds a key, until its lease runs out."""
+
+    def test_first_request_acquires(self):
+        record, acquired = self.acquire("a")
+        self.assertTrue(acquired)
+        self.assertEqual(record.lease_token, "a")
+
+    def test_key_in_flight_is_not_acquired(self):
+        self.acquire("a")
+        record, acquired = self.acquire("b", now=T0 + timedelta(seconds=30))
+        self.assertFalse(acquired)
+        self.assertEqual(record.lease_token, "a")
+
+    def test_completed_key_is_not_taken_over(self):
+        record, _ = self.acquire("a")
+        crud.idempotency_key.complete(
+            self.db, id=record.id, lease_token="a", status_code=200, response_body="{}"
+        )
+        _, acquired = self.acquire("b", now=T0 + timedelta(hours=1))
+        self.assertFalse(acquired)
+
+    def test_abandoned_key_is_taken_over(self):
+        self.acquire("a")
+        record, acquired = self.acquire("b", now=T0 + timedelta(seconds=61))
+        self.assertTrue(acquired)
+        self.assertEqual(record.lease_token, "b")
+
+
+class TestLeaseToken(IdempotencyTestCase):
+    """A request whose lease was taken over can't touch the new holder's key."""
+
+    def setUp(self):
+        super().setUp()
+        record, _ = self.acquire("a")
+        self.id = record.id
+        self.acquire("b", now=T0 + timedelta(seconds=61))
+
+    def test_stale_complete_is_ignored(self):
+        self.assertFalse(crud.idempotency_key.complete(
+            self.db, id=self.id, lease_token="a", status_code=200, response_body='{"id": 1}'
+        ))
+        self.assertIsNone(self.db.get(IdempotencyKey, self.id, populate_existing=True).status_code)
+        self.assertTrue(crud.idempotency_key.complete(
+            self.db, id=self.id, lease_token="b", status_code=200, response_body='{"id": 2}'
+        ))
+        self.assertEqual(self.db.get(IdempotencyKey, self.id, populate_existing=True).response_body, '{"id": 2}')
+
+    def test_stale_release_is_ignored(self):
+        crud.idempotency_key.release(self.db, id=self.id, lease_token="a")
+        self.assertIsNotNone(self.db.get(IdempotencyKey, self.id, populate_existing=True))
+        crud.idempotency_key.release(self.db, id=self.id, lease_token="b")
+        self.assertIsNone(self.db.get(IdempotencyKey, self.id, populate_existing=True))
+
+
+class TestIdempotent(IdempotencyTestCase):
+    """The handler runs once per key and retries get its response back."""
+
+    def run_request(self, handler, value=1):
+        return idempotent(
+            self.db,
+            key="k1",
+            user_id=USER_ID,
+            scope="POST /things/",
+            payload=Payload(value=value),
+            response_model=Result,
+            handler=handler,
+        )
+
+    def test_replay(self):
+        handler = mock.Mock(return_value=Result(id=7))
+        first = self.run_request(handler)
+        second = self.run_request(handler)
+        handler.assert_called_once()
+        self.assertEqual(second.body, first.body)
+        self.assertEqual(second.headers["Idempotent-Replayed"], "true")
+
+    def test_different_payload_is_rejected(self):
+        self.run_request(lambda: Result(id=7))
+        with self.assertRaises(HTTPException) as raised:
+            self.run_request(lambda: Result(id=8), value=2)
+        self.assertEqual(raised.exception.status_code, 422)
+
+    def test_failed_request_releases_the_key(self):
+        with self.assertRaises(ValueError):
+            self.run_request(mock.Mock(side_effect=ValueError))
+        self.assertEqual(self.db.query(IdempotencyKey).count(), 0)
+        self.assertEqual(self.run_request(lambda: Result(id=7)).status_code, 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python
+
+"""Tests for ledger posting, opening balances and reconciliation."""
+
+import unittest
+from datetime import datetime, timedelta
+
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.postgresql import BIT
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+
+from src.parkin_web import crud
+from src.parkin_web.api.routes import payments
+from src.parkin_web.crud.ledger import expected_totals
+from src.parkin_web.db.base_class import Base
+from src.parkin_web.models.booking import Booking, BookingArchive, BookingStatus
+from src.parkin_web.models.ledger import LedgerAccount, LedgerEntry
+from src.parkin_web.models.parking_space import ParkingSpace
+from src.parkin_web.models.payment import HostPayout, Payment, PaymentStatus
+from src.parkin_web.models.user import User
+from src.parkin_web.schemas.payment import PaymentUpdate
+
+T0 = datetime(2025, 6, 1, 12, 0, 0)
+DRIVER_ID = 1
+HOST_ID = 2
+
+
+@compiles(BIT, "sqlite")
+def compile_bit(type_, compiler, **kw):
+    """SQLite has no BIT type, weekly bitmaps are stored as their bit strings."""
+    return "TEXT"
+
+
+class TestExpectedTotals(unittest.TestCase):
+    """What the entries of a payment must sum to."""
+
+    def test_completed(self):
+        self.assertEqual(expected_totals(PaymentStatus.COMPLETED, 20.0, None, 14.0), (20.0, 14.0))
+
+    def test_refunded(self):
+        self.assertEqual(expected_totals(PaymentStatus.PARTIALLY_REFUNDED, 20.0, 5.0, 10.5), (15.0, 10.5))
+        self.assertEqual(expected_totals(PaymentStatus.REFUNDED, 20.0, 20.0, 0.0), (0.0, 0.0))
+
+    def test_failed(self):
+        self.assertEqual(expected_totals(PaymentStatus.FAILED, 20.0, None, 14.0), (0.0, 0.0))
+        self.assertEqual(expected_totals("failed", 20.0, None, 14.0), (0.0, 0.0))
+
+
+class LedgerTestCase(unittest.TestCase):
+    """SQLite database with a host's parking space and a driver's bookings."""
+
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(
+            self.engine,
+            tables=[
+                ParkingSpace.__table__,
+                Booking.__table__,
+                BookingArchive.__table__,
+                HostPayout.__table__,
+                Payment.__table__,
+                LedgerAccount.__table__,
+                LedgerEntry.__table__,
+            ],
+        )
+        self.db = Session(self.engine)
+        self.addCleanup(self.engine.dispose)
+        self.addCleanup(self.db.close)
+        self.db.add(ParkingSpace(
+            id=1,
+            title="Driveway",
+            address="1 Main St",
+            city="Springfield",
+            state="IL",
+            zip_code="62701",
+            country="US",
+            hourly_rate=10.0,
+            owner_id=HOST_ID,
+        ))
+        self.db.commit()
+
+    def add_payment(self, id, **fields):
+        """Add a paid booking, without ledger entries."""
+        values = {
+            "amount": 20.0,
+            "base_amount": 18.0,
+            "service_fee": 2.0,
+            "status": PaymentStatus.COMPLETED,
+            "host_payout_amount": 14.0,
+            "host_payout_status": "pending",
+        }
+        values.update(fields)
+        self.db.add(Payment(id=id, **values))
+        self.db.add(Booking(
+            id=id,
+            start_time=T0,
+            end_time=T0 + timedelta(hours=2),
+            base_price=18.0,
+            service_fee=2.0,
+            total_price=20.0,
+            status=BookingStatus.CONFIRMED,
+            user_id=DRIVER_ID,
+            parking_space_id=1,
+            payment_id=id,
+        ))
+        self.db.commit()
+
+    def balances(self):
+        return {
+            (account.account_type, account.account_id): account.balance
+            for account in self.db.query(LedgerAccount)
+        }
+
+
+class TestPost(LedgerTestCase):
+    """Entries keep a running balance per account."""
+
+    def test_running_balance(self):
+        for amount in (20.0, -5.0, 7.5):
+            crud.ledger.post(
+                self.db, account_type="user", account_id=DRIVER_ID, entry_type="payment", amount=amount
+            )
+        self.db.commit()
+        entries = crud.ledger.get_statement(self.db, account_type="user", account_id=DRIVER_ID)
+        self.assertEqual([entry.balance for entry in entries], [22.5, 15.0, 20.0])
+        account = crud.ledger.get_balance(self.db, account_type="user", account_id=DRIVER_ID)
+        self.assertEqual((account.balance, account.entries_count, account.last_entry_id), (22.5, 3, entries[0].id))
+
+    def test_zero_amount_is_not_posted(self):
+        self.assertIsNone(
+            crud.ledger.post(self.db, account_type="host", account_id=HOST_ID, entry_type="refund", amount=0.0)
+        )
+        self.assertEqual(self.db.query(LedgerEntry).count(), 0)
+
+    def test_refund_posts_the_increment(self):
+        self.add_payment(1)
+        crud.payment.refund(self.db, id=1, refund_amount=5.0)
+        crud.payment.refund(self.db, id=1, refund_amount=8.0)
+        self.assertEqual(self.balances(), {("user", DRIVER_ID): -8.0, ("host", HOST_ID): -8.0})
+
+
+class TestBackfill(LedgerTestCase):
+    """Opening entries bring payments that predate the ledger in line with reconcile."""
+
+    def test_backfill(self):
+        self.add_payment(1)
+        self.add_payment(2, status=PaymentStatus.PARTIALLY_REFUNDED, refund_amount=5.0, host_payout_amount=10.5)
+        self.add_payment(3, status=PaymentStatus.FAILED)
+        # Paid out per payment before host payouts existed
+        self.add_payment(4, host_payout_status="completed")
+        self.db.add(HostPayout(id=1, host_id=HOST_ID, amount=14.0, status="completed", eligible_before=T0))
+        self.db.commit()
+        self.add_payment(5, host_payout_status="completed", host_payout_id=1)
+        self.assertEqual(len(crud.ledger.reconcile(self.db)), 9)
+
+        self.assertEqual(crud.payment.backfill_ledger(self.db, batch_size=2), 10)
+        self.assertEqual(crud.ledger.reconcile(self.db), [])
+        self.assertEqual(self.balances(), {("user", DRIVER_ID): 75.0, ("host", HOST_ID): 24.5})
+        # Payments with entries are left alone, so a rerun posts nothing
+        self.assertEqual(crud.payment.backfill_ledger(self.db), 0)
+
+    def test_payments_with_entries_are_skipped(self):
+        self.add_payment(1)
+        crud.ledger.post(
+            self.db, account_type="user", account_id=DRIVER_ID, entry_type="payment", amount=20.0, payment_id=1
+        )
+        self.db.commit()
+        self.assertEqual(crud.payment.backfill_ledger(self.db), 0)
+        self.assertEqual([d["check"] for d in crud.ledger.reconcile(self.db)], ["host_earnings"])
+
+
+class TestUpdatePayment(LedgerTestCase):
+    """Admins can't change amounts or statuses behind the ledger's back."""
+
+    def setUp(self):
+        super().setUp()
+        self.add_payment(1)
+        self.admin = User(id=99, is_superuser=True)
+
+    def test_ledger_fields_are_rejected(self):
+        for change in (
+            {"status": PaymentStatus.REFUNDED},
+            {"refund_amount": 20.0},
+            {"host_payout_amount": 0.0},
+            {"host_payout_status": "completed"},
+        ):
+            with self.subTest(change=change):
+                with self.assertRaises(HTTPException) as raised:
+                    payments.update_payment(
+                        db=self.db, id=1, payment_in=PaymentUpdate(**change), current_user=self.admin
+                    )
+                self.assertEqual(raised.exception.status_code, 400)
+        self.assertEqual(self.db.get(Payment, 1).status, PaymentStatus.COMPLETED)
+
+    def test_other_fields_are_updated(self):
+        payment_in = PaymentUpdate(receipt_url="https://example.com/r/1", status=PaymentStatus.COMPLETED)
+        payment = payments.update_payment(db=self.db, id=1, payment_in=payment_in, current_user=self.admin)
+        self.assertEqual(payment.receipt_url, "https://example.com/r/1")
+
+
+if __name__ == "__main__":
+    unittest.main()
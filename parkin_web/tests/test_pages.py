@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+
+"""Tests for the rendered page cache of the template pages."""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from fastapi.templating import Jinja2Templates
+from fastapi.testclient import TestClient
+
+import main
+
+
+class TemplatesTestCase(unittest.TestCase):
+    """Page cache over a temporary template directory."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.templates_dir = directory.name
+        self.write("base.html", "<html>{% block content %}{% endblock %}</html>")
+        self.write("index.html", '{% extends "base.html" %}{% block content %}Home {{ locale }}{% endblock %}')
+        patcher = mock.patch.object(main, "templates", Jinja2Templates(directory=self.templates_dir))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = main.PageCache(self.templates_dir)
+
+    def write(self, name, source, mtime=1_700_000_000):
+        path = os.path.join(self.templates_dir, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(source)
+        os.utime(path, (mtime, mtime))
+
+
+class TestPageCache(TemplatesTestCase):
+    """Pages are rendered once per template and locale."""
+
+    def test_render_once(self):
+        page = self.cache.get("index.html")
+        self.assertEqual(page.body, b"<html>Home en</html>")
+        self.assertEqual(page.last_modified.timestamp(), 1_700_000_000)
+        self.assertTrue(page.etag.startswith('"') and page.etag.endswith('"'))
+        with mock.patch.object(main.templates, "get_template") as get_template:
+            self.assertIs(self.cache.get("index.html"), page)
+            get_template.assert_not_called()
+
+    def test_template_change_drops_the_cache_in_dev_mode(self):
+        page = self.cache.get("index.html")
+        # base.html is not a page, but every page extends it
+        self.write("base.html", "<main>{% block content %}{% endblock %}</main>", mtime=1_700_000_100)
+        main.templates.env.cache.clear()
+        with mock.patch.object(main, "DEV_MODE", True):
+            changed = self.cache.get("index.html")
+        self.assertEqual(changed.body, b"<main>Home en</main>")
+        self.assertNotEqual(changed.etag, page.etag)
+        self.assertEqual(changed.last_modified.timestamp(), 1_700_000_100)
+
+    def test_cache_is_kept_in_production(self):
+        page = self.cache.get("index.html")
+        self.write("index.html", "Changed", mtime=1_700_000_100)
+        with mock.patch.object(main, "DEV_MODE", False):
+            self.assertIs(self.cache.get("index.html"), page)
+
+
+class TestResolve(TemplatesTestCase):
+    """Catch-all paths map to page templates or internal links, anything else to None."""
+
+    def setUp(self):
+        super().setUp()
+        self.write("auth/login.html", "<script>window.location.href = '/dashboard';</script>")
+        self.write(
+            "about.html",
+            '<a href="/terms">Terms</a> <a href="/faq/?q=1">FAQ</a> <form action="/contact-us"></form>'
+            '<link href="/static/app.css"> <a href="/api/v1/ping">API</a> <a href="https://example.com/x">x</a>',
+        )
+
+    def test_first_lookup(self):
+        self.assertEqual(self.cache.resolve("about"), "about.html")
+
+    def test_resolve(self):
+        for path, template in (
+            ("about", "about.html"),
+            ("/about/", "about.html"),
+            ("auth/login", "auth/login.html"),
+            ("dashboard", "index.html"),
+            ("terms", "index.html"),
+            ("faq", "index.html"),
+            ("contact-us", "index.html"),
+            ("base", None),
+            ("", None),
+            ("static/app.css", None),
+            ("wp-admin", None),
+            (".env", None),
+        ):
+            with self.subTest(path=path):
+                self.assertEqual(self.cache.resolve(path), template)
+
+    def test_linked_paths(self):
+        self.assertEqual(self.cache.linked_paths(), {"dashboard", "terms", "faq", "contact-us"})
+
+    def test_internal_link_re(self):
+        self.assertEqual(
+            main.INTERNAL_LINK_RE.findall(
+                """<a href='/a'> <form action = "/b"> location = '/c'; location.replace("/d?next=1") """
+                """location.assign('/e#top') <a href="https://example.com/f"> <img src="/g">"""
+            ),
+            ["/a", "/b", "/c", "/d", "/e"],
+        )
+
+    def test_table_is_rebuilt_in_dev_mode(self):
+        self.assertIsNone(self.cache.resolve("help"))
+        self.write("help.html", "Help", mtime=1_700_000_100)
+        with mock.patch.object(main, "DEV_MODE", True):
+            self.assertEqual(self.cache.resolve("help"), "help.html")
+
+
+class TestNegotiateLocale(unittest.TestCase):
+    """Only supported locales are picked, in header order."""
+
+    def test_negotiate_locale(self):
+        self.assertEqual(main.negotiate_locale(None), "en")
+        self.assertEqual(main.negotiate_locale("fr-FR,fr;q=0.9,en-US;q=0.8"), "en")
+        self.assertEqual(main.negotiate_locale("de"), main.DEFAULT_LOCALE)
+
+
+class TestPageRoutes(unittest.TestCase):
+    """Template routes answer with validators and honor conditional requests."""
+
+    def setUp(self):
+        self.client = TestClient(main.app)
+
+    def test_validators(self):
+        response = self.client.get("/pricing")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["vary"], "Accept-Language")
+        self.assertIn("ETag", response.headers)
+        self.assertIn("Last-Modified", response.headers)
+        self.assertEqual(self.client.get("/pricing").headers["etag"], response.headers["etag"])
+
+    def test_if_none_match(self):
+        etag = self.client.get("/").headers["etag"]
+        for header in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+            with self.subTest(header=header):
+                response = self.client.get("/", headers={"If-None-Match": header})
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response.content, b"")
+        self.assertEqual(self.client.get("/", headers={"If-None-Match": '"other"'}).status_code, 200)
+
+    def test_if_modified_since(self):
+        last_modified = self.client.get("/about").headers["last-modified"]
+        self.assertEqual(self.client.get("/about", headers={"If-Modified-Since": last_modified}).status_code, 304)
+        self.assertEqual(
+            self.client.get("/about", headers={"If-Modified-Since": "Thu, 01 Jan 1970 00:00:00 GMT"}).status_code,
+            200,
+        )
+        self.assertEqual(self.client.get("/about", headers={"If-Modified-Since": "yesterday"}).status_code, 200)
+
+    def test_catch_all(self):
+        response = self.client.get("/dashboard")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, self.client.get("/").content)
+        response = self.client.get("/auth/login")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("ETag", response.headers)
+
+    def test_unknown_paths_are_not_found(self):
+        for path in ("/wp-admin", "/.env", "/base", "/wp-login.php"):
+            with self.subTest(path=path):
+                with mock.patch.object(main.templates, "get_template") as get_template:
+                    response = self.client.get(path)
+                    get_template.assert_not_called()
+                self.assertEqual(response.status_code, 404)
+                self.assertEqual(response.headers["content-type"], "application/json")
+                self.assertEqual(response.content, main.NOT_FOUND_BODY)
+
+
+if __name__ == "__main__":
+    unittest.main()
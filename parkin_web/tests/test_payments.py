@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+
+"""Tests for payments whose booking has been archived."""
+
+import unittest
+from datetime import datetime, timedelta
+
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.postgresql import BIT
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+
+from src.parkin_web import crud
+from src.parkin_web.api.routes import payments
+from src.parkin_web.db.base_class import Base
+from src.parkin_web.models.booking import Booking, BookingArchive, BookingStatus
+from src.parkin_web.models.ledger import LedgerAccount, LedgerEntry
+from src.parkin_web.models.parking_space import ParkingSpace
+from src.parkin_web.models.payment import HostPayout, Payment, PaymentStatus
+from src.parkin_web.models.user import User
+from src.parkin_web.schemas.payment import Payment as PaymentSchema
+
+T0 = datetime(2025, 6, 1, 12, 0, 0)
+DRIVER_ID = 1
+HOST_ID = 2
+
+
+@compiles(BIT, "sqlite")
+def compile_bit(type_, compiler, **kw):
+    """SQLite has no BIT type, weekly bitmaps are stored as their bit strings."""
+    return "TEXT"
+
+
+class TestArchivedBookingPayment(unittest.TestCase):
+    """A paid booking moved to the archive keeps its payment readable and refundable."""
+
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(
+            self.engine,
+            tables=[
+                ParkingSpace.__table__,
+                Booking.__table__,
+                BookingArchive.__table__,
+                HostPayout.__table__,
+                Payment.__table__,
+                LedgerAccount.__table__,
+                LedgerEntry.__table__,
+            ],
+        )
+        self.db = Session(self.engine)
+        self.addCleanup(self.engine.dispose)
+        self.addCleanup(self.db.close)
+
+        self.db.add(ParkingSpace(
+            id=1,
+            title="Driveway",
+            address="1 Main St",
+            city="Springfield",
+            state="IL",
+            zip_code="62701",
+            country="US",
+            hourly_rate=10.0,
+            owner_id=HOST_ID,
+        ))
+        self.db.add(Payment(
+            id=10,
+            amount=20.0,
+            base_amount=18.0,
+            service_fee=2.0,
+            status=PaymentStatus.COMPLETED,
+            payment_method="credit_card",
+            host_payout_amount=14.0,
+            host_payout_status="pending",
+        ))
+        self.db.add(Booking(
+            id=5,
+            start_time=T0,
+            end_time=T0 + timedelta(hours=2),
+            base_price=18.0,
+            service_fee=2.0,
+            total_price=20.0,
+            status=BookingStatus.COMPLETED,
+            user_id=DRIVER_ID,
+            parking_space_id=1,
+            payment_id=10,
+        ))
+        self.db.commit()
+        self.archive(5)
+
+        self.host = User(id=HOST_ID, is_superuser=False)
+        self.driver = User(id=DRIVER_ID, is_superuser=False)
+
+    def archive(self, booking_id):
+        """Move a booking into the archive like archive_terminal does."""
+        columns = [column.name for column in Booking.__table__.columns]
+        row = self.db.execute(Booking.__table__.select().where(Booking.id == booking_id)).one()
+        self.db.execute(BookingArchive.__table__.insert().values(**{name: row._mapping[name] for name in columns}))
+        self.db.execute(Booking.__table__.delete().where(Booking.id == booking_id))
+        self.db.commit()
+
+    def test_booking_id(self):
+        payment = self.db.get(Payment, 10)
+        self.assertIsNone(payment.booking)
+        self.assertEqual(payment.booking_id, 5)
+        self.assertEqual(PaymentSchema.from_orm(payment).booking_id, 5)
+
+    def test_user_payments(self):
+        self.assertEqual([p.id for p in crud.payment.get_user_payments(self.db, user_id=DRIVER_ID)], [10])
+        self.assertEqual(crud.payment.get_user_payments(self.db, user_id=HOST_ID), [])
+
+    def test_get_payment(self):
+        payment = payments.get_payment(db=self.db, id=10, current_user=self.driver)
+        self.assertEqual(payment.booking_id, 5)
+        with self.assertRaises(HTTPException) as raised:
+            payments.get_payment(db=self.db, id=10, current_user=User(id=3, is_superuser=False))
+        self.assertEqual(raised.exception.status_code, 403)
+
+    def test_refund_payment(self):
+        payment = payments.refund_payment(
+            db=self.db, id=10, refund_amount=20.0, refund_reason="duplicate", current_user=self.host
+        )
+        self.assertEqual(payment.status, PaymentStatus.REFUNDED)
+        self.assertEqual(payment.host_payout_status, "canceled")
+        balances = {
+            (account.account_type, account.account_id): account.balance
+            for account in self.db.query(LedgerAccount)
+        }
+        self.assertEqual(balances, {("user", DRIVER_ID): -20.0, ("host", HOST_ID): -14.0})
+        # The archived booking is terminal and stays as it was
+        self.assertEqual(self.db.get(BookingArchive, 5).status, BookingStatus.COMPLETED)
+
+    def test_unlinked_payment(self):
+        self.db.execute(BookingArchive.__table__.delete())
+        self.db.commit()
+        for route, kwargs in (
+            (payments.get_payment, {}),
+            (payments.refund_payment, {"refund_amount": 5.0}),
+        ):
+            with self.subTest(route=route.__name__):
+                with self.assertRaises(HTTPException) as raised:
+                    route(db=self.db, id=10, current_user=self.host, **kwargs)
+                self.assertEqual(raised.exception.status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
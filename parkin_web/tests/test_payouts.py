@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+
+"""Tests for host payout settlement."""
+
+import unittest
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.postgresql import BIT
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+
+from src.parkin_web import crud
+from src.parkin_web.core.config import settings
+from src.parkin_web.core.payouts import PayoutError, StubPayoutProvider
+from src.parkin_web.db.base_class import Base
+from src.parkin_web.jobs import payouts
+from src.parkin_web.models.booking import Booking, BookingArchive, BookingStatus
+from src.parkin_web.models.ledger import LedgerAccount, LedgerEntry
+from src.parkin_web.models.parking_space import ParkingSpace
+from src.parkin_web.models.payment import HostPayout, Payment, PaymentStatus
+
+NOW = datetime(2025, 6, 30, 12, 0, 0)
+PAID = NOW - timedelta(days=settings.HOST_PAYOUT_HOLD_DAYS + 1)
+
+
+@compiles(BIT, "sqlite")
+def compile_bit(type_, compiler, **kw):
+    """SQLite has no BIT type, weekly bitmaps are stored as their bit strings."""
+    return "TEXT"
+
+
+class CountingProvider(StubPayoutProvider):
+    """Stub provider recording every transfer call."""
+
+    def __init__(self, fail=False):
+        super().__init__()
+        self.calls = []
+        self.fail = fail
+
+    def transfer(self, **kwargs):
+        self.calls.append(kwargs)
+        if self.fail:
+            raise PayoutError("rejected")
+        return super().transfer(**kwargs)
+
+
+class TestSettlement(unittest.TestCase):
+    """Due payments are settled once per host, whatever happens to the run."""
+
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(
+            self.engine,
+            tables=[
+                ParkingSpace.__table__,
+                Booking.__table__,
+                BookingArchive.__table__,
+                HostPayout.__table__,
+                Payment.__table__,
+                LedgerAccount.__table__,
+                LedgerEntry.__table__,
+            ],
+        )
+        self.db = Session(self.engine)
+        self.addCleanup(self.engine.dispose)
+        self.addCleanup(self.db.close)
+
+        space = {
+            "title": "Driveway",
+            "address": "1 Main St",
+            "city": "Springfield",
+            "state": "IL",
+            "zip_code": "62701",
+            "country": "US",
+            "hourly_rate": 10.0,
+        }
+        # Space 1 belongs to host 100, space 2 to host 200
+        self.db.add_all([ParkingSpace(id=1, owner_id=100, **space), ParkingSpace(id=2, owner_id=200, **space)])
+        for id, space_id, paid in ((1, 1, PAID), (2, 1, PAID), (3, 2, PAID), (4, 1, NOW)):
+            self.db.add(Payment(
+                id=id,
+                amount=20.0,
+                base_amount=18.0,
+                service_fee=2.0,
+                status=PaymentStatus.COMPLETED,
+                payment_date=paid,
+                host_payout_amount=14.0,
+                host_payout_status="pending",
+            ))
+            self.db.add(Booking(
+                id=id,
+                start_time=paid,
+                end_time=paid + timedelta(hours=2),
+                base_price=18.0,
+                service_fee=2.0,
+                total_price=20.0,
+                status=BookingStatus.COMPLETED,
+                user_id=1,
+                parking_space_id=space_id,
+                payment_id=id,
+            ))
+        self.db.commit()
+        self.provider = CountingProvider()
+        self.original_provider = payouts.payout_provider
+        payouts.payout_provider = self.provider
+        self.addCleanup(setattr, payouts, "payout_provider", self.original_provider)
+
+    def payout_statuses(self):
+        return dict(self.db.query(Payment.id, Payment.host_payout_status).order_by(Payment.id))
+
+    def test_settle_due_payouts(self):
+        result = payouts.settle_due_payouts(self.db, now=NOW)
+        self.assertEqual(result, {"completed": 2, "failed": 0, "canceled": 0, "payments": 3})
+        self.assertEqual(
+            sorted((call["host_id"], call["amount"]) for call in self.provider.calls), [(100, 28.0), (200, 14.0)]
+        )
+        # Payment 4 is still within the hold period
+        self.assertEqual(self.payout_statuses(), {1: "completed", 2: "completed", 3: "completed", 4: "pending"})
+        balances = dict(self.db.query(LedgerAccount.account_id, LedgerAccount.balance))
+        self.assertEqual(balances, {100: -28.0, 200: -14.0})
+        # Nothing is left for the next run
+        self.assertEqual(payouts.settle_due_payouts(self.db, now=NOW)["completed"], 0)
+
+    def test_settled_payout_is_not_settled_again(self):
+        payout = crud.host_payout.create_for_host(db=self.db, host_id=100, currency="USD", eligible_before=NOW)
+        crud.host_payout.claim_payments(self.db, payout=payout, payment_ids=[1, 2])
+        stale = self.db.get(HostPayout, payout.id)
+        settled = crud.host_payout.settle(self.db, payout=stale, provider=self.provider, now=NOW)
+        self.assertEqual(settled.status, "completed")
+        # A second settle of the same payout, e.g. from a run that loaded it earlier
+        self.assertIsNone(crud.host_payout.settle(self.db, payout=stale, provider=self.provider, now=NOW))
+        self.assertEqual(len(self.provider.calls), 1)
+        self.assertEqual(self.db.query(LedgerEntry).filter(LedgerEntry.host_payout_id == payout.id).count(), 1)
+
+    def test_failed_transfer_releases_payments(self):
+        self.provider.fail = True
+        result = payouts.settle_due_payouts(self.db, now=NOW)
+        self.assertEqual(result, {"completed": 0, "failed": 2, "canceled": 0, "payments": 0})
+        self.assertEqual(set(self.payout_statuses().values()), {"pending"})
+        self.assertEqual(self.db.query(LedgerEntry).count(), 0)
+
+    def test_unfinished_payout_is_resumed(self):
+        payout = crud.host_payout.create_for_host(db=self.db, host_id=100, currency="USD", eligible_before=NOW)
+        crud.host_payout.claim_payments(self.db, payout=payout, payment_ids=[1])
+        result = payouts.settle_due_payouts(self.db, now=NOW)
+        self.assertEqual(result["completed"], 3)
+        self.assertEqual(self.db.get(HostPayout, payout.id).payments_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python
+
+"""Tests for the vectorized pricing engine."""
+
+import itertools
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+from src.parkin_web.core import pricing
+from src.parkin_web.core.pricing import (
+    DemandMultipliers,
+    PricingInputs,
+    QuoteCache,
+    quote,
+    quote_batch,
+)
+from src.parkin_web.schemas.booking import BookingCreate, BookingDuration
+
+T0 = datetime(2025, 6, 2, 9, 0, 0)  # A Monday
+
+
+def make_space(id=1, **fields):
+    values = {
+        "id": id,
+        "latitude": 41.88,
+        "longitude": -87.63,
+        "hourly_rate": 4.0,
+        "daily_rate": 30.0,
+        "monthly_rate": 250.0,
+        "has_ev_charging": True,
+        "ev_charging_rate": 1.5,
+        "instant_booking": True,
+    }
+    values.update(fields)
+    return PricingInputs(**values)
+
+
+def make_request(hours=3.0, **fields):
+    return BookingCreate(
+        parking_space_id=1, start_time=T0, end_time=T0 + timedelta(hours=hours), **fields
+    )
+
+
+def scalar_quote(parking_space, request):
+    """Price a booking one field at a time, the way bookings were priced before the engine."""
+    hours = (request.end_time - request.start_time).total_seconds() / 3600
+    if request.duration_type == "daily" and parking_space.daily_rate:
+        base_price = parking_space.daily_rate * hours / 24
+    elif request.duration_type == "monthly" and parking_space.monthly_rate:
+        base_price = parking_space.monthly_rate
+    else:
+        base_price = parking_space.hourly_rate * hours
+    service_fee = base_price * 0.15
+    ev_charging_fee = 0.0
+    if request.has_ev_charging and parking_space.has_ev_charging and parking_space.ev_charging_rate:
+        ev_charging_fee = parking_space.ev_charging_rate * hours
+    insurance_fee = 0.0
+    if request.has_insurance:
+        insurance_fee = 10.0 if request.insurance_coverage and request.insurance_coverage > 10000 else 5.0
+    return {
+        "base_price": base_price,
+        "service_fee": service_fee,
+        "ev_charging_fee": ev_charging_fee,
+        "insurance_fee": insurance_fee,
+        "total_price": base_price + service_fee + ev_charging_fee + insurance_fee,
+    }
+
+
+class PricingTestCase(unittest.TestCase):
+    """Runs without demand multipliers unless a test sets some."""
+
+    def setUp(self):
+        patcher = mock.patch.object(pricing, "demand_multipliers", DemandMultipliers())
+        self.multipliers = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def assertPricesEqual(self, first, second):
+        self.assertEqual(first.keys(), second.keys())
+        for field in first:
+            self.assertAlmostEqual(first[field], second[field], places=9, msg=field)
+
+
+class TestParity(PricingTestCase):
+    """The batch engine prices every combination like the scalar formula."""
+
+    def test_batch_matches_scalar(self):
+        spaces = [
+            make_space(),
+            make_space(daily_rate=None, monthly_rate=None),
+            make_space(has_ev_charging=False),
+            make_space(ev_charging_rate=None, latitude=None, longitude=None),
+        ]
+        requests = [
+            make_request(
+                hours=hours,
+                duration_type=duration_type,
+                has_ev_charging=has_ev_charging,
+                has_insurance=has_insurance,
+                insurance_coverage=coverage,
+            )
+            for hours, duration_type, has_ev_charging, has_insurance, coverage in itertools.product(
+                (0.5, 3.0, 50.0),
+                list(BookingDuration),
+                (False, True),
+                (False, True),
+                (None, 5000.0, 20000.0),
+            )
+        ]
+        pairs = list(itertools.product(spaces, requests))
+        quotes = quote_batch([space for space, _ in pairs], [request for _, request in pairs])
+        self.assertEqual(len(quotes), len(pairs))
+        for (space, request), prices in zip(pairs, quotes):
+            self.assertPricesEqual(prices, scalar_quote(space, request))
+
+    def test_single_quote(self):
+        request = make_request(duration_type=BookingDuration.DAILY, has_ev_charging=True)
+        self.assertPricesEqual(quote(make_space(), request), scalar_quote(make_space(), request))
+
+    def test_empty_batch(self):
+        self.assertEqual(quote_batch([], []), [])
+
+    def test_prices_are_floats(self):
+        prices = quote(make_space(), make_request())
+        self.assertTrue(all(type(value) is float for value in prices.values()))
+
+
+class TestQuoteCache(PricingTestCase):
+    """Quotes are computed once per space, window and options until invalidated."""
+
+    def setUp(self):
+        super().setUp()
+        self.cache = QuoteCache(maxsize=2)
+        self.spaces = {1: make_space(1), 2: make_space(2, hourly_rate=6.0)}
+        self.loaded = []
+
+    def load_inputs(self, ids):
+        self.loaded.append(ids)
+        return {id: self.spaces[id] for id in ids if id in self.spaces}
+
+    def quote(self, *requests):
+        return self.cache.quote_batch(requests, self.load_inputs)
+
+    def test_only_misses_are_loaded(self):
+        first = make_request()
+        second = make_request(hours=5.0).copy(update={"parking_space_id": 2})
+        self.quote(first)
+        quotes = self.quote(first, second)
+        self.assertEqual(self.loaded, [[1], [2]])
+        self.assertPricesEqual(quotes[0], scalar_quote(self.spaces[1], first))
+        self.assertPricesEqual(quotes[1], scalar_quote(self.spaces[2], second))
+
+    def test_options_are_part_of_the_key(self):
+        self.quote(make_request())
+        self.quote(make_request(has_insurance=True))
+        self.quote(make_request(duration_type=BookingDuration.DAILY))
+        self.assertEqual(len(self.loaded), 3)
+
+    def test_missing_space(self):
+        self.assertEqual(self.quote(make_request().copy(update={"parking_space_id": 3})), [None])
+
+    def test_invalidate_space(self):
+        self.quote(make_request())
+        self.spaces[1] = make_space(1, hourly_rate=8.0)
+        self.cache.invalidate_space(1)
+        [prices] = self.quote(make_request())
+        self.assertEqual(prices["base_price"], 24.0)
+
+    def test_invalidate_quotes(self):
+        self.quote(make_request())
+        self.cache.invalidate_quotes()
+        self.quote(make_request())
+        self.assertEqual(len(self.loaded), 2)
+
+    def test_generations_are_bounded(self):
+        for id in (1, 2, 3):
+            self.cache.invalidate_space(id)
+        self.assertLessEqual(len(self.cache._generations), self.cache.maxsize)
+        # Resetting the generations must not bring back quotes of an invalidated space
+        self.quote(make_request())
+        self.cache.invalidate_space(1)
+        self.cache.invalidate_space(2)
+        self.cache.invalidate_space(3)
+        self.quote(make_request())
+        self.assertEqual(len(self.loaded), 2)
+
+    def test_inputs(self):
+        self.assertIsNone(self.cache.get_inputs(1))
+        self.cache.set_inputs(self.spaces[1])
+        self.assertEqual(self.cache.get_inputs(1), self.spaces[1])
+        self.cache.invalidate_space(1)
+        self.assertIsNone(self.cache.get_inputs(1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+
+"""Tests for the in-memory parking search read model."""
+
+import random
+import time
+import unittest
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from src.parkin_web.core import availability
+from src.parkin_web.core.read_model import READ_MODEL_COLUMNS, ParkingReadModel, build_snapshot
+
+MONDAY = datetime(2025, 6, 2)
+
+
+def fake_rows(count, seed=0):
+    """Rows shaped like the read model query, in READ_MODEL_COLUMNS order."""
+    rand = random.Random(seed)
+    cities = ["Springfield", "Shelbyville", "Capital City"]
+    weekdays_only = availability.FULL_WEEK >> (2 * availability.SLOTS_PER_DAY)
+    return [
+        (
+            id,
+            rand.random() > 0.1,
+            MONDAY + timedelta(minutes=id),
+            None if id % 25 == 0 else 39.7 + rand.random() / 10,
+            None if id % 25 == 0 else -89.7 + rand.random() / 10,
+            round(rand.uniform(2, 20), 2),
+            rand.choice(cities),
+            rand.random() > 0.5,
+            rand.random() > 0.5,
+            rand.random() > 0.5,
+            rand.choice([None, weekdays_only]),
+        )
+        for id in range(1, count + 1)
+    ]
+
+
+def brute_force(rows, latitude=None, longitude=None, city=None, window_mask=None,
+                has_ev_charging=None, min_price=None, max_price=None, skip=0, limit=100):
+    """Reference implementation of the SQL search semantics."""
+    matches = [
+        row for row in rows
+        if row[1]
+        and (city is None or city.lower() in row[6].lower())
+        and (has_ev_charging is None or row[8] == has_ev_charging)
+        and (min_price is None or row[5] >= min_price)
+        and (max_price is None or row[5] <= max_price)
+        and (window_mask is None or row[10] is None or row[10] & window_mask == window_mask)
+    ]
+    if latitude is not None:
+        def distance(row):
+            if row[3] is None:
+                return float("inf")
+            return ((row[3] - latitude) ** 2 + (row[4] - longitude) ** 2) ** 0.5
+        matches.sort(key=distance)
+    return [row[0] for row in matches[skip:skip + limit]]
+
+
+class TestParkingReadModel(unittest.TestCase):
+    """The vectorized search must match the SQL search semantics."""
+
+    def setUp(self):
+        self.rows = fake_rows(500)
+        self.model = ParkingReadModel(max_staleness=60)
+        self.model.apply(self.rows, full=True)
+
+    def test_filters_match_reference(self):
+        saturday = availability.window_mask(MONDAY + timedelta(days=5, hours=9), MONDAY + timedelta(days=5, hours=11))
+        cases = [
+            {},
+            {"city": "field"},
+            {"has_ev_charging": True, "min_price": 5, "max_price": 10},
+            {"window_mask": saturday},
+            {"latitude": 39.75, "longitude": -89.65, "limit": 20},
+            {"latitude": 39.75, "longitude": -89.65, "city": "shelby", "skip": 5, "limit": 10},
+        ]
+        for case in cases:
+            with self.subTest(**{key: str(value) for key, value in case.items()}):
+                self.assertEqual(self.model.search(**case), brute_force(self.rows, **case))
+
+    def test_incremental_changes(self):
+        deactivated = (self.rows[0][0], False) + self.rows[0][2:]
+        repriced = (self.rows[1][0], True) + self.rows[1][2:5] + (1.0,) + self.rows[1][6:]
+        self.model.apply([self.rows[0][:1] + (True,) + self.rows[0][2:]])
+        self.assertEqual(self.model.apply([deactivated, repriced]), 2)
+        self.assertNotIn(deactivated[0], self.model.search(limit=1000))
+        self.assertEqual(self.model.search(max_price=1.0), [repriced[0]])
+        # Re-reading unchanged rows is a no-op
+        self.assertEqual(self.model.apply([repriced]), 0)
+
+    def test_deleted_ids(self):
+        first = self.model.search(limit=1)[0]
+        self.assertEqual(self.model.apply([], deleted=[first, 10_000]), 1)
+        self.assertNotIn(first, self.model.search(limit=1000))
+
+    def test_discard(self):
+        first = self.model.search(limit=1)[0]
+        self.model.discard(first)
+        self.assertNotIn(first, self.model.search(limit=1000))
+
+    def test_patched_snapshot_matches_rebuild(self):
+        rand = random.Random(1)
+        active = {row[0]: row for row in self.rows if row[1]}
+        for _ in range(20):
+            # Long city names must not be truncated to the width of the current array
+            changed = [
+                (id, rand.random() > 0.2) + self.rows[0][2:6] + ("Llanfairpwllgwyngyll-" * 3,)
+                + self.rows[0][7:]
+                for id in rand.sample(range(1, 600), 15)
+            ]
+            deleted = rand.sample(range(1, 600), 5)
+            discarded = rand.randrange(1, 600)
+            self.model.apply(changed, deleted=deleted)
+            self.model.discard(discarded)
+            # Deletions are applied before the changed rows, then the discard
+            for id in deleted:
+                active.pop(id, None)
+            for row in changed:
+                if row[1]:
+                    active[row[0]] = row
+                else:
+                    active.pop(row[0], None)
+            active.pop(discarded, None)
+
+        expected = build_snapshot(dict(zip(READ_MODEL_COLUMNS, active[id])) for id in sorted(active))
+        for name, column in zip(expected._fields, expected):
+            with self.subTest(column=name):
+                np.testing.assert_array_equal(getattr(self.model._snapshot, name), column)
+
+    def test_stale_model_defers_to_sql(self):
+        self.assertIsNone(ParkingReadModel(max_staleness=60).search())
+        self.model.refreshed_at = time.monotonic() - 120
+        self.assertIsNone(self.model.search())
+
+
+if __name__ == "__main__":
+    unittest.main()
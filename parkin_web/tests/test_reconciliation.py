@@ -0,0 +1,204 @@
+#!/usr/bin/env python
+
+"""Tests for the booking/payment reconciliation rules and row streaming."""
+
+import unittest
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from src.parkin_web import crud
+from src.parkin_web.core import reconciliation
+from src.parkin_web.core.reconciliation import AMOUNT_TOLERANCE, ReconciliationRow
+from src.parkin_web.db.base_class import Base
+from src.parkin_web.jobs.reconciliation import run_reconciliation
+from src.parkin_web.models.booking import Booking, BookingArchive, BookingStatus
+from src.parkin_web.models.payment import Payment, PaymentStatus
+from src.parkin_web.models.reconciliation import ReconciliationDiscrepancy, ReconciliationRun
+
+T0 = datetime(2025, 6, 1, 12, 0, 0)
+
+
+def make_row(**fields):
+    """A consistent row (confirmed booking paid in full), with some fields overridden."""
+    values = {
+        "booking_id": 1,
+        "booking_status": "confirmed",
+        "total_price": 20.0,
+        "payment_id": 10,
+        "payment_status": "completed",
+        "amount": 20.0,
+        "refund_amount": None,
+        "host_payout_status": "pending",
+        "host_payout_amount": 14.0,
+    }
+    values.update(fields)
+    return ReconciliationRow(**values)
+
+
+def violated(row):
+    """Names of the rules a row violates."""
+    return [discrepancy["rule"] for discrepancy in reconciliation.evaluate([row])]
+
+
+class TestRules(unittest.TestCase):
+    """Every rule fires on its inconsistent state and nowhere else."""
+
+    def test_consistent_row(self):
+        self.assertEqual(violated(make_row()), [])
+
+    def test_refunded_payment_active_booking(self):
+        for booking_status in ("pending", BookingStatus.CONFIRMED):
+            with self.subTest(booking_status=booking_status):
+                row = make_row(
+                    booking_status=booking_status,
+                    payment_status=PaymentStatus.REFUNDED,
+                    host_payout_status="canceled",
+                )
+                self.assertEqual(violated(row), ["refunded_payment_active_booking"])
+        row = make_row(booking_status="canceled", payment_status="refunded", host_payout_status="canceled")
+        self.assertEqual(violated(row), [])
+        self.assertEqual(violated(make_row(payment_status="partially_refunded")), [])
+
+    def test_failed_payment_confirmed_booking(self):
+        for payment_status in ("failed", PaymentStatus.FAILED):
+            with self.subTest(payment_status=payment_status):
+                row = make_row(payment_status=payment_status)
+                self.assertEqual(violated(row), ["failed_payment_confirmed_booking"])
+        row = make_row(booking_status="pending", payment_status="failed")
+        self.assertEqual(violated(row), [])
+
+    def test_payout_pending_after_cancellation(self):
+        for booking_status in ("canceled", "rejected", BookingStatus.CANCELED):
+            with self.subTest(booking_status=booking_status):
+                row = make_row(booking_status=booking_status)
+                self.assertEqual(violated(row), ["payout_pending_after_cancellation"])
+        # Nothing left to pay out
+        for amount in (0.0, None):
+            with self.subTest(host_payout_amount=amount):
+                row = make_row(booking_status="canceled", host_payout_amount=amount)
+                self.assertEqual(violated(row), [])
+
+    def test_payout_completed_after_full_refund(self):
+        row = make_row(
+            booking_status="canceled",
+            payment_status=PaymentStatus.REFUNDED,
+            host_payout_status="completed",
+        )
+        self.assertEqual(violated(row), ["payout_completed_after_full_refund"])
+        row = make_row(payment_status="partially_refunded", host_payout_status="completed")
+        self.assertEqual(violated(row), [])
+
+    def test_completed_booking_without_payment(self):
+        row = make_row(
+            booking_status=BookingStatus.COMPLETED,
+            payment_id=None,
+            payment_status=None,
+            amount=None,
+            host_payout_status=None,
+            host_payout_amount=None,
+        )
+        self.assertEqual(violated(row), ["completed_booking_without_payment"])
+        # Unpaid pending bookings are normal
+        row = row._replace(booking_status="pending")
+        self.assertEqual(violated(row), [])
+
+    def test_payment_amount_mismatch_tolerance(self):
+        self.assertEqual(violated(make_row(amount=20.0 + AMOUNT_TOLERANCE / 2)), [])
+        self.assertEqual(violated(make_row(amount=20.0 - AMOUNT_TOLERANCE / 2)), [])
+        self.assertEqual(
+            violated(make_row(amount=20.0 + AMOUNT_TOLERANCE * 2)), ["payment_amount_mismatch"]
+        )
+        self.assertEqual(
+            violated(make_row(amount=20.0 - AMOUNT_TOLERANCE * 2)), ["payment_amount_mismatch"]
+        )
+        # A missing amount counts as zero
+        self.assertEqual(violated(make_row(amount=None)), ["payment_amount_mismatch"])
+
+    def test_orphan_payment(self):
+        row = make_row(booking_id=None, booking_status=None, total_price=None)
+        self.assertEqual(violated(row), ["orphan_payment"])
+        row = make_row(booking_id=None, booking_status=None, total_price=None, payment_id=None)
+        self.assertEqual(violated(row), [])
+
+    def test_discrepancy_details(self):
+        [discrepancy] = reconciliation.evaluate([make_row(payment_status=PaymentStatus.FAILED)])
+        self.assertEqual(discrepancy["booking_id"], 1)
+        self.assertEqual(discrepancy["payment_id"], 10)
+        self.assertIn("payment status failed", discrepancy["details"])
+
+
+class TestIterChunks(unittest.TestCase):
+    """Live, archived and orphan rows are streamed in bounded chunks."""
+
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(
+            self.engine,
+            tables=[
+                Payment.__table__,
+                Booking.__table__,
+                BookingArchive.__table__,
+                ReconciliationRun.__table__,
+                ReconciliationDiscrepancy.__table__,
+            ],
+        )
+        self.db = Session(self.engine)
+        self.addCleanup(self.engine.dispose)
+        self.addCleanup(self.db.close)
+
+        for id in range(1, 8):
+            self.db.add(Payment(id=id, amount=20.0, base_amount=18.0, service_fee=2.0))
+        self.db.flush()
+        booking = {
+            "start_time": T0,
+            "end_time": T0 + timedelta(hours=2),
+            "base_price": 18.0,
+            "service_fee": 2.0,
+            "total_price": 20.0,
+            "user_id": 1,
+            "parking_space_id": 1,
+        }
+        # Payments 1-3 are paid by live bookings, 5 by an archived one; 4, 6 and 7 are orphans
+        for id, payment_id in ((1, 1), (2, 2), (3, 3), (4, None)):
+            self.db.add(Booking(id=id, status=BookingStatus.CONFIRMED, payment_id=payment_id, **booking))
+        self.db.execute(
+            BookingArchive.__table__.insert().values(
+                id=9, status=BookingStatus.COMPLETED, payment_id=5, **booking
+            )
+        )
+        self.db.commit()
+
+    def rows(self, chunk_size):
+        return [row for _, chunk in crud.reconciliation.iter_chunks(self.db, chunk_size=chunk_size) for row in chunk]
+
+    def test_chunks_are_bounded(self):
+        chunks = list(crud.reconciliation.iter_chunks(self.db, chunk_size=2))
+        self.assertTrue(all(len(chunk) <= scanned <= 2 for scanned, chunk in chunks))
+        rows = [row for _, chunk in chunks for row in chunk]
+        self.assertEqual([row.booking_id for row in rows if row.booking_id], [1, 2, 3, 4, 9])
+
+    def test_scanned_rows(self):
+        chunks = list(crud.reconciliation.iter_chunks(self.db, chunk_size=2))
+        # 4 live bookings, 1 archived one and all 7 payments, not just the orphans
+        self.assertEqual(sum(scanned for scanned, _ in chunks), 12)
+        self.assertEqual(run_reconciliation(self.db)["rows_checked"], 12)
+
+    def test_orphan_payments(self):
+        rows = self.rows(2)
+        orphans = [row.payment_id for row in rows if row.booking_id is None]
+        self.assertEqual(orphans, [4, 6, 7])
+        rules = {d["payment_id"]: d["rule"] for d in reconciliation.evaluate(rows) if d["booking_id"] is None}
+        self.assertEqual(rules, {4: "orphan_payment", 6: "orphan_payment", 7: "orphan_payment"})
+
+    def test_unpaid_booking_row(self):
+        rows = self.rows(10)
+        unpaid = next(row for row in rows if row.booking_id == 4)
+        self.assertIsNone(unpaid.payment_id)
+        self.assertIsNone(unpaid.payment_status)
+        self.assertEqual(violated(unpaid), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+
+"""Tests for the ORM fast path of list responses and sparse fieldsets."""
+
+import json
+import unittest
+
+import orjson
+from fastapi import HTTPException
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects.postgresql import BIT
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+
+from src.parkin_web import crud
+from src.parkin_web.api.routes import parking, users
+from src.parkin_web.core import serialization
+from src.parkin_web.db.base_class import Base
+from src.parkin_web.models.parking_space import ParkingSpace, ParkingSpaceImage
+from src.parkin_web.models.user import User
+from tests.bench_serialization import fake_parking_spaces, render_fast_path, render_response_model
+
+OWNER_ID = 2
+
+
+@compiles(BIT, "sqlite")
+def compile_bit(type_, compiler, **kw):
+    """SQLite has no BIT type, weekly bitmaps are stored as their bit strings."""
+    return "TEXT"
+
+
+class TestSerialization(unittest.TestCase):
+    """The fast path must render the same document as the response model."""
+
+    def test_search_result_matches_response_model(self):
+        spaces = fake_parking_spaces(20, 2)
+        self.assertEqual(
+            json.loads(render_fast_path(spaces)),
+            json.loads(render_response_model(spaces)),
+        )
+
+    def test_parking_space_list_has_no_images(self):
+        spaces = fake_parking_spaces(3, 2)
+        items = json.loads(orjson.dumps(serialization.parking_space_list(spaces)))
+        self.assertEqual([item["id"] for item in items], [1, 2, 3])
+        self.assertTrue(all("images" not in item for item in items))
+
+    def test_enums_and_datetimes_are_rendered_like_pydantic(self):
+        item = json.loads(render_fast_path(fake_parking_spaces(1, 1)))["results"][0]
+        self.assertEqual(item["parking_type"], "garage")
+        self.assertEqual(item["created_at"], "2025-06-01T12:30:15.123456")
+        self.assertEqual(item["images"][0]["is_main"], True)
+
+    def test_pin_view_only_has_pin_fields(self):
+        fields = serialization.resolve_fields("pin")
+        result = json.loads(orjson.dumps(serialization.search_result(fake_parking_spaces(2, 2), fields)))
+        self.assertEqual(set(result["results"][0]), {"id", "title", "latitude", "longitude", "hourly_rate"})
+
+    def test_fields_override_view_and_keep_id(self):
+        fields = serialization.resolve_fields("card", "hourly_rate, images")
+        self.assertEqual(fields, ("id", "hourly_rate", "images"))
+        self.assertEqual(serialization.columns_of(fields), ("id", "hourly_rate"))
+        item = serialization.search_result(fake_parking_spaces(1, 2), fields)["results"][0]
+        self.assertEqual(len(item["images"]), 2)
+
+    def test_unknown_fields_are_rejected(self):
+        with self.assertRaises(ValueError):
+            serialization.resolve_fields("full", "id,password")
+        with self.assertRaises(ValueError):
+            serialization.resolve_fields("thumbnail")
+
+    def test_fields_are_deduplicated(self):
+        self.assertEqual(serialization.resolve_fields(fields="title, ,id,title"), ("id", "title"))
+
+
+class TestSparseQueries(unittest.TestCase):
+    """Only the selected columns are loaded, and images only when requested."""
+
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(self.engine, tables=[ParkingSpace.__table__, ParkingSpaceImage.__table__])
+        self.db = Session(self.engine)
+        self.addCleanup(self.engine.dispose)
+        self.addCleanup(self.db.close)
+        for id in (1, 2):
+            self.db.add(ParkingSpace(
+                id=id,
+                title=f"Driveway {id}",
+                description="Long description",
+                address="1 Main St",
+                city="Springfield",
+                state="IL",
+                zip_code="62701",
+                country="US",
+                latitude=41.88,
+                longitude=-87.63,
+                hourly_rate=10.0,
+                owner_id=OWNER_ID,
+                is_active=True,
+            ))
+            self.db.add(ParkingSpaceImage(url=f"https://example.com/{id}.jpg", parking_space_id=id))
+        self.db.commit()
+        self.db.expunge_all()
+        self.statements = []
+        event.listen(
+            self.engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: self.statements.append(statement),
+        )
+
+    def test_pin_search_loads_pin_columns_only(self):
+        response = parking.search_parking_spaces(db=self.db, view="pin", fields=None)
+        self.assertEqual(
+            json.loads(response.body)["results"][0],
+            {"id": 1, "title": "Driveway 1", "latitude": 41.88, "longitude": -87.63, "hourly_rate": 10.0},
+        )
+        self.assertEqual(len(self.statements), 1)
+        self.assertNotIn("description", self.statements[0])
+
+    def test_images_are_loaded_when_requested(self):
+        response = parking.search_parking_spaces(db=self.db, view="pin", fields="images")
+        self.assertEqual(len(self.statements), 2)
+        item = json.loads(response.body)["results"][1]
+        self.assertEqual((item["id"], [image["url"] for image in item["images"]]), (2, ["https://example.com/2.jpg"]))
+
+    def test_owner_list(self):
+        spaces = crud.parking_space.get_multi_by_owner(self.db, owner_id=OWNER_ID, columns=("title",))
+        self.assertEqual([space.title for space in spaces], ["Driveway 1", "Driveway 2"])
+        self.assertNotIn("description", self.statements[0])
+
+    def test_owner_route(self):
+        owner = User(id=OWNER_ID, is_superuser=False)
+        response = users.read_user_parking_spaces(db=self.db, current_user=owner, view="card", fields=None)
+        items = json.loads(response.body)
+        self.assertEqual([tuple(item) for item in items], [serialization.PARKING_SPACE_VIEWS["card"]] * 2)
+        full = json.loads(users.read_user_parking_spaces(db=self.db, current_user=owner, view=None, fields=None).body)
+        self.assertIn("description", full[0])
+
+    def test_unknown_view_is_a_bad_request(self):
+        for route, kwargs in (
+            (parking.search_parking_spaces, {}),
+            (users.read_user_parking_spaces, {"current_user": User(id=OWNER_ID)}),
+        ):
+            with self.subTest(route=route.__name__):
+                with self.assertRaises(HTTPException) as raised:
+                    route(db=self.db, view="thumbnail", fields=None, **kwargs)
+                self.assertEqual(raised.exception.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+
+"""Tests for map tile math, clustering and tile cache invalidation."""
+
+import unittest
+from unittest import mock
+
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.postgresql import BIT
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+
+from src.parkin_web import crud
+from src.parkin_web.api.routes import parking
+from src.parkin_web.core import pricing, tiles
+from src.parkin_web.core.config import settings
+from src.parkin_web.core.pricing import QuoteCache
+from src.parkin_web.core.tiles import TileCache, is_valid_tile, tile_bounds, tile_for
+from src.parkin_web.db.base_class import Base
+from src.parkin_web.models.parking_space import ParkingSpace
+
+Z = 10
+CHICAGO = (41.88, -87.63)
+
+
+@compiles(BIT, "sqlite")
+def compile_bit(type_, compiler, **kw):
+    """SQLite has no BIT type, weekly bitmaps are stored as their bit strings."""
+    return "TEXT"
+
+
+class TestTileMath(unittest.TestCase):
+    """Points map to the tile whose bounds contain them."""
+
+    def test_tile_contains_point(self):
+        for latitude, longitude in (CHICAGO, (-33.87, 151.21), (0.01, 0.01), (64.1, -21.9)):
+            for z in (0, 1, 5, Z, settings.TILE_MAX_ZOOM):
+                with self.subTest(point=(latitude, longitude), z=z):
+                    south, west, north, east = tile_bounds(z, *tile_for(latitude, longitude, z))
+                    self.assertTrue(south <= latitude < north)
+                    self.assertTrue(west <= longitude < east)
+
+    def test_edges_are_clamped(self):
+        self.assertEqual(tile_for(90.0, 180.0, 2), (3, 0))
+        self.assertEqual(tile_for(-90.0, -180.0, 2), (0, 3))
+        self.assertEqual(tile_for(*CHICAGO, 0), (0, 0))
+
+    def test_is_valid_tile(self):
+        self.assertTrue(is_valid_tile(0, 0, 0))
+        self.assertTrue(is_valid_tile(2, 3, 3))
+        self.assertFalse(is_valid_tile(2, 4, 0))
+        self.assertFalse(is_valid_tile(-1, 0, 0))
+        self.assertFalse(is_valid_tile(settings.TILE_MAX_ZOOM + 1, 0, 0))
+
+
+class TestTileCache(unittest.TestCase):
+    """A point only evicts the tiles containing it."""
+
+    def test_invalidate_points(self):
+        cache = TileCache(maxsize=100)
+        here = tile_for(*CHICAGO, Z)
+        elsewhere = tile_for(-33.87, 151.21, Z)
+        for x, y in (here, elsewhere):
+            cache.set(Z, x, y, {"total": 1})
+        cache.set(0, 0, 0, {"total": 2})
+        cache.invalidate_points([CHICAGO, (None, None)])
+        self.assertIsNone(cache.get(Z, *here))
+        self.assertIsNone(cache.get(0, 0, 0))
+        self.assertEqual(cache.get(Z, *elsewhere), {"total": 1})
+
+
+class TestGetTile(unittest.TestCase):
+    """Active spaces of a tile are bucketed per grid cell in SQL."""
+
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(self.engine, tables=[ParkingSpace.__table__])
+        self.db = Session(self.engine)
+        self.addCleanup(self.engine.dispose)
+        self.addCleanup(self.db.close)
+        for patcher in (
+            mock.patch.object(tiles, "tile_cache", TileCache(maxsize=100)),
+            mock.patch.object(pricing, "quote_cache", QuoteCache(maxsize=100)),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.x, self.y = tile_for(*CHICAGO, Z)
+        south, west, north, east = tile_bounds(Z, self.x, self.y)
+
+        def point(fraction):
+            return south + (north - south) * fraction, west + (east - west) * fraction
+
+        for id, fraction, hourly_rate, is_active in (
+            (1, 0.10, 4.0, True),
+            (2, 0.11, 6.0, True),
+            (3, 0.80, 5.0, True),
+            (4, 0.105, 1.0, False),
+            (5, 1.50, 5.0, True),  # In the next tile
+        ):
+            latitude, longitude = point(fraction)
+            self.db.add(ParkingSpace(
+                id=id,
+                title="Driveway",
+                address="1 Main St",
+                city="Springfield",
+                state="IL",
+                zip_code="62701",
+                country="US",
+                latitude=latitude,
+                longitude=longitude,
+                hourly_rate=hourly_rate,
+                owner_id=1,
+                is_active=is_active,
+            ))
+        self.db.commit()
+
+    def get_tile(self):
+        return crud.parking_space.get_tile(self.db, z=Z, x=self.x, y=self.y)
+
+    def test_clusters(self):
+        tile = self.get_tile()
+        self.assertEqual((tile["z"], tile["x"], tile["y"], tile["total"]), (Z, self.x, self.y, 3))
+        clusters = sorted(tile["clusters"], key=lambda cluster: cluster["count"])
+        self.assertEqual(
+            [(c["count"], c["min_price"], c["max_price"], c["parking_space_id"]) for c in clusters],
+            [(1, 5.0, 5.0, 3), (2, 4.0, 6.0, None)],
+        )
+
+    def test_tiles_are_cached_until_a_space_moves(self):
+        tile = self.get_tile()
+        self.assertIs(self.get_tile(), tile)
+        target = self.db.get(ParkingSpace, 3)
+        crud.parking_space.update(
+            self.db,
+            db_obj=self.db.get(ParkingSpace, 5),
+            obj_in={"latitude": target.latitude, "longitude": target.longitude},
+        )
+        self.assertIsNot(self.get_tile(), tile)
+        self.assertEqual(self.get_tile()["total"], 4)
+
+    def test_invalid_tile_is_not_found(self):
+        with self.assertRaises(HTTPException) as raised:
+            parking.get_parking_tile(db=self.db, z=2, x=4, y=0)
+        self.assertEqual(raised.exception.status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
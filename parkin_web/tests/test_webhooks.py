@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+
+"""Tests for payment provider webhook verification and batching."""
+
+import itertools
+import json
+import random
+import time
+import unittest
+
+from src.parkin_web.core import webhooks
+
+SECRET = "whsec_test"
+
+
+class FakeEventGenerator:
+    """Local stand-in for the payment provider emitting signed webhook events."""
+
+    def __init__(self, seed=0):
+        self.random = random.Random(seed)
+        self.ids = itertools.count(1)
+
+    def event(self, event_type, transaction_id, event_id=None, **fields):
+        """Build a raw event body."""
+        obj = {"id": transaction_id, "object": "payment_intent", **fields}
+        if event_type == webhooks.CHARGE_REFUNDED:
+            obj = {"id": f"ch_{transaction_id}", "payment_intent": transaction_id, **fields}
+        event = {
+            "id": event_id or f"evt_{next(self.ids)}",
+            "type": event_type,
+            "data": {"object": obj},
+        }
+        return json.dumps(event).encode()
+
+    def signed(self, payload, timestamp=None):
+        """Sign a payload like the provider does."""
+        return webhooks.sign_payload(payload, SECRET, int(timestamp or time.time()))
+
+    def stream(self, count, transactions=50, redelivery_rate=0.1):
+        """Generate a random stream of events, with redeliveries of earlier events."""
+        sent = []
+        for _ in range(count):
+            if sent and self.random.random() < redelivery_rate:
+                sent.append(self.random.choice(sent))
+                continue
+            event_type = self.random.choice(webhooks.HANDLED_EVENT_TYPES)
+            transaction_id = f"pi_{self.random.randrange(transactions)}"
+            fields = {"amount_refunded": 500} if event_type == webhooks.CHARGE_REFUNDED else {}
+            sent.append(self.event(event_type, transaction_id, **fields))
+        return sent
+
+
+def as_rows(payloads):
+    """Turn raw payloads into queued (queue_id, event_id, event_type, payload) rows."""
+    rows = []
+    for queue_id, payload in enumerate(payloads, start=1):
+        event_id, event_type = webhooks.parse_event(payload)
+        rows.append((queue_id, event_id, event_type, payload.decode()))
+    return rows
+
+
+class TestSignature(unittest.TestCase):
+    """Tests for webhook signature verification."""
+
+    def setUp(self):
+        self.generator = FakeEventGenerator()
+        self.payload = self.generator.event(webhooks.PAYMENT_SUCCEEDED, "pi_1")
+
+    def test_valid_signature(self):
+        webhooks.verify_signature(self.payload, self.generator.signed(self.payload), SECRET)
+
+    def test_tampered_payload(self):
+        header = self.generator.signed(self.payload)
+        with self.assertRaises(webhooks.WebhookSignatureError):
+            webhooks.verify_signature(self.payload + b" ", header, SECRET)
+
+    def test_wrong_secret(self):
+        header = webhooks.sign_payload(self.payload, "other", int(time.time()))
+        with self.assertRaises(webhooks.WebhookSignatureError):
+            webhooks.verify_signature(self.payload, header, SECRET)
+
+    def test_stale_signature(self):
+        header = self.generator.signed(self.payload, timestamp=time.time() - 3600)
+        with self.assertRaises(webhooks.WebhookSignatureError):
+            webhooks.verify_signature(self.payload, header, SECRET, tolerance=300)
+
+    def test_missing_or_malformed_header(self):
+        for header in (None, "", "v1=abc", "t=soon,v1=abc"):
+            with self.assertRaises(webhooks.WebhookSignatureError):
+                webhooks.verify_signature(self.payload, header, SECRET)
+
+
+class TestPlanBatch(unittest.TestCase):
+    """Tests for reducing a batch of queued events to the changes to apply."""
+
+    def setUp(self):
+        self.generator = FakeEventGenerator()
+
+    def test_duplicates_are_ignored(self):
+        payload = self.generator.event(webhooks.PAYMENT_SUCCEEDED, "pi_1")
+        plan = webhooks.plan_batch(as_rows([payload, payload]))
+        self.assertEqual(plan["succeeded"], {"pi_1"})
+        self.assertEqual(plan["ignored"], [2])
+
+    def test_latest_event_per_transaction_wins(self):
+        plan = webhooks.plan_batch(as_rows([
+            self.generator.event(webhooks.PAYMENT_FAILED, "pi_1"),
+            self.generator.event(webhooks.PAYMENT_SUCCEEDED, "pi_1"),
+        ]))
+        self.assertEqual(plan["succeeded"], {"pi_1"})
+        self.assertEqual(plan["failed"], set())
+
+    def test_refund_is_kept_with_the_success(self):
+        plan = webhooks.plan_batch(as_rows([
+            self.generator.event(webhooks.PAYMENT_SUCCEEDED, "pi_1"),
+            self.generator.event(webhooks.CHARGE_REFUNDED, "pi_1", amount_refunded=500),
+        ]))
+        self.assertEqual(plan["succeeded"], {"pi_1"})
+        self.assertEqual(plan["refunded"], {"pi_1": 5.0})
+
+    def test_largest_cumulative_refund_wins(self):
+        plan = webhooks.plan_batch(as_rows([
+            self.generator.event(webhooks.CHARGE_REFUNDED, "pi_1", amount_refunded=800),
+            self.generator.event(webhooks.CHARGE_REFUNDED, "pi_1", amount_refunded=300),
+        ]))
+        self.assertEqual(plan["refunded"], {"pi_1": 8.0})
+
+    def test_refund_amount_in_major_units(self):
+        plan = webhooks.plan_batch(as_rows([
+            self.generator.event(webhooks.CHARGE_REFUNDED, "pi_1", amount_refunded=1250),
+        ]))
+        self.assertEqual(plan["refunded"], {"pi_1": 12.5})
+
+    def test_unhandled_and_malformed_events_are_ignored(self):
+        rows = as_rows([self.generator.event("customer.created", "cus_1")])
+        rows.append((2, "evt_bad", webhooks.PAYMENT_SUCCEEDED, "{}"))
+        plan = webhooks.plan_batch(rows)
+        self.assertEqual(plan["ignored"], [1, 2])
+        self.assertEqual(plan["succeeded"], set())
+
+    def test_random_stream(self):
+        payloads = self.generator.stream(2000)
+        rows = as_rows(payloads)
+        plan = webhooks.plan_batch(rows)
+
+        unique_ids = {event_id for _, event_id, _, _ in rows}
+        self.assertEqual(len(rows) - len(plan["ignored"]), len(unique_ids))
+        self.assertLessEqual(len(plan["succeeded"]) + len(plan["failed"]), 50)
+        self.assertFalse(plan["succeeded"] & plan["failed"])
+
+        # Every transaction ends in the status of its last distinct status event,
+        # and keeps its refunds whatever came after them
+        last = {}
+        refunds = set()
+        seen = set()
+        for _, event_id, event_type, payload in rows:
+            if event_id not in seen:
+                seen.add(event_id)
+                obj = json.loads(payload)["data"]["object"]
+                transaction_id = obj.get("payment_intent") or obj["id"]
+                if event_type == webhooks.CHARGE_REFUNDED:
+                    refunds.add(transaction_id)
+                else:
+                    last[transaction_id] = event_type
+        for transaction_id, event_type in last.items():
+            if event_type == webhooks.PAYMENT_SUCCEEDED:
+                self.assertIn(transaction_id, plan["succeeded"])
+            else:
+                self.assertIn(transaction_id, plan["failed"])
+        self.assertEqual(set(plan["refunded"]), refunds)